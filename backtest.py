@@ -7,15 +7,32 @@ Script para executar simulações do bot de trading com dados históricos.
 import json
 import tempfile
 import os
+import time
 from pathlib import Path
 from decimal import Decimal
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import questionary
 import argparse
 import sys
 import pandas as pd
 
+from src.backtest.analise_resultados import analisar_curva, analisar_saidas
+from src.backtest.cache_resultados import LIMITE_PADRAO_MB, CacheResultados
+from src.backtest.equivalencia import (
+    comparar_modos_numericos,
+    comparar_salto_de_barras,
+    imprimir_relatorio_equivalencia,
+    imprimir_relatorio_salto,
+)
+from src.backtest.executor import normalizar_estrategias
+from src.backtest.giro_vetorizado import confirmar_finalistas, triar_grade_giro
+from src.backtest.lote import carregar_lote, executar_lote, imprimir_relatorio_lote
+from src.backtest.monte_carlo import executar_monte_carlo, imprimir_relatorio_monte_carlo, salvar_caminhos_csv
+from src.backtest.sweep import executar_sweep, imprimir_tabela_ranking, salvar_resultados_csv, timeframes_usados
+from src.backtest.walk_forward import executar_walk_forward, imprimir_relatorio_walk_forward
 from src.core.bot_worker import BotWorker
+from src.core.tabela_trades import TabelaTrades, resumir_trades
+from src.exchange.historico_cache import carregar_store_historico, obter_store_historico
 from src.exchange.simulated_api import SimulatedExchangeAPI
 from src.persistencia.database import DatabaseManager
 from src.persistencia.state_manager import StateManager
@@ -654,10 +671,11 @@ def calcular_benchmark_buy_hold(dados_csv: str, saldo_inicial: float, taxa_pct:
     Returns:
         Dicionário com os resultados do Buy & Hold
     """
-    df = pd.read_csv(dados_csv)
+    # Mesmos arrays (memmap) já abertos pelo SimulatedExchangeAPI
+    closes = obter_store_historico(dados_csv).close
     
-    # Se o DataFrame estiver vazio, retornar resultados neutros para evitar exceções
-    if df is None or df.empty:
+    # Se não houver candles, retornar resultados neutros para evitar exceções
+    if len(closes) == 0:
         return {
             'saldo_final': float(Decimal('0')),
             'lucro_total': float(Decimal('0')),
@@ -670,7 +688,7 @@ def calcular_benchmark_buy_hold(dados_csv: str, saldo_inicial: float, taxa_pct:
         }
 
     # Compra no início (primeira vela)
-    preco_inicial = Decimal(str(df.iloc[0]['close']))
+    preco_inicial = Decimal(str(closes[0]))
     taxa = Decimal(str(taxa_pct)) / Decimal('100')
     
     # Calcular quantidade comprada (descontando taxa)
@@ -680,7 +698,7 @@ def calcular_benchmark_buy_hold(dados_csv: str, saldo_inicial: float, taxa_pct:
     quantidade_ativo = custo_liquido / preco_inicial
     
     # Venda no final (última vela)
-    preco_final = Decimal(str(df.iloc[-1]['close']))
+    preco_final = Decimal(str(closes[-1]))
     receita_bruta = quantidade_ativo * preco_final
     taxa_venda = receita_bruta * taxa
     receita_liquida = receita_bruta - taxa_venda
@@ -707,6 +725,7 @@ def analisar_saidas_por_motivo(trades: list) -> Dict[str, Any]:
 
     Estratégia de matching: Como não há um campo 'id_compra' explícito nos trades,
     usamos FIFO (First In First Out) - cada venda é vinculada à compra não-fechada mais antiga.
+    O emparelhamento é vetorizado em src/backtest/analise_resultados.py.
 
     Args:
         trades: Lista de trades executados (em ordem cronológica)
@@ -714,100 +733,12 @@ def analisar_saidas_por_motivo(trades: list) -> Dict[str, Any]:
     Returns:
         Dicionário com contagem e análise de lucro/prejuízo por motivo
     """
-    saidas = {
-        'Stop Loss (SL)': {
-            'count': 0,
-            'lucro_total': Decimal('0'),
-            'lucro_lista': [],
-            'trades': []
-        },
-        'Trailing Stop Loss (TSL)': {
-            'count': 0,
-            'lucro_total': Decimal('0'),
-            'lucro_lista': [],
-            'trades': []
-        },
-        'Meta de Lucro': {
-            'count': 0,
-            'lucro_total': Decimal('0'),
-            'lucro_lista': [],
-            'trades': []
-        },
-        'Outros': {
-            'count': 0,
-            'lucro_total': Decimal('0'),
-            'lucro_lista': [],
-            'trades': []
-        }
-    }
-
-    # Rastrear posições abertas por carteira usando FIFO
-    # Estrutura: { 'carteira': [{'preco': float, 'quantidade': float, 'custo_total': Decimal}, ...] }
-    posicoes_abertas = {}
-
-    # Iterar sobre trades em ordem cronológica (FIFO)
-    for trade in trades:
-        carteira = trade.get('carteira', 'giro_rapido')
-        side = trade.get('side', '')
-
-        if side == 'BUY':
-            # Adicionar à posição aberta
-            if carteira not in posicoes_abertas:
-                posicoes_abertas[carteira] = []
-
-            # Armazenar info da compra
-            compra_info = {
-                'preco': Decimal(str(trade.get('preco', 0))),
-                'quantidade': Decimal(str(trade.get('quantidade_ativo', 0))),
-                'custo_total': Decimal(str(trade.get('quantidade_usdt', 0))),
-                'timestamp': trade.get('timestamp', '')
-            }
-            posicoes_abertas[carteira].append(compra_info)
-
-        elif side == 'SELL':
-            motivo = trade.get('motivo', '').lower()
-
-            # Determinar categoria de saída
-            if 'stop loss' in motivo and 'trailing' not in motivo:
-                categoria = 'Stop Loss (SL)'
-            elif 'trailing' in motivo or 'tsl' in motivo:
-                categoria = 'Trailing Stop Loss (TSL)'
-            elif 'meta' in motivo or 'lucro' in motivo or 'venda' in motivo:
-                categoria = 'Meta de Lucro'
-            else:
-                categoria = 'Outros'
-
-            saidas[categoria]['count'] += 1
-            saidas[categoria]['trades'].append(trade)
-
-            # Calcular lucro/prejuízo usando FIFO
-            try:
-                receita = Decimal(str(trade.get('receita_usdt', 0)))
-                quantidade_venda = Decimal(str(trade.get('quantidade_ativo', 0)))
-
-                # Buscar posições abertas para esta carteira
-                if carteira in posicoes_abertas and posicoes_abertas[carteira]:
-                    # Vincular à compra mais antiga (FIFO)
-                    compra_info = posicoes_abertas[carteira][0]
-
-                    # Calcular lucro/prejuízo
-                    # lucro = receita_total - custo_total
-                    lucro = receita - compra_info['custo_total']
-
-                    saidas[categoria]['lucro_total'] += lucro
-                    saidas[categoria]['lucro_lista'].append(float(lucro))
-
-                    # Remover a posição fechada da lista (FIFO)
-                    posicoes_abertas[carteira].pop(0)
-            except Exception as e:
-                # Log silencioso de erros de parsing
-                pass
-
-    return saidas
+    return analisar_saidas(TabelaTrades(trades))
 
 
 def imprimir_relatorio_final(resultados: Dict[str, Any], benchmark: Dict[str, float], 
-                              saldo_inicial: float, dados_csv: str):
+                              saldo_inicial: float, dados_csv: str,
+                              saidas_por_motivo: Optional[Dict[str, Any]] = None):
     """
     Imprime o relatório final detalhado do backtest
     
@@ -816,6 +747,7 @@ def imprimir_relatorio_final(resultados: Dict[str, Any], benchmark: Dict[str, fl
         benchmark: Resultados do Buy & Hold
         saldo_inicial: Saldo inicial usado
         dados_csv: Caminho do arquivo de dados
+        saidas_por_motivo: analisar_saidas_por_motivo() já calculada (ex: vinda do cache)
     """
     print("\n" + "="*80)
     print("📊 RELATÓRIO FINAL DO BACKTEST")
@@ -823,18 +755,18 @@ def imprimir_relatorio_final(resultados: Dict[str, Any], benchmark: Dict[str, fl
     
     # Informações gerais
     try:
-        df = pd.read_csv(dados_csv)
+        timestamps_ms = obter_store_historico(dados_csv).timestamps
     except Exception:
-        df = pd.DataFrame()
+        timestamps_ms = []
 
-    if df is None or df.empty:
+    if len(timestamps_ms) == 0:
         data_inicial = None
         data_final = None
         total_velas = 0
     else:
-        data_inicial = df.iloc[0].get('timestamp', None)
-        data_final = df.iloc[-1].get('timestamp', None)
-        total_velas = len(df)
+        data_inicial = pd.Timestamp(int(timestamps_ms[0]), unit='ms')
+        data_final = pd.Timestamp(int(timestamps_ms[-1]), unit='ms')
+        total_velas = len(timestamps_ms)
     
     print(f"\n📅 Período Simulado:")
     print(f"   Início: {data_inicial}")
@@ -843,8 +775,10 @@ def imprimir_relatorio_final(resultados: Dict[str, Any], benchmark: Dict[str, fl
     
     # Resultados da estratégia
     trades = resultados['trades']
-    compras = [t for t in trades if t['side'] == 'BUY']
-    vendas = [t for t in trades if t['side'] == 'SELL']
+    tabela = TabelaTrades(trades)
+    resumo = resumir_trades(tabela)
+    compras = resumo['compras']
+    vendas = resumo['vendas']
     
     saldo_final_usdt = resultados['saldo_final_usdt']
     saldo_final_ativo = resultados['saldo_final_ativo']
@@ -864,32 +798,32 @@ def imprimir_relatorio_final(resultados: Dict[str, Any], benchmark: Dict[str, fl
     print(f"   Lucro/Prejuízo: ${lucro_total:.2f} ({lucro_percentual:+.2f}%)")
     
     print(f"\n📈 Operações Executadas:")
-    print(f"   Total de compras: {len(compras)}")
-    print(f"   Total de vendas: {len(vendas)}")
-    print(f"   Total de trades: {len(trades)}")
+    print(f"   Total de compras: {compras}")
+    print(f"   Total de vendas: {vendas}")
+    print(f"   Total de trades: {resumo['total_trades']}")
     
+    volume_comprado = resumo['volume_comprado']
+    volume_vendido = resumo['volume_vendido']
     if compras:
-        volume_comprado = sum(c['quantidade_usdt'] for c in compras)
         print(f"   Volume comprado: ${volume_comprado:.2f} USDT")
     
     if vendas:
-        volume_vendido = sum(v['receita_usdt'] for v in vendas)
         print(f"   Volume vendido: ${volume_vendido:.2f} USDT")
     
     # Análise de saídas com lucro/prejuízo por motivo
     if vendas:
         print(f"\n🎯 Análise de Saídas (Lucro/Prejuízo por Motivo):")
-        saidas = analisar_saidas_por_motivo(trades)
+        saidas = saidas_por_motivo or analisar_saidas(tabela)
 
         for motivo in ['Stop Loss (SL)', 'Trailing Stop Loss (TSL)', 'Meta de Lucro', 'Outros']:
             info = saidas[motivo]
             count = info['count']
 
             if count > 0:
-                percentual = (count / len(vendas)) * 100
+                percentual = (count / vendas) * 100
                 lucro_total = float(info['lucro_total'])
                 lucro_medio = lucro_total / count if count > 0 else 0
-                lucro_medio_pct = (lucro_medio / sum(c['quantidade_usdt'] for c in compras)) * 100 if compras else 0
+                lucro_medio_pct = (lucro_medio / volume_comprado) * 100 if compras else 0
 
                 # Exibição formatada
                 print(f"\n   {motivo}:")
@@ -897,6 +831,18 @@ def imprimir_relatorio_final(resultados: Dict[str, Any], benchmark: Dict[str, fl
                 print(f"      Lucro/Prejuízo Total: ${lucro_total:+.2f}")
                 print(f"      Lucro/Prejuízo Médio: ${lucro_medio:+.2f} ({lucro_medio_pct:+.2f}%)")
     
+    # Risco e exposição (curva de patrimônio)
+    risco = analisar_curva(resultados.get('portfolio_over_time', []), volume_comprado + volume_vendido)
+    sharpe = f"{risco['sharpe']:.2f}" if risco['sharpe'] is not None else "n/d"
+    sortino = f"{risco['sortino']:.2f}" if risco['sortino'] is not None else "n/d"
+    print(f"\n📐 Risco e Exposição:")
+    print(f"   Drawdown máximo: {risco['drawdown_max_pct']:.2f}%")
+    print(f"   Tempo submerso: {risco['tempo_submerso_pct']:.1f}% (maior: {risco['maior_submersao_dias']:.1f} dias)")
+    print(f"   Sharpe (diário, anualizado): {sharpe}")
+    print(f"   Sortino (diário, anualizado): {sortino}")
+    print(f"   Tempo exposto: {risco['exposicao_pct']:.1f}%")
+    print(f"   Giro da carteira: {risco['giro_carteira']:.2f}x")
+    
     # Benchmark Buy & Hold
     print(f"\n📊 Benchmark Buy & Hold:")
     preco_inicial_bench = benchmark.get('preco_inicial', 0.0)
@@ -927,6 +873,380 @@ def imprimir_relatorio_final(resultados: Dict[str, Any], benchmark: Dict[str, fl
     print("\n" + "="*80)
 
 
+def criar_cache_resultados(args, arquivo_csv: str) -> Optional[CacheResultados]:
+    """
+    Cache de resultados do CSV, ou None com --no-cache.
+
+    Args:
+        args: Argumentos da linha de comando (no_cache, cache_max_mb)
+        arquivo_csv: CSV histórico
+    """
+    if args.no_cache:
+        print("ℹ️  Cache de resultados desativado (--no-cache)")
+        return None
+    try:
+        return CacheResultados(arquivo_csv, limite_mb=args.cache_max_mb)
+    except Exception as e:
+        print(f"⚠️ Cache de resultados indisponível, simulando sem cache: {e}")
+        return None
+
+
+def executar_modo_sweep(args, config: Dict[str, Any], arquivo_csv: str, timeframe_base: str,
+                        saldo_inicial: float, taxa: float, estrategias_selecionadas: list) -> None:
+    """
+    Roda a grade de parâmetros de --sweep em paralelo e imprime o ranking.
+
+    Args:
+        args: Argumentos da linha de comando (sweep, workers, top, ordenar_por, sweep_saida,
+              triagem_giro, no_cache, cache_max_mb)
+        config: Configuração base (cada combinação é aplicada sobre uma cópia)
+        arquivo_csv: CSV histórico
+        timeframe_base: Timeframe do CSV
+        saldo_inicial: Saldo inicial em USDT
+        taxa: Taxa da exchange em %
+        estrategias_selecionadas: Estratégias a simular
+    """
+    try:
+        grade = carregar_configuracao(args.sweep)
+    except Exception:
+        print(f"❌ Não foi possível carregar a grade do sweep: {args.sweep}")
+        return
+
+    if not grade:
+        print("❌ Grade do sweep vazia.")
+        return
+
+    print("\n" + "="*80)
+    print("🧮 SWEEP DE PARÂMETROS")
+    print("="*80)
+    for caminho, valores in grade.items():
+        print(f"   {caminho}: {valores}")
+
+    if args.triagem_giro:
+        flags = normalizar_estrategias(estrategias_selecionadas)
+        if flags['giro_rapido'] and not flags['dca']:
+            resultados = executar_triagem_giro(args, config, grade, arquivo_csv, timeframe_base, saldo_inicial, taxa)
+            imprimir_tabela_ranking(resultados, top=args.top)
+            if args.sweep_saida:
+                try:
+                    salvar_resultados_csv(resultados, args.sweep_saida)
+                    print(f"💾 Ranking das finalistas salvo em: {args.sweep_saida}")
+                except Exception as e:
+                    print(f"⚠️ Falha ao salvar ranking em {args.sweep_saida}: {e}")
+            return
+        print("⚠️ --triagem-giro só se aplica ao giro rápido isolado (--estrategias giro_rapido); rodando o sweep completo.")
+
+    resultados = executar_sweep(
+        config_base=config,
+        grade=grade,
+        caminho_csv=arquivo_csv,
+        saldo_inicial=saldo_inicial,
+        taxa_pct=taxa,
+        timeframe_base=timeframe_base,
+        estrategias=estrategias_selecionadas,
+        max_workers=args.workers,
+        ordenar_por=args.ordenar_por,
+        cache=criar_cache_resultados(args, arquivo_csv)
+    )
+
+    imprimir_tabela_ranking(resultados, top=args.top)
+
+    if args.sweep_saida:
+        try:
+            salvar_resultados_csv(resultados, args.sweep_saida)
+            print(f"💾 Ranking completo salvo em: {args.sweep_saida}")
+        except Exception as e:
+            print(f"⚠️ Falha ao salvar ranking em {args.sweep_saida}: {e}")
+
+
+def executar_triagem_giro(args, config: Dict[str, Any], grade: Dict[str, Any], arquivo_csv: str,
+                          timeframe_base: str, saldo_inicial: float, taxa: float) -> list:
+    """
+    Triagem do sweep com o motor vetorizado do giro rápido e confirmação das
+    --triagem-giro melhores combinações com o BotWorker completo.
+
+    Returns:
+        Resultados confirmados (formato do sweep), ordenados
+    """
+    api = SimulatedExchangeAPI(arquivo_csv, saldo_inicial, taxa, timeframe_base)
+
+    triagem = triar_grade_giro(api, config, grade, ordenar_por=args.ordenar_por)
+    finalistas = [r for r in triagem if not r['erro']][:args.triagem_giro]
+    if not finalistas:
+        print("❌ Nenhuma combinação válida na triagem.")
+        return triagem
+
+    print(f"🏁 {len(finalistas)} finalista(s) de {len(triagem)} combinações")
+    return confirmar_finalistas(api, config, finalistas, ordenar_por=args.ordenar_por)
+
+
+def executar_modo_walk_forward(args, config: Dict[str, Any], arquivo_csv: str, timeframe_base: str,
+                               saldo_inicial: float, taxa: float, estrategias_selecionadas: list) -> None:
+    """
+    Roda o walk-forward da grade de --walk-forward e imprime o relatório OOS.
+
+    Args:
+        args: Argumentos da linha de comando (walk_forward, is_dias, oos_dias,
+            passo_dias, workers, ordenar_por, wf_saida)
+        config: Configuração base (cada combinação é aplicada sobre uma cópia)
+        arquivo_csv: CSV histórico
+        timeframe_base: Timeframe do CSV
+        saldo_inicial: Saldo inicial em USDT
+        taxa: Taxa da exchange em %
+        estrategias_selecionadas: Estratégias a simular
+    """
+    try:
+        grade = carregar_configuracao(args.walk_forward)
+    except Exception:
+        print(f"❌ Não foi possível carregar a grade do walk-forward: {args.walk_forward}")
+        return
+
+    print("\n" + "="*80)
+    print("🧭 WALK-FORWARD")
+    print("="*80)
+    print(f"   In-sample: {args.is_dias} dias | Out-of-sample: {args.oos_dias} dias | "
+          f"Passo: {args.passo_dias or args.oos_dias} dias")
+    for caminho, valores in grade.items():
+        print(f"   {caminho}: {valores}")
+
+    try:
+        relatorio = executar_walk_forward(
+            config_base=config,
+            grade=grade,
+            caminho_csv=arquivo_csv,
+            saldo_inicial=saldo_inicial,
+            taxa_pct=taxa,
+            timeframe_base=timeframe_base,
+            estrategias=estrategias_selecionadas,
+            dias_in_sample=args.is_dias,
+            dias_out_of_sample=args.oos_dias,
+            passo_dias=args.passo_dias,
+            max_workers=args.workers,
+            ordenar_por=args.ordenar_por
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    imprimir_relatorio_walk_forward(relatorio)
+
+    if args.wf_saida:
+        try:
+            relatorio['curva'].to_csv(args.wf_saida, index=False)
+            print(f"💾 Curva OOS salva em: {args.wf_saida}")
+        except Exception as e:
+            print(f"⚠️ Falha ao salvar curva em {args.wf_saida}: {e}")
+
+
+def executar_modo_lote(args) -> None:
+    """
+    Roda os jobs (config, CSV, timeframe) de --lote em paralelo e imprime o
+    resumo por job e a carteira combinada.
+
+    Args:
+        args: Argumentos da linha de comando (lote, lote_saida, saldo, taxa,
+            estrategias, modo_numerico, workers, no_cache, cache_max_mb)
+    """
+    try:
+        jobs = carregar_lote(args.lote, args.saldo, args.taxa, args.estrategias)
+    except Exception as e:
+        print(f"❌ Não foi possível carregar o lote {args.lote}: {e}")
+        return
+
+    print("\n" + "="*80)
+    print("📦 BACKTEST EM LOTE")
+    print("="*80)
+    for job in jobs:
+        if args.modo_numerico:
+            job.config['MODO_NUMERICO'] = args.modo_numerico
+        print(f"   {job.nome}: {job.caminho_config} | {job.caminho_csv} ({job.timeframe}) | "
+              f"${job.saldo_inicial:.2f} | taxa {job.taxa_pct}% | {', '.join(job.estrategias)}")
+    if args.no_cache:
+        print("ℹ️  Cache de resultados desativado (--no-cache)")
+
+    relatorio = executar_lote(
+        jobs,
+        max_workers=args.workers,
+        usar_cache=not args.no_cache,
+        cache_max_mb=args.cache_max_mb
+    )
+    imprimir_relatorio_lote(relatorio)
+
+    if args.lote_saida:
+        try:
+            relatorio['curva'].to_csv(args.lote_saida, index=False)
+            print(f"💾 Curva combinada salva em: {args.lote_saida}")
+        except Exception as e:
+            print(f"⚠️ Falha ao salvar curva em {args.lote_saida}: {e}")
+
+
+def executar_modo_aquecer_resamples(args) -> None:
+    """
+    Grava no cache do CSV os resamples de todos os timeframes que as configs
+    consultam, para que backtests e processos do sweep já os encontrem prontos.
+
+    Fontes: os jobs de --lote, ou --csv/--timeframe com --config (sem
+    --config: todas as configs de configs/).
+
+    Args:
+        args: Argumentos da linha de comando (lote, csv, timeframe, config)
+    """
+    # {(csv, timeframe base): timeframes}
+    alvos: Dict[tuple, set] = {}
+    if args.lote:
+        try:
+            jobs = carregar_lote(args.lote, args.saldo, args.taxa, args.estrategias)
+        except Exception as e:
+            print(f"❌ Não foi possível carregar o lote {args.lote}: {e}")
+            return
+        for job in jobs:
+            alvos.setdefault((job.caminho_csv, job.timeframe), set()).update(timeframes_usados(job.config))
+    elif args.csv:
+        caminhos_config = [args.config] if args.config else [c.value for c in listar_arquivos_json()]
+        timeframes = set()
+        for caminho_config in caminhos_config:
+            try:
+                with open(caminho_config, 'r', encoding='utf-8') as f:
+                    timeframes.update(timeframes_usados(json.load(f)))
+            except Exception as e:
+                print(f"⚠️ Config ignorada ({caminho_config}): {e}")
+        alvos[(args.csv, args.timeframe or '1m')] = timeframes
+    else:
+        print("❌ --aquecer-resamples requer --csv (e opcionalmente --config) ou --lote")
+        return
+
+    print("\n" + "="*80)
+    print("🔥 AQUECIMENTO DO CACHE DE RESAMPLES")
+    print("="*80)
+    for (caminho_csv, timeframe_base), timeframes in alvos.items():
+        try:
+            if carregar_store_historico(caminho_csv) is None:
+                print(f"⚠️ {caminho_csv}: CSV fora do cache binário; resamples não são persistidos")
+                continue
+            api = SimulatedExchangeAPI(caminho_csv, 1000, 0.1, timeframe_base)
+            duracao_base = pd.to_timedelta(timeframe_base)
+        except Exception as e:
+            print(f"❌ {caminho_csv}: {e}")
+            continue
+
+        print(f"\n📂 {caminho_csv} ({timeframe_base})")
+        for timeframe in sorted(timeframes, key=pd.to_timedelta):
+            # Timeframes até o base não são resampleados (a simulação usa o próprio CSV)
+            if pd.to_timedelta(timeframe) <= duracao_base:
+                continue
+            inicio = time.perf_counter()
+            try:
+                store = api.obter_kline_store(timeframe)
+            except Exception as e:
+                print(f"   ❌ {timeframe}: {e}")
+                continue
+            print(f"   ✅ {timeframe}: {len(store):,} candles ({time.perf_counter() - inicio:.2f}s)")
+
+
+def executar_modo_monte_carlo(args, config: Dict[str, Any], arquivo_csv: str, timeframe_base: str,
+                              saldo_inicial: float, taxa: float, estrategias_selecionadas: list) -> None:
+    """
+    Roda a config em --monte-carlo caminhos sintéticos (block bootstrap do CSV)
+    e imprime a distribuição de retorno, drawdown e tempo submerso.
+
+    Args:
+        args: Argumentos da linha de comando (monte_carlo, mc_bloco, mc_semente,
+            mc_saida, workers)
+        config: Configuração do bot
+        arquivo_csv: CSV histórico de origem dos retornos
+        timeframe_base: Timeframe do CSV
+        saldo_inicial: Saldo inicial em USDT
+        taxa: Taxa da exchange em %
+        estrategias_selecionadas: Estratégias a simular
+    """
+    print("\n" + "="*80)
+    print("🎲 MONTE CARLO (BLOCK BOOTSTRAP)")
+    print("="*80)
+
+    try:
+        relatorio = executar_monte_carlo(
+            config=config,
+            caminho_csv=arquivo_csv,
+            saldo_inicial=saldo_inicial,
+            taxa_pct=taxa,
+            timeframe_base=timeframe_base,
+            estrategias=estrategias_selecionadas,
+            n_caminhos=args.monte_carlo,
+            tamanho_bloco=args.mc_bloco,
+            semente=args.mc_semente,
+            max_workers=args.workers
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    imprimir_relatorio_monte_carlo(relatorio)
+
+    if args.mc_saida:
+        try:
+            salvar_caminhos_csv(relatorio, args.mc_saida)
+            print(f"💾 Métricas por caminho salvas em: {args.mc_saida}")
+        except Exception as e:
+            print(f"⚠️ Falha ao salvar métricas em {args.mc_saida}: {e}")
+
+
+def executar_modo_validacao_numerica(config: Dict[str, Any], arquivo_csv: str, timeframe_base: str,
+                                     saldo_inicial: float, taxa: float, estrategias_selecionadas: list) -> None:
+    """
+    Roda a config nos modos decimal e float e imprime as divergências.
+
+    Args:
+        config: Configuração do bot
+        arquivo_csv: CSV histórico
+        timeframe_base: Timeframe do CSV
+        saldo_inicial: Saldo inicial em USDT
+        taxa: Taxa da exchange em %
+        estrategias_selecionadas: Estratégias a simular
+    """
+    print("\n" + "="*80)
+    print("⚖️  VALIDAÇÃO DO MODO NUMÉRICO (decimal x float)")
+    print("="*80)
+
+    relatorio = comparar_modos_numericos(
+        config=config,
+        caminho_csv=arquivo_csv,
+        saldo_inicial=saldo_inicial,
+        taxa_pct=taxa,
+        timeframe_base=timeframe_base,
+        estrategias=estrategias_selecionadas
+    )
+    imprimir_relatorio_equivalencia(relatorio)
+
+
+def executar_modo_validacao_salto(config: Dict[str, Any], arquivo_csv: str, timeframe_base: str,
+                                  saldo_inicial: float, taxa: float, estrategias_selecionadas: list) -> None:
+    """
+    Roda a config barra a barra e com o salto de barras ociosas e imprime as
+    divergências.
+
+    Args:
+        config: Configuração do bot
+        arquivo_csv: CSV histórico
+        timeframe_base: Timeframe do CSV
+        saldo_inicial: Saldo inicial em USDT
+        taxa: Taxa da exchange em %
+        estrategias_selecionadas: Estratégias a simular
+    """
+    print("\n" + "="*80)
+    print("⏩ VALIDAÇÃO DO SALTO DE BARRAS (barra a barra x com salto)")
+    print("="*80)
+
+    relatorio = comparar_salto_de_barras(
+        config=config,
+        caminho_csv=arquivo_csv,
+        saldo_inicial=saldo_inicial,
+        taxa_pct=taxa,
+        timeframe_base=timeframe_base,
+        estrategias=estrategias_selecionadas
+    )
+    imprimir_relatorio_salto(relatorio)
+
+
 def main():
     """Função principal do assistente de backtest"""
     print("="*80)
@@ -942,8 +1262,71 @@ def main():
     parser.add_argument('--taxa', type=float, help='Taxa da exchange em porcentagem (ex: 0.1)')
     parser.add_argument('--estrategias', type=str, help='Estratégias a executar (ex: dca,giro_rapido ou ambas)')
     parser.add_argument('--save-config', type=str, help='Salvar a configuração final (após prompts/overrides) em PATH antes de rodar')
+    parser.add_argument('--exportar-persistencia', type=str, metavar='DIR',
+                        help='Gravar em DIR o banco e o estado (mantidos em memória) ao final da simulação')
+    parser.add_argument('--sweep', type=str, help='Grade de parâmetros (JSON) para rodar em paralelo em vez de uma única simulação')
+    parser.add_argument('--workers', type=int, help='Processos do sweep, walk-forward, lote ou Monte Carlo (padrão: todos os núcleos)')
+    parser.add_argument('--top', type=int, default=20, help='Linhas exibidas no ranking do sweep (padrão: 20)')
+    parser.add_argument('--ordenar-por', type=str, default='retorno_pct',
+                        choices=['retorno_pct', 'drawdown_max_pct', 'total_trades', 'taxas_usdt'],
+                        help='Métrica usada para ranquear o sweep')
+    parser.add_argument('--sweep-saida', type=str, help='Salvar o ranking completo do sweep em CSV')
+    parser.add_argument('--triagem-giro', type=int, metavar='N',
+                        help='Sweep do giro rápido: triar a grade com o motor vetorizado e confirmar só as N melhores no BotWorker')
+    parser.add_argument('--lote', type=str, metavar='ARQUIVO',
+                        help='Lote de jobs (JSON com config, CSV e timeframe de cada bot) rodados em paralelo, com carteira combinada')
+    parser.add_argument('--aquecer-resamples', action='store_true',
+                        help='Só grava no cache do CSV os resamples dos timeframes usados pelas configs (--csv/--config ou --lote)')
+    parser.add_argument('--lote-saida', type=str, help='Salvar a curva de patrimônio combinada do lote em CSV')
+    parser.add_argument('--walk-forward', type=str, help='Grade de parâmetros (JSON) otimizada em janelas in-sample e validada out-of-sample')
+    parser.add_argument('--is-dias', type=float, default=30, help='Walk-forward: dias de cada período in-sample (padrão: 30)')
+    parser.add_argument('--oos-dias', type=float, default=7, help='Walk-forward: dias de cada período out-of-sample (padrão: 7)')
+    parser.add_argument('--passo-dias', type=float, help='Walk-forward: deslocamento entre janelas (padrão: --oos-dias)')
+    parser.add_argument('--wf-saida', type=str, help='Salvar a curva OOS costurada do walk-forward em CSV')
+    parser.add_argument('--monte-carlo', type=int, metavar='N',
+                        help='Roda a config em N caminhos sintéticos (block bootstrap do CSV) e reporta as distribuições')
+    parser.add_argument('--mc-bloco', type=int, metavar='BARRAS',
+                        help='Monte Carlo: barras consecutivas por bloco (padrão: um dia de barras)')
+    parser.add_argument('--mc-semente', type=int, default=0, help='Monte Carlo: semente dos caminhos (padrão: 0)')
+    parser.add_argument('--mc-saida', type=str, help='Salvar as métricas de cada caminho do Monte Carlo em CSV')
+    parser.add_argument('--modo-numerico', type=str, choices=['decimal', 'float'],
+                        help='Tipo numérico da simulação: decimal (exato, padrão) ou float (mais rápido)')
+    parser.add_argument('--validar-modo-numerico', action='store_true',
+                        help='Roda a config em decimal e em float e compara trades e saldos finais')
+    parser.add_argument('--validar-salto-barras', action='store_true',
+                        help='Roda a config barra a barra e com salto de barras ociosas e compara trades e snapshots')
+    parser.add_argument('--saltar-barras', action='store_true',
+                        help='Pula as barras ociosas (SALTAR_BARRAS_OCIOSAS): mesmo resultado, mais rápido')
+    parser.add_argument('--perfil-ciclo', action='store_true',
+                        help='Mede o tempo de cada etapa do ciclo de decisão e imprime o resumo ao final')
+    parser.add_argument('--perfil-log', action='store_true',
+                        help='Descarta logs DEBUG/INFO durante o loop e guarda os trades num destino estruturado')
+    parser.add_argument('--checkpoint-dir', type=str, metavar='DIR',
+                        help='Gravar checkpoints do estado completo da simulação em DIR')
+    parser.add_argument('--checkpoint-barras', type=int, metavar='N',
+                        help='Checkpoint a cada N barras simuladas (padrão: 100000; 0 desliga)')
+    parser.add_argument('--checkpoint-segundos', type=float, metavar='T',
+                        help='Checkpoint a cada T segundos de execução (padrão: 600; 0 desliga)')
+    parser.add_argument('--resume', type=str, metavar='CAMINHO',
+                        help='Retomar a simulação de um checkpoint (.ckpt ou diretório: o mais recente)')
+    parser.add_argument('--resume-em', type=str, metavar='DATA',
+                        help='Com --resume DIR: fork a partir do último checkpoint até DATA, com a config atual')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Sempre simula, sem consultar nem gravar o cache de resultados')
+    parser.add_argument('--cache-max-mb', type=float, default=LIMITE_PADRAO_MB,
+                        help=f'Tamanho máximo do cache de resultados em MB (padrão: {LIMITE_PADRAO_MB})')
     args = parser.parse_args()
 
+    # Pré-aquecimento do cache de resamples: sem simulação
+    if args.aquecer_resamples:
+        executar_modo_aquecer_resamples(args)
+        return
+
+    # Lote: cada job traz config, CSV e timeframe; sem prompts
+    if args.lote:
+        executar_modo_lote(args)
+        return
+
     # Pré-preencher variáveis quando rodando em modo não-interativo
     pref_config = args.config if args.config else None
     pref_csv = args.csv if args.csv else None
@@ -982,6 +1365,38 @@ def main():
             return
         # Carregar configuração
         config = carregar_configuracao(arquivo_config)
+
+    if args.modo_numerico:
+        config['MODO_NUMERICO'] = args.modo_numerico
+        print(f"🔢 Modo numérico da simulação: {args.modo_numerico}")
+    if args.saltar_barras:
+        config['SALTAR_BARRAS_OCIOSAS'] = True
+        print("⏩ Salto de barras ociosas ativado")
+    if args.perfil_ciclo:
+        config['PERFIL_CICLO_DECISAO'] = True
+        print("⏱️  Perfil do ciclo de decisão ativado")
+    if args.perfil_log:
+        config['PERFIL_LOG_SIMULACAO'] = True
+        print("🔇 Perfil de log da simulação ativado")
+    if args.checkpoint_dir:
+        config['CHECKPOINT_DIRETORIO'] = args.checkpoint_dir
+    if args.checkpoint_barras is not None:
+        config['CHECKPOINT_INTERVALO_BARRAS'] = args.checkpoint_barras
+    if args.checkpoint_segundos is not None:
+        config['CHECKPOINT_INTERVALO_SEGUNDOS'] = args.checkpoint_segundos
+    if args.resume:
+        config['CHECKPOINT_RETOMAR'] = args.resume
+        if args.resume_em:
+            config['CHECKPOINT_RETOMAR_EM'] = args.resume_em
+            print(f"⏯️  Fork a partir do último checkpoint até {args.resume_em} em: {args.resume}")
+        else:
+            print(f"⏯️  Retomando do checkpoint: {args.resume}")
+            if not config.get('CHECKPOINT_DIRETORIO'):
+                # Continuação da mesma execução: novos checkpoints no mesmo diretório
+                origem = Path(args.resume)
+                config['CHECKPOINT_DIRETORIO'] = str(origem if origem.is_dir() else origem.parent)
+    if config.get('CHECKPOINT_DIRETORIO'):
+        print(f"💾 Checkpoints da simulação em: {config['CHECKPOINT_DIRETORIO']}")
     
     # 2. Arquivo CSV (interactive ou pré-preenchido)
     if pref_csv:
@@ -1064,6 +1479,31 @@ def main():
             print("❌ Nenhuma estratégia selecionada. Use ESPAÇO para marcar as opções antes de pressionar ENTER.")
             return
     
+    # 6b. Sweep de parâmetros: grade inteira em paralelo, sem prompts de parâmetros
+    if args.sweep:
+        executar_modo_sweep(args, config, arquivo_csv, timeframe_base, saldo_inicial, taxa, estrategias_selecionadas)
+        return
+
+    # 6c. Walk-forward: otimização IS + validação OOS em janelas móveis
+    if args.walk_forward:
+        executar_modo_walk_forward(args, config, arquivo_csv, timeframe_base, saldo_inicial, taxa, estrategias_selecionadas)
+        return
+
+    # 6d. Validação do modo numérico: mesma config em decimal e em float
+    if args.validar_modo_numerico:
+        executar_modo_validacao_numerica(config, arquivo_csv, timeframe_base, saldo_inicial, taxa, estrategias_selecionadas)
+        return
+
+    # 6e. Validação do salto de barras: mesma config com e sem o salto
+    if args.validar_salto_barras:
+        executar_modo_validacao_salto(config, arquivo_csv, timeframe_base, saldo_inicial, taxa, estrategias_selecionadas)
+        return
+
+    # 6f. Monte Carlo: distribuição das métricas em caminhos sintéticos
+    if args.monte_carlo:
+        executar_modo_monte_carlo(args, config, arquivo_csv, timeframe_base, saldo_inicial, taxa, estrategias_selecionadas)
+        return
+
     # 7. Perguntar sobre parâmetros das estratégias
     print("\n🔬 LABORATÓRIO DE OTIMIZAÇÃO DE PARÂMETROS")
     print("Você pode agora personalizar todos os parâmetros chave das estratégias...\n")
@@ -1212,6 +1652,14 @@ def main():
 
         # Log de confirmação para o usuário
         print(f"🔧 Modo de operação do bot ('ESTRATEGIA_ATIVA') definido para: '{config['ESTRATEGIA_ATIVA']}'")
+
+        # Banco e estado ficam em memória durante o backtest; exportar só se pedido
+        if args.exportar_persistencia:
+            dir_exportacao = Path(args.exportar_persistencia)
+            config['DATABASE_PATH'] = str(dir_exportacao / 'backtest.db')
+            config['STATE_FILE_PATH'] = str(dir_exportacao / 'backtest_state.json')
+            config['EXPORTAR_PERSISTENCIA_BACKTEST'] = True
+            print(f"💾 Banco e estado serão exportados para: {dir_exportacao}")
         # ============================================================================
         
         # Instanciar API simulada com timeframe base (CORREÇÃO BUG 2)
@@ -1223,30 +1671,53 @@ def main():
             timeframe_base=timeframe_base
         )
 
-        # DEBUG: Imprimir config de Giro Rápido antes de iniciar BotWorker
-        print("\n[DEBUG] Configuração de Giro Rápido ANTES de iniciar BotWorker:")
-        print(f"[DEBUG] config['estrategia_giro_rapido'] = {config.get('estrategia_giro_rapido', {})}")
-        print()
+        # Cache de resultados: execução idêntica já simulada volta do disco.
+        # Exportar persistência, medir o ciclo e checkpoints exigem rodar de verdade.
+        cache = None
+        entrada_cache = None
+        if (args.exportar_persistencia or args.perfil_ciclo
+                or config.get('CHECKPOINT_DIRETORIO') or config.get('CHECKPOINT_RETOMAR')):
+            print("ℹ️  Cache de resultados ignorado (exportação, perfil do ciclo ou checkpoints)")
+        else:
+            cache = criar_cache_resultados(args, arquivo_csv)
+        if cache:
+            impressao = cache.impressao_digital(config, exchange_api, estrategias_selecionadas)
+            entrada_cache = cache.obter(impressao, exchange_api)
+
+        if entrada_cache:
+            print(f"♻️  Resultado reaproveitado do cache ({impressao[:12]}); use --no-cache para simular de novo")
+            resultados = entrada_cache['resultados']
+            saidas_por_motivo = entrada_cache['extras'].get('saidas_por_motivo')
+        else:
+            # DEBUG: Imprimir config de Giro Rápido antes de iniciar BotWorker
+            print("\n[DEBUG] Configuração de Giro Rápido ANTES de iniciar BotWorker:")
+            print(f"[DEBUG] config['estrategia_giro_rapido'] = {config.get('estrategia_giro_rapido', {})}")
+            print()
+
+            # Instanciar BotWorker em modo simulação
+            print("🤖 Inicializando BotWorker...")
+            bot_worker = BotWorker(
+                config=config,
+                exchange_api=exchange_api,
+                telegram_notifier=None,
+                notifier=None,
+                modo_simulacao=True
+            )
+
+            # Executar simulação
+            print("▶️ Executando simulação...\n")
+            bot_worker.run()
+
+            # Obter resultados
+            resultados = exchange_api.get_resultados()
+            saidas_por_motivo = analisar_saidas_por_motivo(resultados['trades'])
+            if cache and bot_worker.simulacao_completa:
+                cache.salvar(impressao, resultados, {'saidas_por_motivo': saidas_por_motivo})
+            elif cache:
+                print("ℹ️  Simulação incompleta: resultado não foi para o cache")
 
-        # Instanciar BotWorker em modo simulação
-        print("🤖 Inicializando BotWorker...")
-        bot_worker = BotWorker(
-            config=config,
-            exchange_api=exchange_api,
-            telegram_notifier=None,
-            notifier=None,
-            modo_simulacao=True
-        )
-        
-        # Executar simulação
-        print("▶️ Executando simulação...\n")
-        bot_worker.run()
-        
-        # Obter resultados
-        resultados = exchange_api.get_resultados()
-        
         # Imprimir relatório final
-        imprimir_relatorio_final(resultados, benchmark, saldo_inicial, arquivo_csv)
+        imprimir_relatorio_final(resultados, benchmark, saldo_inicial, arquivo_csv, saidas_por_motivo)
 
         # Limpar arquivos temporários
         try:
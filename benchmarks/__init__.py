@@ -0,0 +1,13 @@
+"""
+Benchmarks de desempenho do backtest.
+
+Mede separadamente os componentes quentes da simulação (klines, RSI, ciclo de
+decisão, banco, estado) e o BotWorker.run completo em 10k, 100k e 1M barras,
+sobre dados OHLCV sintéticos (GBM) gerados localmente. Os resultados vão para
+JSON com as informações da máquina e podem ser comparados com uma baseline.
+
+Uso:
+    python -m benchmarks executar                       # suíte completa
+    python -m benchmarks executar --barras 10000 --saida /tmp/atual.json
+    python -m benchmarks comparar baseline.json /tmp/atual.json --tolerancia 0.15
+"""
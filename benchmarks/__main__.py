@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+CLI da suíte de benchmarks.
+
+Uso:
+    python -m benchmarks executar [--barras 10000,100000] [--repeticoes 3]
+                                  [--csv dados/historicos/ADA_1m.csv --timeframe 1m]
+                                  [--saida benchmarks/resultados/x.json]
+                                  [--baseline benchmarks/resultados/baseline.json]
+    python -m benchmarks comparar BASELINE ATUAL [--tolerancia 0.15]
+
+'comparar' (e 'executar --baseline') sai com código 1 se houver regressão.
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.comparacao import TOLERANCIA_PADRAO, comparar_resultados, imprimir_comparacao
+from benchmarks.suite import carregar_resultados, executar_suite, salvar_resultados
+
+DIRETORIO_RESULTADOS = Path(__file__).parent / 'resultados'
+
+
+def _lista_inteiros(texto: str):
+    return [int(valor.replace('_', '')) for valor in texto.split(',') if valor.strip()]
+
+
+def _comparar_e_sair(baseline: Path, atual: dict, tolerancia: float) -> int:
+    comparacao = comparar_resultados(carregar_resultados(baseline), atual, tolerancia)
+    imprimir_comparacao(comparacao)
+    return 1 if comparacao['regressoes'] else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks de desempenho do backtest')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    executar = subcomandos.add_parser('executar', help='Roda a suíte e salva o JSON de resultados')
+    executar.add_argument('--barras', type=_lista_inteiros,
+                          help='Tamanhos do BotWorker.run completo (padrão: 10000,100000,1000000)')
+    executar.add_argument('--repeticoes', type=int, default=3, help='Repetições por benchmark (vale a mais rápida)')
+    executar.add_argument('--csv', type=str, help='CSV real: componentes e um run completo rodam sobre ele')
+    executar.add_argument('--timeframe', type=str, default='1m', help='Timeframe do CSV real (padrão: 1m)')
+    executar.add_argument('--config', type=Path, help='Config do bot (padrão: configs/backtest_template.json)')
+    executar.add_argument('--modo-numerico', choices=['decimal', 'float'], default='decimal',
+                          help='MODO_NUMERICO do ciclo de decisão e dos runs completos')
+    executar.add_argument('--apenas', type=lambda texto: texto.split(','),
+                          help='Só os benchmarks com estes prefixos (ex: get_rsi,bot_run_10k)')
+    executar.add_argument('--saida', type=Path, help='JSON de saída (padrão: benchmarks/resultados/<data>.json)')
+    executar.add_argument('--baseline', type=Path, help='Comparar com esta baseline ao final')
+    executar.add_argument('--tolerancia', type=float, default=TOLERANCIA_PADRAO,
+                          help='Piora relativa aceita antes de acusar regressão (padrão: 0.15)')
+
+    comparar = subcomandos.add_parser('comparar', help='Compara dois JSONs de resultados')
+    comparar.add_argument('baseline', type=Path)
+    comparar.add_argument('atual', type=Path)
+    comparar.add_argument('--tolerancia', type=float, default=TOLERANCIA_PADRAO,
+                          help='Piora relativa aceita antes de acusar regressão (padrão: 0.15)')
+
+    args = parser.parse_args(argv)
+
+    if args.comando == 'comparar':
+        return _comparar_e_sair(args.baseline, carregar_resultados(args.atual), args.tolerancia)
+
+    print("="*80)
+    print("⏱️  BENCHMARKS DO BACKTEST")
+    print("="*80)
+    relatorio = executar_suite(
+        barras=args.barras,
+        repeticoes=args.repeticoes,
+        caminho_csv=args.csv,
+        timeframe_csv=args.timeframe,
+        caminho_config=args.config,
+        modo_numerico=args.modo_numerico,
+        incluir=args.apenas,
+    )
+    saida = args.saida or DIRETORIO_RESULTADOS / f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+    print(f"\n💾 Resultados salvos em: {salvar_resultados(relatorio, saida)}")
+
+    if args.baseline:
+        return _comparar_e_sair(args.baseline, relatorio, args.tolerancia)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
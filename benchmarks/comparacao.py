@@ -0,0 +1,114 @@
+"""
+Comparação de resultados de benchmark com uma baseline.
+
+A métrica comparada é o tempo por operação (us_por_operacao, menor é
+melhor). Um benchmark regrediu quando ficou mais lento que a baseline além
+da tolerância relativa (ex: 0.15 = 15%).
+"""
+
+from typing import Any, Dict, List
+
+# Tolerância relativa padrão antes de acusar regressão
+TOLERANCIA_PADRAO = 0.15
+
+# Campos da máquina que, se diferentes, tornam a comparação pouco confiável
+CAMPOS_MAQUINA = ('processador', 'nucleos', 'python', 'numpy', 'pandas')
+
+
+def comparar_resultados(
+    baseline: Dict[str, Any],
+    atual: Dict[str, Any],
+    tolerancia: float = TOLERANCIA_PADRAO
+) -> Dict[str, Any]:
+    """
+    Compara dois relatórios da suíte benchmark a benchmark.
+
+    Args:
+        baseline: Relatório de referência
+        atual: Relatório novo
+        tolerancia: Piora relativa aceita no tempo por operação
+
+    Returns:
+        Dict com:
+            linhas: [{nome, baseline_us, atual_us, razao, situacao}], situacao
+                em 'regressao', 'melhora', 'estavel', 'novo' ou 'ausente'
+            regressoes: nomes dos benchmarks que regrediram
+            maquina_diferente: campos de máquina que mudaram entre os relatórios
+            tolerancia: a tolerância usada
+    """
+    resultados_base = baseline.get('resultados', {})
+    resultados_atual = atual.get('resultados', {})
+
+    linhas: List[Dict[str, Any]] = []
+    for nome in list(resultados_base) + [n for n in resultados_atual if n not in resultados_base]:
+        base = resultados_base.get(nome)
+        novo = resultados_atual.get(nome)
+        if base is None or novo is None:
+            linhas.append({
+                'nome': nome,
+                'baseline_us': base['us_por_operacao'] if base else None,
+                'atual_us': novo['us_por_operacao'] if novo else None,
+                'razao': None,
+                'situacao': 'novo' if base is None else 'ausente',
+            })
+            continue
+
+        razao = novo['us_por_operacao'] / base['us_por_operacao'] if base['us_por_operacao'] else float('inf')
+        if razao > 1 + tolerancia:
+            situacao = 'regressao'
+        elif razao < 1 / (1 + tolerancia):
+            situacao = 'melhora'
+        else:
+            situacao = 'estavel'
+        linhas.append({
+            'nome': nome,
+            'baseline_us': base['us_por_operacao'],
+            'atual_us': novo['us_por_operacao'],
+            'razao': razao,
+            'situacao': situacao,
+        })
+
+    maquina_base = baseline.get('maquina', {})
+    maquina_atual = atual.get('maquina', {})
+    maquina_diferente = [
+        campo for campo in CAMPOS_MAQUINA if maquina_base.get(campo) != maquina_atual.get(campo)
+    ]
+
+    return {
+        'linhas': linhas,
+        'regressoes': [linha['nome'] for linha in linhas if linha['situacao'] == 'regressao'],
+        'maquina_diferente': maquina_diferente,
+        'tolerancia': tolerancia,
+    }
+
+
+def imprimir_comparacao(comparacao: Dict[str, Any]) -> None:
+    """
+    Imprime a tabela de comparar_resultados.
+
+    Args:
+        comparacao: Saída de comparar_resultados
+    """
+    marcadores = {'regressao': '❌', 'melhora': '🚀', 'estavel': '✅', 'novo': '🆕', 'ausente': '⚠️'}
+
+    print("\n" + "="*80)
+    print(f"📊 BENCHMARKS: BASELINE x ATUAL (tolerância {comparacao['tolerancia']:.0%})")
+    print("="*80)
+    print(f"   {'Benchmark':<28} {'Baseline µs/op':>15} {'Atual µs/op':>15} {'Razão':>8}")
+    print("   " + "─"*70)
+    for linha in comparacao['linhas']:
+        base = f"{linha['baseline_us']:.2f}" if linha['baseline_us'] is not None else '-'
+        novo = f"{linha['atual_us']:.2f}" if linha['atual_us'] is not None else '-'
+        razao = f"{linha['razao']:.2f}x" if linha['razao'] is not None else '-'
+        print(f"{marcadores[linha['situacao']]} {linha['nome']:<28} {base:>15} {novo:>15} {razao:>8}")
+
+    if comparacao['maquina_diferente']:
+        print(f"\n   ⚠️ Máquina/ambiente diferente da baseline ({', '.join(comparacao['maquina_diferente'])}): "
+              f"compare com cautela")
+
+    print("\n" + "─"*80)
+    if comparacao['regressoes']:
+        print(f"   ❌ {len(comparacao['regressoes'])} regressão(ões): {', '.join(comparacao['regressoes'])}")
+    else:
+        print("   ✅ Nenhuma regressão acima da tolerância")
+    print("="*80)
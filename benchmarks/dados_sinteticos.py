@@ -0,0 +1,67 @@
+"""
+Dados OHLCV sintéticos para os benchmarks (sem rede).
+
+Os fechamentos seguem um movimento browniano geométrico (GBM); abertura,
+máxima e mínima são derivadas do fechamento anterior e do atual, de forma
+que o candle é sempre consistente (low <= open/close <= high).
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def gerar_ohlcv_gbm(
+    linhas: int,
+    seed: int = 42,
+    preco_inicial: float = 0.5,
+    volatilidade: float = 0.0015,
+    deriva: float = 0.0,
+    inicio: str = '2020-01-01',
+    frequencia: str = '1min'
+) -> pd.DataFrame:
+    """
+    Gera candles OHLCV com movimento browniano geométrico.
+
+    Args:
+        linhas: Número de candles
+        seed: Semente do gerador (mesma semente = mesmos dados)
+        preco_inicial: Preço de abertura do primeiro candle
+        volatilidade: Desvio padrão do log-retorno por candle
+        deriva: Média do log-retorno por candle
+        inicio: Timestamp do primeiro candle
+        frequencia: Frequência pandas dos candles (ex: '1min', '5min')
+
+    Returns:
+        DataFrame com colunas timestamp, open, high, low, close, volume
+    """
+    rng = np.random.default_rng(seed)
+    close = preco_inicial * np.exp(np.cumsum(rng.normal(deriva, volatilidade, linhas)))
+    open_ = np.concatenate([[preco_inicial], close[:-1]])
+    pavio = np.abs(rng.normal(0, volatilidade / 2, linhas))
+    return pd.DataFrame({
+        'timestamp': pd.date_range(inicio, periods=linhas, freq=frequencia),
+        'open': open_.round(6),
+        'high': (np.maximum(open_, close) * (1 + pavio)).round(6),
+        'low': (np.minimum(open_, close) * (1 - pavio)).round(6),
+        'close': close.round(6),
+        'volume': rng.uniform(100, 1000, linhas).round(2),
+    })
+
+
+def gravar_csv_gbm(caminho: Path, linhas: int, **parametros) -> Path:
+    """
+    Grava um CSV sintético no formato de dados/historicos.
+
+    Args:
+        caminho: Arquivo de destino
+        linhas: Número de candles
+        **parametros: Repassados a gerar_ohlcv_gbm
+
+    Returns:
+        O próprio caminho
+    """
+    caminho = Path(caminho)
+    gerar_ohlcv_gbm(linhas, **parametros).to_csv(caminho, index=False)
+    return caminho
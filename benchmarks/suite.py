@@ -0,0 +1,454 @@
+"""
+Suíte de benchmarks do backtest.
+
+Cada benchmark prepara um estado novo a cada repetição (fora do tempo medido)
+e cronometra só a operação de interesse; vale a repetição mais rápida, que é
+a menos afetada por ruído da máquina. O resultado de cada um:
+
+    {
+        'descricao': str,
+        'operacoes': int,             # chamadas/barras por repetição
+        'segundos': float,            # melhor repetição
+        'us_por_operacao': float,     # métrica usada na comparação
+        'operacoes_por_segundo': float,
+        'repeticoes': int,
+        ...                           # extras (ex: barras, trades)
+    }
+"""
+
+import copy
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.dados_sinteticos import gravar_csv_gbm
+from src.backtest.executor import executar_simulacao, preparar_config_simulacao, silenciar_logs_simulacao
+from src.core.analise_tecnica import AnaliseTecnica
+from src.core.bot_worker import BotWorker
+from src.exchange.simulated_api import SimulatedExchangeAPI
+from src.persistencia.armazenamento import ArmazenamentoEstadoMemoria
+from src.persistencia.database import DatabaseManager
+from src.persistencia.state_manager import StateManager
+from src.utils.logger import PerfilLogSimulacao, get_loggers
+
+# Versão do formato do JSON de resultados
+VERSAO_RESULTADOS = 1
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+# Tamanhos do BotWorker.run completo
+BARRAS_PADRAO = [10_000, 100_000, 1_000_000]
+
+# Barras do dataset dos benchmarks de componentes
+BARRAS_COMPONENTES = 50_000
+
+# Operações por repetição nos benchmarks de componentes
+OPERACOES_PADRAO = {
+    'obter_klines': 5_000,
+    'get_rsi': 20_000,
+    'ciclo_decisao': 20_000,
+    'registrar_ordem': 2_000,
+    'set_state': 5_000,
+}
+
+SALDO_INICIAL = 1000.0
+TAXA_PCT = 0.1
+
+
+def _medir(preparar: Callable[[], Callable[[], Any]], operacoes: int, repeticoes: int,
+           descricao: str) -> Dict[str, Any]:
+    """
+    Cronometra 'repeticoes' execuções e devolve a mais rápida.
+
+    Args:
+        preparar: Monta o estado (não cronometrado) e devolve a função medida;
+            o retorno da função medida (dict ou None) entra no resultado
+        operacoes: Operações feitas por execução da função medida
+        repeticoes: Quantas vezes medir
+        descricao: Texto do benchmark no relatório
+    """
+    melhor = None
+    extras = None
+    for _ in range(repeticoes):
+        executar = preparar()
+        inicio = time.perf_counter()
+        retorno = executar()
+        decorrido = time.perf_counter() - inicio
+        if melhor is None or decorrido < melhor:
+            melhor, extras = decorrido, retorno
+
+    resultado = {
+        'descricao': descricao,
+        'operacoes': operacoes,
+        'segundos': melhor,
+        'us_por_operacao': melhor / operacoes * 1e6,
+        'operacoes_por_segundo': operacoes / melhor if melhor else 0.0,
+        'repeticoes': repeticoes,
+    }
+    if extras:
+        resultado.update(extras)
+    return resultado
+
+
+def _config_base(caminho_config: Optional[Path] = None) -> Dict[str, Any]:
+    return json.loads(Path(caminho_config or CONFIG_TEMPLATE).read_text(encoding='utf-8'))
+
+
+# ═══════════════════════════════════════════════════════════════════
+# COMPONENTES
+# ═══════════════════════════════════════════════════════════════════
+
+def medir_obter_klines(api: SimulatedExchangeAPI, operacoes: int, repeticoes: int) -> Dict[str, Any]:
+    """SimulatedExchangeAPI.obter_klines (100 candles de 1h) com o cursor avançando."""
+    inicio_cursor = min(api.indice_atual, api.total_barras - 1)
+    indices = inicio_cursor + np.arange(operacoes) % (api.total_barras - inicio_cursor)
+
+    def preparar():
+        simulacao = api.clonar()
+
+        def executar():
+            for indice in indices.tolist():
+                simulacao.indice_atual = indice
+                simulacao.obter_klines('ADA/USDT', '1h', 100)
+        return executar
+
+    return _medir(preparar, operacoes, repeticoes, 'obter_klines 1h x100, cursor avançando')
+
+
+def medir_get_rsi(api: SimulatedExchangeAPI, operacoes: int, repeticoes: int) -> Dict[str, Any]:
+    """AnaliseTecnica.get_rsi (15m, período 14) uma vez por barra."""
+    inicio_cursor = min(api.indice_atual, api.total_barras - 1)
+    operacoes = min(operacoes, api.total_barras - inicio_cursor)
+
+    def preparar():
+        simulacao = api.clonar()
+        analise = AnaliseTecnica(simulacao)
+
+        def executar():
+            for indice in range(inicio_cursor + 1, inicio_cursor + operacoes + 1):
+                simulacao.indice_atual = indice
+                analise.get_rsi('ADA/USDT', '15m', periodo=14, limite_candles=100)
+        return executar
+
+    return _medir(preparar, operacoes, repeticoes, 'get_rsi 15m/14 por barra')
+
+
+@contextmanager
+def _contexto_log(perfil_log: Optional[bool]):
+    """
+    Logging durante a medição do ciclo de decisão.
+
+    None: como estiver (a suíte silencia em ERROR); False: como no backtest
+    sem perfil (logger em DEBUG, console com a saída descartada); True: idem
+    com o PerfilLogSimulacao aplicado. Devolve o destino dos eventos de trade.
+    """
+    if perfil_log is None:
+        yield None
+        return
+    logger = get_loggers()[0].logger
+    nivel_anterior = logger.level
+    with open(os.devnull, 'w', encoding='utf-8') as descarte:
+        streams = [
+            (handler, handler.setStream(descarte)) for handler in logger.handlers
+            if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler)
+        ]
+        logger.setLevel(logging.DEBUG)
+        try:
+            if perfil_log:
+                with PerfilLogSimulacao() as eventos:
+                    yield eventos
+            else:
+                yield None
+        finally:
+            logger.setLevel(nivel_anterior)
+            for handler, stream in streams:
+                handler.setStream(stream)
+
+
+def medir_ciclo_decisao(api: SimulatedExchangeAPI, config: Dict[str, Any], operacoes: int,
+                        repeticoes: int, modo_numerico: str = 'decimal',
+                        perfil_log: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    BotWorker._executar_ciclo_decisao barra a barra (estratégias 'ambas').
+
+    perfil_log: logging durante a medição (ver _contexto_log)
+    """
+    inicio_cursor = min(api.indice_atual, api.total_barras - 1)
+    operacoes = min(operacoes, api.total_barras - inicio_cursor)
+    dir_temp = Path(tempfile.mkdtemp(prefix='benchmark_ciclo_'))
+
+    def preparar():
+        config_ciclo = preparar_config_simulacao(copy.deepcopy(config), ['ambas'], dir_temp)
+        config_ciclo['MODO_NUMERICO'] = modo_numerico
+        worker = BotWorker(config=config_ciclo, exchange_api=api.clonar(), telegram_notifier=None,
+                           notifier=None, modo_simulacao=True)
+        worker._sincronizar_saldos_exchange()
+        worker._preparar_sma_simulacao()
+        worker._atualizar_sma_referencia()
+        worker.rodando = True
+        simulacao = worker.exchange_api
+
+        def executar():
+            with _contexto_log(perfil_log) as eventos:
+                worker.eventos_trade = eventos
+                for _ in range(operacoes):
+                    barra = simulacao.get_barra_atual()
+                    preco = barra.preco_decimal if worker.num.exato else barra.close
+                    worker._executar_ciclo_decisao(preco, barra.timestamp)
+            return {'trades': len(simulacao.trades_executados)}
+        return executar
+
+    descricao = f'_executar_ciclo_decisao ambas ({modo_numerico})'
+    if perfil_log is not None:
+        descricao += ', log ' + ('perfil simulação' if perfil_log else 'padrão (DEBUG)')
+    try:
+        return _medir(preparar, operacoes, repeticoes, descricao)
+    finally:
+        shutil.rmtree(dir_temp, ignore_errors=True)
+
+
+def _ordem_exemplo(i: int) -> Dict[str, Any]:
+    return {
+        'timestamp': datetime(2024, 1, 1).isoformat(), 'tipo': 'COMPRA' if i % 2 else 'VENDA',
+        'par': 'ADA/USDT', 'quantidade': 100.0 + i, 'preco': 0.5, 'valor_total': 50.0,
+        'taxa': 0.05, 'estrategia': 'giro_rapido', 'observacao': 'benchmark',
+    }
+
+
+def medir_registrar_ordem(operacoes: int, repeticoes: int, em_memoria: bool) -> Dict[str, Any]:
+    """DatabaseManager.registrar_ordem (banco em memória do backtest ou em arquivo)."""
+    ordens = [_ordem_exemplo(i) for i in range(operacoes)]
+    diretorios: List[Path] = []
+
+    def preparar():
+        diretorio = Path(tempfile.mkdtemp(prefix='benchmark_db_'))
+        diretorios.append(diretorio)
+        db = DatabaseManager(db_path=diretorio / 'bench.db', backup_dir=diretorio / 'backup', em_memoria=em_memoria)
+
+        def executar():
+            for ordem in ordens:
+                db.registrar_ordem(ordem)
+        return executar
+
+    destino = 'memória' if em_memoria else 'arquivo'
+    try:
+        return _medir(preparar, operacoes, repeticoes, f'registrar_ordem ({destino})')
+    finally:
+        for diretorio in diretorios:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def medir_set_state(operacoes: int, repeticoes: int, em_memoria: bool) -> Dict[str, Any]:
+    """StateManager.set_state (backend em memória do backtest ou JSON com journal)."""
+    diretorios: List[Path] = []
+
+    def preparar():
+        if em_memoria:
+            state = StateManager(armazenamento=ArmazenamentoEstadoMemoria())
+        else:
+            diretorio = Path(tempfile.mkdtemp(prefix='benchmark_state_'))
+            diretorios.append(diretorio)
+            state = StateManager(state_file_path=diretorio / 'state.json', intervalo_flush_segundos=5)
+
+        def executar():
+            for i in range(operacoes):
+                state.set_state(f'ultima_compra_degrau_{i % 8}_ts', datetime(2024, 1, 1).isoformat())
+        return executar
+
+    destino = 'memória' if em_memoria else 'arquivo, flush 5s'
+    try:
+        return _medir(preparar, operacoes, repeticoes, f'set_state ({destino})')
+    finally:
+        for diretorio in diretorios:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def medir_bot_run(api: SimulatedExchangeAPI, config: Dict[str, Any], repeticoes: int,
+                  estrategias: Optional[List[str]] = None) -> Dict[str, Any]:
+    """BotWorker.run completo (executar_simulacao) sobre todas as barras da API."""
+    estrategias = estrategias or ['ambas']
+    barras = api.total_barras - api.indice_atual
+
+    def preparar():
+        simulacao = api.clonar()
+
+        def executar():
+            resultados = executar_simulacao(config, simulacao, estrategias)
+            return {'barras': barras, 'trades': len(resultados['trades'])}
+        return executar
+
+    return _medir(preparar, barras, repeticoes, f"BotWorker.run {'+'.join(estrategias)} ({barras:,} barras)")
+
+
+# ═══════════════════════════════════════════════════════════════════
+# SUÍTE
+# ═══════════════════════════════════════════════════════════════════
+
+def informacoes_maquina() -> Dict[str, Any]:
+    """Plataforma, CPU, memória, versões e commit em que a suíte rodou."""
+    info = {
+        'plataforma': platform.platform(),
+        'maquina': platform.machine(),
+        'processador': platform.processor() or platform.machine(),
+        'nucleos': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+    try:
+        info['memoria_gb'] = round(os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 1024 ** 3, 1)
+    except (AttributeError, ValueError, OSError):
+        info['memoria_gb'] = None
+    try:
+        info['commit'] = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        info['commit'] = None
+    return info
+
+
+def executar_suite(
+    barras: Optional[List[int]] = None,
+    repeticoes: int = 3,
+    operacoes: Optional[Dict[str, int]] = None,
+    caminho_csv: Optional[str] = None,
+    timeframe_csv: str = '1m',
+    caminho_config: Optional[Path] = None,
+    modo_numerico: str = 'decimal',
+    incluir: Optional[List[str]] = None,
+    progresso: Callable[[str], None] = print
+) -> Dict[str, Any]:
+    """
+    Roda a suíte e devolve o relatório (pronto para salvar em JSON).
+
+    Args:
+        barras: Tamanhos do BotWorker.run completo (padrão: 10k, 100k e 1M)
+        repeticoes: Repetições dos componentes (o run completo roda 1x
+            a partir de 1M barras)
+        operacoes: Operações por benchmark de componente (sobrescreve OPERACOES_PADRAO)
+        caminho_csv: CSV real (opcional): componentes rodam sobre ele e o
+            run completo também é medido nele
+        timeframe_csv: Timeframe do CSV real
+        caminho_config: Config do bot (padrão: configs/backtest_template.json)
+        modo_numerico: MODO_NUMERICO do ciclo de decisão e dos runs completos
+        incluir: Nomes (prefixos) dos benchmarks a rodar (padrão: todos)
+        progresso: Função que recebe as mensagens de andamento
+
+    Returns:
+        Dict com versao, criado_em, maquina, parametros e resultados {nome: medição}
+    """
+    barras = BARRAS_PADRAO if barras is None else barras
+    operacoes = {**OPERACOES_PADRAO, **(operacoes or {})}
+    config = _config_base(caminho_config)
+    config['MODO_NUMERICO'] = modo_numerico
+    silenciar_logs_simulacao(logging.ERROR)
+
+    def selecionado(nome: str) -> bool:
+        return not incluir or any(nome.startswith(prefixo) for prefixo in incluir)
+
+    resultados: Dict[str, Dict[str, Any]] = {}
+
+    def registrar(nome: str, medir: Callable[[], Dict[str, Any]]) -> None:
+        if not selecionado(nome):
+            return
+        progresso(f"⏱️  {nome}...")
+        resultados[nome] = medir()
+        medicao = resultados[nome]
+        progresso(f"   {medicao['us_por_operacao']:>12.2f} µs/op  ({medicao['segundos']:.3f}s, "
+                  f"{medicao['operacoes']:,} ops)")
+
+    with tempfile.TemporaryDirectory(prefix='benchmarks_') as tmp:
+        # Dataset dos componentes: CSV real ou GBM sintético
+        if caminho_csv:
+            api = SimulatedExchangeAPI(caminho_csv, SALDO_INICIAL, TAXA_PCT, timeframe_csv)
+        else:
+            csv_componentes = gravar_csv_gbm(Path(tmp) / f'gbm_{BARRAS_COMPONENTES}.csv', BARRAS_COMPONENTES)
+            api = SimulatedExchangeAPI(str(csv_componentes), SALDO_INICIAL, TAXA_PCT, '1m')
+
+        registrar('obter_klines', lambda: medir_obter_klines(api, operacoes['obter_klines'], repeticoes))
+        registrar('get_rsi', lambda: medir_get_rsi(api, operacoes['get_rsi'], repeticoes))
+        registrar('ciclo_decisao', lambda: medir_ciclo_decisao(
+            api, config, operacoes['ciclo_decisao'], repeticoes, modo_numerico))
+        # Custo do logging no ciclo: padrão de hoje x perfil de simulação
+        registrar('ciclo_log_padrao', lambda: medir_ciclo_decisao(
+            api, config, operacoes['ciclo_decisao'], repeticoes, modo_numerico, perfil_log=False))
+        registrar('ciclo_log_simulacao', lambda: medir_ciclo_decisao(
+            api, config, operacoes['ciclo_decisao'], repeticoes, modo_numerico, perfil_log=True))
+        if 'ciclo_log_padrao' in resultados and 'ciclo_log_simulacao' in resultados:
+            padrao = resultados['ciclo_log_padrao']['us_por_operacao']
+            simulacao = resultados['ciclo_log_simulacao']['us_por_operacao']
+            fracao = (padrao - simulacao) / padrao * 100 if padrao else 0.0
+            resultados['ciclo_log_padrao']['fracao_logging_pct'] = fracao
+            progresso(f"   📉 Logging: {fracao:.1f}% do tempo por barra com o log padrão")
+        registrar('registrar_ordem_memoria', lambda: medir_registrar_ordem(operacoes['registrar_ordem'], repeticoes, True))
+        registrar('registrar_ordem_arquivo', lambda: medir_registrar_ordem(operacoes['registrar_ordem'], repeticoes, False))
+        registrar('set_state_memoria', lambda: medir_set_state(operacoes['set_state'], repeticoes, True))
+        registrar('set_state_arquivo', lambda: medir_set_state(operacoes['set_state'], repeticoes, False))
+
+        for total in barras:
+            nome = f'bot_run_{_rotulo_barras(total)}'
+            if not selecionado(nome):
+                continue
+            # +200 barras de aquecimento: a simulação começa no índice 200
+            csv_run = gravar_csv_gbm(Path(tmp) / f'gbm_{total}.csv', total + 200, seed=total)
+            api_run = SimulatedExchangeAPI(str(csv_run), SALDO_INICIAL, TAXA_PCT, '1m')
+            repeticoes_run = 1 if total >= 1_000_000 else repeticoes
+            registrar(nome, lambda: medir_bot_run(api_run, config, repeticoes_run))
+            del api_run
+
+        if caminho_csv:
+            registrar('bot_run_csv', lambda: medir_bot_run(api, config, 1))
+
+    return {
+        'versao': VERSAO_RESULTADOS,
+        'criado_em': datetime.now().isoformat(timespec='seconds'),
+        'maquina': informacoes_maquina(),
+        'parametros': {
+            'barras': barras,
+            'repeticoes': repeticoes,
+            'operacoes': operacoes,
+            'csv': str(caminho_csv) if caminho_csv else None,
+            'modo_numerico': modo_numerico,
+            'saltar_barras_ociosas': config.get('SALTAR_BARRAS_OCIOSAS', False),
+        },
+        'resultados': resultados,
+    }
+
+
+def _rotulo_barras(total: int) -> str:
+    """10000 -> '10k', 1000000 -> '1m'."""
+    if total >= 1_000_000 and total % 1_000_000 == 0:
+        return f'{total // 1_000_000}m'
+    if total >= 1_000 and total % 1_000 == 0:
+        return f'{total // 1_000}k'
+    return str(total)
+
+
+def salvar_resultados(relatorio: Dict[str, Any], caminho: Path) -> Path:
+    """Grava o relatório da suíte em JSON (cria o diretório se preciso)."""
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    caminho.write_text(json.dumps(relatorio, indent=2, ensure_ascii=False), encoding='utf-8')
+    return caminho
+
+
+def carregar_resultados(caminho: Path) -> Dict[str, Any]:
+    """Lê um relatório salvo por salvar_resultados."""
+    relatorio = json.loads(Path(caminho).read_text(encoding='utf-8'))
+    if relatorio.get('versao') != VERSAO_RESULTADOS:
+        raise ValueError(f"Versão de resultados não suportada em {caminho}: {relatorio.get('versao')}")
+    return relatorio
@@ -1,18 +1,112 @@
+import argparse
+import sys
 import pandas as pd
 import pathlib
 import questionary
-import os
 from dotenv import load_dotenv
-from src.exchange.binance_api import BinanceAPI
+from src.exchange.download_historico import (
+    DIRETORIO_HISTORICOS,
+    atualizar_historico,
+    atualizar_todos,
+    baixar_historico,
+    caminho_historico,
+)
 from src.exchange.kucoin_api import KucoinAPI
 
 # Carregar variáveis de ambiente
 load_dotenv('configs/.env')
 
+
+def imprimir_resultado(resultado: dict) -> None:
+    """Resumo de um download/atualização: candles e lacunas encontradas."""
+    print(f"\nDados salvos com sucesso em: {resultado['caminho']} ({resultado['candles']} candles)")
+    if resultado['lacunas']:
+        faltando = sum(lacuna['candles'] for lacuna in resultado['lacunas'])
+        print(f"⚠️ {len(resultado['lacunas'])} lacunas no histórico ({faltando} candles ausentes)")
+
+
+def confirmar_sobrescrita(filepath: pathlib.Path, exchange: str, symbol: str, timeframe: str) -> bool:
+    """
+    Pede confirmação explícita antes de substituir um histórico existente.
+
+    O nome do arquivo não tem datas: baixar outro período por cima troca o
+    histórico inteiro pelo intervalo digitado.
+
+    Returns:
+        True se o usuário confirmou a substituição
+    """
+    if questionary.confirm(
+        f"⚠️ Substituir {filepath.name} inteiro pelo período que será digitado? "
+        "O histórico atual será perdido.",
+        default=False
+    ).ask():
+        return True
+    print("Nada foi gravado.")
+    if exchange == 'binance':
+        print(f"Para trazer só os candles novos: python download_data.py update --par {symbol} --timeframe {timeframe}")
+    return False
+
+
+def executar_atualizacao(args: argparse.Namespace) -> int:
+    """
+    Comando 'update': anexa só os candles novos aos históricos existentes.
+
+    Sem --par, atualiza todos os históricos da Binance com nome canônico
+    (BINANCE_<PAR>_<timeframe>.csv) do diretório; pensado para um cron noturno.
+
+    Returns:
+        Código de saída (1 se algum histórico falhou)
+    """
+    opcoes = {'workers': args.workers}
+    if args.par:
+        if not args.timeframe:
+            print("❌ --par exige --timeframe")
+            return 2
+        try:
+            resultado = atualizar_historico(
+                args.par, args.timeframe, inicio=args.inicio, diretorio=args.diretorio, **opcoes
+            )
+        except Exception as e:
+            print(f"❌ Falha ao atualizar {args.par} {args.timeframe}: {e}")
+            return 1
+        imprimir_resultado(resultado)
+        return 0
+
+    relatorio = atualizar_todos(args.diretorio, **opcoes)
+    if not relatorio:
+        print(f"ℹ️ Nenhum histórico BINANCE_<PAR>_<timeframe>.csv em {args.diretorio}")
+        return 0
+
+    print(f"\n{'Histórico':<36} {'Novos':>8} {'Lacunas':>8}")
+    for item in relatorio:
+        nome = item['caminho'].name
+        if 'erro' in item:
+            print(f"{nome:<36} {'ERRO':>8}   {item['erro']}")
+        else:
+            print(f"{nome:<36} {item['resultado']['candles']:>8} {len(item['resultado']['lacunas']):>8}")
+    return 1 if any('erro' in item for item in relatorio) else 0
+
+
 def main():
     """
     Assistente interativo para baixar dados históricos de candles.
+
+    Cada (exchange, par, timeframe) fica num único arquivo, sem datas no nome;
+    'python download_data.py update' traz os existentes até o último candle.
     """
+    parser = argparse.ArgumentParser(description="Download de dados históricos de candles")
+    subcomandos = parser.add_subparsers(dest='comando')
+    atualizar = subcomandos.add_parser('update', help="Anexa só os candles novos aos históricos existentes")
+    atualizar.add_argument('--par', help="Par a atualizar (ex: ADA/USDT); sem ele, atualiza todos do diretório")
+    atualizar.add_argument('--timeframe', help="Timeframe do par (ex: 1m)")
+    atualizar.add_argument('--inicio', help="Data inicial (YYYY-MM-DD) se o histórico do par ainda não existe")
+    atualizar.add_argument('--diretorio', default=DIRETORIO_HISTORICOS, help="Diretório dos históricos")
+    atualizar.add_argument('--workers', type=int, default=4, help="Requisições em paralelo")
+    args = parser.parse_args()
+
+    if args.comando == 'update':
+        sys.exit(executar_atualizacao(args))
+
     exchange = questionary.select(
         "Selecione a exchange:",
         choices=['binance', 'kucoin']
@@ -23,16 +117,35 @@ def main():
         "Selecione o timeframe:",
         choices=['1m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '8h', '12h', '1d', '3d', '1w']
     ).ask()
+
+    # Criar a pasta de dados históricos se não existir
+    data_dir = pathlib.Path(DIRETORIO_HISTORICOS)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    filepath = caminho_historico(exchange, symbol, timeframe, str(data_dir))
+
+    if filepath.exists():
+        if exchange == 'binance' and questionary.confirm(
+            f"{filepath.name} já existe. Baixar só os candles novos?", default=True
+        ).ask():
+            try:
+                imprimir_resultado(atualizar_historico(symbol, timeframe, str(filepath)))
+            except Exception as e:
+                print(f"Ocorreu um erro: {e}")
+            return
+        if not confirmar_sobrescrita(filepath, exchange, symbol, timeframe):
+            return
+
     start_date = questionary.text("Digite a data de início (YYYY-MM-DD):").ask()
     end_date = questionary.text("Digite a data de fim (YYYY-MM-DD):").ask()
 
     if exchange == 'binance':
-        api_key = os.getenv('BINANCE_API_KEY')
-        api_secret = os.getenv('BINANCE_API_SECRET')
-        if not api_key or not api_secret:
-            print("Erro: API Keys da Binance não encontradas no arquivo .env")
-            return
-        api = BinanceAPI(api_key=api_key, api_secret=api_secret, base_url='https://api.binance.com')
+        # Klines são públicos: download em partes paralelas, retomável e já com o cache binário
+        try:
+            imprimir_resultado(baixar_historico(symbol, timeframe, start_date, end_date, str(filepath)))
+        except Exception as e:
+            print(f"Ocorreu um erro: {e}")
+            print("As partes já baixadas foram mantidas: rode de novo com os mesmos parâmetros para retomar.")
+        return
     elif exchange == 'kucoin':
         api = KucoinAPI()
     else:
@@ -44,13 +157,7 @@ def main():
         df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
         df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
 
-        # Criar a pasta de dados históricos se não existir
-        data_dir = pathlib.Path('dados/historicos')
-        data_dir.mkdir(parents=True, exist_ok=True)
-
         # Salvar o arquivo
-        filename = f'{exchange.upper()}_{symbol.replace("/", "")}_{timeframe}_{start_date}_{end_date}.csv'
-        filepath = data_dir / filename
         df.to_csv(filepath, index=False)
 
         print(f"\nDados salvos com sucesso em: {filepath}")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: cursor de barras da SimulatedExchangeAPI.
+
+Compara o acesso por barra ANTES (iloc[...].to_dict() + pd.to_datetime +
+Decimal(str(close))) com o cursor colunar atual (get_barra_atual devolvendo
+BarraSimulada a partir dos arrays NumPy).
+
+Uso:
+    python scripts/benchmark_cursor_barras.py                  # gera CSV 1m sintético com 1M linhas
+    python scripts/benchmark_cursor_barras.py --csv dados/historicos/BINANCE_ADAUSDT_1m.csv
+    python scripts/benchmark_cursor_barras.py --linhas 200000 --amostra-legado 20000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+
+def gerar_csv_sintetico(caminho: Path, linhas: int) -> None:
+    """Gera um CSV 1m com movimento browniano geométrico."""
+    rng = np.random.default_rng(42)
+    close = 0.5 * np.exp(np.cumsum(rng.normal(0, 0.0015, linhas)))
+    open_ = np.concatenate([[0.5], close[:-1]])
+    pd.DataFrame({
+        'timestamp': pd.date_range('2020-01-01', periods=linhas, freq='1min'),
+        'open': open_.round(6),
+        'high': (np.maximum(open_, close) * 1.0008).round(6),
+        'low': (np.minimum(open_, close) * 0.9992).round(6),
+        'close': close.round(6),
+        'volume': rng.uniform(100, 1000, linhas).round(2),
+    }).to_csv(caminho, index=False)
+
+
+def medir_legado(api: SimulatedExchangeAPI, amostra: int) -> float:
+    """Reproduz o acesso antigo por barra (pandas) e retorna barras/segundo."""
+    dados = api.dados
+    fim = min(len(dados), amostra)
+    inicio = time.perf_counter()
+    for i in range(fim):
+        barra = dados.iloc[i].to_dict()
+        tempo = pd.to_datetime(barra['timestamp'])
+        preco = Decimal(str(barra['close']))
+    decorrido = time.perf_counter() - inicio
+    return fim / decorrido
+
+
+def medir_cursor(api: SimulatedExchangeAPI) -> float:
+    """Percorre todas as barras com o cursor colunar e retorna barras/segundo."""
+    api.indice_atual = 0
+    n = 0
+    inicio = time.perf_counter()
+    while (barra := api.get_barra_atual()) is not None:
+        tempo = barra.timestamp
+        preco = barra.preco_decimal
+        n += 1
+    decorrido = time.perf_counter() - inicio
+    return n / decorrido
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do cursor de barras da simulação')
+    parser.add_argument('--csv', type=str, help='CSV 1m existente (se omitido, gera um sintético)')
+    parser.add_argument('--linhas', type=int, default=1_000_000, help='Linhas do CSV sintético')
+    parser.add_argument('--amostra-legado', type=int, default=50_000,
+                        help='Barras medidas no caminho antigo (é lento; o resultado é extrapolado)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.csv:
+            caminho = Path(args.csv)
+        else:
+            caminho = Path(tmp) / 'sintetico_1m.csv'
+            print(f"⏳ Gerando CSV sintético com {args.linhas:,} linhas...")
+            gerar_csv_sintetico(caminho, args.linhas)
+
+        api = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m')
+        total = api.total_barras
+
+        print("=" * 60)
+        print(f"📊 BENCHMARK: cursor de barras ({total:,} barras)")
+        print("=" * 60)
+
+        bps_legado = medir_legado(api, args.amostra_legado)
+        print(f"   Antes  (iloc + to_dict): {bps_legado:>12,.0f} barras/s "
+              f"(~{total / bps_legado:,.1f}s para o CSV inteiro)")
+
+        bps_cursor = medir_cursor(api)
+        print(f"   Depois (BarraSimulada):  {bps_cursor:>12,.0f} barras/s "
+              f"({total / bps_cursor:,.1f}s para o CSV inteiro)")
+
+        print(f"   🚀 Ganho: {bps_cursor / bps_legado:,.1f}x")
+
+
+if __name__ == '__main__':
+    main()
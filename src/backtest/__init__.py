@@ -0,0 +1,3 @@
+"""
+Módulo de backtest - Execução de simulações, sweep de parâmetros e walk-forward
+"""
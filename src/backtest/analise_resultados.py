@@ -0,0 +1,236 @@
+"""
+Análise de Resultados - Métricas de trades e da curva de patrimônio em colunas.
+
+O relatório do backtest percorria os trades como lista de dicts (FIFO com
+listas de Decimal, um list comprehension por estatística). Aqui os trades
+viram colunas NumPy uma única vez (TabelaTrades) e o resto é vetorizado:
+
+    - emparelhamento FIFO compra → venda por carteira (mesma regra de antes:
+      cada venda fecha a compra aberta mais antiga da carteira, inteira)
+    - lucro/prejuízo por motivo de saída (SL, TSL, meta, outros)
+    - drawdown máximo, tempo submerso, Sharpe/Sortino (retornos diários,
+      anualizados em 365 dias), tempo exposto e giro da carteira
+
+A tabela de trades (TabelaTrades, resumir_trades) fica em
+src/core/tabela_trades.py, porque o próprio BotWorker a usa no resumo que
+loga no fim da simulação (o core não depende do pacote de backtest).
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.core.tabela_trades import CATEGORIAS_SAIDA, TabelaTrades, resumir_trades
+
+
+DIA_MS = 86_400_000
+DIAS_POR_ANO = 365
+
+
+def emparelhar_fifo(tabela: TabelaTrades) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Emparelha vendas e compras em FIFO, por carteira.
+
+    Em cada carteira a fila de compras abertas é um passeio +1 (compra) / -1
+    (venda) refletido em zero: uma venda sem compra aberta é a que leva a
+    soma acumulada a um novo mínimo abaixo de zero. As demais vendas fecham
+    as compras na ordem em que entraram.
+
+    Returns:
+        (índices das vendas emparelhadas, índices das compras que elas fecham)
+    """
+    vendas, compras = [], []
+    for codigo in range(len(tabela.carteiras)):
+        eventos = np.flatnonzero((tabela.carteira == codigo) & (tabela.compra | tabela.venda))
+        e_compra = tabela.compra[eventos]
+        fila = np.cumsum(np.where(e_compra, 1, -1))
+        minimo_anterior = np.minimum.accumulate(np.concatenate(([0], fila[:-1])))
+        sem_compra = ~e_compra & (fila < minimo_anterior)
+        vendas_carteira = eventos[~e_compra & ~sem_compra]
+        vendas.append(vendas_carteira)
+        compras.append(eventos[e_compra][:len(vendas_carteira)])
+
+    if not vendas:
+        vazio = np.empty(0, dtype=np.int64)
+        return vazio, vazio
+    vendas = np.concatenate(vendas)
+    compras = np.concatenate(compras)
+    ordem = np.argsort(vendas, kind='stable')
+    return vendas[ordem], compras[ordem]
+
+
+def analisar_saidas(tabela: TabelaTrades) -> Dict[str, Dict[str, Any]]:
+    """
+    Contagem e lucro/prejuízo das vendas por motivo de saída.
+
+    Lucro de uma venda = receita da venda - custo da compra que ela fecha
+    (FIFO); vendas sem compra aberta contam na quantidade mas não no lucro.
+
+    Returns:
+        {categoria: {'count', 'lucro_total', 'lucro_lista', 'trades'}}
+    """
+    vendas, compras = emparelhar_fifo(tabela)
+    lucros = tabela.receita_usdt[vendas] - tabela.quantidade_usdt[compras]
+    categorias_emparelhadas = tabela.categoria[vendas]
+
+    saidas = {}
+    for codigo, nome in enumerate(CATEGORIAS_SAIDA):
+        indices = np.flatnonzero(tabela.categoria == codigo)
+        lucros_categoria = lucros[categorias_emparelhadas == codigo]
+        saidas[nome] = {
+            'count': len(indices),
+            'lucro_total': float(lucros_categoria.sum()),
+            'lucro_lista': lucros_categoria.tolist(),
+            'trades': [tabela.trades[i] for i in indices],
+        }
+    return saidas
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CURVA DE PATRIMÔNIO
+# ═══════════════════════════════════════════════════════════════════════════
+
+def calcular_drawdown_maximo(valores: np.ndarray) -> float:
+    """
+    Drawdown máximo (%) de uma curva de patrimônio.
+
+    Args:
+        valores: Patrimônio ao longo do tempo
+
+    Returns:
+        Maior queda percentual desde um pico (valor positivo, ex: 12.5)
+    """
+    if len(valores) == 0:
+        return 0.0
+    picos = np.maximum.accumulate(valores)
+    quedas = np.where(picos > 0, (picos - valores) / picos, 0.0)
+    return float(quedas.max() * 100)
+
+
+def calcular_tempo_submerso(valores: np.ndarray, timestamps_ms: np.ndarray) -> Dict[str, float]:
+    """
+    Tempo abaixo do pico anterior (under water) de uma curva de patrimônio.
+
+    Args:
+        valores: Patrimônio ao longo do tempo
+        timestamps_ms: Timestamp (ms) de cada ponto da curva
+
+    Returns:
+        {'tempo_submerso_pct': % dos pontos abaixo do pico,
+         'maior_submersao_dias': maior intervalo entre um pico e a recuperação
+         (ou o fim da curva, se não recuperou)}
+    """
+    if len(valores) == 0:
+        return {'tempo_submerso_pct': 0.0, 'maior_submersao_dias': 0.0}
+
+    submerso = valores < np.maximum.accumulate(valores)
+    # Trechos submersos [inicio, fim): medidos do pico (inicio-1) até a recuperação (fim)
+    bordas = np.diff(np.concatenate(([0], submerso.view(np.int8), [0])))
+    inicios = np.flatnonzero(bordas == 1)
+    fins = np.flatnonzero(bordas == -1)
+    maior_ms = 0
+    if len(inicios):
+        ultimo = len(valores) - 1
+        duracoes = timestamps_ms[np.minimum(fins, ultimo)] - timestamps_ms[np.maximum(inicios - 1, 0)]
+        maior_ms = int(duracoes.max())
+
+    return {
+        'tempo_submerso_pct': float(submerso.mean() * 100),
+        'maior_submersao_dias': maior_ms / DIA_MS,
+    }
+
+
+def retornos_diarios(valores: np.ndarray, timestamps_ms: np.ndarray) -> np.ndarray:
+    """Retornos simples entre o último patrimônio de cada dia (UTC)."""
+    if len(valores) == 0:
+        return np.empty(0, dtype=np.float64)
+    dias = timestamps_ms // DIA_MS
+    ultimos = np.flatnonzero(np.append(dias[1:] != dias[:-1], True))
+    # Patrimônio inicial como base do primeiro dia
+    fechamentos = np.concatenate(([valores[0]], valores[ultimos]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        retornos = fechamentos[1:] / fechamentos[:-1] - 1
+    return retornos[np.isfinite(retornos)]
+
+
+def calcular_sharpe_sortino(retornos: np.ndarray) -> Dict[str, Optional[float]]:
+    """
+    Sharpe e Sortino anualizados (taxa livre de risco zero).
+
+    Returns:
+        {'sharpe', 'sortino'}; None com menos de 2 retornos ou dispersão zero
+    """
+    if len(retornos) < 2:
+        return {'sharpe': None, 'sortino': None}
+    media = retornos.mean()
+    anualizacao = np.sqrt(DIAS_POR_ANO)
+    desvio = retornos.std(ddof=1)
+    desvio_baixa = np.sqrt(np.mean(np.minimum(retornos, 0.0) ** 2))
+    return {
+        'sharpe': float(media / desvio * anualizacao) if desvio > 0 else None,
+        'sortino': float(media / desvio_baixa * anualizacao) if desvio_baixa > 0 else None,
+    }
+
+
+def colunas_curva(historico) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (timestamps_ms, patrimônio, saldo do ativo) de cada snapshot.
+
+    Args:
+        historico: HistoricoPortfolio ou lista de snapshots (dicts)
+    """
+    if hasattr(historico, 'valores_totais'):
+        return historico.timestamps_ms(), historico.valores_totais(), historico.saldos_ativo()
+
+    n = len(historico)
+    timestamps = np.array([s['timestamp'] for s in historico], dtype='datetime64[ms]').astype(np.int64)
+    valores = np.fromiter((s['total_value_quote'] for s in historico), dtype=np.float64, count=n)
+    ativos = np.fromiter((s['saldo_ativo'] for s in historico), dtype=np.float64, count=n)
+    return timestamps, valores, ativos
+
+
+def analisar_curva(historico, volume_negociado: float = 0.0) -> Dict[str, Any]:
+    """
+    Métricas de risco e exposição da curva de patrimônio.
+
+    Args:
+        historico: portfolio_over_time de get_resultados()
+        volume_negociado: Volume comprado + vendido (para o giro da carteira)
+
+    Returns:
+        Dict com drawdown_max_pct, tempo_submerso_pct, maior_submersao_dias,
+        sharpe, sortino, exposicao_pct (% dos snapshots com ativo em carteira)
+        e giro_carteira (volume negociado / patrimônio médio)
+    """
+    timestamps, valores, ativos = colunas_curva(historico)
+    patrimonio_medio = float(valores.mean()) if len(valores) else 0.0
+    metricas = {
+        'drawdown_max_pct': calcular_drawdown_maximo(valores),
+        **calcular_tempo_submerso(valores, timestamps),
+        **calcular_sharpe_sortino(retornos_diarios(valores, timestamps)),
+        'exposicao_pct': float((ativos > 0).mean() * 100) if len(ativos) else 0.0,
+        'giro_carteira': volume_negociado / patrimonio_medio if patrimonio_medio > 0 else 0.0,
+    }
+    return metricas
+
+
+def analisar_resultados(resultados: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Análise completa de uma simulação (trades montados em colunas uma vez).
+
+    Args:
+        resultados: Saída de SimulatedExchangeAPI.get_resultados()
+
+    Returns:
+        {'trades': resumir_trades, 'saidas': analisar_saidas, 'curva': analisar_curva}
+    """
+    tabela = TabelaTrades(resultados.get('trades', []))
+    resumo = resumir_trades(tabela)
+    return {
+        'trades': resumo,
+        'saidas': analisar_saidas(tabela),
+        'curva': analisar_curva(
+            resultados.get('portfolio_over_time', []),
+            resumo['volume_comprado'] + resumo['volume_vendido']
+        ),
+    }
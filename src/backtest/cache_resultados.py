@@ -0,0 +1,267 @@
+"""
+Cache de Resultados - Reaproveita backtests já executados.
+
+No laboratório é comum rodar de novo exatamente a mesma configuração (o
+mesmo JSON do --save-config, o mesmo CSV, timeframe, taxa e saldo). Cada
+execução recebe uma impressão digital (sha256) de:
+
+    - config mesclada em JSON canônico (chaves ordenadas, números como float),
+      sem caminhos temporários, perfis de diagnóstico e chaves de comentário ('_...')
+    - sha256 do conteúdo do CSV, timeframe base e janela simulada
+    - saldo inicial, taxa e estratégias selecionadas
+    - versão do motor: hash do código-fonte em src/ (qualquer mudança invalida)
+
+Se a impressão já foi simulada, trades, saldos finais e portfolio_over_time
+voltam do disco em vez de re-simular. As entradas ficam ao lado do CSV:
+
+    dados/historicos/.cache_resultados/<impressao>.pkl
+
+O diretório tem limite de tamanho (LRU pelo mtime, atualizado a cada
+acerto). O histórico do portfólio é gravado sem os arrays de candles e
+remontado sobre os arrays da API simulada no acesso.
+
+Uso:
+    cache = CacheResultados('dados/historicos/ADA_1m.csv')
+    impressao = cache.impressao_digital(config, api, ['ambas'])
+    entrada = cache.obter(impressao, api)
+    if entrada is None:
+        resultados = executar_simulacao(config, api, ['ambas'])
+        cache.salvar(impressao, resultados)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.backtest.executor import normalizar_estrategias
+from src.exchange.historico_cache import hash_historico
+from src.exchange.simulated_api import HistoricoPortfolio, SimulatedExchangeAPI
+from src.utils.logger import get_loggers
+
+logger, _ = get_loggers()
+
+
+# Versão do formato das entradas (incrementar ao mudar o layout)
+VERSAO_CACHE_RESULTADOS = 1
+
+# Diretório do cache, criado ao lado do CSV
+NOME_DIRETORIO_CACHE = '.cache_resultados'
+
+# Tamanho máximo do diretório antes de descartar as entradas menos usadas
+LIMITE_PADRAO_MB = 256
+
+# Chaves da config que não mudam o resultado da simulação
+CHAVES_IGNORADAS = frozenset({
+    'DATABASE_PATH',
+    'BACKUP_DIR',
+    'STATE_FILE_PATH',
+    'EXPORTAR_PERSISTENCIA_BACKTEST',
+    'PERFIL_CICLO_DECISAO',
+    'PERFIL_LOG_SIMULACAO',
+    'CHECKPOINT_DIRETORIO',
+    'CHECKPOINT_INTERVALO_BARRAS',
+    'CHECKPOINT_INTERVALO_SEGUNDOS',
+    'CHECKPOINT_MANTER',
+    'CHECKPOINT_RETOMAR',
+    'CHECKPOINT_RETOMAR_EM',
+})
+
+_DIRETORIO_FONTES = Path(__file__).resolve().parent.parent
+
+_versao_motor: Optional[str] = None
+
+
+def versao_motor() -> str:
+    """sha256 do código-fonte em src/ (calculado uma vez por processo)."""
+    global _versao_motor
+    if _versao_motor is None:
+        sha = hashlib.sha256()
+        for arquivo in sorted(_DIRETORIO_FONTES.rglob('*.py')):
+            sha.update(arquivo.relative_to(_DIRETORIO_FONTES).as_posix().encode())
+            sha.update(arquivo.read_bytes())
+        _versao_motor = sha.hexdigest()
+    return _versao_motor
+
+
+def _canonico(valor: Any) -> Any:
+    """Normaliza a config para JSON estável (30 e 30.0 viram o mesmo valor)."""
+    if isinstance(valor, dict):
+        return {
+            str(chave): _canonico(item) for chave, item in valor.items()
+            if chave not in CHAVES_IGNORADAS and not str(chave).startswith('_')
+        }
+    if isinstance(valor, (list, tuple)):
+        return [_canonico(item) for item in valor]
+    if isinstance(valor, bool) or valor is None or isinstance(valor, str):
+        return valor
+    if isinstance(valor, (int, float, Decimal)):
+        return float(valor)
+    return str(valor)
+
+
+def diretorio_cache_resultados(caminho_csv: str) -> Path:
+    """Diretório das entradas do cache de resultados de um CSV."""
+    return Path(caminho_csv).resolve().parent / NOME_DIRETORIO_CACHE
+
+
+class CacheResultados:
+    """Resultados de backtest em disco, indexados pela impressão digital da execução."""
+
+    def __init__(self, caminho_csv: str, diretorio: Optional[Path] = None, limite_mb: float = LIMITE_PADRAO_MB):
+        """
+        Args:
+            caminho_csv: CSV histórico das simulações
+            diretorio: Onde gravar as entradas (padrão: .cache_resultados ao lado do CSV)
+            limite_mb: Tamanho máximo do diretório em MB
+        """
+        self.caminho_csv = str(caminho_csv)
+        self.diretorio = Path(diretorio) if diretorio else diretorio_cache_resultados(caminho_csv)
+        self.limite_bytes = int(limite_mb * 1024 * 1024)
+        # Calculado aqui para que os processos do sweep não releiam o CSV
+        self.sha256_csv = hash_historico(self.caminho_csv)
+
+    def impressao_digital(self, config: Dict[str, Any], api: SimulatedExchangeAPI, estrategias: List[str]) -> str:
+        """
+        Impressão digital de uma execução (antes de rodar).
+
+        Args:
+            config: Configuração mesclada (após overrides e parâmetros do sweep)
+            api: API simulada ainda não usada (saldo, taxa, timeframe e janela)
+            estrategias: Estratégias selecionadas
+
+        Returns:
+            sha256 hexadecimal
+        """
+        timestamps = api.store_base.timestamps
+        conteudo = {
+            'versao': VERSAO_CACHE_RESULTADOS,
+            'motor': versao_motor(),
+            'csv': self.sha256_csv,
+            'timeframe_base': api.timeframe_base,
+            'janela': [
+                int(timestamps[0]) if len(timestamps) else None,
+                int(timestamps[-1]) if len(timestamps) else None,
+                api.total_barras,
+                api.indice_atual,
+            ],
+            'saldo_inicial': float(api.saldo_inicial),
+            'taxa_pct': float(api.taxa_pct),
+            'alocacao_giro_pct': float(api.alocacao_giro_pct),
+            'estrategias': normalizar_estrategias(estrategias),
+            'config': _canonico(config),
+        }
+        texto = json.dumps(conteudo, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+    def _caminho(self, impressao: str) -> Path:
+        return self.diretorio / f'{impressao}.pkl'
+
+    def obter(self, impressao: str, api: SimulatedExchangeAPI) -> Optional[Dict[str, Any]]:
+        """
+        Resultado já simulado com esta impressão digital.
+
+        Args:
+            impressao: Saída de impressao_digital()
+            api: API da execução; o portfolio_over_time é remontado sobre os candles dela
+
+        Returns:
+            {'resultados': formato de get_resultados(), 'extras': dict salvo junto},
+            ou None se não houver entrada válida
+        """
+        caminho = self._caminho(impressao)
+        try:
+            with open(caminho, 'rb') as arquivo:
+                entrada = pickle.load(arquivo)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ Entrada do cache de resultados ilegível, descartando: {caminho.name} ({e})")
+            caminho.unlink(missing_ok=True)
+            return None
+        if entrada.get('versao') != VERSAO_CACHE_RESULTADOS or entrada.get('impressao') != impressao:
+            return None
+
+        try:
+            os.utime(caminho)  # LRU: acerto conta como uso recente
+        except OSError:
+            pass
+
+        gravado = entrada['resultados']
+        resultados = {
+            'trades': gravado['trades'],
+            'saldo_final_usdt': gravado['saldo_final_usdt'],
+            'saldo_final_ativo': gravado['saldo_final_ativo'],
+            'portfolio_over_time': HistoricoPortfolio.restaurar(
+                gravado['portfolio'], api.store_base.timestamps, api.store_base.close
+            ),
+        }
+        return {'resultados': resultados, 'extras': entrada.get('extras', {})}
+
+    def salvar(self, impressao: str, resultados: Dict[str, Any], extras: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Grava o resultado de uma execução e aplica o limite de tamanho.
+
+        Falhas de escrita só geram aviso: o cache nunca derruba o backtest.
+
+        Args:
+            impressao: Saída de impressao_digital()
+            resultados: Saída de get_resultados()
+            extras: Dados derivados para devolver junto (ex: análise de saídas)
+        """
+        historico = resultados['portfolio_over_time']
+        entrada = {
+            'versao': VERSAO_CACHE_RESULTADOS,
+            'impressao': impressao,
+            'criado_em': time.time(),
+            'csv': Path(self.caminho_csv).name,
+            'resultados': {
+                'trades': resultados['trades'],
+                'saldo_final_usdt': resultados['saldo_final_usdt'],
+                'saldo_final_ativo': resultados['saldo_final_ativo'],
+                'portfolio': historico.exportar_estado(),
+            },
+            'extras': extras or {},
+        }
+        try:
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            descritor, temporario = tempfile.mkstemp(prefix=f'.{impressao}.', dir=self.diretorio)
+            try:
+                with os.fdopen(descritor, 'wb') as arquivo:
+                    pickle.dump(entrada, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temporario, self._caminho(impressao))
+            except Exception:
+                Path(temporario).unlink(missing_ok=True)
+                raise
+        except Exception as e:
+            logger.warning(f"⚠️ Não foi possível gravar no cache de resultados: {e}")
+            return
+        self._aplicar_limite()
+
+    def _aplicar_limite(self) -> None:
+        """Remove as entradas usadas há mais tempo até caber no limite."""
+        entradas = []
+        for caminho in self.diretorio.glob('*.pkl'):
+            try:
+                info = caminho.stat()
+            except FileNotFoundError:
+                continue  # removida por outro processo do sweep
+            entradas.append((info.st_mtime_ns, info.st_size, caminho))
+
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, caminho in sorted(entradas, key=lambda entrada: entrada[0]):
+            if total <= self.limite_bytes:
+                break
+            caminho.unlink(missing_ok=True)
+            total -= tamanho
+            logger.debug(f"🗑️ Cache de resultados: {caminho.name} descartado (limite de tamanho)")
+
+    def limpar(self) -> None:
+        """Remove todas as entradas do diretório."""
+        shutil.rmtree(self.diretorio, ignore_errors=True)
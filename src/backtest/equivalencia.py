@@ -0,0 +1,374 @@
+"""
+Equivalência Numérica - Confere que MODO_NUMERICO='float' não muda decisões.
+
+Roda a mesma configuração sobre os mesmos dados nos dois modos (Decimal exato
+e float rápido) e compara:
+- sequência de trades (lado, carteira, timestamp, motivo e preço)
+- quantidades e taxas de cada trade (tolerância relativa, com piso absoluto)
+- saldos finais e métricas da simulação
+
+O piso absoluto evita falsos alarmes com valores perto de zero: um saldo de
+ativo zerado termina como poeira de arredondamento (1e-13 num modo, 9e-14 no
+outro), o que é 24% em termos relativos e nada em termos práticos.
+
+comparar_salto_de_barras() faz o mesmo para SALTAR_BARRAS_OCIOSAS: com e sem
+o salto os trades e os snapshots (barra a barra) precisam ser idênticos.
+
+Uso:
+    relatorio = comparar_modos_numericos(config, 'dados/historicos/ADA_1m.csv',
+                                         1000, 0.1, '1m', ['ambas'])
+    imprimir_relatorio_equivalencia(relatorio)
+"""
+
+import copy
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.backtest.executor import calcular_metricas, executar_simulacao
+from src.core.numerico import MODO_DECIMAL, MODO_FLOAT
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+
+# Campos que precisam ser idênticos nos dois modos
+CAMPOS_EXATOS = ('side', 'carteira', 'timestamp', 'motivo', 'preco')
+
+# Campos comparados com tolerância relativa
+CAMPOS_TOLERANCIA = ('quantidade_usdt', 'quantidade_ativo', 'fee')
+
+# Tolerância relativa padrão (erro de arredondamento de float64 acumulado)
+TOLERANCIA_PADRAO = 1e-9
+
+# Diferença absoluta sempre aceita (bem abaixo do step size de qualquer par)
+TOLERANCIA_ABSOLUTA_PADRAO = 1e-8
+
+
+def _diferenca_relativa(a: float, b: float) -> float:
+    """|a - b| relativo ao maior módulo (0 se ambos forem zero)."""
+    a, b = float(a), float(b)
+    escala = max(abs(a), abs(b))
+    return abs(a - b) / escala if escala else 0.0
+
+
+def _dentro_da_tolerancia(a: float, b: float, tolerancia: float, tolerancia_absoluta: float) -> bool:
+    """|a - b| <= max(tolerancia_absoluta, tolerancia * maior módulo)."""
+    a, b = float(a), float(b)
+    return abs(a - b) <= max(tolerancia_absoluta, tolerancia * max(abs(a), abs(b)))
+
+
+def comparar_trades(
+    trades_decimal: List[Dict[str, Any]],
+    trades_float: List[Dict[str, Any]],
+    tolerancia: float = TOLERANCIA_PADRAO,
+    tolerancia_absoluta: float = TOLERANCIA_ABSOLUTA_PADRAO
+) -> Dict[str, Any]:
+    """
+    Compara duas listas de trades, na ordem de execução.
+
+    Args:
+        trades_decimal: Trades do modo exato
+        trades_float: Trades do modo rápido
+        tolerancia: Diferença relativa aceita nas quantidades e taxas
+        tolerancia_absoluta: Diferença absoluta sempre aceita (valores perto de zero)
+
+    Returns:
+        Dict com equivalentes (bool), primeira_divergencia (dict ou None) e
+        maior_diferenca_relativa (float)
+    """
+    maior_diferenca = 0.0
+
+    for indice, (trade_d, trade_f) in enumerate(zip(trades_decimal, trades_float)):
+        for campo in CAMPOS_EXATOS:
+            if str(trade_d.get(campo)) != str(trade_f.get(campo)):
+                return {
+                    'equivalentes': False,
+                    'primeira_divergencia': {
+                        'indice': indice, 'campo': campo,
+                        'decimal': trade_d.get(campo), 'float': trade_f.get(campo),
+                    },
+                    'maior_diferenca_relativa': maior_diferenca,
+                }
+
+        for campo in CAMPOS_TOLERANCIA:
+            valor_d, valor_f = trade_d.get(campo, 0.0), trade_f.get(campo, 0.0)
+            maior_diferenca = max(maior_diferenca, _diferenca_relativa(valor_d, valor_f))
+            if not _dentro_da_tolerancia(valor_d, valor_f, tolerancia, tolerancia_absoluta):
+                return {
+                    'equivalentes': False,
+                    'primeira_divergencia': {
+                        'indice': indice, 'campo': campo,
+                        'decimal': trade_d.get(campo), 'float': trade_f.get(campo),
+                    },
+                    'maior_diferenca_relativa': maior_diferenca,
+                }
+
+    if len(trades_decimal) != len(trades_float):
+        indice = min(len(trades_decimal), len(trades_float))
+        return {
+            'equivalentes': False,
+            'primeira_divergencia': {
+                'indice': indice, 'campo': 'total_trades',
+                'decimal': len(trades_decimal), 'float': len(trades_float),
+            },
+            'maior_diferenca_relativa': maior_diferenca,
+        }
+
+    return {'equivalentes': True, 'primeira_divergencia': None, 'maior_diferenca_relativa': maior_diferenca}
+
+
+def _executar_no_modo(
+    config: Dict[str, Any],
+    api: SimulatedExchangeAPI,
+    estrategias: List[str],
+    modo: str
+) -> Dict[str, Any]:
+    """Roda uma simulação com MODO_NUMERICO=modo e mede a duração."""
+    return _executar_com(config, api, estrategias, MODO_NUMERICO=modo)
+
+
+def _executar_com(
+    config: Dict[str, Any],
+    api: SimulatedExchangeAPI,
+    estrategias: List[str],
+    **chaves: Any
+) -> Dict[str, Any]:
+    """Roda uma simulação com as chaves de config sobrescritas e mede a duração."""
+    config_modo = copy.deepcopy(config)
+    config_modo.update(chaves)
+    inicio = time.time()
+    resultados = executar_simulacao(config_modo, api, estrategias)
+    return {
+        'resultados': resultados,
+        'metricas': calcular_metricas(resultados, float(api.saldo_inicial)),
+        'duracao_s': time.time() - inicio,
+    }
+
+
+def comparar_modos_numericos(
+    config: Dict[str, Any],
+    caminho_csv: str,
+    saldo_inicial: float,
+    taxa_pct: float,
+    timeframe_base: str,
+    estrategias: List[str],
+    tolerancia: float = TOLERANCIA_PADRAO,
+    api_base: Optional[SimulatedExchangeAPI] = None,
+    tolerancia_absoluta: float = TOLERANCIA_ABSOLUTA_PADRAO
+) -> Dict[str, Any]:
+    """
+    Executa a config nos modos decimal e float e relata as divergências.
+
+    Args:
+        config: Configuração do bot (não é modificada)
+        caminho_csv: CSV histórico
+        saldo_inicial: Saldo inicial em USDT
+        taxa_pct: Taxa da exchange em %
+        timeframe_base: Timeframe do CSV
+        estrategias: Estratégias a simular
+        tolerancia: Diferença relativa aceita em quantidades, taxas e saldos
+        api_base: API já carregada (opcional; evita reler o CSV)
+        tolerancia_absoluta: Diferença absoluta sempre aceita (ex: saldo zerado
+            que termina como poeira de arredondamento)
+
+    Returns:
+        Dict com equivalentes, trades (saída de comparar_trades), saldos
+        {campo: (decimal, float, diferenca_relativa)}, saldos_ok {campo: bool},
+        metricas {metrica: (decimal, float)}, duracao_s {modo: segundos},
+        tolerancia e tolerancia_absoluta
+    """
+    if api_base is None:
+        api_base = SimulatedExchangeAPI(caminho_csv, saldo_inicial, taxa_pct, timeframe_base)
+
+    execucoes = {
+        MODO_DECIMAL: _executar_no_modo(config, api_base.clonar(), estrategias, MODO_DECIMAL),
+        MODO_FLOAT: _executar_no_modo(config, api_base.clonar(), estrategias, MODO_FLOAT),
+    }
+    exato, rapido = execucoes[MODO_DECIMAL], execucoes[MODO_FLOAT]
+
+    comparacao_trades = comparar_trades(
+        exato['resultados']['trades'], rapido['resultados']['trades'], tolerancia, tolerancia_absoluta
+    )
+
+    saldos, saldos_ok = {}, {}
+    for campo in ('saldo_final_usdt', 'saldo_final_ativo'):
+        valor_d = exato['resultados'][campo]
+        valor_f = rapido['resultados'][campo]
+        saldos[campo] = (valor_d, valor_f, _diferenca_relativa(valor_d, valor_f))
+        saldos_ok[campo] = _dentro_da_tolerancia(valor_d, valor_f, tolerancia, tolerancia_absoluta)
+
+    metricas = {chave: (exato['metricas'][chave], rapido['metricas'][chave]) for chave in exato['metricas']}
+
+    return {
+        'equivalentes': comparacao_trades['equivalentes'] and all(saldos_ok.values()),
+        'trades': comparacao_trades,
+        'saldos': saldos,
+        'saldos_ok': saldos_ok,
+        'metricas': metricas,
+        'duracao_s': {modo: execucao['duracao_s'] for modo, execucao in execucoes.items()},
+        'tolerancia': tolerancia,
+        'tolerancia_absoluta': tolerancia_absoluta,
+    }
+
+
+def comparar_snapshots(historico_a, historico_b) -> Optional[Dict[str, Any]]:
+    """
+    Primeira barra em que duas curvas de portfólio diferem.
+
+    Args:
+        historico_a: portfolio_over_time de uma simulação
+        historico_b: portfolio_over_time da outra
+
+    Returns:
+        None se idênticas; senão {'indice', 'a', 'b'} com os snapshots (ou o
+        total de snapshots, quando os tamanhos diferem)
+    """
+    total = min(len(historico_a), len(historico_b))
+    curva_a = np.asarray(historico_a.valores_totais() if hasattr(historico_a, 'valores_totais')
+                         else [s['total_value_quote'] for s in historico_a], dtype=np.float64)
+    curva_b = np.asarray(historico_b.valores_totais() if hasattr(historico_b, 'valores_totais')
+                         else [s['total_value_quote'] for s in historico_b], dtype=np.float64)
+
+    diferentes = np.flatnonzero(curva_a[:total] != curva_b[:total])
+    if diferentes.size:
+        indice = int(diferentes[0])
+        return {'indice': indice, 'a': historico_a[indice], 'b': historico_b[indice]}
+    if len(historico_a) != len(historico_b):
+        return {'indice': total, 'a': len(historico_a), 'b': len(historico_b)}
+    return None
+
+
+def comparar_salto_de_barras(
+    config: Dict[str, Any],
+    caminho_csv: str,
+    saldo_inicial: float,
+    taxa_pct: float,
+    timeframe_base: str,
+    estrategias: List[str],
+    api_base: Optional[SimulatedExchangeAPI] = None
+) -> Dict[str, Any]:
+    """
+    Executa a config com e sem SALTAR_BARRAS_OCIOSAS e compara trades e
+    snapshots (sem tolerância: o salto não pode mudar nada).
+
+    Args:
+        config: Configuração do bot (não é modificada)
+        caminho_csv: CSV histórico
+        saldo_inicial: Saldo inicial em USDT
+        taxa_pct: Taxa da exchange em %
+        timeframe_base: Timeframe do CSV
+        estrategias: Estratégias a simular
+        api_base: API já carregada (opcional; evita reler o CSV)
+
+    Returns:
+        Dict com equivalentes, trades (saída de comparar_trades), snapshots
+        (saída de comparar_snapshots), barras_saltadas, total_barras e
+        duracao_s {'barra_a_barra', 'com_salto'}
+    """
+    if api_base is None:
+        api_base = SimulatedExchangeAPI(caminho_csv, saldo_inicial, taxa_pct, timeframe_base)
+
+    api_completa, api_salto = api_base.clonar(), api_base.clonar()
+    completa = _executar_com(config, api_completa, estrategias, SALTAR_BARRAS_OCIOSAS=False)
+    com_salto = _executar_com(config, api_salto, estrategias, SALTAR_BARRAS_OCIOSAS=True)
+
+    comparacao_trades = comparar_trades(
+        completa['resultados']['trades'], com_salto['resultados']['trades'],
+        tolerancia=0.0, tolerancia_absoluta=0.0
+    )
+    divergencia_snapshots = comparar_snapshots(
+        completa['resultados']['portfolio_over_time'], com_salto['resultados']['portfolio_over_time']
+    )
+
+    return {
+        'equivalentes': comparacao_trades['equivalentes'] and divergencia_snapshots is None,
+        'trades': comparacao_trades,
+        'snapshots': divergencia_snapshots,
+        'total_trades': len(com_salto['resultados']['trades']),
+        'barras_saltadas': api_salto.barras_sem_eventos,
+        'total_barras': len(com_salto['resultados']['portfolio_over_time']),
+        'duracao_s': {'barra_a_barra': completa['duracao_s'], 'com_salto': com_salto['duracao_s']},
+    }
+
+
+def imprimir_relatorio_salto(relatorio: Dict[str, Any]) -> None:
+    """
+    Imprime o resultado de comparar_salto_de_barras.
+
+    Args:
+        relatorio: Saída de comparar_salto_de_barras
+    """
+    print("\n" + "="*80)
+    print("⏩ EQUIVALÊNCIA DO SALTO DE BARRAS: BARRA A BARRA x COM SALTO")
+    print("="*80)
+
+    duracao = relatorio['duracao_s']
+    aceleracao = duracao['barra_a_barra'] / duracao['com_salto'] if duracao['com_salto'] else 0.0
+    print(f"   Duração: barra a barra {duracao['barra_a_barra']:.2f}s | com salto {duracao['com_salto']:.2f}s "
+          f"({aceleracao:.2f}x)")
+
+    total_barras = relatorio['total_barras']
+    percentual = relatorio['barras_saltadas'] / total_barras * 100 if total_barras else 0.0
+    print(f"   Barras puladas: {relatorio['barras_saltadas']} de {total_barras} ({percentual:.1f}%)")
+    print(f"   Trades: {relatorio['total_trades']}")
+
+    divergencia = relatorio['trades']['primeira_divergencia']
+    if divergencia:
+        print(f"   ❌ Primeira divergência no trade #{divergencia['indice']} ({divergencia['campo']}): "
+              f"barra a barra={divergencia['decimal']} | com salto={divergencia['float']}")
+
+    snapshots = relatorio['snapshots']
+    if snapshots:
+        print(f"   ❌ Primeiro snapshot diferente (#{snapshots['indice']}): "
+              f"barra a barra={snapshots['a']} | com salto={snapshots['b']}")
+
+    print("\n" + "─"*80)
+    if relatorio['equivalentes']:
+        print("   ✅ Trades e snapshots idênticos: o salto de barras pode ser usado neste backtest")
+    else:
+        print("   ⚠️ Salto de barras diverge: use SALTAR_BARRAS_OCIOSAS=false para esta configuração")
+    print("="*80)
+
+
+def imprimir_relatorio_equivalencia(relatorio: Dict[str, Any]) -> None:
+    """
+    Imprime o resultado de comparar_modos_numericos.
+
+    Args:
+        relatorio: Saída de comparar_modos_numericos
+    """
+    print("\n" + "="*80)
+    print("⚖️  EQUIVALÊNCIA NUMÉRICA: DECIMAL x FLOAT")
+    print("="*80)
+
+    duracao = relatorio['duracao_s']
+    aceleracao = duracao[MODO_DECIMAL] / duracao[MODO_FLOAT] if duracao[MODO_FLOAT] else 0.0
+    print(f"   Duração: decimal {duracao[MODO_DECIMAL]:.2f}s | float {duracao[MODO_FLOAT]:.2f}s "
+          f"({aceleracao:.2f}x)")
+
+    trades = relatorio['trades']
+    total_d, total_f = relatorio['metricas']['total_trades']
+    print(f"   Trades: decimal {total_d} | float {total_f}")
+    print(f"   Maior diferença relativa em quantidades: {trades['maior_diferenca_relativa']:.2e} "
+          f"(tolerância {relatorio['tolerancia']:.0e}, piso absoluto {relatorio['tolerancia_absoluta']:.0e})")
+
+    divergencia = trades['primeira_divergencia']
+    if divergencia:
+        print(f"   ❌ Primeira divergência no trade #{divergencia['indice']} ({divergencia['campo']}): "
+              f"decimal={divergencia['decimal']} | float={divergencia['float']}")
+
+    print("\n   Saldos finais:")
+    for campo, (valor_d, valor_f, diferenca) in relatorio['saldos'].items():
+        marcador = '✅' if relatorio['saldos_ok'][campo] else '❌'
+        print(f"   {marcador} {campo}: decimal {valor_d:.8f} | float {valor_f:.8f} (Δ rel {diferenca:.2e})")
+
+    print("\n   Métricas:")
+    for chave, (valor_d, valor_f) in relatorio['metricas'].items():
+        print(f"      {chave}: decimal {valor_d} | float {valor_f}")
+
+    print("\n" + "─"*80)
+    if relatorio['equivalentes']:
+        print("   ✅ Modos equivalentes: o modo float pode ser usado neste backtest")
+    else:
+        print("   ⚠️ Modos divergem: use MODO_NUMERICO='decimal' para esta configuração")
+    print("="*80)
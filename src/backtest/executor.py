@@ -0,0 +1,167 @@
+"""
+Executor de Backtest - Roda uma simulação completa e resume o resultado.
+
+Reúne o que o backtest.py fazia inline (config temporária de banco/estado,
+flags de estratégia, BotWorker em modo simulação) para que o sweep de
+parâmetros, o walk-forward e o lote usem exatamente o mesmo caminho.
+"""
+
+import copy
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.backtest.analise_resultados import calcular_drawdown_maximo, calcular_tempo_submerso
+from src.core.bot_worker import BotWorker
+from src.exchange.simulated_api import SimulatedExchangeAPI
+from src.utils.logger import get_loggers
+
+
+# Erro reportado por lote, Monte Carlo e sweep quando o loop parou antes da
+# última barra (o BotWorker captura a exceção e devolve o resultado parcial)
+ERRO_SIMULACAO_INCOMPLETA = 'Simulação incompleta: o loop parou antes da última barra'
+
+
+def normalizar_estrategias(estrategias: List[str]) -> Dict[str, bool]:
+    """
+    Converte a seleção de estratégias ('dca', 'giro_rapido', 'ambas') em flags.
+
+    Returns:
+        {'dca': bool, 'giro_rapido': bool}
+    """
+    return {
+        'dca': 'dca' in estrategias or 'ambas' in estrategias,
+        'giro_rapido': 'giro_rapido' in estrategias or 'ambas' in estrategias,
+    }
+
+
+def preparar_config_simulacao(config: Dict[str, Any], estrategias: List[str], dir_temp: Path) -> Dict[str, Any]:
+    """
+    Ajusta a configuração para rodar em backtest.
+
+    - Banco, backups e estado em arquivos temporários (isolados por execução)
+    - ESTRATEGIA_ATIVA e ESTRATEGIAS[...]['habilitado'] coerentes com a seleção
+    - Sem checkpoints nem retomada (execuções paralelas gravariam no mesmo diretório)
+
+    Args:
+        config: Configuração do bot (é modificada e retornada)
+        estrategias: Estratégias selecionadas ('dca', 'giro_rapido' ou 'ambas')
+        dir_temp: Diretório temporário exclusivo desta execução
+
+    Returns:
+        A própria config, já ajustada
+    """
+    dir_temp = Path(dir_temp)
+    config['DATABASE_PATH'] = str(dir_temp / 'backtest.db')
+    config['BACKUP_DIR'] = str(dir_temp / 'backtest_backup')
+    config['STATE_FILE_PATH'] = str(dir_temp / 'backtest_state.json')
+    config['CHECKPOINT_DIRETORIO'] = None
+    config['CHECKPOINT_RETOMAR'] = None
+
+    flags = normalizar_estrategias(estrategias)
+    if flags['dca'] and flags['giro_rapido']:
+        config['ESTRATEGIA_ATIVA'] = 'ambas'
+    elif flags['dca']:
+        config['ESTRATEGIA_ATIVA'] = 'dca'
+    elif flags['giro_rapido']:
+        config['ESTRATEGIA_ATIVA'] = 'giro'
+    else:
+        config['ESTRATEGIA_ATIVA'] = 'nenhuma'  # Fallback de segurança
+
+    config.setdefault('ESTRATEGIAS', {})
+    config['ESTRATEGIAS'].setdefault('dca', {})
+    config['ESTRATEGIAS'].setdefault('giro_rapido', {})
+    config['ESTRATEGIAS']['dca']['habilitado'] = flags['dca']
+    config['ESTRATEGIAS']['giro_rapido']['habilitado'] = flags['giro_rapido']
+
+    return config
+
+
+def silenciar_logs_simulacao(nivel: int = logging.WARNING) -> None:
+    """
+    Reduz o volume de logs do bot (ex: em processos do sweep, onde dezenas
+    de simulações simultâneas inundariam o terminal).
+    """
+    logger_principal, logger_painel = get_loggers()
+    logger_principal.logger.setLevel(nivel)
+    logger_painel.setLevel(nivel)
+
+
+def executar_simulacao(
+    config: Dict[str, Any],
+    exchange_api: SimulatedExchangeAPI,
+    estrategias: List[str],
+    callback_progresso: Optional[Callable[[int], None]] = None
+) -> Dict[str, Any]:
+    """
+    Executa um backtest completo com o BotWorker em modo simulação.
+
+    Args:
+        config: Configuração do bot (não é modificada; uma cópia é usada)
+        exchange_api: API simulada já posicionada no início da simulação
+        estrategias: Estratégias selecionadas
+        callback_progresso: Chamado com o % concluído a cada ponto percentual (opcional)
+
+    Returns:
+        Resultados de exchange_api.get_resultados(), mais 'simulacao_completa'
+        (False se o loop parou antes da última barra: Ctrl+C ou erro)
+    """
+    config_execucao = copy.deepcopy(config)
+    dir_temp = Path(tempfile.mkdtemp(prefix='backtest_'))
+    try:
+        preparar_config_simulacao(config_execucao, estrategias, dir_temp)
+        bot_worker = BotWorker(
+            config=config_execucao,
+            exchange_api=exchange_api,
+            telegram_notifier=None,
+            notifier=None,
+            modo_simulacao=True
+        )
+        bot_worker.callback_progresso = callback_progresso
+        bot_worker.run()
+        resultados = exchange_api.get_resultados()
+        resultados['simulacao_completa'] = bot_worker.simulacao_completa
+        return resultados
+    finally:
+        shutil.rmtree(dir_temp, ignore_errors=True)
+
+
+def calcular_metricas(resultados: Dict[str, Any], saldo_inicial: float) -> Dict[str, Any]:
+    """
+    Resume uma simulação nas métricas usadas para ranquear configurações.
+
+    Args:
+        resultados: Saída de SimulatedExchangeAPI.get_resultados()
+        saldo_inicial: Saldo inicial em USDT
+
+    Returns:
+        Dict com retorno_pct, drawdown_max_pct, total_trades, compras, vendas,
+        taxas_usdt e valor_final
+    """
+    trades = resultados.get('trades', [])
+    historico = resultados.get('portfolio_over_time', [])
+
+    if hasattr(historico, 'valores_totais'):
+        curva = historico.valores_totais()
+    else:
+        curva = np.fromiter((s['total_value_quote'] for s in historico), dtype=np.float64, count=len(historico))
+    if len(curva):
+        valor_final = float(curva[-1])
+    else:
+        valor_final = float(resultados.get('saldo_final_usdt', saldo_inicial))
+
+    compras = sum(1 for t in trades if t['side'] == 'BUY')
+
+    return {
+        'retorno_pct': (valor_final - saldo_inicial) / saldo_inicial * 100 if saldo_inicial else 0.0,
+        'drawdown_max_pct': calcular_drawdown_maximo(curva),
+        'total_trades': len(trades),
+        'compras': compras,
+        'vendas': len(trades) - compras,
+        'taxas_usdt': float(sum(t.get('fee', 0.0) for t in trades)),
+        'valor_final': valor_final,
+    }
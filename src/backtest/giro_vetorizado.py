@@ -0,0 +1,472 @@
+"""
+Giro Rápido Vetorizado - Triagem rápida de parâmetros do giro rápido.
+
+Reproduz, sobre os arrays NumPy da SimulatedExchangeAPI, a lógica que o
+BotWorker aplica à carteira giro_rapido quando ESTRATEGIA_ATIVA='giro':
+
+- Entrada: RSI (rsi_timeframe_entrada, 14 períodos) < rsi_limite_compra,
+  respeitando cooldown_compra_segundos e a reserva da GestaoCapital
+- Stop Loss inicial em stop_loss_inicial_pct abaixo do preço médio
+- Promoção SL → TSL quando o lucro atinge tsl_gatilho_lucro_pct
+- Trailing Stop a trailing_stop_distancia_pct do pico
+
+A série de RSI é calculada uma vez (mesma semeadura e mesmo candle em
+formação do RSIIncremental) e as entradas candidatas são encontradas por máscara; o laço
+Python só visita barras de entrada e de saída, não todas as barras. Os trades
+têm o mesmo formato de SimulatedExchangeAPI.trades_executados.
+
+Uso típico: triar milhares de combinações com o motor vetorizado e confirmar
+só as finalistas com o BotWorker completo (ver triar_grade_giro e
+backtest.py --sweep GRADE --triagem-giro N).
+"""
+
+import copy
+import time
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+import talib
+
+from src.backtest.executor import calcular_drawdown_maximo
+from src.backtest.sweep import aplicar_parametros, avaliar_combinacao, expandir_grade, ordenar_resultados
+from src.core.rsi_incremental import medias_wilder, rsi_com_formando
+from src.core.salto_barras import BLOCO_BUSCA_INICIAL, primeira_barra
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+# Constantes fixas da StrategySwingTrade / AnaliseTecnica.get_rsi
+PERIODO_RSI = 14
+LIMITE_CANDLES_RSI = 100
+
+# Máximo de séries de RSI (timeframe, semente) mantidas em cache
+MAX_SERIES_RSI_CACHE = 32
+
+
+class ParametrosGiro(NamedTuple):
+    """Parâmetros do giro rápido lidos da config (mesmos padrões do BotWorker)."""
+    alocacao_capital_pct: float
+    usar_filtro_rsi_entrada: bool
+    rsi_timeframe_entrada: str
+    rsi_limite_compra: float
+    stop_loss_inicial_pct: float
+    trailing_stop_distancia_pct: float
+    tsl_gatilho_lucro_pct: float
+    cooldown_segundos: float
+    percentual_reserva: float
+    valor_minimo_ordem: float
+    par: str
+
+
+def ler_parametros_giro(config: Dict[str, Any]) -> ParametrosGiro:
+    """
+    Extrai os parâmetros do giro rápido de uma config do bot.
+
+    Args:
+        config: Configuração completa do bot
+
+    Returns:
+        ParametrosGiro
+    """
+    giro = config.get('estrategia_giro_rapido', {})
+
+    # Mesma normalização da StrategySwingTrade (ex: "30Mh" → "30m")
+    timeframe = (giro.get('rsi_timeframe_entrada', '15m') or '15m').lower()
+    if timeframe.endswith('mh'):
+        timeframe = timeframe[:-1]
+
+    alocacao = giro.get('alocacao_capital_pct')
+    return ParametrosGiro(
+        alocacao_capital_pct=float(20 if alocacao is None else alocacao),
+        usar_filtro_rsi_entrada=bool(giro.get('usar_filtro_rsi_entrada', True)),
+        rsi_timeframe_entrada=timeframe,
+        rsi_limite_compra=float(giro.get('rsi_limite_compra', 30)),
+        stop_loss_inicial_pct=float(giro.get('stop_loss_inicial_pct', 2.5)),
+        trailing_stop_distancia_pct=float(giro.get('trailing_stop_distancia_pct', 0.8)),
+        tsl_gatilho_lucro_pct=float(giro.get('tsl_gatilho_lucro_pct', 0)),
+        cooldown_segundos=float(giro.get('cooldown_compra_segundos', 60)),
+        percentual_reserva=float(config.get('PERCENTUAL_RESERVA', 8)),
+        valor_minimo_ordem=float(config.get('VALOR_MINIMO_ORDEM', 5.0)),
+        par=config.get('par', 'ADA/USDT'),
+    )
+
+
+class MotorGiroVetorizado:
+    """
+    Simulação vetorizada do giro rápido sobre uma SimulatedExchangeAPI.
+
+    Os arrays de preço e as séries de RSI são calculados uma vez e
+    reaproveitados por todas as combinações simuladas com o mesmo motor. A
+    API não é consumida (o cursor e a conta dela não mudam).
+
+    Exemplo:
+        motor = MotorGiroVetorizado(api)
+        resultados = motor.simular(config)
+        metricas = motor.calcular_metricas(resultados)
+    """
+
+    def __init__(self, api: SimulatedExchangeAPI):
+        """
+        Args:
+            api: API simulada posicionada no início da simulação (ex: recém
+                criada, clonada ou fatiada)
+        """
+        self.api = api
+        self.inicio = int(api.indice_atual)
+        self.timestamps_ms = np.asarray(api.store_base.timestamps, dtype=np.int64)
+        self.closes = np.ascontiguousarray(api.store_base.close, dtype=np.float64)
+        self.total_barras = len(self.closes)
+        self.saldo_inicial = float(api.saldo_inicial)
+        self.taxa = float(api.taxa_pct) / 100
+
+        # Candle do timeframe do RSI em formação em cada barra base
+        self._candles_por_barra: Dict[str, np.ndarray] = {}
+        # RSI por barra base para cada (timeframe, candle semente)
+        self._rsi_por_barra: Dict[tuple, np.ndarray] = {}
+
+    # ═══════════════════════════════════════════════════════════════════
+    # RSI
+    # ═══════════════════════════════════════════════════════════════════
+
+    def _candles(self, timeframe: str) -> np.ndarray:
+        """Índice do candle visível (o último, em formação) em cada barra base."""
+        candles = self._candles_por_barra.get(timeframe)
+        if candles is None:
+            store = self.api.obter_kline_store(timeframe)
+            candles = np.searchsorted(store.timestamps, self.timestamps_ms, side='right') - 1
+            self._candles_por_barra[timeframe] = candles
+        return candles
+
+    def _serie_rsi(self, timeframe: str, semente: int) -> np.ndarray:
+        """
+        RSI em cada barra base com a suavização de Wilder iniciada no candle
+        'semente', exatamente como o RSIIncremental semeado por uma janela
+        que começa nesse candle (NaN = dados insuficientes). O candle em
+        formação entra com o fechamento da própria barra base, como em
+        SimulatedExchangeAPI.obter_klines_array.
+        """
+        chave = (timeframe, semente)
+        serie = self._rsi_por_barra.get(chave)
+        if serie is not None:
+            return serie
+
+        closes_tf = np.ascontiguousarray(self.api.obter_kline_store(timeframe).close[semente:], dtype=np.float64)
+        candles = self._candles(timeframe) - semente
+
+        serie = np.full(self.total_barras, np.nan)
+        if len(closes_tf) > PERIODO_RSI:
+            # Motor semeado: estado de Wilder dos candles fechados + candle em formação
+            medias_ganho, medias_perda = medias_wilder(closes_tf, PERIODO_RSI)
+            semeadas = candles > PERIODO_RSI
+            anteriores = candles[semeadas] - 1
+            serie[semeadas] = rsi_com_formando(
+                medias_ganho[anteriores], medias_perda[anteriores], closes_tf[anteriores],
+                self.closes[semeadas], PERIODO_RSI
+            )
+            # Janela com PERIODO_RSI candles fechados: get_rsi usa o TA-Lib direto na janela
+            for barra in np.flatnonzero(candles == PERIODO_RSI).tolist():
+                janela = np.append(closes_tf[:PERIODO_RSI], self.closes[barra])
+                serie[barra] = talib.RSI(janela, timeperiod=PERIODO_RSI)[-1]
+
+        if len(self._rsi_por_barra) >= MAX_SERIES_RSI_CACHE:
+            self._rsi_por_barra.clear()
+        self._rsi_por_barra[chave] = serie
+        return serie
+
+    # ═══════════════════════════════════════════════════════════════════
+    # SIMULAÇÃO
+    # ═══════════════════════════════════════════════════════════════════
+
+    def _saldos_iniciais(self, alocacao_pct: float):
+        """Saldos USDT (giro, acumulação) como em SimulatedExchangeAPI.reconfigurar_alocacao_inicial."""
+        total = Decimal(str(self.saldo_inicial))
+        saldo_giro = (total * (Decimal(str(alocacao_pct)) / Decimal('100'))).quantize(Decimal('0.00000001'))
+        saldo_acum = (total - saldo_giro).quantize(Decimal('0.00000001'))
+        return float(saldo_giro), float(saldo_acum)
+
+    def _timestamp(self, barra: int) -> pd.Timestamp:
+        return pd.Timestamp(int(self.timestamps_ms[barra]), unit='ms')
+
+    def simular(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Simula o giro rápido com os parâmetros de uma config.
+
+        Args:
+            config: Configuração do bot (apenas lida)
+
+        Returns:
+            Dict no formato de SimulatedExchangeAPI.get_resultados(), com
+            'curva' (patrimônio por snapshot, np.ndarray) no lugar de
+            'portfolio_over_time'
+        """
+        p = ler_parametros_giro(config)
+        closes = self.closes
+        timestamps_ms = self.timestamps_ms
+        fim = self.total_barras
+
+        saldo_giro, saldo_acum = self._saldos_iniciais(p.alocacao_capital_pct)
+        # GestaoCapital.saldo_usdt: só é sincronizado após compras
+        saldo_gestao = saldo_giro + saldo_acum
+        reserva_pct = p.percentual_reserva / 100
+        fator_sl = 1 - p.stop_loss_inicial_pct / 100
+        fator_tsl = 1 - p.trailing_stop_distancia_pct / 100
+        cooldown_ms = p.cooldown_segundos * 1000
+
+        trades: List[Dict[str, Any]] = []
+        # Saldos após cada barra com trade: (barra, usdt total, ativo)
+        mudancas = [(self.inicio - 1, saldo_giro + saldo_acum, 0.0)]
+
+        candles = self._candles(p.rsi_timeframe_entrada) if p.usar_filtro_rsi_entrada else None
+        semente: Optional[int] = None
+        candle_ultima_consulta: Optional[int] = None
+
+        barra = self.inicio
+        proxima_compra_ms = None
+        while p.usar_filtro_rsi_entrada and barra < fim:
+            # ─── Entrada: primeira barra fora do cooldown com RSI < limite ───
+            if proxima_compra_ms is not None:
+                barra = max(barra, int(np.searchsorted(timestamps_ms, proxima_compra_ms, side='left')))
+                if barra >= fim:
+                    break
+
+            # Primeira consulta ao RSI após uma pausa: o RSIIncremental é
+            # semeado de novo se a janela de 100 candles não alcança o estado
+            candle = int(candles[barra])
+            janela_inicio = max(0, candle + 1 - LIMITE_CANDLES_RSI)
+            if semente is None or janela_inicio > candle_ultima_consulta - 1:
+                semente = janela_inicio
+            rsi = self._serie_rsi(p.rsi_timeframe_entrada, semente)
+
+            limite = p.rsi_limite_compra
+            entrada = primeira_barra(lambda a, b: rsi[a:b] < limite, barra, fim)
+            if entrada < 0:
+                break
+            candle_ultima_consulta = int(candles[entrada])
+
+            # Capital (GestaoCapital em simulação); sem trades o bloqueio não muda
+            reserva = reserva_pct * saldo_gestao
+            capital = max(saldo_giro - reserva, 0.0)
+            if capital <= 0 or capital < p.valor_minimo_ordem:
+                break
+            saldo_apos = saldo_gestao - capital
+            if saldo_apos < reserva or saldo_apos < 5.0:
+                break
+
+            preco = float(closes[entrada])
+            taxa_compra = capital * self.taxa
+            quantidade = (capital - taxa_compra) / preco
+            saldo_giro -= capital
+            saldo_gestao = saldo_giro + saldo_acum
+            preco_medio = capital / quantidade
+            trades.append({
+                'id': str(uuid.uuid4()),
+                'par': p.par,
+                'side': 'BUY',
+                'carteira': 'giro_rapido',
+                'preco': preco,
+                'quantidade_usdt': capital,
+                'quantidade_ativo': quantidade,
+                'fee': taxa_compra,
+                'timestamp': self._timestamp(entrada),
+                'motivo': 'COMPRA',
+            })
+            mudancas.append((entrada, saldo_giro + saldo_acum, quantidade))
+            proxima_compra_ms = int(timestamps_ms[entrada]) + cooldown_ms
+
+            # ─── Stop Loss inicial ou promoção para TSL ───
+            nivel_sl = preco_medio * fator_sl
+            gatilho = p.tsl_gatilho_lucro_pct
+
+            def sl_ou_promocao(a, b):
+                bloco = closes[a:b]
+                return (bloco <= nivel_sl) | (((bloco - preco_medio) / preco_medio) * 100 >= gatilho)
+
+            saida = primeira_barra(sl_ou_promocao, entrada + 1, fim)
+            if saida < 0:
+                break
+
+            motivo = 'SL'
+            if closes[saida] > nivel_sl:
+                # Promovido: TSL a partir da barra seguinte
+                pico = float(closes[saida])
+                barra_tsl = saida + 1
+                saida = -1
+                passo = BLOCO_BUSCA_INICIAL
+                while barra_tsl < fim:
+                    bloco = closes[barra_tsl:barra_tsl + passo]
+                    picos = np.maximum(np.maximum.accumulate(bloco), pico)
+                    achados = np.flatnonzero(bloco <= picos * fator_tsl)
+                    if achados.size:
+                        saida = barra_tsl + int(achados[0])
+                        break
+                    pico = float(picos[-1])
+                    barra_tsl += len(bloco)
+                    passo *= 4
+                if saida < 0:
+                    break
+                motivo = 'TSL'
+
+            # ─── Venda total da posição ───
+            preco = float(closes[saida])
+            receita_bruta = quantidade * preco
+            taxa_venda = receita_bruta * self.taxa
+            receita = receita_bruta - taxa_venda
+            saldo_giro += receita
+            trades.append({
+                'id': str(uuid.uuid4()),
+                'par': p.par,
+                'side': 'SELL',
+                'carteira': 'giro_rapido',
+                'preco': preco,
+                'quantidade_ativo': quantidade,
+                'receita_usdt': receita,
+                'fee': taxa_venda,
+                'timestamp': self._timestamp(saida),
+                'motivo': motivo,
+            })
+            mudancas.append((saida, saldo_giro + saldo_acum, 0.0))
+
+            # Mesmo ciclo: após a venda o BotWorker já verifica nova entrada
+            barra = saida
+
+        ativo_final = mudancas[-1][2]
+        return {
+            'trades': trades,
+            'saldo_final_usdt': saldo_giro + saldo_acum,
+            'saldo_final_ativo': ativo_final,
+            'curva': self._curva_patrimonio(mudancas),
+        }
+
+    def _curva_patrimonio(self, mudancas: List[tuple]) -> np.ndarray:
+        """
+        Patrimônio nos snapshots do BotWorker: um antes da primeira barra e
+        um após cada barra.
+        """
+        barras_mudanca = np.fromiter((m[0] for m in mudancas), dtype=np.int64, count=len(mudancas))
+        usdt = np.fromiter((m[1] for m in mudancas), dtype=np.float64, count=len(mudancas))
+        ativo = np.fromiter((m[2] for m in mudancas), dtype=np.float64, count=len(mudancas))
+
+        barras = np.arange(self.inicio, self.total_barras)
+        vigente = np.searchsorted(barras_mudanca, barras, side='right') - 1
+        curva = usdt[vigente] + ativo[vigente] * self.closes[barras]
+        return np.concatenate(([usdt[0]], curva))
+
+    def calcular_metricas(self, resultados: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Mesmas métricas de executor.calcular_metricas, a partir da curva vetorizada.
+
+        Args:
+            resultados: Saída de simular()
+
+        Returns:
+            Dict com retorno_pct, drawdown_max_pct, total_trades, compras,
+            vendas, taxas_usdt e valor_final
+        """
+        trades = resultados['trades']
+        curva = resultados['curva']
+        valor_final = float(curva[-1]) if len(curva) else float(resultados['saldo_final_usdt'])
+        compras = sum(1 for t in trades if t['side'] == 'BUY')
+
+        return {
+            'retorno_pct': (valor_final - self.saldo_inicial) / self.saldo_inicial * 100 if self.saldo_inicial else 0.0,
+            'drawdown_max_pct': calcular_drawdown_maximo(curva),
+            'total_trades': len(trades),
+            'compras': compras,
+            'vendas': len(trades) - compras,
+            'taxas_usdt': float(sum(t['fee'] for t in trades)),
+            'valor_final': valor_final,
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TRIAGEM + CONFIRMAÇÃO
+# ═══════════════════════════════════════════════════════════════════════════
+
+def triar_grade_giro(
+    api: SimulatedExchangeAPI,
+    config_base: Dict[str, Any],
+    grade: Dict[str, List[Any]],
+    ordenar_por: str = 'retorno_pct'
+) -> List[Dict[str, Any]]:
+    """
+    Avalia todas as combinações da grade com o motor vetorizado.
+
+    Args:
+        api: API simulada com os dados (não é consumida)
+        config_base: Configuração de partida (não é modificada)
+        grade: Grade de parâmetros (formato do sweep)
+        ordenar_por: Métrica do ranking
+
+    Returns:
+        Resultados no formato do sweep ({'indice', 'parametros', 'metricas',
+        'erro', 'duracao_s'}), ordenados (melhor primeiro)
+    """
+    motor = MotorGiroVetorizado(api)
+    combinacoes = expandir_grade(grade)
+
+    print(f"⚡ Triagem vetorizada do giro rápido: {len(combinacoes)} combinações")
+    inicio_total = time.time()
+
+    resultados = []
+    for indice, parametros in enumerate(combinacoes):
+        inicio = time.time()
+        try:
+            config = aplicar_parametros(copy.deepcopy(config_base), parametros)
+            metricas = motor.calcular_metricas(motor.simular(config))
+            erro = None
+        except Exception as e:
+            metricas = {}
+            erro = f"{type(e).__name__}: {e}"
+        resultados.append({
+            'indice': indice,
+            'parametros': parametros,
+            'metricas': metricas,
+            'erro': erro,
+            'duracao_s': time.time() - inicio,
+        })
+
+    duracao = time.time() - inicio_total
+    taxa = len(combinacoes) / duracao * 60 if duracao > 0 else float('inf')
+    print(f"⏱️  Triagem concluída em {duracao:.1f}s ({taxa:.0f} combinações/min)")
+    return ordenar_resultados(resultados, ordenar_por)
+
+
+def confirmar_finalistas(
+    api: SimulatedExchangeAPI,
+    config_base: Dict[str, Any],
+    finalistas: List[Dict[str, Any]],
+    ordenar_por: str = 'retorno_pct'
+) -> List[Dict[str, Any]]:
+    """
+    Roda as finalistas da triagem no BotWorker completo (ESTRATEGIA_ATIVA='giro').
+
+    Args:
+        api: API simulada com os dados (cada execução usa um clone)
+        config_base: Configuração de partida
+        finalistas: Primeiros resultados de triar_grade_giro
+        ordenar_por: Métrica do ranking
+
+    Returns:
+        Resultados do BotWorker no formato do sweep, ordenados; cada um traz
+        também 'metricas_triagem' (as do motor vetorizado)
+    """
+    print(f"🤖 Confirmando {len(finalistas)} finalista(s) com o BotWorker completo")
+
+    resultados = []
+    for posicao, finalista in enumerate(finalistas, start=1):
+        resultado = avaliar_combinacao(
+            api.clonar(), config_base, finalista['parametros'], ['giro_rapido'], finalista['indice']
+        )
+        resultado['metricas_triagem'] = finalista['metricas']
+        if resultado['erro']:
+            print(f"   ❌ [{posicao}/{len(finalistas)}] #{resultado['indice']}: {resultado['erro']}")
+        else:
+            print(
+                f"   ✅ [{posicao}/{len(finalistas)}] #{resultado['indice']} "
+                f"retorno {resultado['metricas']['retorno_pct']:+.2f}% "
+                f"(triagem {finalista['metricas']['retorno_pct']:+.2f}%, {resultado['duracao_s']:.1f}s)"
+            )
+        resultados.append(resultado)
+
+    return ordenar_resultados(resultados, ordenar_por)
@@ -0,0 +1,357 @@
+"""
+Backtest em Lote - Vários bots (config, CSV, timeframe) em paralelo.
+
+Em produção cada instância opera um par numa exchange com o próprio capital
+(ex: configs/bot_ada_binance.json e configs/bot_xrp_kucoin.json). O lote roda
+um job por instância num ProcessPoolExecutor, acompanha o progresso de cada
+simulação enquanto elas rodam e reúne tudo numa tabela única e numa curva de
+patrimônio combinada: a soma das carteiras, como se os bots operassem lado a
+lado (antes do primeiro candle de um job conta o capital inicial dele; depois
+do último, o patrimônio final).
+
+Formato do arquivo de lote (JSON):
+    {
+        "saldo": 1000,
+        "taxa": 0.1,
+        "estrategias": "ambas",
+        "jobs": [
+            {"nome": "ADA", "config": "configs/bot_ada_binance.json",
+             "csv": "dados/historicos/BINANCE_ADAUSDT_1m.csv", "timeframe": "1m", "saldo": 180},
+            {"nome": "XRP", "config": "configs/bot_xrp_kucoin.json",
+             "csv": "dados/historicos/KUCOIN_XRPUSDT_5m.csv", "timeframe": "5m", "taxa": 0.08}
+        ]
+    }
+
+Chaves de nível superior (saldo, taxa, estrategias, timeframe) são padrões
+para os jobs; também é aceita só a lista de jobs. Sem saldo em lugar nenhum,
+vale o CAPITAL_INICIAL da config do job.
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import Manager
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.cache_resultados import LIMITE_PADRAO_MB, CacheResultados
+from src.backtest.executor import (
+    ERRO_SIMULACAO_INCOMPLETA,
+    calcular_drawdown_maximo,
+    calcular_metricas,
+    executar_simulacao,
+    silenciar_logs_simulacao,
+)
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+
+# Passo (em %) das linhas de progresso impressas por job
+PASSO_PROGRESSO_PCT = 10
+
+
+class JobLote(NamedTuple):
+    """Uma instância do bot simulada no lote."""
+    indice: int
+    nome: str
+    config: Dict[str, Any]
+    caminho_config: str
+    caminho_csv: str
+    timeframe: str
+    saldo_inicial: float
+    taxa_pct: float
+    estrategias: List[str]
+
+
+def _normalizar_estrategias_lote(valor: Union[str, List[str]]) -> List[str]:
+    """Aceita 'ambas', 'dca,giro_rapido' ou lista (como --estrategias)."""
+    if isinstance(valor, list):
+        return valor
+    if valor.strip().lower() == 'ambas':
+        return ['ambas']
+    return [s.strip() for s in valor.split(',') if s.strip()]
+
+
+def carregar_lote(
+    caminho: str,
+    saldo_padrao: Optional[float] = None,
+    taxa_padrao: Optional[float] = None,
+    estrategias_padrao: Optional[Union[str, List[str]]] = None
+) -> List[JobLote]:
+    """
+    Lê o arquivo de lote e as configs de cada job.
+
+    Args:
+        caminho: Arquivo JSON do lote (ver docstring do módulo)
+        saldo_padrao: Saldo dos jobs sem 'saldo' no arquivo (ex: --saldo)
+        taxa_padrao: Taxa dos jobs sem 'taxa' no arquivo (ex: --taxa)
+        estrategias_padrao: Estratégias dos jobs sem 'estrategias' (ex: --estrategias; padrão: ambas)
+
+    Returns:
+        Jobs na ordem do arquivo, com nomes únicos
+
+    Raises:
+        ValueError: Lote vazio, job sem config/csv/timeframe/saldo/taxa ou config ilegível
+    """
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        conteudo = json.load(arquivo)
+
+    padroes = conteudo if isinstance(conteudo, dict) else {}
+    entradas = conteudo.get('jobs', []) if isinstance(conteudo, dict) else conteudo
+    if not entradas:
+        raise ValueError(f"Nenhum job no lote: {caminho}")
+
+    jobs = []
+    nomes_usados = set()
+    for indice, entrada in enumerate(entradas):
+        entrada = {**{k: v for k, v in padroes.items() if k != 'jobs'}, **entrada}
+        for chave in ('config', 'csv', 'timeframe'):
+            if not entrada.get(chave):
+                raise ValueError(f"Job #{indice + 1} do lote sem '{chave}'")
+
+        try:
+            with open(entrada['config'], 'r', encoding='utf-8') as arquivo:
+                config = json.load(arquivo)
+        except Exception as e:
+            raise ValueError(f"Job #{indice + 1}: não foi possível carregar {entrada['config']} ({e})")
+
+        saldo = entrada.get('saldo', saldo_padrao)
+        if saldo is None:
+            saldo = config.get('CAPITAL_INICIAL')
+        taxa = entrada.get('taxa', taxa_padrao)
+        if saldo is None or taxa is None:
+            raise ValueError(f"Job #{indice + 1} do lote sem saldo ou taxa (use --saldo/--taxa)")
+
+        nome = str(entrada.get('nome') or config.get('nome_instancia') or Path(entrada['csv']).stem)
+        base, sufixo = nome, 2
+        while nome in nomes_usados:
+            nome = f"{base}#{sufixo}"
+            sufixo += 1
+        nomes_usados.add(nome)
+
+        jobs.append(JobLote(
+            indice=indice,
+            nome=nome,
+            config=config,
+            caminho_config=str(entrada['config']),
+            caminho_csv=str(entrada['csv']),
+            timeframe=str(entrada['timeframe']),
+            saldo_inicial=float(saldo),
+            taxa_pct=float(taxa),
+            estrategias=_normalizar_estrategias_lote(entrada.get('estrategias', estrategias_padrao or ['ambas'])),
+        ))
+    return jobs
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PROCESSO DO POOL
+# ═══════════════════════════════════════════════════════════════════════════
+
+def executar_job(
+    job: JobLote,
+    fila_progresso=None,
+    usar_cache: bool = True,
+    cache_max_mb: float = LIMITE_PADRAO_MB
+) -> Dict[str, Any]:
+    """
+    Simula um job do lote (carrega o próprio CSV).
+
+    Args:
+        job: Job a simular
+        fila_progresso: Fila onde publicar (indice, %) durante a simulação (opcional)
+        usar_cache: Reaproveitar execuções idênticas do cache de resultados
+        cache_max_mb: Limite do cache de resultados do CSV
+
+    Returns:
+        {'job', 'metricas', 'curva': (timestamps_ms, patrimonio), 'erro', 'duracao_s', 'em_cache'};
+        erros são capturados em 'erro' para não derrubar o lote inteiro
+    """
+    silenciar_logs_simulacao(logging.ERROR)
+    inicio = time.time()
+    resultado = {'job': job, 'metricas': {}, 'curva': None, 'erro': None, 'duracao_s': 0.0, 'em_cache': False}
+
+    callback = None
+    if fila_progresso is not None:
+        def callback(percentual: int) -> None:
+            fila_progresso.put((job.indice, percentual))
+
+    try:
+        api = SimulatedExchangeAPI(job.caminho_csv, job.saldo_inicial, job.taxa_pct, job.timeframe)
+        cache = CacheResultados(job.caminho_csv, limite_mb=cache_max_mb) if usar_cache else None
+        impressao = cache.impressao_digital(job.config, api, job.estrategias) if cache else None
+        entrada = cache.obter(impressao, api) if cache else None
+        if entrada:
+            resultados = entrada['resultados']
+            resultado['em_cache'] = True
+        else:
+            resultados = executar_simulacao(job.config, api, job.estrategias, callback_progresso=callback)
+            # Resultado parcial: fora do cache, da tabela e da curva combinada
+            if not resultados['simulacao_completa']:
+                resultado['erro'] = ERRO_SIMULACAO_INCOMPLETA
+            elif cache:
+                cache.salvar(impressao, resultados)
+
+        if not resultado['erro']:
+            historico = resultados['portfolio_over_time']
+            resultado['metricas'] = calcular_metricas(resultados, job.saldo_inicial)
+            resultado['curva'] = (historico.timestamps_ms(), historico.valores_totais())
+    except Exception as e:
+        resultado['erro'] = f"{type(e).__name__}: {e}"
+
+    resultado['duracao_s'] = time.time() - inicio
+    return resultado
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ORQUESTRAÇÃO
+# ═══════════════════════════════════════════════════════════════════════════
+
+def combinar_curvas(resultados: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Soma as curvas de patrimônio dos jobs numa carteira combinada.
+
+    Timeframes diferentes são alinhados pela união dos timestamps; cada curva
+    segue no último valor conhecido e, antes do primeiro snapshot, vale o
+    capital inicial do job.
+
+    Args:
+        resultados: Saídas de executar_job (jobs com erro são ignorados)
+
+    Returns:
+        DataFrame com timestamp, uma coluna por job (nome) e 'total'
+    """
+    validos = [r for r in resultados if not r['erro'] and r['curva'] is not None and len(r['curva'][0])]
+    if not validos:
+        return pd.DataFrame(columns=['timestamp', 'total'])
+
+    series = {}
+    for resultado in validos:
+        timestamps_ms, valores = resultado['curva']
+        serie = pd.Series(valores, index=pd.to_datetime(timestamps_ms, unit='ms'))
+        # Snapshot inicial repete o timestamp do primeiro candle
+        series[resultado['job'].nome] = serie[~serie.index.duplicated(keep='last')]
+
+    curva = pd.DataFrame(series).sort_index().ffill()
+    for resultado in validos:
+        curva[resultado['job'].nome] = curva[resultado['job'].nome].fillna(resultado['job'].saldo_inicial)
+    curva['total'] = curva[list(series)].sum(axis=1)
+    curva.index.name = 'timestamp'
+    return curva.reset_index()
+
+
+def executar_lote(
+    jobs: List[JobLote],
+    max_workers: Optional[int] = None,
+    usar_cache: bool = True,
+    cache_max_mb: float = LIMITE_PADRAO_MB
+) -> Dict[str, Any]:
+    """
+    Executa os jobs num ProcessPoolExecutor, imprimindo o progresso de cada um.
+
+    Args:
+        jobs: Saída de carregar_lote
+        max_workers: Processos (padrão: todos os núcleos, no máximo um por job)
+        usar_cache: Reaproveitar execuções idênticas do cache de resultados
+        cache_max_mb: Limite do cache de resultados de cada CSV
+
+    Returns:
+        {'jobs': resultados na ordem do lote, 'curva': DataFrame combinado, 'metricas': {...}}
+    """
+    max_workers = min(max_workers or os.cpu_count() or 1, len(jobs)) or 1
+    print(f"📦 Lote: {len(jobs)} job(s) em {max_workers} processo(s)")
+
+    resultados = []
+    inicio = time.time()
+    ultimo_impresso = {job.indice: -1 for job in jobs}
+    nomes = {job.indice: job.nome for job in jobs}
+
+    def imprimir_progresso(fila) -> None:
+        while not fila.empty():
+            indice, percentual = fila.get()
+            marco = percentual - percentual % PASSO_PROGRESSO_PCT
+            if 0 < marco < 100 and marco > ultimo_impresso[indice]:
+                ultimo_impresso[indice] = marco
+                print(f"   ⏳ {nomes[indice]}: {marco}%")
+
+    with Manager() as gerenciador:
+        fila = gerenciador.Queue()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pendentes = {executor.submit(executar_job, job, fila, usar_cache, cache_max_mb) for job in jobs}
+            while pendentes:
+                concluidos, pendentes = wait(pendentes, timeout=0.5, return_when=FIRST_COMPLETED)
+                imprimir_progresso(fila)
+                for futuro in concluidos:
+                    resultado = futuro.result()
+                    resultados.append(resultado)
+                    job = resultado['job']
+                    contagem = f"[{len(resultados)}/{len(jobs)}]"
+                    if resultado['erro']:
+                        print(f"   ❌ {contagem} {job.nome}: {resultado['erro']}")
+                    else:
+                        origem = "cache" if resultado['em_cache'] else f"{resultado['duracao_s']:.1f}s"
+                        print(
+                            f"   ✅ {contagem} {job.nome} retorno "
+                            f"{resultado['metricas']['retorno_pct']:+.2f}% ({origem})"
+                        )
+
+    print(f"⏱️  Lote concluído em {time.time() - inicio:.1f}s")
+
+    resultados.sort(key=lambda r: r['job'].indice)
+    curva = combinar_curvas(resultados)
+    validos = [r for r in resultados if not r['erro']]
+
+    capital_inicial = sum(r['job'].saldo_inicial for r in validos)
+    patrimonio = curva['total'].to_numpy(dtype=np.float64)
+    valor_final = float(patrimonio[-1]) if len(patrimonio) else capital_inicial
+    metricas = {
+        'capital_inicial': capital_inicial,
+        'retorno_pct': (valor_final - capital_inicial) / capital_inicial * 100 if capital_inicial else 0.0,
+        'drawdown_max_pct': calcular_drawdown_maximo(patrimonio),
+        'total_trades': sum(r['metricas']['total_trades'] for r in validos),
+        'taxas_usdt': sum(r['metricas']['taxas_usdt'] for r in validos),
+        'jobs_validos': len(validos),
+        'valor_final': valor_final,
+    }
+    return {'jobs': resultados, 'curva': curva, 'metricas': metricas}
+
+
+def imprimir_relatorio_lote(relatorio: Dict[str, Any]) -> None:
+    """
+    Imprime a tabela por job e a linha da carteira combinada.
+
+    Args:
+        relatorio: Saída de executar_lote
+    """
+    print("\n" + "="*80)
+    print("📦 RESUMO DO BACKTEST EM LOTE")
+    print("="*80)
+    print(f"{'Job':<12} {'TF':>4} {'Capital $':>10} {'Retorno %':>10} {'DD %':>7} "
+          f"{'Trades':>7} {'Taxas $':>8} {'Final $':>10}")
+    print("─"*80)
+
+    for resultado in relatorio['jobs']:
+        job = resultado['job']
+        if resultado['erro']:
+            print(f"{job.nome:<12} {job.timeframe:>4} {job.saldo_inicial:>10.2f}  ❌ {resultado['erro']}")
+            continue
+        metricas = resultado['metricas']
+        origem = "  ♻️" if resultado['em_cache'] else ""
+        print(
+            f"{job.nome:<12} {job.timeframe:>4} {job.saldo_inicial:>10.2f} {metricas['retorno_pct']:>10.2f} "
+            f"{metricas['drawdown_max_pct']:>7.2f} {metricas['total_trades']:>7d} "
+            f"{metricas['taxas_usdt']:>8.2f} {metricas['valor_final']:>10.2f}{origem}"
+        )
+
+    metricas = relatorio['metricas']
+    print("─"*80)
+    print(
+        f"{'COMBINADO':<12} {'':>4} {metricas['capital_inicial']:>10.2f} {metricas['retorno_pct']:>10.2f} "
+        f"{metricas['drawdown_max_pct']:>7.2f} {metricas['total_trades']:>7d} "
+        f"{metricas['taxas_usdt']:>8.2f} {metricas['valor_final']:>10.2f}"
+    )
+    print(f"   ✅ Jobs concluídos: {metricas['jobs_validos']}/{len(relatorio['jobs'])}")
+    print("="*80)
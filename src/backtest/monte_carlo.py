@@ -0,0 +1,395 @@
+"""
+Monte Carlo - Robustez da estratégia em caminhos de preço sintéticos.
+
+Um único histórico premia parâmetros ajustados aos acidentes daquele caminho
+(ex: degraus do DCA calibrados para as quedas que de fato aconteceram). O
+Monte Carlo gera muitos caminhos OHLCV alternativos a partir do CSV e roda a
+estratégia completa em cada um, reportando a distribuição de retorno,
+drawdown máximo e tempo submerso (abaixo do pico anterior).
+
+Geração (block bootstrap circular, vetorizada em NumPy):
+    - cada barra histórica vira (retorno log do close, forma do candle em
+      relação ao próprio close: open/high/low, volume)
+    - o caminho sintético concatena blocos de barras consecutivas sorteados
+      com reposição; blocos longos (padrão: um dia de barras) preservam o
+      agrupamento de volatilidade
+    - close = preço inicial × exp(soma acumulada dos retornos sorteados);
+      open/high/low reaplicam a forma da barra sorteada, volume idem
+    - os timestamps são os do histórico (mesmo calendário)
+
+Os caminhos vão direto para SimulatedExchangeAPI.de_store, sem CSV. Cada
+processo do pool decompõe o histórico uma vez; o caminho i depende só de
+(semente, i), então o resultado não muda com o número de processos.
+"""
+
+import csv
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from src.backtest.executor import (
+    ERRO_SIMULACAO_INCOMPLETA,
+    calcular_metricas,
+    calcular_tempo_submerso,
+    executar_simulacao,
+    silenciar_logs_simulacao,
+)
+from src.exchange.historico_cache import obter_store_historico
+from src.exchange.kline_store import DIA_MS, KlineStore
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+
+# Métricas resumidas na distribuição: (chave, título, formato)
+METRICAS_DISTRIBUICAO = (
+    ('retorno_pct', 'Retorno %', '{:>9.2f}'),
+    ('drawdown_max_pct', 'DD Máx %', '{:>9.2f}'),
+    ('tempo_submerso_pct', 'Submerso %', '{:>9.1f}'),
+    ('maior_submersao_dias', 'Maior subm. (d)', '{:>9.1f}'),
+    ('total_trades', 'Trades', '{:>9.0f}'),
+)
+
+PERCENTIS = (5, 25, 50, 75, 95)
+
+# Índice reservado para a simulação sobre o histórico real (referência)
+INDICE_HISTORICO = -1
+
+
+class DecomposicaoBarras(NamedTuple):
+    """Histórico decomposto em unidades sorteáveis (uma por barra após a primeira)."""
+    timestamps: np.ndarray   # int64 ms, n barras
+    primeira_barra: np.ndarray  # OHLCV da barra 0 (ponto de partida dos caminhos)
+    retornos: np.ndarray     # log(close[t] / close[t-1]), n-1
+    forma: np.ndarray        # (3, n-1): log(open/close), log(high/close), log(low/close) da barra t
+    volume: np.ndarray       # volume da barra t, n-1
+
+
+def decompor_barras(store: KlineStore) -> DecomposicaoBarras:
+    """
+    Decompõe os candles em retornos do close e forma de cada barra.
+
+    Retornos ou formas não finitos (preço zero, NaN) viram 0.
+
+    Raises:
+        ValueError: Menos de duas barras
+    """
+    if len(store) < 2:
+        raise ValueError("Histórico curto demais para o Monte Carlo (mínimo de 2 barras)")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_close = np.log(store.close)
+        retornos = np.diff(log_close)
+        forma = np.log(np.vstack((store.open[1:], store.high[1:], store.low[1:]))) - log_close[1:]
+    return DecomposicaoBarras(
+        timestamps=np.asarray(store.timestamps),
+        primeira_barra=np.array(store.valores[:, 0]),
+        retornos=np.nan_to_num(retornos, nan=0.0, posinf=0.0, neginf=0.0),
+        forma=np.nan_to_num(forma, nan=0.0, posinf=0.0, neginf=0.0),
+        volume=np.nan_to_num(np.array(store.volume[1:])),
+    )
+
+
+def tamanho_bloco_padrao(timestamps_ms: np.ndarray) -> int:
+    """Barras em um dia, pelo intervalo mediano entre candles."""
+    if len(timestamps_ms) < 2:
+        return 1
+    intervalo = float(np.median(np.diff(timestamps_ms)))
+    return max(1, int(round(DIA_MS / intervalo))) if intervalo > 0 else 1
+
+
+def indices_bootstrap(
+    n_retornos: int,
+    n_sorteados: int,
+    tamanho_bloco: int,
+    rngs: Sequence[np.random.Generator]
+) -> np.ndarray:
+    """
+    Sorteia os índices das barras de cada caminho (block bootstrap circular).
+
+    Args:
+        n_retornos: Barras sorteáveis do histórico
+        n_sorteados: Barras por caminho
+        tamanho_bloco: Barras consecutivas por bloco
+        rngs: Um gerador por caminho
+
+    Returns:
+        Matriz int64 (caminhos, n_sorteados)
+    """
+    tamanho_bloco = max(1, min(int(tamanho_bloco), n_retornos))
+    n_blocos = -(-n_sorteados // tamanho_bloco)
+    inicios = np.stack([rng.integers(0, n_retornos, size=n_blocos) for rng in rngs])
+    indices = (inicios[:, :, None] + np.arange(tamanho_bloco)) % n_retornos
+    return indices.reshape(len(rngs), -1)[:, :n_sorteados]
+
+
+def gerar_caminhos(
+    decomposicao: DecomposicaoBarras,
+    caminhos: Sequence[int],
+    tamanho_bloco: int,
+    semente: int = 0
+) -> np.ndarray:
+    """
+    Gera caminhos OHLCV sintéticos com o mesmo número de barras do histórico.
+
+    Args:
+        decomposicao: Saída de decompor_barras
+        caminhos: Números dos caminhos (o caminho i usa o gerador (semente, i))
+        tamanho_bloco: Barras consecutivas por bloco do bootstrap
+        semente: Semente base
+
+    Returns:
+        Array float64 (caminhos, 5, n) na ordem open, high, low, close, volume
+    """
+    n = len(decomposicao.timestamps)
+    rngs = [np.random.default_rng([semente, caminho]) for caminho in caminhos]
+    indices = indices_bootstrap(len(decomposicao.retornos), n - 1, tamanho_bloco, rngs)
+
+    log_close = np.log(decomposicao.primeira_barra[3]) + np.cumsum(decomposicao.retornos[indices], axis=1)
+    valores = np.empty((len(caminhos), 5, n), dtype=np.float64)
+    valores[:, :, 0] = decomposicao.primeira_barra
+    valores[:, 0:3, 1:] = np.exp(log_close[:, None, :] + decomposicao.forma[:, indices].transpose(1, 0, 2))
+    valores[:, 3, 1:] = np.exp(log_close)
+    valores[:, 4, 1:] = decomposicao.volume[indices]
+    return valores
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PROCESSO DO POOL
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Histórico carregado e decomposto uma vez por processo (ver inicializar_processo_monte_carlo)
+_store_processo: Optional[KlineStore] = None
+_decomposicao_processo: Optional[DecomposicaoBarras] = None
+
+
+def inicializar_processo_monte_carlo(caminho_csv: str) -> None:
+    """Initializer do pool: carrega e decompõe o CSV uma única vez neste processo."""
+    global _store_processo, _decomposicao_processo
+    silenciar_logs_simulacao(logging.ERROR)
+    _store_processo = obter_store_historico(caminho_csv)
+    _decomposicao_processo = decompor_barras(_store_processo)
+
+
+def avaliar_caminho(
+    store: KlineStore,
+    config: Dict[str, Any],
+    estrategias: List[str],
+    saldo_inicial: float,
+    taxa_pct: float,
+    timeframe_base: str,
+    indice: int = 0
+) -> Dict[str, Any]:
+    """
+    Roda a estratégia completa sobre um caminho de candles.
+
+    Returns:
+        {'indice', 'metricas', 'erro', 'duracao_s'}; métricas de calcular_metricas
+        mais tempo_submerso_pct e maior_submersao_dias. Caminho cuja simulação
+        parou antes do fim sai com erro (fora da distribuição)
+    """
+    inicio = time.time()
+    try:
+        api = SimulatedExchangeAPI.de_store(store, saldo_inicial, taxa_pct, timeframe_base)
+        resultados = executar_simulacao(config, api, estrategias)
+        if resultados['simulacao_completa']:
+            historico = resultados['portfolio_over_time']
+            metricas = calcular_metricas(resultados, saldo_inicial)
+            metricas.update(calcular_tempo_submerso(historico.valores_totais(), historico.timestamps_ms()))
+            erro = None
+        else:
+            metricas = {}
+            erro = ERRO_SIMULACAO_INCOMPLETA
+    except Exception as e:
+        metricas = {}
+        erro = f"{type(e).__name__}: {e}"
+    return {'indice': indice, 'metricas': metricas, 'erro': erro, 'duracao_s': time.time() - inicio}
+
+
+def _executar_caminho(
+    indice: int,
+    config: Dict[str, Any],
+    estrategias: List[str],
+    saldo_inicial: float,
+    taxa_pct: float,
+    timeframe_base: str,
+    tamanho_bloco: int,
+    semente: int
+) -> Dict[str, Any]:
+    """Gera o caminho 'indice' (ou usa o histórico, INDICE_HISTORICO) e simula."""
+    if indice == INDICE_HISTORICO:
+        store = KlineStore(_store_processo.timestamps, _store_processo.valores)
+    else:
+        valores = gerar_caminhos(_decomposicao_processo, [indice], tamanho_bloco, semente)[0]
+        store = KlineStore(_decomposicao_processo.timestamps, valores)
+    return avaliar_caminho(store, config, estrategias, saldo_inicial, taxa_pct, timeframe_base, indice)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ORQUESTRAÇÃO
+# ═══════════════════════════════════════════════════════════════════════════
+
+def resumir_distribuicao(resultados: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Média, mínimo, máximo e percentis de cada métrica nos caminhos válidos.
+
+    Returns:
+        {metrica: {'media', 'min', 'max', 'p5', 'p25', 'p50', 'p75', 'p95'}}
+    """
+    validos = [r['metricas'] for r in resultados if not r['erro']]
+    resumo = {}
+    for chave, _, _ in METRICAS_DISTRIBUICAO:
+        valores = np.array([m[chave] for m in validos], dtype=np.float64)
+        if not len(valores):
+            continue
+        resumo[chave] = {'media': float(valores.mean()), 'min': float(valores.min()), 'max': float(valores.max())}
+        for percentil, valor in zip(PERCENTIS, np.percentile(valores, PERCENTIS)):
+            resumo[chave][f'p{percentil}'] = float(valor)
+    return resumo
+
+
+def executar_monte_carlo(
+    config: Dict[str, Any],
+    caminho_csv: str,
+    saldo_inicial: float,
+    taxa_pct: float,
+    timeframe_base: str,
+    estrategias: List[str],
+    n_caminhos: int,
+    tamanho_bloco: Optional[int] = None,
+    semente: int = 0,
+    max_workers: Optional[int] = None,
+    incluir_historico: bool = True
+) -> Dict[str, Any]:
+    """
+    Simula a config em n_caminhos caminhos sintéticos num ProcessPoolExecutor.
+
+    Args:
+        config: Configuração do bot (não é modificada)
+        caminho_csv: CSV histórico de origem dos retornos
+        saldo_inicial: Saldo inicial em USDT
+        taxa_pct: Taxa da exchange em %
+        timeframe_base: Timeframe do CSV
+        estrategias: Estratégias a simular
+        n_caminhos: Quantidade de caminhos sintéticos
+        tamanho_bloco: Barras por bloco do bootstrap (padrão: um dia de barras)
+        semente: Semente base (mesma semente = mesmos caminhos)
+        max_workers: Processos (padrão: todos os núcleos)
+        incluir_historico: Simular também o histórico real, como referência
+
+    Returns:
+        {'caminhos': resultados por caminho, 'historico': resultado real ou None,
+         'resumo': resumir_distribuicao, 'prob_prejuizo_pct', 'percentil_historico',
+         'tamanho_bloco', 'semente'}
+    """
+    if n_caminhos < 1:
+        raise ValueError("n_caminhos deve ser ao menos 1")
+    if tamanho_bloco is None:
+        tamanho_bloco = tamanho_bloco_padrao(obter_store_historico(caminho_csv).timestamps)
+
+    indices = ([INDICE_HISTORICO] if incluir_historico else []) + list(range(n_caminhos))
+    max_workers = min(max_workers or os.cpu_count() or 1, len(indices))
+    print(f"🎲 Monte Carlo: {n_caminhos} caminhos (bloco de {tamanho_bloco} barras, semente {semente}) "
+          f"em {max_workers} processo(s)")
+
+    caminhos = []
+    historico = None
+    inicio = time.time()
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=inicializar_processo_monte_carlo,
+        initargs=(caminho_csv,)
+    ) as executor:
+        futuros = [
+            executor.submit(_executar_caminho, indice, config, estrategias, saldo_inicial, taxa_pct,
+                            timeframe_base, tamanho_bloco, semente)
+            for indice in indices
+        ]
+        for concluidos, futuro in enumerate(as_completed(futuros), start=1):
+            resultado = futuro.result()
+            nome = "histórico" if resultado['indice'] == INDICE_HISTORICO else f"#{resultado['indice']}"
+            if resultado['indice'] == INDICE_HISTORICO:
+                historico = resultado
+            else:
+                caminhos.append(resultado)
+            if resultado['erro']:
+                print(f"   ❌ [{concluidos}/{len(indices)}] {nome}: {resultado['erro']}")
+            else:
+                metricas = resultado['metricas']
+                print(
+                    f"   ✅ [{concluidos}/{len(indices)}] {nome} retorno {metricas['retorno_pct']:+.2f}% "
+                    f"DD {metricas['drawdown_max_pct']:.2f}% ({resultado['duracao_s']:.1f}s)"
+                )
+
+    print(f"⏱️  Monte Carlo concluído em {time.time() - inicio:.1f}s")
+
+    caminhos.sort(key=lambda r: r['indice'])
+    retornos = np.array([r['metricas']['retorno_pct'] for r in caminhos if not r['erro']], dtype=np.float64)
+    percentil_historico = None
+    if historico and not historico['erro'] and len(retornos):
+        percentil_historico = float((retornos < historico['metricas']['retorno_pct']).mean() * 100)
+
+    return {
+        'caminhos': caminhos,
+        'historico': historico,
+        'resumo': resumir_distribuicao(caminhos),
+        'prob_prejuizo_pct': float((retornos < 0).mean() * 100) if len(retornos) else None,
+        'percentil_historico': percentil_historico,
+        'tamanho_bloco': tamanho_bloco,
+        'semente': semente,
+    }
+
+
+def imprimir_relatorio_monte_carlo(relatorio: Dict[str, Any]) -> None:
+    """
+    Imprime a distribuição das métricas e a posição do histórico real nela.
+
+    Args:
+        relatorio: Saída de executar_monte_carlo
+    """
+    validos = sum(1 for r in relatorio['caminhos'] if not r['erro'])
+    historico = relatorio['historico']
+    metricas_historico = historico['metricas'] if historico and not historico['erro'] else {}
+
+    print("\n" + "="*80)
+    print(f"🎲 RELATÓRIO MONTE CARLO ({validos}/{len(relatorio['caminhos'])} caminhos válidos)")
+    print("="*80)
+    print(f"{'Métrica':<16}{'Histórico':>10}{'Média':>9}" + "".join(f"{'P' + str(p):>9}" for p in PERCENTIS))
+    print("─"*80)
+
+    for chave, titulo, fmt in METRICAS_DISTRIBUICAO:
+        estatisticas = relatorio['resumo'].get(chave)
+        if not estatisticas:
+            continue
+        referencia = fmt.format(metricas_historico[chave]) if chave in metricas_historico else f"{'-':>9}"
+        valores = "".join(fmt.format(estatisticas[f'p{p}']) for p in PERCENTIS)
+        print(f"{titulo:<16} {referencia}{fmt.format(estatisticas['media'])}{valores}")
+
+    print("─"*80)
+    if relatorio['prob_prejuizo_pct'] is not None:
+        print(f"   📉 Caminhos com prejuízo: {relatorio['prob_prejuizo_pct']:.1f}%")
+    if relatorio['percentil_historico'] is not None:
+        print(f"   📍 Retorno do histórico real no percentil {relatorio['percentil_historico']:.0f} dos caminhos")
+    print("="*80)
+
+
+def salvar_caminhos_csv(relatorio: Dict[str, Any], caminho: str) -> None:
+    """
+    Salva as métricas de cada caminho em CSV (linha 'historico' primeiro, se houver).
+
+    Args:
+        relatorio: Saída de executar_monte_carlo
+        caminho: Arquivo de destino
+    """
+    chaves = [chave for chave, _, _ in METRICAS_DISTRIBUICAO] + ['taxas_usdt', 'valor_final']
+    linhas = ([relatorio['historico']] if relatorio['historico'] else []) + relatorio['caminhos']
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(['caminho'] + chaves + ['erro'])
+        for resultado in linhas:
+            nome = 'historico' if resultado['indice'] == INDICE_HISTORICO else resultado['indice']
+            escritor.writerow(
+                [nome] + [resultado['metricas'].get(k, '') for k in chaves] + [resultado['erro'] or '']
+            )
@@ -0,0 +1,353 @@
+"""
+Sweep de Parâmetros - Executa uma grade de configurações em paralelo.
+
+Cada processo do pool carrega e resampleia o CSV UMA vez (initializer) e
+depois roda várias simulações sobre os mesmos arrays via
+SimulatedExchangeAPI.clonar(). Os resultados são reunidos num ranking único
+(retorno, drawdown, trades, taxas).
+
+Formato da grade (JSON):
+    {
+        "estrategia_giro_rapido.rsi_limite_compra": [25, 30, 35],
+        "estrategia_giro_rapido.stop_loss_inicial_pct": [0.8, 1.0, 1.5],
+        "DEGRAUS_COMPRA.0.gatilho_distancia_sma": [3, 5]
+    }
+
+Chaves são caminhos com pontos (índices numéricos acessam listas). Um valor
+pode ser qualquer JSON, inclusive listas inteiras (ex: conjuntos alternativos
+de DEGRAUS_COMPRA).
+
+Com um CacheResultados, combinações já simuladas (neste ou em sweeps
+anteriores) saem do cache sem rodar o BotWorker.
+"""
+
+import copy
+import csv
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from src.backtest.cache_resultados import CacheResultados
+from src.backtest.executor import (
+    ERRO_SIMULACAO_INCOMPLETA,
+    calcular_metricas,
+    executar_simulacao,
+    normalizar_estrategias,
+    silenciar_logs_simulacao,
+)
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+
+# Colunas do ranking: (chave da métrica, título, formato)
+COLUNAS_RANKING = (
+    ('retorno_pct', 'Retorno %', '{:>10.2f}'),
+    ('drawdown_max_pct', 'DD Máx %', '{:>9.2f}'),
+    ('total_trades', 'Trades', '{:>7d}'),
+    ('taxas_usdt', 'Taxas $', '{:>9.2f}'),
+)
+
+# Métricas em que menor é melhor
+METRICAS_CRESCENTES = {'drawdown_max_pct', 'taxas_usdt'}
+
+
+def expandir_grade(grade: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Gera o produto cartesiano da grade.
+
+    Args:
+        grade: {caminho: [valores]}; valores escalares viram lista de 1 item
+
+    Returns:
+        Lista de dicts {caminho: valor}, um por combinação
+    """
+    caminhos = list(grade.keys())
+    listas = [v if isinstance(v, list) else [v] for v in grade.values()]
+    return [dict(zip(caminhos, combinacao)) for combinacao in itertools.product(*listas)]
+
+
+def aplicar_parametros(config: Dict[str, Any], parametros: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Aplica uma combinação de parâmetros na config (caminhos com pontos).
+
+    Args:
+        config: Configuração do bot (é modificada e retornada)
+        parametros: {caminho: valor}, ex: {'DEGRAUS_COMPRA.0.gatilho_distancia_sma': 4}
+
+    Returns:
+        A própria config
+
+    Raises:
+        KeyError: Caminho inexistente numa lista (índice fora do intervalo)
+    """
+    for caminho, valor in parametros.items():
+        partes = caminho.split('.')
+        alvo = config
+        for parte in partes[:-1]:
+            if isinstance(alvo, list):
+                alvo = alvo[int(parte)]
+            else:
+                alvo = alvo.setdefault(parte, {})
+
+        ultima = partes[-1]
+        if isinstance(alvo, list):
+            indice = int(ultima)
+            if indice >= len(alvo):
+                raise KeyError(f"Índice {indice} fora da lista em '{caminho}'")
+            alvo[indice] = copy.deepcopy(valor)
+        else:
+            alvo[ultima] = copy.deepcopy(valor)
+    return config
+
+
+def timeframes_usados(config: Dict[str, Any]) -> List[str]:
+    """Timeframes que as estratégias vão consultar (para resamplear no initializer)."""
+    timeframes = {'1h', '4h', config.get('rsi_timeframe', '1h')}
+    giro = config.get('estrategia_giro_rapido', {})
+    timeframes.add(giro.get('rsi_timeframe_entrada', '15m'))
+    return sorted(timeframes)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PROCESSO DO POOL
+# ═══════════════════════════════════════════════════════════════════════════
+
+# API carregada uma vez por processo (ver inicializar_processo)
+_api_processo: Optional[SimulatedExchangeAPI] = None
+
+
+def inicializar_processo(
+    caminho_csv: str,
+    saldo_inicial: float,
+    taxa_pct: float,
+    timeframe_base: str,
+    timeframes: List[str]
+) -> None:
+    """
+    Initializer do pool: carrega e resampleia o CSV uma única vez neste processo.
+    Também usado pelo walk-forward.
+    """
+    global _api_processo
+    silenciar_logs_simulacao(logging.ERROR)
+    _api_processo = SimulatedExchangeAPI(caminho_csv, saldo_inicial, taxa_pct, timeframe_base)
+    for intervalo in timeframes:
+        _api_processo.obter_kline_store(intervalo)
+
+
+def obter_api_processo() -> SimulatedExchangeAPI:
+    """API carregada por inicializar_processo neste processo."""
+    if _api_processo is None:
+        raise RuntimeError("inicializar_processo() não foi chamado neste processo")
+    return _api_processo
+
+
+def avaliar_combinacao(
+    api: SimulatedExchangeAPI,
+    config_base: Dict[str, Any],
+    parametros: Dict[str, Any],
+    estrategias: List[str],
+    indice: int = 0,
+    cache: Optional[CacheResultados] = None
+) -> Dict[str, Any]:
+    """
+    Roda uma combinação de parâmetros numa API simulada ainda não usada.
+
+    Args:
+        cache: Reaproveita o resultado de uma execução idêntica (opcional)
+
+    Returns:
+        {'indice', 'parametros', 'metricas', 'erro', 'duracao_s', 'em_cache'};
+        erros da simulação são capturados em 'erro' para não derrubar o sweep inteiro
+    """
+    config = aplicar_parametros(copy.deepcopy(config_base), parametros)
+    inicio = time.time()
+    em_cache = False
+    erro = None
+    try:
+        impressao = cache.impressao_digital(config, api, estrategias) if cache else None
+        entrada = cache.obter(impressao, api) if cache else None
+        if entrada:
+            resultados = entrada['resultados']
+            em_cache = True
+        else:
+            resultados = executar_simulacao(config, api, estrategias)
+            # Execução interrompida: métricas parciais ficam fora do cache e do ranking
+            if not resultados['simulacao_completa']:
+                erro = ERRO_SIMULACAO_INCOMPLETA
+            elif cache:
+                cache.salvar(impressao, resultados)
+        metricas = calcular_metricas(resultados, float(api.saldo_inicial)) if erro is None else {}
+    except Exception as e:
+        metricas = {}
+        erro = f"{type(e).__name__}: {e}"
+
+    return {
+        'indice': indice,
+        'parametros': parametros,
+        'metricas': metricas,
+        'erro': erro,
+        'duracao_s': time.time() - inicio,
+        'em_cache': em_cache,
+    }
+
+
+def _executar_combinacao(
+    indice: int,
+    config_base: Dict[str, Any],
+    parametros: Dict[str, Any],
+    estrategias: List[str],
+    cache: Optional[CacheResultados] = None
+) -> Dict[str, Any]:
+    """Roda uma combinação da grade sobre a API já carregada no processo."""
+    return avaliar_combinacao(obter_api_processo().clonar(), config_base, parametros, estrategias, indice, cache)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ORQUESTRAÇÃO
+# ═══════════════════════════════════════════════════════════════════════════
+
+def executar_sweep(
+    config_base: Dict[str, Any],
+    grade: Dict[str, List[Any]],
+    caminho_csv: str,
+    saldo_inicial: float,
+    taxa_pct: float,
+    timeframe_base: str,
+    estrategias: List[str],
+    max_workers: Optional[int] = None,
+    ordenar_por: str = 'retorno_pct',
+    cache: Optional[CacheResultados] = None
+) -> List[Dict[str, Any]]:
+    """
+    Executa todas as combinações da grade num ProcessPoolExecutor.
+
+    Args:
+        config_base: Configuração de partida (não é modificada)
+        grade: Grade de parâmetros (ver docstring do módulo)
+        caminho_csv: CSV histórico
+        saldo_inicial: Saldo inicial em USDT
+        taxa_pct: Taxa da exchange em %
+        timeframe_base: Timeframe do CSV
+        estrategias: Estratégias a simular ('dca', 'giro_rapido' ou 'ambas')
+        max_workers: Processos (padrão: todos os núcleos)
+        ordenar_por: Métrica do ranking
+        cache: Cache de resultados (None: simula todas as combinações)
+
+    Returns:
+        Resultados ordenados (melhor primeiro); execuções com erro ficam no fim
+    """
+    combinacoes = expandir_grade(grade)
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = min(max_workers, len(combinacoes)) or 1
+
+    flags = normalizar_estrategias(estrategias)
+    timeframes = timeframes_usados(config_base) if (flags['dca'] or flags['giro_rapido']) else []
+
+    print(f"🧮 Sweep: {len(combinacoes)} combinações em {max_workers} processo(s)")
+
+    resultados = []
+    inicio = time.time()
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=inicializar_processo,
+        initargs=(caminho_csv, saldo_inicial, taxa_pct, timeframe_base, timeframes)
+    ) as executor:
+        futuros = [
+            executor.submit(_executar_combinacao, i, config_base, parametros, estrategias, cache)
+            for i, parametros in enumerate(combinacoes)
+        ]
+        for concluidos, futuro in enumerate(as_completed(futuros), start=1):
+            resultado = futuro.result()
+            resultados.append(resultado)
+            if resultado['erro']:
+                print(f"   ❌ [{concluidos}/{len(combinacoes)}] #{resultado['indice']}: {resultado['erro']}")
+            else:
+                origem = "cache" if resultado['em_cache'] else f"{resultado['duracao_s']:.1f}s"
+                print(
+                    f"   ✅ [{concluidos}/{len(combinacoes)}] #{resultado['indice']} "
+                    f"retorno {resultado['metricas']['retorno_pct']:+.2f}% ({origem})"
+                )
+
+    reaproveitadas = sum(1 for resultado in resultados if resultado['em_cache'])
+    if reaproveitadas:
+        print(f"♻️  {reaproveitadas}/{len(combinacoes)} combinação(ões) reaproveitada(s) do cache de resultados")
+    print(f"⏱️  Sweep concluído em {time.time() - inicio:.1f}s")
+    return ordenar_resultados(resultados, ordenar_por)
+
+
+def ordenar_resultados(resultados: List[Dict[str, Any]], ordenar_por: str = 'retorno_pct') -> List[Dict[str, Any]]:
+    """
+    Ordena os resultados pela métrica escolhida (drawdown e taxas: menor é melhor).
+    Execuções com erro vão para o fim.
+    """
+    crescente = ordenar_por in METRICAS_CRESCENTES
+
+    def chave(resultado):
+        if resultado['erro']:
+            return (1, 0.0)
+        valor = resultado['metricas'][ordenar_por]
+        return (0, valor if crescente else -valor)
+
+    return sorted(resultados, key=chave)
+
+
+def imprimir_tabela_ranking(resultados: List[Dict[str, Any]], top: Optional[int] = None) -> None:
+    """
+    Imprime o ranking do sweep.
+
+    Args:
+        resultados: Saída de executar_sweep (já ordenada)
+        top: Quantidade de linhas (None = todas)
+    """
+    linhas = resultados[:top] if top else resultados
+
+    print("\n" + "="*80)
+    print("🏆 RANKING DO SWEEP DE PARÂMETROS")
+    print("="*80)
+
+    cabecalho = f"{'#':>4} " + " ".join(
+        f"{titulo:>{len(fmt.format(0))}}" for _, titulo, fmt in COLUNAS_RANKING
+    ) + "  Parâmetros"
+    print(cabecalho)
+    print("─"*80)
+
+    for posicao, resultado in enumerate(linhas, start=1):
+        parametros = ", ".join(f"{k}={v}" for k, v in resultado['parametros'].items())
+        if resultado['erro']:
+            print(f"{posicao:>4} ❌ {resultado['erro']}  {parametros}")
+            continue
+        metricas = resultado['metricas']
+        valores = " ".join(fmt.format(metricas[chave]) for chave, _, fmt in COLUNAS_RANKING)
+        print(f"{posicao:>4} {valores}  {parametros}")
+
+    print("="*80)
+
+
+def salvar_resultados_csv(resultados: List[Dict[str, Any]], caminho: str) -> None:
+    """
+    Salva o ranking completo em CSV (uma coluna por parâmetro e por métrica).
+
+    Args:
+        resultados: Saída de executar_sweep
+        caminho: Arquivo de destino
+    """
+    chaves_parametros: List[str] = []
+    for resultado in resultados:
+        for chave in resultado['parametros']:
+            if chave not in chaves_parametros:
+                chaves_parametros.append(chave)
+    chaves_metricas = ['retorno_pct', 'drawdown_max_pct', 'total_trades', 'compras',
+                       'vendas', 'taxas_usdt', 'valor_final']
+
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(['posicao'] + chaves_parametros + chaves_metricas + ['erro'])
+        for posicao, resultado in enumerate(resultados, start=1):
+            escritor.writerow(
+                [posicao]
+                + [resultado['parametros'].get(k, '') for k in chaves_parametros]
+                + [resultado['metricas'].get(k, '') for k in chaves_metricas]
+                + [resultado['erro'] or '']
+            )
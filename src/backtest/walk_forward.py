@@ -0,0 +1,300 @@
+"""
+Walk-Forward - Otimização em janelas móveis in-sample / out-of-sample.
+
+O histórico é dividido em janelas consecutivas: em cada uma, a grade de
+parâmetros é otimizada no período in-sample (IS) e a melhor combinação é
+executada no período out-of-sample (OOS) seguinte, que ela nunca viu. As
+curvas de patrimônio OOS são costuradas numa única curva, que é a estimativa
+honesta do desempenho da configuração antes de levá-la para produção.
+
+As janelas são independentes e rodam em paralelo (ProcessPoolExecutor). Cada
+processo carrega e resampleia o CSV uma vez; as janelas são fatias
+(SimulatedExchangeAPI.fatiar) dos mesmos arrays.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.executor import calcular_drawdown_maximo, normalizar_estrategias
+from src.backtest.sweep import (
+    avaliar_combinacao,
+    expandir_grade,
+    inicializar_processo,
+    obter_api_processo,
+    ordenar_resultados,
+    timeframes_usados,
+)
+from src.exchange.historico_cache import obter_store_historico
+
+
+class JanelaWalkForward(NamedTuple):
+    """Períodos [inicio, fim) de uma janela do walk-forward."""
+    numero: int
+    is_inicio: pd.Timestamp
+    is_fim: pd.Timestamp
+    oos_inicio: pd.Timestamp
+    oos_fim: pd.Timestamp
+
+
+def gerar_janelas(
+    indice: pd.DatetimeIndex,
+    dias_in_sample: float,
+    dias_out_of_sample: float,
+    passo_dias: Optional[float] = None
+) -> List[JanelaWalkForward]:
+    """
+    Divide o histórico em janelas IS/OOS móveis.
+
+    Args:
+        indice: Timestamps das barras base
+        dias_in_sample: Duração do período de otimização
+        dias_out_of_sample: Duração do período de validação
+        passo_dias: Deslocamento entre janelas (padrão: dias_out_of_sample,
+            ou seja, períodos OOS contíguos e sem sobreposição)
+
+    Returns:
+        Janelas cujo OOS cabe inteiro no histórico
+
+    Raises:
+        ValueError: Durações inválidas ou passo menor que o OOS (curvas
+            OOS se sobreporiam e não poderiam ser costuradas)
+    """
+    if dias_in_sample <= 0 or dias_out_of_sample <= 0:
+        raise ValueError("Durações in-sample e out-of-sample devem ser positivas")
+
+    passo_dias = dias_out_of_sample if passo_dias is None else passo_dias
+    if passo_dias < dias_out_of_sample:
+        raise ValueError("passo_dias não pode ser menor que dias_out_of_sample (OOS sobrepostos)")
+
+    duracao_is = pd.Timedelta(days=dias_in_sample)
+    duracao_oos = pd.Timedelta(days=dias_out_of_sample)
+    passo = pd.Timedelta(days=passo_dias)
+    fim_dados = indice[-1]
+
+    janelas = []
+    is_inicio = indice[0]
+    while is_inicio + duracao_is + duracao_oos <= fim_dados:
+        is_fim = is_inicio + duracao_is
+        janelas.append(JanelaWalkForward(len(janelas) + 1, is_inicio, is_fim, is_fim, is_fim + duracao_oos))
+        is_inicio += passo
+    return janelas
+
+
+def _executar_janela(
+    janela: JanelaWalkForward,
+    config_base: Dict[str, Any],
+    grade: Dict[str, List[Any]],
+    estrategias: List[str],
+    ordenar_por: str,
+    barras_aquecimento: int
+) -> Dict[str, Any]:
+    """Otimiza a grade no IS da janela e valida a melhor combinação no OOS."""
+    api = obter_api_processo()
+    inicio = time.time()
+
+    resultados_is = [
+        avaliar_combinacao(
+            api.fatiar(janela.is_inicio, janela.is_fim, barras_aquecimento),
+            config_base, parametros, estrategias, indice
+        )
+        for indice, parametros in enumerate(expandir_grade(grade))
+    ]
+    melhor = ordenar_resultados(resultados_is, ordenar_por)[0]
+
+    resultado = {
+        'janela': janela,
+        'parametros': melhor['parametros'],
+        'metricas_is': melhor['metricas'],
+        'metricas_oos': {},
+        'curva_oos': [],
+        'erro': melhor['erro'],
+        'duracao_s': 0.0,
+    }
+    if melhor['erro']:
+        resultado['duracao_s'] = time.time() - inicio
+        return resultado
+
+    api_oos = api.fatiar(janela.oos_inicio, janela.oos_fim, barras_aquecimento)
+    validacao = avaliar_combinacao(api_oos, config_base, melhor['parametros'], estrategias)
+    resultado['metricas_oos'] = validacao['metricas']
+    resultado['erro'] = validacao['erro']
+    resultado['curva_oos'] = [
+        (snap['timestamp'], snap['total_value_quote'])
+        for snap in api_oos.get_resultados()['portfolio_over_time']
+    ]
+    resultado['duracao_s'] = time.time() - inicio
+    return resultado
+
+
+def costurar_curvas_oos(resultados: List[Dict[str, Any]], saldo_inicial: float) -> pd.DataFrame:
+    """
+    Encadeia as curvas OOS numa curva única de patrimônio.
+
+    Cada janela começa com o saldo inicial; a curva dela é reescalada para
+    começar no patrimônio final da janela anterior (composição dos retornos).
+
+    Args:
+        resultados: Resultados por janela (ordenados pelo número da janela)
+        saldo_inicial: Patrimônio inicial da curva costurada
+
+    Returns:
+        DataFrame com colunas timestamp, janela, patrimonio
+    """
+    partes = []
+    capital = float(saldo_inicial)
+    for resultado in resultados:
+        curva = resultado['curva_oos']
+        if resultado['erro'] or not curva:
+            continue
+        valores = np.array([valor for _, valor in curva], dtype=np.float64)
+        if valores[0] <= 0:
+            continue
+        valores = valores * (capital / valores[0])
+        partes.append(pd.DataFrame({
+            'timestamp': pd.to_datetime([ts for ts, _ in curva]),
+            'janela': resultado['janela'].numero,
+            'patrimonio': valores,
+        }))
+        capital = float(valores[-1])
+
+    if not partes:
+        return pd.DataFrame(columns=['timestamp', 'janela', 'patrimonio'])
+    # O snapshot inicial de cada janela repete o timestamp da primeira barra
+    return pd.concat(partes, ignore_index=True).drop_duplicates('timestamp', keep='last', ignore_index=True)
+
+
+def executar_walk_forward(
+    config_base: Dict[str, Any],
+    grade: Dict[str, List[Any]],
+    caminho_csv: str,
+    saldo_inicial: float,
+    taxa_pct: float,
+    timeframe_base: str,
+    estrategias: List[str],
+    dias_in_sample: float,
+    dias_out_of_sample: float,
+    passo_dias: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    ordenar_por: str = 'retorno_pct',
+    barras_aquecimento: int = 200
+) -> Dict[str, Any]:
+    """
+    Executa o walk-forward completo, com as janelas em paralelo.
+
+    Args:
+        config_base: Configuração de partida (não é modificada)
+        grade: Grade de parâmetros otimizada em cada IS (formato do sweep)
+        caminho_csv: CSV histórico
+        saldo_inicial: Saldo inicial em USDT (de cada janela e da curva costurada)
+        taxa_pct: Taxa da exchange em %
+        timeframe_base: Timeframe do CSV
+        estrategias: Estratégias a simular
+        dias_in_sample: Duração do IS em dias
+        dias_out_of_sample: Duração do OOS em dias
+        passo_dias: Deslocamento entre janelas (padrão: dias_out_of_sample)
+        max_workers: Processos (padrão: todos os núcleos)
+        ordenar_por: Métrica usada para escolher a melhor combinação no IS
+        barras_aquecimento: Barras base de histórico antes de cada período
+
+    Returns:
+        {'janelas': [...], 'curva': DataFrame, 'metricas': {...}}
+    """
+    indice = pd.DatetimeIndex(obter_store_historico(caminho_csv).timestamps.astype('datetime64[ms]'))
+    janelas = gerar_janelas(indice, dias_in_sample, dias_out_of_sample, passo_dias)
+    if not janelas:
+        raise ValueError(
+            f"Histórico curto demais para IS de {dias_in_sample}d + OOS de {dias_out_of_sample}d"
+        )
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(janelas))
+    flags = normalizar_estrategias(estrategias)
+    timeframes = timeframes_usados(config_base) if (flags['dca'] or flags['giro_rapido']) else []
+    n_combinacoes = len(expandir_grade(grade))
+
+    print(f"🧭 Walk-forward: {len(janelas)} janelas × {n_combinacoes} combinações em {max_workers} processo(s)")
+
+    resultados = []
+    inicio = time.time()
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=inicializar_processo,
+        initargs=(caminho_csv, saldo_inicial, taxa_pct, timeframe_base, timeframes)
+    ) as executor:
+        futuros = [
+            executor.submit(_executar_janela, janela, config_base, grade, estrategias, ordenar_por, barras_aquecimento)
+            for janela in janelas
+        ]
+        for concluidas, futuro in enumerate(as_completed(futuros), start=1):
+            resultado = futuro.result()
+            resultados.append(resultado)
+            numero = resultado['janela'].numero
+            if resultado['erro']:
+                print(f"   ❌ [{concluidas}/{len(janelas)}] Janela {numero}: {resultado['erro']}")
+            else:
+                print(
+                    f"   ✅ [{concluidas}/{len(janelas)}] Janela {numero}: "
+                    f"IS {resultado['metricas_is']['retorno_pct']:+.2f}% → "
+                    f"OOS {resultado['metricas_oos']['retorno_pct']:+.2f}% "
+                    f"({resultado['duracao_s']:.1f}s)"
+                )
+
+    print(f"⏱️  Walk-forward concluído em {time.time() - inicio:.1f}s")
+
+    resultados.sort(key=lambda r: r['janela'].numero)
+    curva = costurar_curvas_oos(resultados, saldo_inicial)
+    validos = [r for r in resultados if not r['erro']]
+
+    patrimonio = curva['patrimonio'].to_numpy(dtype=np.float64)
+    valor_final = float(patrimonio[-1]) if len(patrimonio) else float(saldo_inicial)
+    metricas = {
+        'retorno_pct': (valor_final - saldo_inicial) / saldo_inicial * 100 if saldo_inicial else 0.0,
+        'drawdown_max_pct': calcular_drawdown_maximo(patrimonio),
+        'total_trades': sum(r['metricas_oos']['total_trades'] for r in validos),
+        'taxas_usdt': sum(r['metricas_oos']['taxas_usdt'] for r in validos),
+        'janelas_positivas': sum(1 for r in validos if r['metricas_oos']['retorno_pct'] > 0),
+        'janelas_validas': len(validos),
+        'valor_final': valor_final,
+    }
+    return {'janelas': resultados, 'curva': curva, 'metricas': metricas}
+
+
+def imprimir_relatorio_walk_forward(relatorio: Dict[str, Any]) -> None:
+    """
+    Imprime o resumo por janela e as métricas da curva OOS costurada.
+
+    Args:
+        relatorio: Saída de executar_walk_forward
+    """
+    print("\n" + "="*80)
+    print("🧭 RELATÓRIO WALK-FORWARD (OUT-OF-SAMPLE)")
+    print("="*80)
+    print(f"{'Jan':>4} {'OOS início':>16} {'OOS fim':>16} {'IS %':>8} {'OOS %':>8} {'DD %':>7} {'Trades':>7}  Parâmetros")
+    print("─"*80)
+
+    for resultado in relatorio['janelas']:
+        janela = resultado['janela']
+        periodo = f"{janela.oos_inicio:%Y-%m-%d %H:%M} {janela.oos_fim:%Y-%m-%d %H:%M}"
+        parametros = ", ".join(f"{k}={v}" for k, v in resultado['parametros'].items())
+        if resultado['erro']:
+            print(f"{janela.numero:>4} {periodo}  ❌ {resultado['erro']}")
+            continue
+        metricas_is = resultado['metricas_is']
+        metricas_oos = resultado['metricas_oos']
+        print(
+            f"{janela.numero:>4} {periodo} {metricas_is['retorno_pct']:>8.2f} "
+            f"{metricas_oos['retorno_pct']:>8.2f} {metricas_oos['drawdown_max_pct']:>7.2f} "
+            f"{metricas_oos['total_trades']:>7d}  {parametros}"
+        )
+
+    metricas = relatorio['metricas']
+    print("─"*80)
+    print(f"   💰 Retorno OOS costurado: {metricas['retorno_pct']:+.2f}% (${metricas['valor_final']:.2f})")
+    print(f"   📉 Drawdown máximo OOS: {metricas['drawdown_max_pct']:.2f}%")
+    print(f"   🔁 Trades OOS: {metricas['total_trades']} | Taxas: ${metricas['taxas_usdt']:.2f}")
+    print(f"   ✅ Janelas OOS positivas: {metricas['janelas_positivas']}/{metricas['janelas_validas']}")
+    print("="*80)
@@ -6,13 +6,69 @@ from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
-import talib
+import time
 
+from src.core.rsi_incremental import RSIIncremental
 from src.utils.logger import get_loggers
+from src.utils.timeframe_validator import timeframe_to_seconds
 
 logger, _ = get_loggers()
 
 
+class SerieSMA:
+    """
+    SMA de referência de um timeframe, consultada pelo índice da barra base.
+
+    Em cada barra entram os N candles mais recentes visíveis: os fechados com
+    o fechamento final e o candle em formação com o fechamento da barra base.
+    """
+
+    def __init__(self, ts_base: np.ndarray, closes_base: np.ndarray, store, n_candles: int):
+        """
+        Args:
+            ts_base: Timestamps (ms) das barras base
+            closes_base: Fechamentos das barras base
+            store: KlineStore do timeframe da SMA
+            n_candles: Candles na média (incluindo o candle em formação)
+        """
+        self._ts_base = ts_base
+        self._closes_base = closes_base
+        self._timestamps = store.timestamps
+        self._soma_acumulada = np.concatenate(([0.0], np.cumsum(store.close)))
+        self._n_candles = n_candles
+
+    def __len__(self) -> int:
+        return len(self._ts_base)
+
+    def __getitem__(self, indice: int) -> float:
+        # Candles visíveis na barra (o último é o candle em formação)
+        visiveis = int(np.searchsorted(self._timestamps, self._ts_base[indice], side='right'))
+        if visiveis == 0:
+            return np.nan
+
+        fechados = visiveis - 1
+        usados = min(fechados, self._n_candles - 1)
+        soma_fechados = self._soma_acumulada[fechados] - self._soma_acumulada[fechados - usados]
+        return float((soma_fechados + self._closes_base[indice]) / (usados + 1))
+
+
+class SerieSMAPonderada:
+    """Média ponderada de séries de SMA, consultada pelo índice da barra base."""
+
+    def __init__(self, componentes):
+        """
+        Args:
+            componentes: Sequência de (SerieSMA, peso)
+        """
+        self._componentes = tuple(componentes)
+
+    def __len__(self) -> int:
+        return len(self._componentes[0][0])
+
+    def __getitem__(self, indice: int) -> float:
+        return sum(serie[indice] * peso for serie, peso in self._componentes)
+
+
 class AnaliseTecnica:
     """
     Calcula indicadores técnicos baseados em histórico de preços
@@ -33,6 +89,10 @@ class AnaliseTecnica:
         self.cache_timestamp = {}  # Timestamp do último cache
         self.cache_ttl_seconds = 300  # Cache válido por 5 minutos
 
+        # RSI incremental por (par, timeframe, período), compartilhado entre estratégias
+        self.motores_rsi: Dict[tuple, RSIIncremental] = {}
+        self._rsi_decimal_cache: Dict[tuple, tuple] = {}
+
     def obter_klines_cached(
         self,
         simbolo: str,
@@ -194,6 +254,53 @@ class AnaliseTecnica:
 
         return resultado
 
+    def calcular_serie_sma_multiplos_timeframes(
+        self,
+        periodo_dias: int = 28
+    ) -> Dict[str, 'SerieSMA']:
+        """
+        Série da SMA de referência para cada barra do backtest.
+
+        Reproduz calcular_sma_multiplos_timeframes barra a barra sem lookahead.
+        Em cada instante usa os N candles mais recentes (mesmo N de
+        obter_klines_cached). Os candles fechados entram com o fechamento final
+        e o candle em formação entra com o fechamento da barra base atual, como
+        a Binance devolve em tempo real.
+
+        Só a soma acumulada dos candles de cada timeframe fica em memória; o
+        valor de uma barra é resolvido na consulta (busca binária, O(log n)),
+        sem arrays do tamanho do histórico base.
+
+        Só disponível com a API simulada (precisa de obter_kline_store).
+
+        Args:
+            periodo_dias: Número de dias (default: 28 = 4 semanas)
+
+        Returns:
+            Dict com séries indexáveis pelo índice da barra base: {
+                '1h': SerieSMA,
+                '4h': SerieSMA,
+                'media': SerieSMAPonderada  # 40% 1h + 60% 4h
+            }
+            (NaN onde ainda não há candles)
+        """
+        store_base = self.api.obter_kline_store(self.api.timeframe_base)
+        ts_base = store_base.timestamps
+        closes_base = store_base.close
+
+        candles_por_dia = {'1h': 24, '4h': 6}
+        series = {}
+        for intervalo, por_dia in candles_por_dia.items():
+            n_candles = min(periodo_dias * por_dia, 1000)  # Mesmo limite de obter_klines_cached
+            series[intervalo] = SerieSMA(ts_base, closes_base, self.api.obter_kline_store(intervalo), n_candles)
+
+        series['media'] = SerieSMAPonderada(((series['1h'], 0.4), (series['4h'], 0.6)))
+
+        logger.info(
+            f"📊 Série de SMA {periodo_dias}d pré-calculada para {len(ts_base)} barras (40% 1h + 60% 4h)"
+        )
+        return series
+
     def calcular_queda_desde_sma(
         self,
         preco_atual: Decimal,
@@ -259,39 +366,77 @@ class AnaliseTecnica:
             'num_candles': len(klines)
         }
 
-    def get_rsi(self, par, timeframe='4h', periodo=14, limite_candles=100) -> Optional[Decimal]:
-        """Busca o valor do RSI para um par de moedas usando TA-Lib."""
+    @staticmethod
+    def normalizar_timeframe_rsi(timeframe) -> str:
+        """Sanitiza o timeframe do RSI (ex: "30Mh" → "30m", "4hh" → "4h")."""
+        timeframe_clean = str(timeframe).lower() if timeframe else '4h'
+        if timeframe_clean.endswith('mh'):
+            timeframe_clean = timeframe_clean[:-1]
+        elif timeframe_clean.endswith('hh'):
+            timeframe_clean = timeframe_clean[:-1]
+        return timeframe_clean
+
+    def obter_motor_rsi(self, par, timeframe='4h', periodo=14) -> Optional[RSIIncremental]:
+        """RSIIncremental usado por get_rsi para (par, timeframe, período), ou None se ainda não criado."""
+        return self.motores_rsi.get((par, self.normalizar_timeframe_rsi(timeframe), periodo))
+
+    def get_rsi(self, par, timeframe='4h', periodo=14, limite_candles=100, preco_atual=None) -> Optional[Decimal]:
+        """
+        Busca o valor do RSI para um par de moedas.
+
+        Usa um RSIIncremental por (par, timeframe, período): semeado uma vez
+        com 'limite_candles' candles e depois atualizado em O(1) a cada candle
+        fechado. Entre fechamentos o valor fica em cache. Em modo real, se
+        'preco_atual' for informado e o candle em formação ainda não fechou,
+        o RSI é calculado sem nova chamada REST.
+        """
         try:
-            # Sanitizar timeframe
-            timeframe_clean = str(timeframe).lower() if timeframe else '4h'
-            if timeframe_clean.endswith('mh'):
-                timeframe_clean = timeframe_clean[:-1]
-            elif timeframe_clean.endswith('hh'):
-                timeframe_clean = timeframe_clean[:-1]
-
-            klines = self.api.obter_klines(par, timeframe_clean, limite_candles)
-            
-            # TA-Lib precisa de um número mínimo de pontos de dados
-            if not klines or len(klines) <= periodo:
-                logger.debug(f"Dados insuficientes para calcular RSI de {periodo} períodos (recebido: {len(klines)}).")
+            timeframe_clean = self.normalizar_timeframe_rsi(timeframe)
+            chave = (par, timeframe_clean, periodo)
+            motor = self.motores_rsi.get(chave)
+            if motor is None:
+                motor = RSIIncremental(periodo)
+                self.motores_rsi[chave] = motor
+
+            # Backtest: a API simulada entrega views NumPy diretamente (sem montar listas)
+            if hasattr(self.api, 'obter_klines_array'):
+                janela = self.api.obter_klines_array(par, timeframe_clean, limite_candles)
+                timestamps, close_prices = janela.timestamps, janela.close
+            else:
+                # Modo real: candle em formação ainda aberto → usar preço atual, sem REST
+                if preco_atual is not None and motor.semeado and motor.ts_formando is not None:
+                    try:
+                        duracao_ms = timeframe_to_seconds(timeframe_clean) * 1000
+                    except ValueError:
+                        duracao_ms = 0
+                    if time.time() * 1000 < motor.ts_formando + duracao_ms:
+                        valor = motor.valor_com_close(float(preco_atual))
+                        return Decimal(str(valor)) if valor is not None else None
+
+                klines = self.api.obter_klines(par, timeframe_clean, limite_candles)
+                # TA-Lib / RSIIncremental esperam arrays float64
+                timestamps = np.array([int(k[0]) for k in klines], dtype=np.int64) if klines else np.empty(0, dtype=np.int64)
+                close_prices = np.array([float(k[4]) for k in klines]) if klines else np.empty(0)
+
+            # RSI precisa de um número mínimo de pontos de dados
+            if len(close_prices) <= periodo:
+                logger.debug(f"Dados insuficientes para calcular RSI de {periodo} períodos (recebido: {len(close_prices)}).")
                 return None
 
-            # Extrair apenas os preços de fechamento para um array numpy
-            # TA-Lib espera um array de float64
-            close_prices = np.array([float(k[4]) for k in klines])
-
-            # Calcular RSI com TA-Lib
-            rsi_values = talib.RSI(close_prices, timeperiod=periodo)
-
-            # O resultado pode ter NaNs no início, pegar o último valor
-            last_rsi = rsi_values[-1]
+            last_rsi = motor.atualizar(timestamps, close_prices)
 
-            # Verificar se o último valor é NaN
-            if np.isnan(last_rsi):
-                logger.warning(f"Cálculo de RSI (TA-Lib) para {par} com timeframe {timeframe_clean} resultou em NaN.")
+            if last_rsi is None:
+                logger.warning(f"Cálculo de RSI para {par} com timeframe {timeframe_clean} resultou em NaN.")
                 return None
 
-            return Decimal(str(last_rsi))
+            # Evitar reconverter para Decimal enquanto o candle não muda
+            em_cache = self._rsi_decimal_cache.get(chave)
+            if em_cache is not None and em_cache[0] == motor.chave_valor:
+                return em_cache[1]
+
+            rsi_decimal = Decimal(str(last_rsi))
+            self._rsi_decimal_cache[chave] = (motor.chave_valor, rsi_decimal)
+            return rsi_decimal
         except Exception as e:
-            logger.error(f"Erro ao calcular RSI com TA-Lib para {par}: {e}", exc_info=True)
-            return None
\ No newline at end of file
+            logger.error(f"Erro ao calcular RSI para {par}: {e}", exc_info=True)
+            return None
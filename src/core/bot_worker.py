@@ -15,21 +15,32 @@ import logging
 import pandas as pd
 from decimal import Decimal
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from typing import Callable, Optional, Dict, List, Any
 
+from src.core.tabela_trades import TabelaTrades, resumir_trades
 from src.exchange.base import ExchangeAPI
 from src.exchange.binance_api import BinanceAPI
 from src.core.gerenciador_aportes import GerenciadorAportes
 from src.core.gerenciador_bnb import GerenciadorBNB
 from src.core.analise_tecnica import AnaliseTecnica
+from src.core.checkpoint_simulacao import (
+    AgendadorCheckpoints,
+    aplicar_estado,
+    carregar_checkpoint,
+    localizar_checkpoint,
+)
 from src.core.gestao_capital import GestaoCapital
+from src.core.numerico import criar_contexto_numerico
+from src.core.perfil_ciclo import PERFIL_INATIVO, PerfilCiclo
 from src.core.position_manager import PositionManager
+from src.core.salto_barras import PlanejadorSaltos
 from src.core.strategy_dca import StrategyDCA
 from src.core.strategy_sell import StrategySell
 from src.core.strategy_swing_trade import StrategySwingTrade
 from src.persistencia.database import DatabaseManager
+from src.persistencia.armazenamento import ArmazenamentoEstadoMemoria
 from src.persistencia.state_manager import StateManager
-from src.utils.logger import get_loggers
+from src.utils.logger import PerfilLogSimulacao, SinkEventosTrade, get_loggers
 from src.utils.constants import Icones, LogConfig
 
 
@@ -71,6 +82,12 @@ class BotWorker:
         # Logger do worker com contexto
         self.logger = logging.LoggerAdapter(main_logger.logger, {'context': nome_instancia})
 
+        # Tipo numérico do ciclo de decisão: Decimal (padrão, sempre em tempo
+        # real) ou float (MODO_NUMERICO='float', apenas backtests)
+        self.num = criar_contexto_numerico(self.config, self.modo_simulacao, self.logger)
+        if not self.num.exato:
+            self.logger.info(f"⚡ Modo numérico rápido ativado: {self.num.modo}")
+
         # Loggers contextuais para especialistas
         dca_logger = logging.LoggerAdapter(main_logger.logger, {'context': f"{nome_instancia}-StrategyDCA"})
         sell_logger = logging.LoggerAdapter(main_logger.logger, {'context': f"{nome_instancia}-StrategySell"})
@@ -81,9 +98,10 @@ class BotWorker:
         self.gerenciador_bnb = GerenciadorBNB(self.exchange_api, self.config)
         self.analise_tecnica = AnaliseTecnica(self.exchange_api)
         self.gestao_capital = GestaoCapital(
-            percentual_reserva=Decimal(str(self.config.get('PERCENTUAL_RESERVA', 8))),
+            percentual_reserva=self.num(self.config.get('PERCENTUAL_RESERVA', 8)),
             modo_simulacao=modo_simulacao,
-            exchange_api=self.exchange_api
+            exchange_api=self.exchange_api,
+            contexto_numerico=self.num
         )
         
         # ===========================================================================
@@ -98,9 +116,9 @@ class BotWorker:
             self.logger.warning("⚠️  AVISO: 'alocacao_capital_pct' não foi encontrado em config['estrategia_giro_rapido']")
             self.logger.warning("           Verifique se perguntar_parametros_giro_rapido() foi chamado em backtest.py")
             self.logger.warning("           Usando fallback: 20% (padrão de segurança)")
-            alocacao_giro_pct = Decimal('20')
+            alocacao_giro_pct = self.num('20')
         else:
-            alocacao_giro_pct = Decimal(str(alocacao_giro_pct))
+            alocacao_giro_pct = self.num(alocacao_giro_pct)
 
         self.gestao_capital.configurar_alocacao_giro_rapido(alocacao_giro_pct)
         self.logger.info(f"✅ Alocação do Giro Rápido configurada: {alocacao_giro_pct}% do saldo livre")
@@ -113,13 +131,29 @@ class BotWorker:
                 self.logger.info("🔁 Alocação inicial propagada para a exchange simulada")
         except Exception as e:
             self.logger.warning(f"⚠️ Não foi possível propagar alocação para a exchange: {e}")
+        if hasattr(self.exchange_api, 'definir_contexto_numerico'):
+            self.exchange_api.definir_contexto_numerico(self.num)
 
         # Banco de dados e estado
+        # Backtest: tudo em memória (sem fsync/rename por alteração); o conteúdo
+        # pode ser exportado para DATABASE_PATH/STATE_FILE_PATH ao final
+        # (EXPORTAR_PERSISTENCIA_BACKTEST)
         self.db = DatabaseManager(
             db_path=Path(self.config['DATABASE_PATH']),
-            backup_dir=Path(self.config['BACKUP_DIR'])
+            backup_dir=Path(self.config['BACKUP_DIR']),
+            em_memoria=self.modo_simulacao
         )
-        self.state = StateManager(state_file_path=Path(self.config['STATE_FILE_PATH']))
+        if self.modo_simulacao:
+            self.state = StateManager(armazenamento=ArmazenamentoEstadoMemoria())
+        else:
+            # Produção: snapshot a cada alteração; com STATE_FLUSH_INTERVALO_SEGUNDOS
+            # > 0 (opt-in), escritas agrupadas com journal entre snapshots.
+            # Stops são sempre gravados imediatamente (fsync)
+            self.state = StateManager(
+                state_file_path=Path(self.config['STATE_FILE_PATH']),
+                intervalo_flush_segundos=self.config.get('STATE_FLUSH_INTERVALO_SEGUNDOS', 0),
+                chaves_criticas=self.config.get('STATE_CHAVES_CRITICAS', ['stops_ativos_persistentes'])
+            )
 
         # Gerenciamento de Stop Loss / Trailing Stop Loss
         self.stops_ativos = {'acumulacao': None, 'giro_rapido': None}
@@ -130,7 +164,7 @@ class BotWorker:
         # ═══════════════════════════════════════
 
         # Gerenciador de posições
-        self.position_manager = PositionManager(self.db)
+        self.position_manager = PositionManager(self.db, contexto_numerico=self.num)
 
         # Estratégias (agora com loggers contextuais)
         self.strategy_dca = StrategyDCA(
@@ -140,7 +174,8 @@ class BotWorker:
             state_manager=self.state,
             worker=self,
             logger=dca_logger,
-            notifier=self.notifier
+            notifier=self.notifier,
+            contexto_numerico=self.num
         )
 
         self.strategy_sell = StrategySell(
@@ -148,7 +183,8 @@ class BotWorker:
             position_manager=self.position_manager,
             state_manager=self.state,
             carteira='acumulacao',  # StrategySell gerencia vendas da carteira de acumulação
-            logger=sell_logger
+            logger=sell_logger,
+            contexto_numerico=self.num
         )
 
         # Estratégia de Giro Rápido (Swing Trade)
@@ -159,7 +195,13 @@ class BotWorker:
             analise_tecnica=self.analise_tecnica,  # NOVO: Passar AnaliseTecnica para cálculo de RSI
             logger=swing_logger,
             notifier=self.notifier,
-            exchange_api=self.exchange_api  # CRÍTICO: Passar API para buscar histórico
+            exchange_api=self.exchange_api,  # CRÍTICO: Passar API para buscar histórico
+            contexto_numerico=self.num
+        )
+
+        # Gatilho de promoção SL → TSL (convertido uma vez; verificado a cada ciclo)
+        self.tsl_gatilho_lucro_pct = self.num(
+            self.config.get('estrategia_giro_rapido', {}).get('tsl_gatilho_lucro_pct', 0)
         )
 
         # Estado do bot
@@ -167,10 +209,23 @@ class BotWorker:
         self.sma_1h: Optional[Decimal] = None
         self.sma_4h: Optional[Decimal] = None
         self.ultima_atualizacao_sma = None
+        # Backtest: série de SMA pré-calculada por barra (ver _preparar_sma_simulacao)
+        self.serie_sma_simulacao: Optional[Dict[str, Any]] = None
+        self.ts_ms_ultima_sma: Optional[int] = None
         self.ultimo_backup = datetime.now()
         self.rodando = False
+        # Simulação chegou à última barra sem interrupção (só esses resultados vão para o cache)
+        self.simulacao_completa = False
         self.inicio_bot = datetime.now()
         self.ultimo_percentual_logado = -1
+        self.callback_progresso: Optional[Callable[[int], None]] = None  # Recebe o % concluído (runner em lote)
+
+        # Perfil por etapa do ciclo de decisão (opcional; None = sem custo)
+        self.perfil_ciclo: Optional[PerfilCiclo] = (
+            PerfilCiclo() if self.config.get('PERFIL_CICLO_DECISAO', False) else None
+        )
+        # Backtest com PERFIL_LOG_SIMULACAO: trades vão para este destino em vez do log
+        self.eventos_trade: Optional[SinkEventosTrade] = None
         
         # Tempo simulado para backtesting
         self.tempo_simulado_atual: Optional[datetime] = None
@@ -230,9 +285,9 @@ class BotWorker:
                         # Reconstruir o estado do stop com conversão de tipos
                         self.stops_ativos[carteira] = {
                             'tipo': dados_stop.get('tipo'),
-                            'nivel_stop': Decimal(str(dados_stop['nivel_stop'])),
-                            'preco_pico': Decimal(str(dados_stop.get('preco_pico', 0))) if dados_stop.get('preco_pico') else None,
-                            'distancia_pct': Decimal(str(dados_stop.get('distancia_pct', 0))) if dados_stop.get('distancia_pct') else None
+                            'nivel_stop': self.num(dados_stop['nivel_stop']),
+                            'preco_pico': self.num(dados_stop.get('preco_pico', 0)) if dados_stop.get('preco_pico') else None,
+                            'distancia_pct': self.num(dados_stop.get('distancia_pct', 0)) if dados_stop.get('distancia_pct') else None
                         }
 
                         tipo_nome = "Stop Loss" if dados_stop.get('tipo') == 'sl' else "Trailing Stop Loss"
@@ -249,7 +304,7 @@ class BotWorker:
             self.logger.warning("⚠️ Continuando com estado limpo de stops")
             self.stops_ativos = {'acumulacao': None, 'giro_rapido': None}
 
-    def _salvar_estado_stops(self):
+    def _salvar_estado_stops(self, critico: bool = True):
         """
         Salva o estado atual dos Stop Loss e Trailing Stop Loss no StateManager.
 
@@ -257,6 +312,12 @@ class BotWorker:
         - Ativado
         - Desativado
         - Atualizado (ex: trailing stop ajustando o nível)
+
+        Args:
+            critico: True (stop criado, promovido ou removido) = snapshot imediato
+                com fsync; False (novo pico do TSL) = caminho agrupado, via journal
+                com STATE_FLUSH_INTERVALO_SEGUNDOS > 0. Numa alta contínua há um
+                pico quase a cada ciclo: um fsync por pico seria I/O síncrono demais
         """
         try:
             # Preparar dados para serialização JSON (converter Decimal para float)
@@ -274,7 +335,7 @@ class BotWorker:
                     stops_serializaveis[carteira] = None
 
             # Salvar no StateManager
-            self.state.set_state('stops_ativos_persistentes', stops_serializaveis)
+            self.state.set_state('stops_ativos_persistentes', stops_serializaveis, critico=critico)
 
             self.logger.debug(f"💾 Estado dos stops salvo: {len([s for s in stops_serializaveis.values() if s])} stops ativos")
 
@@ -310,13 +371,13 @@ class BotWorker:
             self.logger.info(f"📊 Saldo EXCHANGE (API real): {saldo_base_real:.1f} {base_currency} | ${saldo_quote_real:.2f} {quote_currency}")
 
             # 3. Comparar os dois valores
-            diferenca_absoluta = abs(Decimal(str(saldo_base_real)) - quantidade_local)
+            diferenca_absoluta = abs(self.num(saldo_base_real) - quantidade_local)
 
             # Calcular tolerância: usar percentual configurável do saldo da API (mínimo configurável)
             # Tolerância mais alta para evitar reimports por pequenas divergências
-            tolerancia_pct = Decimal(str(self.config.get('TOLERANCIA_DIVERGENCIA_PCT', 2.5))) / Decimal('100')
-            tolerancia_minima = Decimal(str(self.config.get('TOLERANCIA_DIVERGENCIA_MINIMA', 0.5)))
-            tolerancia = max(Decimal(str(saldo_base_real)) * tolerancia_pct, tolerancia_minima)
+            tolerancia_pct = self.num(self.config.get('TOLERANCIA_DIVERGENCIA_PCT', 2.5)) / self.num.cem
+            tolerancia_minima = self.num(self.config.get('TOLERANCIA_DIVERGENCIA_MINIMA', 0.5))
+            tolerancia = max(self.num(saldo_base_real) * tolerancia_pct, tolerancia_minima)
             
             self.logger.info(f"📏 Diferença detectada: {diferenca_absoluta:.2f} {base_currency} (tolerância: {tolerancia:.2f})")
 
@@ -357,7 +418,7 @@ class BotWorker:
                         quantidade_acum_corrigida = self.position_manager.get_quantidade_total('acumulacao')
                         quantidade_giro_corrigida = self.position_manager.get_quantidade_total('giro_rapido')
                         quantidade_corrigida = quantidade_acum_corrigida + quantidade_giro_corrigida
-                        diferenca_pos_correcao = abs(Decimal(str(saldo_base_real)) - quantidade_corrigida)
+                        diferenca_pos_correcao = abs(self.num(saldo_base_real) - quantidade_corrigida)
 
                         self.logger.info(f"✅ Auto-correção concluída!")
                         self.logger.info(f"   📊 Saldo LOCAL corrigido: {quantidade_corrigida:.1f} {base_currency}")
@@ -381,15 +442,15 @@ class BotWorker:
                 self.logger.info(f"✅ Saldo local sincronizado com a exchange (diferença: {diferenca_absoluta:.2f} dentro da tolerância)")
 
             # Atualizar gestão de capital com saldos reais
-            valor_posicao_base = Decimal(str(saldo_base_real)) * self._obter_preco_atual_seguro()
+            valor_posicao_base = self.num(saldo_base_real) * self._obter_preco_atual_seguro()
             
             # Em modo simulação, usar o método específico para atualizar saldo USDT
             if self.modo_simulacao:
-                self.gestao_capital.atualizar_saldo_usdt_simulado(Decimal(str(saldo_quote_real)))
+                self.gestao_capital.atualizar_saldo_usdt_simulado(self.num(saldo_quote_real))
                 # Atualizar valor da posição separadamente
-                self.gestao_capital.atualizar_saldos(Decimal(str(saldo_quote_real)), valor_posicao_base)
+                self.gestao_capital.atualizar_saldos(self.num(saldo_quote_real), valor_posicao_base)
             else:
-                self.gestao_capital.atualizar_saldos(Decimal(str(saldo_quote_real)), valor_posicao_base)
+                self.gestao_capital.atualizar_saldos(self.num(saldo_quote_real), valor_posicao_base)
 
             self.logger.info(f"💼 Saldo final confirmado: {saldo_base_real:.1f} {base_currency} | ${saldo_quote_real:.2f} {quote_currency}")
 
@@ -478,9 +539,9 @@ class BotWorker:
     def _obter_preco_atual_seguro(self) -> Decimal:
         """Obtém preço atual com fallback seguro"""
         try:
-            return Decimal(str(self.exchange_api.get_preco_atual(self.config['par'])))
+            return self.num(self.exchange_api.get_preco_atual(self.config['par']))
         except:
-            return Decimal('1.0')  # Fallback para evitar divisão por zero
+            return self.num('1.0')  # Fallback para evitar divisão por zero
     
     def _obter_tempo_atual(self) -> datetime:
         """
@@ -499,11 +560,18 @@ class BotWorker:
     def _atualizar_sma_referencia(self):
         """
         Atualiza SMA de referência (4 semanas)
-        """
-        agora = datetime.now()
 
+        Em backtest com a série pré-calculada, o intervalo de atualização é
+        medido no tempo simulado e o valor vem da série (O(1)).
+        """
         # Atualizar apenas se passou o intervalo configurado ou se nunca foi calculada
         intervalo_atualizacao_horas = self.config.get('INTERVALO_ATUALIZACAO_SMA_HORAS', 1)
+
+        if self.modo_simulacao and self.serie_sma_simulacao is not None:
+            self._atualizar_sma_referencia_simulada(intervalo_atualizacao_horas)
+            return
+
+        agora = datetime.now()
         if (
             self.ultima_atualizacao_sma is None
             or (agora - self.ultima_atualizacao_sma) >= timedelta(hours=intervalo_atualizacao_horas)
@@ -528,14 +596,59 @@ class BotWorker:
             else:
                 self.logger.error("❌ Não foi possível atualizar SMA")
 
-    def _calcular_distancia_sma(self, preco_atual: Decimal) -> Optional[Decimal]:
+    def _preparar_sma_simulacao(self):
+        """
+        Pré-calcula (uma vez por backtest) a série de SMA de referência
+        alinhada às barras do CSV.
+        """
+        if not hasattr(self.exchange_api, 'obter_kline_store'):
+            return
+
+        try:
+            periodo_dias_sma = self.config.get('PERIODO_DIAS_SMA_REFERENCIA', 28)
+            self.serie_sma_simulacao = self.analise_tecnica.calcular_serie_sma_multiplos_timeframes(
+                periodo_dias=periodo_dias_sma
+            )
+            self.ts_ms_ultima_sma = None
+        except Exception as e:
+            self.serie_sma_simulacao = None
+            self.logger.warning(f"⚠️ Não foi possível pré-calcular a série de SMA: {e}")
+
+    def _atualizar_sma_referencia_simulada(self, intervalo_atualizacao_horas: float):
+        """
+        Atualiza a SMA de referência a partir da série pré-calculada, respeitando
+        INTERVALO_ATUALIZACAO_SMA_HORAS no tempo simulado.
+        """
+        timestamps_ms = self.exchange_api.store_base.timestamps
+        indice = min(max(self.exchange_api.indice_atual - 1, 0), len(timestamps_ms) - 1)
+        ts_ms = int(timestamps_ms[indice])
+
+        if (
+            self.ts_ms_ultima_sma is not None
+            and ts_ms - self.ts_ms_ultima_sma < intervalo_atualizacao_horas * 3_600_000
+        ):
+            return
+
+        sma_media = self.serie_sma_simulacao['media'][indice]
+        if math.isnan(sma_media):
+            return
+
+        self.sma_1h = self.num(self.serie_sma_simulacao['1h'][indice])
+        self.sma_4h = self.num(self.serie_sma_simulacao['4h'][indice])
+        self.sma_referencia = self.num(sma_media)
+        self.ultima_atualizacao_sma = self.exchange_api._timestamp_barra(indice).to_pydatetime()
+        self.ts_ms_ultima_sma = ts_ms
+
+        self.logger.debug(f"🔄 SMA de referência (simulada) atualizada: ${self.sma_referencia:.6f} em {self.ultima_atualizacao_sma}")
+
+    def calcular_distancia_sma(self, preco_atual: Decimal) -> Optional[Decimal]:
         """
         Calcula distância percentual desde a SMA de referência
         """
         if self.sma_referencia is None:
             return None
 
-        distancia = ((self.sma_referencia - preco_atual) / self.sma_referencia) * Decimal('100')
+        distancia = ((self.sma_referencia - preco_atual) / self.sma_referencia) * self.num.cem
         return distancia
 
     def _executar_oportunidade_compra(self, oportunidade: Dict[str, Any]) -> bool:
@@ -567,7 +680,7 @@ class BotWorker:
             if self.modo_simulacao:
                 valor_quote = oportunidade.get('valor_ordem') or oportunidade.get('valor_operacao')
                 if valor_quote is None:
-                    valor_quote = Decimal(str(quantidade)) * Decimal(str(preco_atual))
+                    valor_quote = self.num(quantidade) * self.num(preco_atual)
 
             # Executar ordem na exchange
             if self.modo_simulacao:
@@ -599,14 +712,14 @@ class BotWorker:
                 executed_qty = ordem.get('executedQty')
                 quote_total = ordem.get('cummulativeQuoteQty')
                 if executed_qty is not None:
-                    quantidade_real = Decimal(str(executed_qty))
+                    quantidade_real = self.num(executed_qty)
                     if quote_total is not None and quantidade_real > 0:
-                        preco_real = Decimal(str(quote_total)) / quantidade_real
+                        preco_real = self.num(quote_total) / quantidade_real
                     else:
                         preco_real = preco_atual
                 else:
                     # Fallback: usar quantidade solicitada e preço atual
-                    quantidade_real = Decimal(str(quantidade))
+                    quantidade_real = self.num(quantidade)
                     preco_real = preco_atual
 
                 self.main_logger.operacao_compra(
@@ -632,7 +745,7 @@ class BotWorker:
 
                 # MODO SIMULAÇÃO: Sincronizar saldo USDT com GestaoCapital
                 if self.modo_simulacao:
-                    novo_saldo_usdt = Decimal(str(self.exchange_api.get_saldo_disponivel('USDT')))
+                    novo_saldo_usdt = self.num(self.exchange_api.get_saldo_disponivel('USDT'))
                     self.gestao_capital.set_saldo_usdt_simulado(novo_saldo_usdt, carteira)
 
                 # Registrar na estratégia para ativar cooldowns (passa tempo simulado em backtest)
@@ -652,7 +765,7 @@ class BotWorker:
                     # ═══════════════════════════════════════════════════════════════
                     # Após compra, ativar automaticamente o SL inicial
                     stop_loss_inicial_pct = self.strategy_swing_trade.stop_loss_inicial_pct
-                    nivel_sl = preco_real * (Decimal('1') - stop_loss_inicial_pct / Decimal('100'))
+                    nivel_sl = preco_real * (self.num.um - stop_loss_inicial_pct / self.num.cem)
 
                     self.stops_ativos['giro_rapido'] = {
                         'tipo': 'sl',
@@ -721,7 +834,7 @@ class BotWorker:
             # ═══════════════════════════════════════════════════════════════════
             # Previne vendas duplicadas e tentativas de vender mais do que se tem
             base_currency = self.config['par'].split('/')[0]
-            saldo_real_exchange = Decimal(str(self.exchange_api.get_saldo_disponivel(base_currency)))
+            saldo_real_exchange = self.num(self.exchange_api.get_saldo_disponivel(base_currency))
             saldo_carteira_db = self.position_manager.get_quantidade_total(carteira)
 
             self.logger.info(f"🔍 Verificação de saldo antes da venda [{carteira}]:")
@@ -807,23 +920,23 @@ class BotWorker:
                 executed_qty = ordem.get('executedQty')
                 quote_total = ordem.get('cummulativeQuoteQty')
                 if executed_qty is not None:
-                    quantidade_real = Decimal(str(executed_qty))
-                    valor_real = Decimal(str(quote_total)) if quote_total is not None else quantidade_real * preco_atual
+                    quantidade_real = self.num(executed_qty)
+                    valor_real = self.num(quote_total) if quote_total is not None else quantidade_real * preco_atual
                     preco_real = valor_real / quantidade_real if quantidade_real > 0 else preco_atual
                 else:
                     # Fallback: usar quantidade solicitada e preço atual
-                    quantidade_real = Decimal(str(quantidade))
+                    quantidade_real = self.num(quantidade)
                     valor_real = quantidade_real * preco_atual
                     preco_real = preco_atual
 
                 # Calcular lucro ANTES de atualizar PositionManager
                 # IMPORTANTE: Usar PM da carteira que está vendendo
                 preco_medio = self.position_manager.get_preco_medio(carteira)
-                lucro_pct = Decimal('0')
-                lucro_usdt = Decimal('0')
+                lucro_pct = self.num.zero
+                lucro_usdt = self.num.zero
 
                 if preco_medio:
-                    lucro_pct = ((preco_real - preco_medio) / preco_medio) * Decimal('100')
+                    lucro_pct = ((preco_real - preco_medio) / preco_medio) * self.num.cem
                     lucro_usdt = (preco_real - preco_medio) * quantidade_real
 
                 self.main_logger.operacao_venda(
@@ -850,7 +963,7 @@ class BotWorker:
 
                 # MODO SIMULAÇÃO: Sincronizar saldo USDT com GestaoCapital
                 if self.modo_simulacao:
-                    novo_saldo_usdt = Decimal(str(self.exchange_api.get_saldo_disponivel('USDT')))
+                    novo_saldo_usdt = self.num(self.exchange_api.get_saldo_disponivel('USDT'))
                     self.gestao_capital.set_saldo_usdt_simulado(novo_saldo_usdt, carteira)
 
                 # Registrar na estratégia
@@ -914,7 +1027,7 @@ class BotWorker:
             if self.modo_simulacao:
                 valor_quote = oportunidade.get('valor_ordem') or oportunidade.get('valor_operacao')
                 if valor_quote is None:
-                    valor_quote = Decimal(str(quantidade)) * Decimal(str(preco_atual))
+                    valor_quote = self.num(quantidade) * self.num(preco_atual)
 
             # Executar ordem na exchange
             if self.modo_simulacao:
@@ -946,12 +1059,12 @@ class BotWorker:
                 executed_qty = ordem.get('executedQty')
                 quote_total = ordem.get('cummulativeQuoteQty')
                 if executed_qty is not None:
-                    quantidade_real = Decimal(str(executed_qty))
-                    valor_real = Decimal(str(quote_total)) if quote_total is not None else quantidade_real * preco_atual
+                    quantidade_real = self.num(executed_qty)
+                    valor_real = self.num(quote_total) if quote_total is not None else quantidade_real * preco_atual
                     preco_real = valor_real / quantidade_real if quantidade_real > 0 else preco_atual
                 else:
                     # Fallback: usar quantidade solicitada e preço atual
-                    quantidade_real = Decimal(str(quantidade))
+                    quantidade_real = self.num(quantidade)
                     valor_real = quantidade_real * preco_atual
                     preco_real = preco_atual
 
@@ -969,7 +1082,7 @@ class BotWorker:
 
                 # MODO SIMULAÇÃO: Sincronizar saldo USDT com GestaoCapital
                 if self.modo_simulacao:
-                    novo_saldo_usdt = Decimal(str(self.exchange_api.get_saldo_disponivel('USDT')))
+                    novo_saldo_usdt = self.num(self.exchange_api.get_saldo_disponivel('USDT'))
                     self.gestao_capital.set_saldo_usdt_simulado(novo_saldo_usdt, carteira_recompra)
 
                 # Registrar na estratégia de vendas
@@ -1014,11 +1127,14 @@ class BotWorker:
         try:
             tipo_nome = "Stop Loss" if tipo_stop == 'sl' else "Trailing Stop Loss"
             tipo_sigla = "SL" if tipo_stop == 'sl' else "TSL"
+            # No perfil de log da simulação a venda vai para self.eventos_trade
+            narrar = self.eventos_trade is None
 
-            self.logger.warning(f"🚨 {tipo_nome} ACIONADO para carteira '{carteira}'")
-            self.logger.warning(f"   📊 Nível de stop: ${self.stops_ativos[carteira]['nivel_stop']:.4f}")
+            if narrar:
+                self.logger.warning(f"🚨 {tipo_nome} ACIONADO para carteira '{carteira}'")
+                self.logger.warning(f"   📊 Nível de stop: ${self.stops_ativos[carteira]['nivel_stop']:.4f}")
 
-            if tipo_stop == 'tsl':
+            if narrar and tipo_stop == 'tsl':
                 self.logger.warning(f"   📈 Preço pico: ${self.stops_ativos[carteira]['preco_pico']:.4f}")
                 self.logger.warning(f"   📏 Distância: {self.stops_ativos[carteira]['distancia_pct']:.2f}%")
 
@@ -1038,11 +1154,11 @@ class BotWorker:
             # OPÇÃO A: VENDA TOTAL (100%) PARA AMBAS AS CARTEIRAS
             if carteira == 'giro_rapido':
                 # Giro Rápido: vender 100% da posição
-                percentual_venda = Decimal('100')
+                percentual_venda = self.num.cem
                 quantidade_a_vender = quantidade_total_carteira
             else:
                 # Acumulação: vender 100% da posição (OPÇÃO A - Venda Total)
-                percentual_venda = Decimal('100')
+                percentual_venda = self.num.cem
                 quantidade_a_vender = quantidade_total_carteira
 
             # Obter preço atual para cálculo de lucro
@@ -1050,17 +1166,18 @@ class BotWorker:
             preco_medio = self.position_manager.get_preco_medio(carteira)
 
             # Calcular lucro antes da venda
-            lucro_pct = Decimal('0')
+            lucro_pct = self.num.zero
             if preco_medio:
-                lucro_pct = ((preco_atual - preco_medio) / preco_medio) * Decimal('100')
+                lucro_pct = ((preco_atual - preco_medio) / preco_medio) * self.num.cem
 
-            self.logger.warning(f"💰 Executando venda por {tipo_nome}:")
-            self.logger.warning(f"   • Quantidade total [{carteira}]: {quantidade_total_carteira:.4f}")
-            self.logger.warning(f"   • Percentual de venda: {percentual_venda:.1f}%")
-            self.logger.warning(f"   • Quantidade a vender: {quantidade_a_vender:.4f}")
-            self.logger.warning(f"   • Preço médio: ${preco_medio:.6f}")
-            self.logger.warning(f"   • Preço atual: ${preco_atual:.6f}")
-            self.logger.warning(f"   • Lucro: {lucro_pct:.2f}%")
+            if narrar:
+                self.logger.warning(f"💰 Executando venda por {tipo_nome}:")
+                self.logger.warning(f"   • Quantidade total [{carteira}]: {quantidade_total_carteira:.4f}")
+                self.logger.warning(f"   • Percentual de venda: {percentual_venda:.1f}%")
+                self.logger.warning(f"   • Quantidade a vender: {quantidade_a_vender:.4f}")
+                self.logger.warning(f"   • Preço médio: ${preco_medio:.6f}")
+                self.logger.warning(f"   • Preço atual: ${preco_atual:.6f}")
+                self.logger.warning(f"   • Lucro: {lucro_pct:.2f}%")
 
             # ═══════════════════════════════════════════════════════════════════
             # 2. EXECUTAR ORDEM DE VENDA NA EXCHANGE
@@ -1093,25 +1210,26 @@ class BotWorker:
                 executed_qty = ordem.get('executedQty')
                 quote_total = ordem.get('cummulativeQuoteQty')
                 if executed_qty is not None:
-                    quantidade_real = Decimal(str(executed_qty))
-                    valor_real = Decimal(str(quote_total)) if quote_total is not None else quantidade_real * preco_atual
+                    quantidade_real = self.num(executed_qty)
+                    valor_real = self.num(quote_total) if quote_total is not None else quantidade_real * preco_atual
                     preco_real = valor_real / quantidade_real if quantidade_real > 0 else preco_atual
                 else:
-                    quantidade_real = Decimal(str(quantidade_a_vender))
+                    quantidade_real = self.num(quantidade_a_vender)
                     valor_real = quantidade_real * preco_atual
                     preco_real = preco_atual
 
                 # Recalcular lucro com preço real
-                lucro_usdt = Decimal('0')
+                lucro_usdt = self.num.zero
                 if preco_medio:
-                    lucro_pct = ((preco_real - preco_medio) / preco_medio) * Decimal('100')
+                    lucro_pct = ((preco_real - preco_medio) / preco_medio) * self.num.cem
                     lucro_usdt = (preco_real - preco_medio) * quantidade_real
 
-                self.logger.warning(f"✅ Venda por {tipo_nome} EXECUTADA com sucesso!")
-                self.logger.warning(f"   • Quantidade vendida: {quantidade_real:.4f} {base_currency}")
-                self.logger.warning(f"   • Preço de venda: ${preco_real:.6f}")
-                self.logger.warning(f"   • Valor total: ${valor_real:.2f}")
-                self.logger.warning(f"   • Lucro: ${lucro_usdt:.2f} ({lucro_pct:.2f}%)")
+                if narrar:
+                    self.logger.warning(f"✅ Venda por {tipo_nome} EXECUTADA com sucesso!")
+                    self.logger.warning(f"   • Quantidade vendida: {quantidade_real:.4f} {base_currency}")
+                    self.logger.warning(f"   • Preço de venda: ${preco_real:.6f}")
+                    self.logger.warning(f"   • Valor total: ${valor_real:.2f}")
+                    self.logger.warning(f"   • Lucro: ${lucro_usdt:.2f} ({lucro_pct:.2f}%)")
 
                 # Log estruturado de operação
                 self.main_logger.operacao_venda(
@@ -1169,7 +1287,8 @@ class BotWorker:
                     'timestamp': self._obter_tempo_atual().isoformat()
                 }, estrategia=estrategia_nome)
 
-                self.logger.warning(f"🛡️ Stop {tipo_sigla} desativado para carteira '{carteira}'")
+                if narrar:
+                    self.logger.warning(f"🛡️ Stop {tipo_sigla} desativado para carteira '{carteira}'")
 
             else:
                 # Falha na execução da ordem
@@ -1224,7 +1343,7 @@ class BotWorker:
             # Ativar Stop Loss para a carteira
             self.stops_ativos[carteira] = {
                 'tipo': 'sl',
-                'nivel_stop': Decimal(str(stop_loss_nivel)),
+                'nivel_stop': self.num(stop_loss_nivel),
                 'preco_pico': None,  # SL fixo não usa pico
                 'distancia_pct': None  # SL fixo não usa distância
             }
@@ -1266,7 +1385,7 @@ class BotWorker:
                 self.logger.error(f"❌ Tentativa de ativar TSL sem distância_pct definida [{carteira}]")
                 return
 
-            distancia_pct = Decimal(str(distancia_pct))
+            distancia_pct = self.num(distancia_pct)
 
             # ═══════════════════════════════════════════════════════════════════
             # VERIFICAÇÃO CRÍTICA: Se já existe um TSL ativo, NÃO reativar
@@ -1278,7 +1397,7 @@ class BotWorker:
                 return
 
             # Calcular nível inicial do TSL baseado no preço atual
-            nivel_stop_inicial = preco_atual * (Decimal('1') - distancia_pct / Decimal('100'))
+            nivel_stop_inicial = preco_atual * (self.num.um - distancia_pct / self.num.cem)
 
             # ═══════════════════════════════════════════════════════════════════
             # ATIVAÇÃO ÚNICA: Criar novo TSL
@@ -1333,13 +1452,20 @@ class BotWorker:
                 'preco_medio_depois': self.position_manager.get_preco_medio(),
                 'saldo_ada_antes': self.position_manager.get_quantidade_total(),
                 'saldo_ada_depois': self.position_manager.get_quantidade_total(),
-                'saldo_usdt_antes': Decimal('0'),  # Placeholder
-                'saldo_usdt_depois': Decimal('0'),  # Placeholder
+                'saldo_usdt_antes': self.num.zero,  # Placeholder
+                'saldo_usdt_depois': self.num.zero,  # Placeholder
                 'estrategia': estrategia
             })
 
             self.db.registrar_ordem(ordem_dados)
 
+            if self.eventos_trade is not None:
+                self.eventos_trade.registrar(
+                    ordem_dados['timestamp'], ordem_dados['tipo'], estrategia, ordem_dados['preco'],
+                    ordem_dados['quantidade'], ordem_dados.get('meta'), ordem_dados.get('lucro_usdt'),
+                    ordem_dados.get('observacao')
+                )
+
         except Exception as e:
             self.logger.error(f"❌ Erro ao salvar ordem no banco: {e}")
 
@@ -1407,6 +1533,7 @@ class BotWorker:
                         tempo_atual = datetime.now()
                         
                         self._executar_ciclo_decisao(preco_atual, tempo_atual)
+                        self.state.flush_se_necessario()
                         
                         intervalo_ciclo_segundos = self.config.get('INTERVALO_CICLO_SEGUNDOS', 5)
                         time.sleep(intervalo_ciclo_segundos)
@@ -1426,46 +1553,104 @@ class BotWorker:
             self.logger.error(f"❌ Erro fatal no bot: {e}", exc_info=True)
             raise
 
+        finally:
+            if not self.modo_simulacao:
+                self._encerrar_persistencia_estado()
+
+    def _encerrar_persistencia_estado(self):
+        """Grava o snapshot final do estado (alterações ainda no journal) e loga as métricas."""
+        try:
+            self.state.flush()
+            metricas = self.state.obter_metricas()
+            self.logger.info(
+                f"💾 Estado persistido: {metricas['alteracoes']} alterações, "
+                f"{metricas['flushes']} snapshots (média {metricas['latencia_media_ms']:.1f}ms, "
+                f"máx {metricas['latencia_max_ms']:.1f}ms)"
+            )
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao gravar snapshot final do estado: {e}")
+
     def _run_simulacao(self):
         """
         Executa o loop principal para o modo de simulação (backtesting).
         Itera sobre os dados históricos e usa o timestamp da vela como o tempo atual.
+
+        Opções da config (desligadas por padrão):
+            SALTAR_BARRAS_OCIOSAS: pula direto para a próxima barra em que algum
+                gatilho pode disparar (PlanejadorSaltos); mesmos trades e
+                snapshots, confira com backtest.py --validar-salto-barras
+            PERFIL_LOG_SIMULACAO: descarta DEBUG/INFO no loop e grava os trades
+                em self.eventos_trade (PerfilLogSimulacao)
         """
         self.logger.info("🏁 Iniciando worker em MODO DE SIMULAÇÃO.")
-        # Atualizar SMA de referência antes de iniciar o loop de simulação
+        # Pré-calcular a série de SMA (uma vez) e definir o valor inicial antes do loop
+        self._preparar_sma_simulacao()
         try:
             self._atualizar_sma_referencia()
         except Exception as e:
             self.logger.warning(f"⚠️ Não foi possível calcular SMA de referência antes da simulação: {e}")
+
+        # Retomar de um checkpoint (CHECKPOINT_RETOMAR): estado de uma execução
+        # anterior até a barra salva; a config atual define os parâmetros
+        retomada = self._retomar_checkpoint()
         
         # Loop principal do backtest
-        total_passos = len(self.exchange_api.dados)
+        total_passos = self.exchange_api.total_barras
         # Registrar snapshot inicial do portfólio (estado antes do primeiro candle)
         try:
-            if hasattr(self.exchange_api, 'record_snapshot'):
+            if hasattr(self.exchange_api, 'record_snapshot') and not retomada:
                 # timestamp inicial: usar primeira barra disponível se possível
                 primeiro_ts = None
                 try:
-                    primeira_barra = self.exchange_api.dados.iloc[self.exchange_api.indice_atual]['timestamp'] if hasattr(self.exchange_api, 'dados') and len(self.exchange_api.dados) > self.exchange_api.indice_atual else None
-                    primeiro_ts = pd.to_datetime(primeira_barra) if primeira_barra is not None else None
+                    if total_passos > self.exchange_api.indice_atual:
+                        primeiro_ts = self.exchange_api._timestamp_barra(self.exchange_api.indice_atual)
                 except Exception:
                     primeiro_ts = None
                 self.exchange_api.record_snapshot(timestamp=primeiro_ts.isoformat() if primeiro_ts is not None else None)
         except Exception:
             pass
 
+        # Salto de barras ociosas (opt-in): pular direto para a próxima barra com possível evento
+        planejador = None
+        if self.config.get('SALTAR_BARRAS_OCIOSAS', False) and hasattr(self.exchange_api, 'avancar_sem_eventos'):
+            planejador = PlanejadorSaltos(self)
+
+        # Perfil de log da simulação (opt-in): sem DEBUG/INFO no caminho quente,
+        # trades no destino estruturado; o progresso segue pelo logger do painel
+        perfil_log = None
+        logar_progresso = self.logger.info
+        if self.config.get('PERFIL_LOG_SIMULACAO', False):
+            perfil_log = PerfilLogSimulacao()
+            self.eventos_trade = perfil_log.ativar()
+            logar_progresso = self.panel_logger.info
+
+        # Checkpoints periódicos (CHECKPOINT_DIRETORIO)
+        agendador = None
+        if self.config.get('CHECKPOINT_DIRETORIO'):
+            agendador = AgendadorCheckpoints(
+                self.config['CHECKPOINT_DIRETORIO'],
+                intervalo_barras=self.config.get('CHECKPOINT_INTERVALO_BARRAS', 100_000),
+                intervalo_segundos=self.config.get('CHECKPOINT_INTERVALO_SEGUNDOS', 600),
+                manter=self.config.get('CHECKPOINT_MANTER', 0),
+            )
+            agendador.iniciar(self.exchange_api.indice_atual)
+
+        self.simulacao_completa = False
+        interrompida = False
         while self.rodando and (barra := self.exchange_api.get_barra_atual()) is not None:
             try:
                 # Log de progresso
                 passo_atual = self.exchange_api.indice_atual
                 percentual_atual = int((passo_atual / total_passos) * 100)
                 if percentual_atual > self.ultimo_percentual_logado:
-                    self.logger.info(f"⏳ Progresso do Backtest: {percentual_atual}% concluído...")
+                    logar_progresso(f"⏳ Progresso do Backtest: {percentual_atual}% concluído...")
                     self.ultimo_percentual_logado = percentual_atual
+                    if self.callback_progresso:
+                        self.callback_progresso(percentual_atual)
 
-                # TEMPO SIMULADO: Capturar timestamp da barra
-                tempo_simulado = pd.to_datetime(barra['timestamp'])
-                preco_atual = Decimal(str(barra['close']))
+                # TEMPO SIMULADO: datetime e preço já vêm prontos na barra (sem pandas por barra)
+                tempo_simulado = barra.timestamp
+                preco_atual = barra.preco_decimal if self.num.exato else barra.close
                 
                 # Executa o ciclo de decisão com os dados e tempo da simulação
                 # Passando tempo_simulado para todas as funções que verificam cooldowns
@@ -1474,39 +1659,135 @@ class BotWorker:
                 # Registrar snapshot do portfólio após o ciclo de decisão (se disponível)
                 try:
                     if hasattr(self.exchange_api, 'record_snapshot'):
-                        # Passar timestamp em isoformat para maior interoperabilidade
-                        self.exchange_api.record_snapshot(timestamp=tempo_simulado.isoformat())
+                        # Timestamp padrão = o da barra atual (isoformat montado só no acesso)
+                        self.exchange_api.record_snapshot()
                 except Exception as e:
                     self.logger.debug(f"⚠️ Falha ao gravar snapshot no simulador: {e}")
 
+                if planejador is not None:
+                    try:
+                        proxima = planejador.proxima_barra(barra.indice)
+                    except Exception as e:
+                        self.logger.warning(f"⚠️ Salto de barras desativado (seguindo barra a barra): {e}")
+                        planejador = None
+                    else:
+                        if proxima > self.exchange_api.indice_atual:
+                            self.exchange_api.avancar_sem_eventos(proxima)
+
+                # Entre barras: estado consistente para um checkpoint
+                if agendador is not None:
+                    agendador.verificar(self)
+
             except KeyboardInterrupt:
                 self.logger.info("🛑 Interrupção solicitada pelo usuário durante a simulação.")
+                self._logar_ultimo_checkpoint(agendador)
                 self.rodando = False
+                interrompida = True
                 break
             except Exception as e:
                 self.logger.error(f'❌ Erro inesperado no loop de simulação: {e}', exc_info=True)
+                self._logar_ultimo_checkpoint(agendador)
                 self.rodando = False
+                interrompida = True
                 break
+
+        self.simulacao_completa = not interrompida and self.exchange_api.indice_atual >= total_passos
+        if not self.simulacao_completa:
+            self.logger.warning(
+                f"⚠️ Simulação incompleta: parou na barra {self.exchange_api.indice_atual} de {total_passos}"
+            )
         
+        if perfil_log is not None:
+            perfil_log.desativar()
+            self.logger.info(f"🧾 {len(self.eventos_trade)} eventos de trade registrados (perfil de log da simulação)")
+
         self.logger.info("🏁 Simulação finalizada.")
         if hasattr(self.exchange_api, 'get_resultados'):
             self._logar_resultados_simulacao()
+        if self.perfil_ciclo is not None:
+            self._logar_perfil_ciclo()
+
+        if self.config.get('EXPORTAR_PERSISTENCIA_BACKTEST', False):
+            self.exportar_persistencia()
+
+    def _retomar_checkpoint(self) -> bool:
+        """
+        Aplica o checkpoint de CHECKPOINT_RETOMAR (arquivo ou diretório), se
+        configurado. CHECKPOINT_RETOMAR_EM escolhe o último até a data (fork).
+
+        Returns:
+            True se a simulação foi retomada
+
+        Raises:
+            FileNotFoundError / ValueError: Checkpoint ausente ou incompatível
+                (nunca recomeça do zero em silêncio)
+        """
+        origem = self.config.get('CHECKPOINT_RETOMAR')
+        if not origem:
+            return False
+
+        ate = self.config.get('CHECKPOINT_RETOMAR_EM')
+        if ate:
+            ate = pd.Timestamp(ate)
+            ate = (ate.tz_convert(None) if ate.tz else ate).to_pydatetime()
+        caminho = localizar_checkpoint(origem, ate or None)
+        aplicar_estado(self, carregar_checkpoint(caminho))
+        self.logger.info(
+            f"⏯️ Simulação retomada do checkpoint {caminho.name} "
+            f"(barra {self.exchange_api.indice_atual:,} de {self.exchange_api.total_barras:,})"
+        )
+        return True
+
+    def _logar_ultimo_checkpoint(self, agendador: Optional[AgendadorCheckpoints]):
+        """Indica de onde retomar depois de uma interrupção."""
+        if agendador is not None and agendador.ultimo is not None:
+            self.logger.warning(f"💾 Último checkpoint: {agendador.ultimo} (retome com backtest.py --resume)")
+
+    def exportar_persistencia(self):
+        """
+        Grava em disco o banco e o estado mantidos em memória durante o
+        backtest (DATABASE_PATH e STATE_FILE_PATH da config).
+        """
+        try:
+            caminho_db = self.db.exportar(Path(self.config['DATABASE_PATH']))
+            self.state.exportar(self.config['STATE_FILE_PATH'])
+            self.logger.info(f"💾 Persistência do backtest exportada: {caminho_db} / {self.config['STATE_FILE_PATH']}")
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao exportar persistência do backtest: {e}")
 
     def _executar_ciclo_decisao(self, preco_atual: Decimal, tempo_atual: datetime):
         """
         Contém a lógica de decisão principal do bot, chamada em cada ciclo.
         É agnóstico ao modo (simulação ou tempo real), operando com o tempo e preço fornecidos.
+        Com PERFIL_CICLO_DECISAO, o tempo de cada etapa é acumulado em self.perfil_ciclo;
+        sem ele, as etapas marcam um PERFIL_INATIVO (métodos vazios).
         """
+        perfil = self.perfil_ciclo
+        if perfil is None:
+            self._executar_etapas_ciclo(preco_atual, tempo_atual, PERFIL_INATIVO)
+            return
+        perfil.iniciar()
+        try:
+            self._executar_etapas_ciclo(preco_atual, tempo_atual, perfil)
+        finally:
+            perfil.encerrar()
+
+    def _executar_etapas_ciclo(self, preco_atual: Decimal, tempo_atual: datetime, perfil: PerfilCiclo):
+        """Etapas do ciclo de decisão (ver _executar_ciclo_decisao)."""
         # Atualizar o tempo do worker (relevante para simulação)
         self.tempo_simulado_atual = tempo_atual if self.modo_simulacao else None
 
         # Processar comandos remotos
+        perfil.entrar('comandos')
         self._processar_comandos()
 
         # ═══════════════════════════════════════════════════════════════════
         # VERIFICAÇÃO E ATUALIZAÇÃO DE STOP LOSS E TRAILING STOP LOSS
         # ═══════════════════════════════════════════════════════════════════
         for carteira in ['acumulacao', 'giro_rapido']:
+            # Por carteira: a venda por stop de uma (execucao) não leva junto
+            # a verificação da seguinte
+            perfil.entrar('stops')
             stop_ativo = self.stops_ativos.get(carteira)
 
             if stop_ativo:
@@ -1518,16 +1799,19 @@ class BotWorker:
                     if preco_atual > stop_ativo['preco_pico']:
                         # Atualizar pico e recalcular nível de stop
                         stop_ativo['preco_pico'] = preco_atual
-                        stop_ativo['nivel_stop'] = preco_atual * (Decimal('1') - stop_ativo['distancia_pct'] / Decimal('100'))
-                        self._salvar_estado_stops()
+                        stop_ativo['nivel_stop'] = preco_atual * (self.num.um - stop_ativo['distancia_pct'] / self.num.cem)
+                        # Pico/nível: journal (sem fsync), consolidado no próximo flush
+                        self._salvar_estado_stops(critico=False)
                         self.logger.debug(f"🔄 TSL ATUALIZADO [{carteira}]: Pico ${preco_atual:.4f}, Nível ${stop_ativo['nivel_stop']:.4f}")
                     
                     # b) Verificar se preço caiu abaixo do nível de stop
                     if preco_atual <= stop_ativo['nivel_stop']:
-                        self.logger.warning(f"⚠️ Trailing Stop Loss ACIONADO [{carteira}]!")
-                        self.logger.warning(f"   📈 Pico máximo: ${stop_ativo['preco_pico']:.6f}")
-                        self.logger.warning(f"   📍 Nível stop: ${stop_ativo['nivel_stop']:.6f}")
-                        self.logger.warning(f"   📉 Preço atual: ${preco_atual:.6f}")
+                        if self.eventos_trade is None:
+                            self.logger.warning(f"⚠️ Trailing Stop Loss ACIONADO [{carteira}]!")
+                            self.logger.warning(f"   📈 Pico máximo: ${stop_ativo['preco_pico']:.6f}")
+                            self.logger.warning(f"   📍 Nível stop: ${stop_ativo['nivel_stop']:.6f}")
+                            self.logger.warning(f"   📉 Preço atual: ${preco_atual:.6f}")
+                        perfil.entrar('execucao')
                         self._executar_venda_stop(carteira, 'tsl')
                         continue  # Pular resto do ciclo após executar venda
                 
@@ -1537,9 +1821,11 @@ class BotWorker:
                 elif stop_ativo['tipo'] == 'sl':
                     # VERIFICAÇÃO 1: Se Stop Loss foi disparado → VENDER
                     if preco_atual <= stop_ativo['nivel_stop']:
-                        self.logger.warning(f"⚠️ Stop Loss ACIONADO [{carteira}]!")
-                        self.logger.warning(f"   📍 Nível stop: ${stop_ativo['nivel_stop']:.6f}")
-                        self.logger.warning(f"   📉 Preço atual: ${preco_atual:.6f}")
+                        if self.eventos_trade is None:
+                            self.logger.warning(f"⚠️ Stop Loss ACIONADO [{carteira}]!")
+                            self.logger.warning(f"   📍 Nível stop: ${stop_ativo['nivel_stop']:.6f}")
+                            self.logger.warning(f"   📉 Preço atual: ${preco_atual:.6f}")
+                        perfil.entrar('execucao')
                         self._executar_venda_stop(carteira, 'sl')
                         continue  # Pular resto do ciclo após executar venda
 
@@ -1549,11 +1835,10 @@ class BotWorker:
                         preco_medio = self.position_manager.get_preco_medio('giro_rapido')
                         if preco_medio:
                             # Calcular lucro percentual
-                            lucro_pct = ((preco_atual - preco_medio) / preco_medio) * Decimal('100')
+                            lucro_pct = ((preco_atual - preco_medio) / preco_medio) * self.num.cem
 
-                            # Obter gatilho de lucro mínimo da config (padrão: 0% para breakeven)
-                            estrategia_config = self.config.get('estrategia_giro_rapido', {})
-                            tsl_gatilho_lucro = Decimal(str(estrategia_config.get('tsl_gatilho_lucro_pct', 0)))
+                            # Gatilho de lucro mínimo da config (padrão: 0% para breakeven)
+                            tsl_gatilho_lucro = self.tsl_gatilho_lucro_pct
 
                             # Verificar se atingiu o gatilho de lucro mínimo
                             if lucro_pct >= tsl_gatilho_lucro:
@@ -1568,7 +1853,7 @@ class BotWorker:
                                 self.logger.info(f"   TSL Distância: {distancia_tsl_pct:.2f}%")
 
                                 # Desativar SL e ativar TSL
-                                nivel_tsl_inicial = preco_atual * (Decimal('1') - distancia_tsl_pct / Decimal('100'))
+                                nivel_tsl_inicial = preco_atual * (self.num.um - distancia_tsl_pct / self.num.cem)
 
                                 self.stops_ativos['giro_rapido'] = {
                                     'tipo': 'tsl',
@@ -1592,8 +1877,16 @@ class BotWorker:
 
                                 continue  # Pular resto do ciclo após promoção
 
+        # Atualizar SMA de referência se passou INTERVALO_ATUALIZACAO_SMA_HORAS
+        # (tempo simulado no backtest, relógio do sistema em tempo real)
+        perfil.entrar('sma')
+        try:
+            self._atualizar_sma_referencia()
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao atualizar SMA de referência: {e}")
+
         # Calcular distância da SMA
-        distancia_sma = self._calcular_distancia_sma(preco_atual)
+        distancia_sma = self.calcular_distancia_sma(preco_atual)
 
         # ═══════════════════════════════════════════════════════════════════
         # ESTRATÉGIA DCA/ACUMULAÇÃO (apenas se ativa)
@@ -1601,20 +1894,25 @@ class BotWorker:
         if self.estrategia_ativa in ['dca', 'ambas']:
             # 2. Verificar oportunidade de compra (DCA) - Carteira Acumulação
             if distancia_sma:
+                perfil.entrar('dca')
                 oportunidade_compra = self.strategy_dca.verificar_oportunidade(
                     preco_atual=preco_atual,
                     distancia_sma=distancia_sma,
                     tempo_atual=self._obter_tempo_atual()  # Usa tempo simulado em backtest
                 )
-                if oportunidade_compra and self._executar_oportunidade_compra(oportunidade_compra):
-                    self.logger.info("✅ Compra executada com sucesso (Acumulação)!")
-                    pausa_apos_operacao = self.config.get('PAUSA_APOS_OPERACAO_SEGUNDOS', 10)
-                    if not self.modo_simulacao: time.sleep(pausa_apos_operacao)
-                    return
+                if oportunidade_compra:
+                    perfil.entrar('execucao')
+                    if self._executar_oportunidade_compra(oportunidade_compra):
+                        self.logger.info("✅ Compra executada com sucesso (Acumulação)!")
+                        pausa_apos_operacao = self.config.get('PAUSA_APOS_OPERACAO_SEGUNDOS', 10)
+                        if not self.modo_simulacao: time.sleep(pausa_apos_operacao)
+                        return
 
             # 3. Verificar oportunidade de venda - Carteira Acumulação
+            perfil.entrar('venda')
             oportunidade_venda = self.strategy_sell.verificar_oportunidade(preco_atual)
             if oportunidade_venda:
+                perfil.entrar('execucao')
                 # Verificar se é ativação de TSL
                 if oportunidade_venda.get('acao') == 'ativar_tsl':
                     self._ativar_trailing_stop(oportunidade_venda, preco_atual)
@@ -1627,12 +1925,15 @@ class BotWorker:
                     return
 
             # 4. Verificar recompras de segurança - Carteira Acumulação
+            perfil.entrar('recompra')
             oportunidade_recompra = self.strategy_sell.verificar_recompra_de_seguranca(preco_atual)
-            if oportunidade_recompra and self._executar_oportunidade_recompra(oportunidade_recompra):
-                self.logger.info("✅ Recompra executada com sucesso!")
-                pausa_apos_operacao = self.config.get('PAUSA_APOS_OPERACAO_SEGUNDOS', 10)
-                if not self.modo_simulacao: time.sleep(pausa_apos_operacao)
-                return
+            if oportunidade_recompra:
+                perfil.entrar('execucao')
+                if self._executar_oportunidade_recompra(oportunidade_recompra):
+                    self.logger.info("✅ Recompra executada com sucesso!")
+                    pausa_apos_operacao = self.config.get('PAUSA_APOS_OPERACAO_SEGUNDOS', 10)
+                    if not self.modo_simulacao: time.sleep(pausa_apos_operacao)
+                    return
 
         # ESTRATÉGIA GIRO RÁPIDO (apenas se ativa)
         # ═══════════════════════════════════════════════════════════════════
@@ -1641,9 +1942,11 @@ class BotWorker:
             if self.strategy_swing_trade.habilitado:
                 # Passar tempo atual (timestamp em segundos) para swing trade
                 tempo_atual_timestamp = self.tempo_simulado_atual.timestamp() if self.modo_simulacao and self.tempo_simulado_atual else None
+                perfil.entrar('giro')
                 oportunidade_swing = self.strategy_swing_trade.verificar_oportunidade(preco_atual, tempo_atual_timestamp)
                 if oportunidade_swing:
                     if oportunidade_swing.get('tipo') == 'compra':
+                        perfil.entrar('execucao')
                         if self._executar_oportunidade_compra(oportunidade_swing):
                             self.logger.info("✅ Compra executada com sucesso (Giro Rápido)!")
                             # NOTA: Stop Loss Inicial é ativado automaticamente em _executar_oportunidade_compra
@@ -1653,6 +1956,7 @@ class BotWorker:
 
         # 5. Tarefas periódicas (só executam em tempo real)
         if not self.modo_simulacao:
+            perfil.entrar('tarefas_periodicas')
             if self.intervalo_verificacao_aportes is not None:
                 self._verificar_aportes_brl()
             self._fazer_backup_periodico()
@@ -1683,20 +1987,22 @@ class BotWorker:
 
         # Análise de Trades
         if trades:
-            total_trades = len(trades)
-            compras = [t for t in trades if t['side'] == 'BUY']
-            vendas = [t for t in trades if t['side'] == 'SELL']
-            total_taxas = sum(t['fee'] for t in trades)
-
-            self.logger.info(f"Total de Trades Executados: {total_trades}")
-            self.logger.info(f"  - Compras: {len(compras)}")
-            self.logger.info(f"  - Vendas: {len(vendas)}")
-            self.logger.info(f"Total de Taxas Pagas:       ${total_taxas:.4f}")
+            resumo = resumir_trades(TabelaTrades(trades))
+
+            self.logger.info(f"Total de Trades Executados: {resumo['total_trades']}")
+            self.logger.info(f"  - Compras: {resumo['compras']}")
+            self.logger.info(f"  - Vendas: {resumo['vendas']}")
+            self.logger.info(f"Total de Taxas Pagas:       ${resumo['taxas_usdt']:.4f}")
         else:
             self.logger.info("Nenhum trade foi executado durante a simulação.")
 
         self.logger.info("="*62)
 
+    def _logar_perfil_ciclo(self):
+        """Imprime o tempo acumulado por etapa do ciclo de decisão (PERFIL_CICLO_DECISAO)."""
+        for linha in self.perfil_ciclo.formatar():
+            self.logger.info(linha)
+
     def get_status_dict(self) -> Dict[str, Any]:
         """
         Coleta e retorna um dicionário com o estado atual do bot.
@@ -1757,14 +2063,14 @@ class BotWorker:
             # Calcular lucro percentual consolidado
             lucro_atual_consolidado = None
             if valor_investido_total > 0:
-                lucro_atual_consolidado = ((valor_total_atual - valor_investido_total) / valor_investido_total) * Decimal('100')
+                lucro_atual_consolidado = ((valor_total_atual - valor_investido_total) / valor_investido_total) * self.num.cem
 
             # Lógica de estado inteligente
             estado_bot = 'Operando | Aguardando Oportunidade'
             if saldo_disponivel_usdt < 10:
                 estado_bot = 'Sem Saldo | Aguardando Venda/Aporte'
             else:
-                limite_exposicao = Decimal(str(self.config.get('GESTAO_DE_RISCO', {}).get('exposicao_maxima_percentual_capital', 70.0)))
+                limite_exposicao = self.num(self.config.get('GESTAO_DE_RISCO', {}).get('exposicao_maxima_percentual_capital', 70.0))
                 alocacao_atual = self.gestao_capital.get_alocacao_percentual_ada()
                 if alocacao_atual > limite_exposicao:
                     estado_bot = 'Exposição Máxima | Compras Suspensas'
@@ -1805,7 +2111,7 @@ class BotWorker:
                 'status_posicao_giro_rapido': status_posicao_giro_rapido,
                 'estado_bot': estado_bot,
                 'sma_referencia': self.sma_referencia,
-                'distancia_sma': self._calcular_distancia_sma(preco_atual),
+                'distancia_sma': self.calcular_distancia_sma(preco_atual),
                 'rodando_desde': self.inicio_bot.strftime('%Y-%m-%d %H:%M:%S'),
                 'uptime': str(uptime).split('.')[0],
                 # Últimas ordens globais (mantido para compatibilidade)
@@ -1841,6 +2147,8 @@ class BotWorker:
         status = self.get_status_dict()
         strategy_stats = self.strategy_dca.obter_estatisticas()
         status.update(strategy_stats)
+        if self.perfil_ciclo is not None:
+            status['perfil_ciclo'] = self.perfil_ciclo.resumo()
         return status
 
 
@@ -0,0 +1,261 @@
+"""
+Checkpoints da Simulação - Estado completo do backtest em disco.
+
+Um backtest de anos em 1m leva muito tempo e, sem checkpoint, qualquer
+exceção ou Ctrl+C perde tudo. Com CHECKPOINT_DIRETORIO na config, o
+BotWorker grava o estado a cada CHECKPOINT_INTERVALO_BARRAS barras e/ou
+CHECKPOINT_INTERVALO_SEGUNDOS segundos, sempre entre duas barras:
+
+    <diretorio>/checkpoint_<barra>_<AAAAMMDDTHHMMSS>.ckpt
+
+(barra = próxima barra a simular; data = timestamp dela). Cada arquivo é um
+pickle comprimido com zlib contendo:
+    - simulador: saldos por carteira, trades, histórico do portfólio e cursor
+    - banco em memória (SQLite serializado) e estado do StateManager
+    - carteiras do PositionManager e da GestaoCapital, stops, cooldowns e
+      high water mark das estratégias, motores de RSI e flags do worker
+
+CHECKPOINT_RETOMAR (backtest.py --resume) aponta para um checkpoint ou um
+diretório (usa o mais recente) e a simulação continua dali. Parâmetros das
+estratégias vêm sempre da config atual: retomar com outra config é um fork
+que testa a mudança a partir daquela data sem simular o prefixo de novo
+(CHECKPOINT_RETOMAR_EM / --resume-em escolhe o último checkpoint até a data).
+"""
+
+import os
+import pickle
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.utils.logger import get_loggers
+
+logger, _ = get_loggers()
+
+
+# Versão do formato (incrementar ao mudar o conteúdo)
+VERSAO_CHECKPOINT = 2
+
+PREFIXO_ARQUIVO = 'checkpoint_'
+EXTENSAO_ARQUIVO = '.ckpt'
+FORMATO_DATA = '%Y%m%dT%H%M%S'
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Atributos mutáveis por componente do worker ('worker' = o próprio BotWorker).
+# Parâmetros vindos da config ficam de fora: num fork valem os da config nova.
+ATRIBUTOS_ESTADO = {
+    'worker': (
+        'stops_ativos', 'sma_referencia', 'sma_1h', 'sma_4h', 'ultima_atualizacao_sma',
+        'ts_ms_ultima_sma', 'tempo_simulado_atual', 'ultimo_percentual_logado',
+        'compras_pausadas_manualmente', 'guardiao_suspenso_temporariamente',
+        'modo_crash_ativo', 'estado_bot', 'ja_avisou_sem_saldo',
+    ),
+    'position_manager': ('carteiras',),
+    'gestao_capital': ('saldo_usdt', 'carteiras', '_ultimo_motivo_bloqueio'),
+    'strategy_dca': (
+        'ultima_tentativa_log_degrau', 'degraus_notificados_bloqueados',
+        'notificou_exposicao_maxima', 'ultimo_habilitado_logged',
+    ),
+    'strategy_sell': ('high_water_mark_profit', 'zonas_de_seguranca_acionadas', 'capital_para_recompra'),
+    'strategy_swing_trade': (
+        'ultima_compra_timestamp', 'ultima_log_status', 'ultimo_status_posicao', 'notificou_esperando_rsi',
+    ),
+    'analise_tecnica': ('motores_rsi', '_rsi_decimal_cache'),
+}
+
+
+def _componente(worker, nome: str):
+    return worker if nome == 'worker' else getattr(worker, nome)
+
+
+def capturar_estado(worker) -> Dict[str, Any]:
+    """
+    Estado completo da simulação entre duas barras.
+
+    Os valores são referências aos objetos vivos: serialize em seguida
+    (salvar_checkpoint) antes de a simulação continuar.
+
+    Args:
+        worker: BotWorker em modo simulação
+
+    Returns:
+        Dict com metadados (versão, barra, timestamp) e o estado de cada componente
+    """
+    api = worker.exchange_api
+    indice = api.indice_atual
+    return {
+        'versao': VERSAO_CHECKPOINT,
+        'criado_em': time.time(),
+        'modo_numerico': worker.num.modo,
+        'timeframe_base': api.timeframe_base,
+        'indice': indice,
+        'timestamp_ms': int(api.store_base.timestamps[indice]) if indice < api.total_barras else None,
+        'simulador': api.exportar_estado_conta(),
+        'banco': worker.db.serializar(),
+        'estado': worker.state.get_all_state(),
+        'componentes': {
+            nome: {atributo: getattr(_componente(worker, nome), atributo) for atributo in atributos}
+            for nome, atributos in ATRIBUTOS_ESTADO.items()
+        },
+    }
+
+
+def aplicar_estado(worker, estado: Dict[str, Any]) -> None:
+    """
+    Restaura no worker (já construído com a config desejada) um estado de
+    capturar_estado(). Os candles precisam ser os mesmos até a barra salva.
+
+    Raises:
+        ValueError: Versão, timeframe, modo numérico ou histórico incompatíveis
+    """
+    api = worker.exchange_api
+    if estado.get('versao') != VERSAO_CHECKPOINT:
+        raise ValueError(f"Checkpoint na versão {estado.get('versao')} (esperada {VERSAO_CHECKPOINT})")
+    if estado['timeframe_base'] != api.timeframe_base:
+        raise ValueError(f"Checkpoint em {estado['timeframe_base']}, simulação em {api.timeframe_base}")
+    if estado['modo_numerico'] != worker.num.modo:
+        raise ValueError(f"Checkpoint em MODO_NUMERICO '{estado['modo_numerico']}', config em '{worker.num.modo}'")
+
+    indice = estado['indice']
+    if indice > api.total_barras or (
+        estado['timestamp_ms'] is not None
+        and (indice >= api.total_barras or int(api.store_base.timestamps[indice]) != estado['timestamp_ms'])
+    ):
+        raise ValueError(f"Checkpoint da barra {indice:,} não corresponde ao histórico carregado")
+
+    api.restaurar_estado_conta(estado['simulador'])
+    worker.db.restaurar_serializado(estado['banco'])
+    worker.state.restaurar(estado['estado'])
+    for nome, atributos in estado['componentes'].items():
+        componente = _componente(worker, nome)
+        for atributo, valor in atributos.items():
+            setattr(componente, atributo, valor)
+
+
+def _data_barra(timestamp_ms: Optional[int]) -> str:
+    if timestamp_ms is None:
+        return 'fim'
+    return (_EPOCH + timedelta(milliseconds=timestamp_ms)).strftime(FORMATO_DATA)
+
+
+def salvar_checkpoint(estado: Dict[str, Any], diretorio: Path) -> Path:
+    """
+    Grava o estado (pickle + zlib) com escrita atômica.
+
+    Returns:
+        Caminho do arquivo criado
+    """
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    destino = diretorio / (
+        f"{PREFIXO_ARQUIVO}{estado['indice']:010d}_{_data_barra(estado['timestamp_ms'])}{EXTENSAO_ARQUIVO}"
+    )
+    conteudo = zlib.compress(pickle.dumps(estado, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+    descritor, temporario = tempfile.mkstemp(prefix=f'.{destino.name}.', dir=diretorio)
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            arquivo.write(conteudo)
+        os.replace(temporario, destino)
+    except Exception:
+        Path(temporario).unlink(missing_ok=True)
+        raise
+    return destino
+
+
+def carregar_checkpoint(caminho: Path) -> Dict[str, Any]:
+    """Lê um arquivo gravado por salvar_checkpoint()."""
+    with open(caminho, 'rb') as arquivo:
+        return pickle.loads(zlib.decompress(arquivo.read()))
+
+
+def listar_checkpoints(diretorio: Path) -> List[Path]:
+    """Checkpoints do diretório, do mais antigo ao mais recente."""
+    return sorted(Path(diretorio).glob(f'{PREFIXO_ARQUIVO}*{EXTENSAO_ARQUIVO}'))
+
+
+def data_checkpoint(caminho: Path) -> Optional[datetime]:
+    """Data da próxima barra do checkpoint (lida do nome), ou None no fim do histórico."""
+    parte = Path(caminho).stem.rsplit('_', 1)[-1]
+    return None if parte == 'fim' else datetime.strptime(parte, FORMATO_DATA)
+
+
+def localizar_checkpoint(origem: str, ate: Optional[datetime] = None) -> Path:
+    """
+    Resolve o checkpoint a retomar.
+
+    Args:
+        origem: Arquivo .ckpt ou diretório de checkpoints
+        ate: Num diretório, usar o último checkpoint com data <= ate (fork)
+
+    Raises:
+        FileNotFoundError: Nenhum checkpoint encontrado
+    """
+    caminho = Path(origem)
+    if caminho.is_file():
+        return caminho
+
+    candidatos = listar_checkpoints(caminho) if caminho.is_dir() else []
+    if ate is not None:
+        candidatos = [c for c in candidatos if (data := data_checkpoint(c)) is not None and data <= ate]
+    if not candidatos:
+        limite = f" até {ate}" if ate is not None else ""
+        raise FileNotFoundError(f"Nenhum checkpoint{limite} em {origem}")
+    return candidatos[-1]
+
+
+class AgendadorCheckpoints:
+    """Decide quando gravar checkpoints durante o loop da simulação."""
+
+    def __init__(self, diretorio: Path, intervalo_barras: int = 0, intervalo_segundos: float = 0.0, manter: int = 0):
+        """
+        Args:
+            diretorio: Onde gravar os checkpoints
+            intervalo_barras: Gravar a cada N barras simuladas (0 = desligado)
+            intervalo_segundos: Gravar a cada T segundos de execução (0 = desligado)
+            manter: Quantos checkpoints manter no diretório (0 = todos)
+        """
+        self.diretorio = Path(diretorio)
+        self.intervalo_barras = int(intervalo_barras or 0)
+        self.intervalo_segundos = float(intervalo_segundos or 0)
+        self.manter = int(manter or 0)
+        self.ultimo: Optional[Path] = None
+        self._indice_ultimo = 0
+        self._instante_ultimo = time.monotonic()
+
+    def iniciar(self, indice: int) -> None:
+        """Marca o ponto de partida (início ou barra retomada)."""
+        self._indice_ultimo = indice
+        self._instante_ultimo = time.monotonic()
+
+    def verificar(self, worker) -> Optional[Path]:
+        """
+        Grava um checkpoint se algum intervalo venceu. Chamar entre barras.
+        Falhas de escrita só geram aviso (a simulação continua).
+
+        Returns:
+            Caminho gravado, ou None
+        """
+        indice = worker.exchange_api.indice_atual
+        vencido = (
+            (self.intervalo_barras and indice - self._indice_ultimo >= self.intervalo_barras)
+            or (self.intervalo_segundos and time.monotonic() - self._instante_ultimo >= self.intervalo_segundos)
+        )
+        if not vencido or indice >= worker.exchange_api.total_barras:
+            return None
+
+        self.iniciar(indice)
+        try:
+            self.ultimo = salvar_checkpoint(capturar_estado(worker), self.diretorio)
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao gravar checkpoint da barra {indice:,}: {e}")
+            return None
+
+        if self.manter:
+            for antigo in listar_checkpoints(self.diretorio)[:-self.manter]:
+                antigo.unlink(missing_ok=True)
+        return self.ultimo
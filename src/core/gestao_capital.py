@@ -15,6 +15,7 @@ import sys
 # Adicionar path do projeto
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.core.numerico import CONTEXTO_DECIMAL, ContextoNumerico
 from src.utils.logger import get_loggers
 
 # Logger usa configuração padrão (não precisa especificar nível)
@@ -39,7 +40,7 @@ class GestaoCapital:
     - Cada carteira tem seu próprio saldo alocado
     """
 
-    def __init__(self, saldo_usdt: Decimal = Decimal('0'), valor_posicao_ada: Decimal = Decimal('0'), percentual_reserva: Decimal = Decimal('8'), modo_simulacao: bool = False, exchange_api=None):
+    def __init__(self, saldo_usdt: Decimal = Decimal('0'), valor_posicao_ada: Decimal = Decimal('0'), percentual_reserva: Decimal = Decimal('8'), modo_simulacao: bool = False, exchange_api=None, contexto_numerico: Optional[ContextoNumerico] = None):
         """
         Inicializar gestor de capital
 
@@ -49,22 +50,24 @@ class GestaoCapital:
             percentual_reserva: Percentual da reserva (padrão: 8%)
             modo_simulacao: Se True, permite atualização direta de saldo (para backtesting)
             exchange_api: Referência à API de exchange (necessária para sincronização em modo simulação)
+            contexto_numerico: Tipo numérico dos cálculos (padrão: Decimal)
         """
-        self.saldo_usdt = saldo_usdt
-        self.percentual_reserva = percentual_reserva / Decimal('100')
-        self.saldo_minimo = Decimal('5.00')
+        self.num = contexto_numerico or CONTEXTO_DECIMAL
+        self.saldo_usdt = self.num(saldo_usdt)
+        self.percentual_reserva = self.num(percentual_reserva) / self.num.cem
+        self.saldo_minimo = self.num('5.00')
         self.modo_simulacao = modo_simulacao
         self.exchange_api = exchange_api  # Necessário para modo simulação
 
         # Carteiras separadas
         self.carteiras = {
             'acumulacao': {
-                'valor_posicao': valor_posicao_ada,
-                'saldo_alocado': Decimal('0')  # Calculado dinamicamente
+                'valor_posicao': self.num(valor_posicao_ada),
+                'saldo_alocado': self.num.zero  # Calculado dinamicamente
             },
             'giro_rapido': {
-                'valor_posicao': Decimal('0'),
-                'saldo_alocado': Decimal('0')  # Percentual do saldo livre
+                'valor_posicao': self.num.zero,
+                'saldo_alocado': self.num.zero  # Percentual do saldo livre
             }
         }
 
@@ -83,7 +86,7 @@ class GestaoCapital:
         Args:
             percentual: Percentual do saldo livre a alocar para giro rápido
         """
-        self.alocacao_giro_rapido_pct = percentual
+        self.alocacao_giro_rapido_pct = self.num(percentual)
         logger.debug(f"⚙️ Alocação giro rápido configurada: {percentual}%")
 
     def atualizar_saldo_usdt_simulado(self, novo_saldo: Decimal):
@@ -101,6 +104,7 @@ class GestaoCapital:
             logger.warning("⚠️ Tentativa de atualizar saldo simulado fora do modo simulação - ignorando")
             return
 
+        novo_saldo = self.num(novo_saldo)
         saldo_anterior = self.saldo_usdt
         self.saldo_usdt = novo_saldo
         
@@ -129,13 +133,13 @@ class GestaoCapital:
         # IMPORTANTE: Calcular saldo total como SOMA de ambas as carteiras
         # em vez de sobrescrever com o valor de uma única carteira
         try:
-            saldo_giro = Decimal(str(self.exchange_api.saldos_por_carteira['giro_rapido']['saldo_usdt']))
-            saldo_acum = Decimal(str(self.exchange_api.saldos_por_carteira['acumulacao']['saldo_usdt']))
+            saldo_giro = self.num(self.exchange_api.saldos_por_carteira['giro_rapido']['saldo_usdt'])
+            saldo_acum = self.num(self.exchange_api.saldos_por_carteira['acumulacao']['saldo_usdt'])
             saldo_total_novo = saldo_giro + saldo_acum
         except (KeyError, AttributeError, TypeError) as e:
             # Fallback se algo der errado com o acesso à API
             logger.warning(f"⚠️ Erro ao sincronizar saldo total: {e}. Usando valor fornecido como fallback.")
-            saldo_total_novo = novo_saldo
+            saldo_total_novo = self.num(novo_saldo)
 
         saldo_anterior = self.saldo_usdt
         self.saldo_usdt = saldo_total_novo
@@ -153,10 +157,10 @@ class GestaoCapital:
             valor_posicao_ada: Novo valor da posição (em USDT)
             carteira: Nome da carteira ('acumulacao' ou 'giro_rapido')
         """
-        self.saldo_usdt = saldo_usdt
+        self.saldo_usdt = self.num(saldo_usdt)
 
         if carteira in self.carteiras:
-            self.carteiras[carteira]['valor_posicao'] = valor_posicao_ada
+            self.carteiras[carteira]['valor_posicao'] = self.num(valor_posicao_ada)
         else:
             logger.warning(f"⚠️ Carteira '{carteira}' não reconhecida. Use 'acumulacao' ou 'giro_rapido'")
 
@@ -206,22 +210,22 @@ class GestaoCapital:
             # Não recalcular percentuais! A SimulatedExchangeAPI já mantém
             # os saldos separados corretamente após cada trade.
             try:
-                saldo_carteira = Decimal(str(
+                saldo_carteira = self.num(
                     self.exchange_api.saldos_por_carteira[carteira]['saldo_usdt']
-                ))
+                )
                 # Aplicar reserva apenas se necessário
                 reserva = self.calcular_reserva_obrigatoria()
-                return max(saldo_carteira - reserva, Decimal('0'))
+                return max(saldo_carteira - reserva, self.num.zero)
             except (KeyError, AttributeError, TypeError) as e:
                 logger.warning(f"⚠️ Erro ao obter saldo da carteira '{carteira}': {e}")
-                return Decimal('0')
+                return self.num.zero
         else:
             # Em modo real: calcular dividindo o saldo livre
             reserva = self.calcular_reserva_obrigatoria()
             saldo_livre = self.saldo_usdt - reserva
 
             if saldo_livre <= 0:
-                return Decimal('0')
+                return self.num.zero
 
             if carteira == 'giro_rapido':
                 # ✅ Validação: alocacao_giro_rapido_pct DEVE ter sido configurado
@@ -231,7 +235,7 @@ class GestaoCapital:
                     raise ValueError("alocacao_giro_rapido_pct não foi configurada - impossível alocar capital")
 
                 # Giro rápido usa um percentual do saldo livre
-                return saldo_livre * (self.alocacao_giro_rapido_pct / Decimal('100'))
+                return saldo_livre * (self.alocacao_giro_rapido_pct / self.num.cem)
             elif carteira == 'acumulacao':
                 # ✅ Validação: alocacao_giro_rapido_pct DEVE ter sido configurado
                 if self.alocacao_giro_rapido_pct is None:
@@ -240,11 +244,11 @@ class GestaoCapital:
                     raise ValueError("alocacao_giro_rapido_pct não foi configurada - impossível alocar capital")
 
                 # Acumulação usa o restante do saldo livre
-                saldo_giro_rapido = saldo_livre * (self.alocacao_giro_rapido_pct / Decimal('100'))
+                saldo_giro_rapido = saldo_livre * (self.alocacao_giro_rapido_pct / self.num.cem)
                 return saldo_livre - saldo_giro_rapido
 
         logger.warning(f"⚠️ Carteira '{carteira}' desconhecida. Retornando 0.")
-        return Decimal('0')
+        return self.num.zero
 
     def get_alocacao_percentual_ada(self, carteira: str = 'acumulacao') -> Decimal:
         """
@@ -258,15 +262,15 @@ class GestaoCapital:
         """
         capital_total = self.calcular_capital_total()
         if capital_total <= 0:
-            return Decimal('0')
+            return self.num.zero
 
         if carteira in self.carteiras:
             valor_posicao = self.carteiras[carteira]['valor_posicao']
-            return (valor_posicao / capital_total) * Decimal('100')
+            return (valor_posicao / capital_total) * self.num.cem
         else:
             # Retornar total de todas as carteiras
             valor_total_posicoes = self.get_valor_posicao_total()
-            return (valor_total_posicoes / capital_total) * Decimal('100')
+            return (valor_total_posicoes / capital_total) * self.num.cem
 
     def pode_comprar(self, valor_operacao: Decimal, carteira: str = 'acumulacao') -> Tuple[bool, str]:
         """
@@ -343,6 +347,24 @@ class GestaoCapital:
 
         return True, ""
 
+    def compra_bloqueada(self, valor_operacao: Decimal, carteira: str = 'acumulacao') -> bool:
+        """
+        Mesmas validações de pode_comprar, sem logs nem efeitos colaterais
+        (usado para prever decisões, ex: salto de barras no backtest).
+
+        Args:
+            valor_operacao: Valor da operação em USDT
+            carteira: Nome da carteira ('acumulacao' ou 'giro_rapido')
+
+        Returns:
+            True se pode_comprar recusaria a operação
+        """
+        valor_operacao = self.num(valor_operacao)
+        if self.calcular_capital_disponivel(carteira) < valor_operacao:
+            return True
+        saldo_apos = self.saldo_usdt - valor_operacao
+        return saldo_apos < self.calcular_reserva_obrigatoria() or saldo_apos < self.saldo_minimo
+
     def pode_vender(self, quantidade_ada: Decimal, preco_ada: Decimal) -> Tuple[bool, str]:
         """
         Valida se pode vender (sempre permitido, aumenta USDT)
@@ -0,0 +1,113 @@
+"""
+Numérico - Tipo numérico do ciclo de decisão (Decimal exato ou float rápido).
+
+Em produção tudo roda em Decimal (padrão). Em backtests, MODO_NUMERICO='float'
+faz o caminho quente (BotWorker, estratégias, GestaoCapital, PositionManager)
+operar em float nativo: constantes convertidas uma única vez e nenhuma
+conversão Decimal(str(x)) por barra. O livro-razão da SimulatedExchangeAPI
+continua em Decimal.
+
+Uso:
+    num = criar_contexto_numerico(config, modo_simulacao=True)
+    limite = num(config['rsi_limite_compra'])     # Decimal ou float
+    lucro = (preco - pm) / pm * num.cem
+
+Para conferir que o modo float não altera decisões, ver
+src/backtest/equivalencia.py (backtest.py --validar-modo-numerico).
+"""
+
+import math
+from decimal import Decimal, ROUND_DOWN
+from typing import Any, Dict, Optional
+
+MODO_DECIMAL = 'decimal'
+MODO_FLOAT = 'float'
+MODOS_NUMERICOS = (MODO_DECIMAL, MODO_FLOAT)
+
+
+def para_decimal(valor: Any) -> Decimal:
+    """Decimal(str(valor)), sem reconverter o que já é Decimal."""
+    if isinstance(valor, Decimal):
+        return valor
+    return Decimal(str(valor))
+
+
+class ContextoNumerico:
+    """
+    Conversões e constantes do tipo numérico em uso.
+
+    Chamar o contexto converte um valor (config, estado, exchange) para o tipo
+    do modo: num(x) equivale a Decimal(str(x)) no modo exato e a float(x) no
+    modo rápido. zero/um/cem já vêm convertidos.
+    """
+
+    def __init__(self, modo: str = MODO_DECIMAL):
+        """
+        Args:
+            modo: 'decimal' (exato, padrão) ou 'float' (rápido, só backtest)
+        """
+        if modo not in MODOS_NUMERICOS:
+            raise ValueError(f"Modo numérico inválido: {modo!r} (use {' ou '.join(MODOS_NUMERICOS)})")
+
+        self.modo = modo
+        self.exato = modo == MODO_DECIMAL
+        self.converter = para_decimal if self.exato else float
+
+        self.zero = self.converter('0')
+        self.um = self.converter('1')
+        self.cem = self.converter('100')
+
+    def __call__(self, valor: Any):
+        return self.converter(valor)
+
+    def arredondar_para_baixo(self, valor, fator):
+        """
+        Trunca valor em múltiplos de 1/fator (ex: fator 10 → passo 0.1).
+
+        Args:
+            valor: Valor no tipo do modo
+            fator: Inverso do passo, no tipo do modo
+
+        Returns:
+            floor(valor * fator) / fator
+        """
+        if self.exato:
+            return (valor * fator).quantize(Decimal('1'), rounding=ROUND_DOWN) / fator
+        return math.floor(valor * fator) / fator
+
+    def __repr__(self) -> str:
+        return f"ContextoNumerico(modo={self.modo!r})"
+
+
+# Contexto padrão para quem não recebe um explicitamente (produção, scripts)
+CONTEXTO_DECIMAL = ContextoNumerico(MODO_DECIMAL)
+
+
+def criar_contexto_numerico(config: Dict[str, Any], modo_simulacao: bool, logger: Optional[Any] = None) -> ContextoNumerico:
+    """
+    Monta o contexto a partir de config['MODO_NUMERICO'].
+
+    O modo float só é aceito em simulação: em tempo real o bot sempre usa
+    Decimal, mesmo que a config peça outra coisa.
+
+    Args:
+        config: Configuração do bot
+        modo_simulacao: True em backtests
+        logger: Logger para avisos (opcional)
+
+    Returns:
+        ContextoNumerico
+    """
+    modo = str(config.get('MODO_NUMERICO', MODO_DECIMAL)).lower()
+
+    if modo not in MODOS_NUMERICOS:
+        if logger:
+            logger.warning(f"⚠️ MODO_NUMERICO desconhecido ({modo!r}); usando '{MODO_DECIMAL}'")
+        return CONTEXTO_DECIMAL
+
+    if modo == MODO_FLOAT and not modo_simulacao:
+        if logger:
+            logger.warning(f"⚠️ MODO_NUMERICO='{MODO_FLOAT}' só é permitido em backtests; usando '{MODO_DECIMAL}'")
+        return CONTEXTO_DECIMAL
+
+    return CONTEXTO_DECIMAL if modo == MODO_DECIMAL else ContextoNumerico(modo)
@@ -0,0 +1,131 @@
+"""
+Perfil do Ciclo - Tempo acumulado por etapa do ciclo de decisão.
+
+Opcional (PERFIL_CICLO_DECISAO=true na config). O BotWorker marca a entrada
+em cada etapa; o tempo decorrido até a próxima marcação (ou o fim do ciclo)
+é somado à etapa corrente. Desativado, o ciclo marca as etapas em
+PERFIL_INATIVO, cujos métodos não fazem nada.
+
+Uso:
+    perfil = PerfilCiclo()
+    perfil.iniciar()
+    perfil.entrar('comandos')
+    ...
+    perfil.entrar('stops')
+    ...
+    perfil.encerrar()
+    for linha in perfil.formatar():
+        logger.info(linha)
+"""
+
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+# Etapas na ordem em que aparecem no ciclo (é também a ordem do relatório)
+ETAPAS_CICLO = (
+    'comandos',             # fila de comandos remotos
+    'stops',                # verificação de SL/TSL e atualização do pico
+    'sma',                  # atualização da SMA de referência e distância
+    'dca',                  # StrategyDCA.verificar_oportunidade
+    'venda',                # StrategySell.verificar_oportunidade
+    'recompra',             # StrategySell.verificar_recompra_de_seguranca
+    'giro',                 # StrategySwingTrade.verificar_oportunidade
+    'execucao',             # execução de ordens e persistência (banco/estado)
+    'tarefas_periodicas',   # aportes BRL e backup (só em tempo real)
+)
+
+
+class PerfilCiclo:
+    """Tempo acumulado e número de entradas por etapa do ciclo de decisão."""
+
+    def __init__(self):
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Zera os acumulados."""
+        self.ciclos = 0
+        self._tempos: Dict[str, float] = dict.fromkeys(ETAPAS_CICLO, 0.0)
+        self._chamadas: Dict[str, int] = dict.fromkeys(ETAPAS_CICLO, 0)
+        self._etapa: Optional[str] = None
+        self._inicio_etapa = 0.0
+
+    def iniciar(self):
+        """Marca o início de um ciclo (nenhuma etapa aberta)."""
+        self.ciclos += 1
+        self._etapa = None
+
+    def entrar(self, etapa: str):
+        """Fecha a etapa corrente (se houver) e abre `etapa`."""
+        agora = perf_counter()
+        if self._etapa is not None:
+            self._tempos[self._etapa] += agora - self._inicio_etapa
+        self._etapa = etapa
+        self._chamadas[etapa] += 1
+        self._inicio_etapa = agora
+
+    def encerrar(self):
+        """Fecha a etapa corrente ao fim do ciclo."""
+        if self._etapa is not None:
+            self._tempos[self._etapa] += perf_counter() - self._inicio_etapa
+            self._etapa = None
+
+    def resumo(self) -> Dict[str, Any]:
+        """
+        Acumulados por etapa.
+
+        Returns:
+            Dict com ciclos, tempo_total_s, media_ciclo_us e etapas: lista de
+            {etapa, chamadas, tempo_total_s, media_us, percentual} na ordem do ciclo
+        """
+        tempo_total = sum(self._tempos.values())
+        etapas = []
+        for etapa in ETAPAS_CICLO:
+            chamadas = self._chamadas[etapa]
+            tempo = self._tempos[etapa]
+            etapas.append({
+                'etapa': etapa,
+                'chamadas': chamadas,
+                'tempo_total_s': tempo,
+                'media_us': tempo / chamadas * 1e6 if chamadas else 0.0,
+                'percentual': tempo / tempo_total * 100 if tempo_total else 0.0,
+            })
+        return {
+            'ciclos': self.ciclos,
+            'tempo_total_s': tempo_total,
+            'media_ciclo_us': tempo_total / self.ciclos * 1e6 if self.ciclos else 0.0,
+            'etapas': etapas,
+        }
+
+    def formatar(self) -> List[str]:
+        """Linhas de texto com a tabela do resumo (etapas sem chamadas omitidas)."""
+        resumo = self.resumo()
+        linhas = [
+            f"⏱️  PERFIL DO CICLO DE DECISÃO: {resumo['ciclos']:,} ciclos, "
+            f"{resumo['tempo_total_s']:.3f}s ({resumo['media_ciclo_us']:.1f} µs/ciclo)",
+            f"   {'Etapa':<20} {'Chamadas':>10} {'Total (s)':>11} {'Média (µs)':>11} {'%':>7}",
+        ]
+        for etapa in resumo['etapas']:
+            if not etapa['chamadas']:
+                continue
+            linhas.append(
+                f"   {etapa['etapa']:<20} {etapa['chamadas']:>10,} {etapa['tempo_total_s']:>11.3f} "
+                f"{etapa['media_us']:>11.1f} {etapa['percentual']:>6.1f}%"
+            )
+        return linhas
+
+
+class PerfilCicloInativo(PerfilCiclo):
+    """Perfil desligado: as marcações do ciclo não medem nem acumulam nada."""
+
+    def iniciar(self):
+        pass
+
+    def entrar(self, etapa: str):
+        pass
+
+    def encerrar(self):
+        pass
+
+
+# Instância única usada pelo BotWorker quando PERFIL_CICLO_DECISAO está desligado
+PERFIL_INATIVO = PerfilCicloInativo()
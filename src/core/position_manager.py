@@ -7,6 +7,7 @@ from decimal import Decimal
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 
+from src.core.numerico import CONTEXTO_DECIMAL, ContextoNumerico
 from src.persistencia.database import DatabaseManager
 from src.utils.logger import get_loggers
 
@@ -24,29 +25,31 @@ class PositionManager:
     - 'giro_rapido': Posição de swing trade (operações rápidas)
     """
 
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, contexto_numerico: Optional[ContextoNumerico] = None):
         """
         Inicializa o Position Manager
 
         Args:
             db_manager: Instância do DatabaseManager
+            contexto_numerico: Tipo numérico das posições (padrão: Decimal)
         """
         self.db = db_manager
+        self.num = contexto_numerico or CONTEXTO_DECIMAL
 
         # Estado interno por carteira
         self.carteiras = {
             'acumulacao': {
-                'quantidade_total': Decimal('0'),
+                'quantidade_total': self.num.zero,
                 'preco_medio': None,
-                'valor_total_investido': Decimal('0'),
+                'valor_total_investido': self.num.zero,
                 'posicao_carregada': False
             },
             'giro_rapido': {
-                'quantidade_total': Decimal('0'),
+                'quantidade_total': self.num.zero,
                 'preco_medio': None,
-                'valor_total_investido': Decimal('0'),
+                'valor_total_investido': self.num.zero,
                 'posicao_carregada': False,
-                'high_water_mark_lucro': Decimal('0')  # Para proteção de lucro
+                'high_water_mark_lucro': self.num.zero  # Para proteção de lucro
             }
         }
 
@@ -215,7 +218,7 @@ class PositionManager:
 
                     for campo in campos_numericos:
                         if ordem.get(campo) is not None:
-                            ordem[campo] = Decimal(str(ordem[campo]))
+                            ordem[campo] = self.num(ordem[campo])
 
                     ordens.append(ordem)
 
@@ -238,8 +241,8 @@ class PositionManager:
             ordens: Lista de ordens do banco de dados
             carteira: Nome da carteira ('acumulacao' ou 'giro_rapido')
         """
-        quantidade_total = Decimal('0')
-        valor_total_investido = Decimal('0')
+        quantidade_total = self.num.zero
+        valor_total_investido = self.num.zero
         ordens_processadas = 0
 
         for ordem in ordens:
@@ -274,16 +277,16 @@ class PositionManager:
                 # Venda: diminui quantidade proporcionalmente
                 if quantidade_total > 0:
                     # Calcular proporção vendida
-                    proporcao_vendida = min(quantidade / quantidade_total, Decimal('1'))
+                    proporcao_vendida = min(quantidade / quantidade_total, self.num.um)
 
                     # Reduzir quantidade e valor investido proporcionalmente
                     quantidade_total -= quantidade
-                    valor_total_investido *= (Decimal('1') - proporcao_vendida)
+                    valor_total_investido *= (self.num.um - proporcao_vendida)
 
                     # Garantir que não ficou negativo por arredondamentos
-                    if quantidade_total < Decimal('0.0001'):
-                        quantidade_total = Decimal('0')
-                        valor_total_investido = Decimal('0')
+                    if quantidade_total < self.num('0.0001'):
+                        quantidade_total = self.num.zero
+                        valor_total_investido = self.num.zero
 
                     ordens_processadas += 1
                     logger.debug(f"🔴 VENDA ({carteira}): -{quantidade:.4f} @ ${preco:.6f}")
@@ -312,7 +315,7 @@ class PositionManager:
         """
         if carteira not in self.carteiras:
             logger.warning(f"⚠️ Carteira '{carteira}' não existe. Retornando 0.")
-            return Decimal('0')
+            return self.num.zero
 
         # Não tentar recarregar se não foi carregada
         # (a inicialização já carregou corretamente)
@@ -346,7 +349,7 @@ class PositionManager:
         """
         if carteira not in self.carteiras:
             logger.warning(f"⚠️ Carteira '{carteira}' não existe. Retornando 0.")
-            return Decimal('0')
+            return self.num.zero
 
         return self.carteiras[carteira]['valor_total_investido']
     
@@ -363,6 +366,8 @@ class PositionManager:
             logger.error(f"❌ Carteira '{carteira}' não existe!")
             return
 
+        quantidade = self.num(quantidade)
+        preco = self.num(preco)
         valor_compra = quantidade * preco
 
         # Atualizar valores totais da carteira
@@ -401,23 +406,24 @@ class PositionManager:
             return
 
         # Calcular proporção vendida
+        quantidade = self.num(quantidade)
         proporcao_vendida = min(
             quantidade / self.carteiras[carteira]['quantidade_total'],
-            Decimal('1')
+            self.num.um
         )
 
         # Reduzir quantidade e valor investido proporcionalmente
         self.carteiras[carteira]['quantidade_total'] -= quantidade
-        self.carteiras[carteira]['valor_total_investido'] *= (Decimal('1') - proporcao_vendida)
+        self.carteiras[carteira]['valor_total_investido'] *= (self.num.um - proporcao_vendida)
 
         # Garantir que não ficou negativo por arredondamentos
-        if self.carteiras[carteira]['quantidade_total'] < Decimal('0.0001'):
-            self.carteiras[carteira]['quantidade_total'] = Decimal('0')
-            self.carteiras[carteira]['valor_total_investido'] = Decimal('0')
+        if self.carteiras[carteira]['quantidade_total'] < self.num('0.0001'):
+            self.carteiras[carteira]['quantidade_total'] = self.num.zero
+            self.carteiras[carteira]['valor_total_investido'] = self.num.zero
             self.carteiras[carteira]['preco_medio'] = None
             # Resetar high water mark se for giro rápido
             if carteira == 'giro_rapido':
-                self.carteiras[carteira]['high_water_mark_lucro'] = Decimal('0')
+                self.carteiras[carteira]['high_water_mark_lucro'] = self.num.zero
         elif self.carteiras[carteira]['quantidade_total'] > 0:
             self.carteiras[carteira]['preco_medio'] = (
                 self.carteiras[carteira]['valor_total_investido'] /
@@ -450,7 +456,7 @@ class PositionManager:
         if not preco_medio or preco_medio <= 0 or quantidade <= 0:
             return None
 
-        lucro_pct = ((preco_atual - preco_medio) / preco_medio) * Decimal('100')
+        lucro_pct = ((preco_atual - preco_medio) / preco_medio) * self.num.cem
         return lucro_pct
 
     def tem_posicao(self, carteira: str = 'acumulacao') -> bool:
@@ -476,12 +482,12 @@ class PositionManager:
             carteira: Nome da carteira a resetar
         """
         if carteira in self.carteiras:
-            self.carteiras[carteira]['quantidade_total'] = Decimal('0')
+            self.carteiras[carteira]['quantidade_total'] = self.num.zero
             self.carteiras[carteira]['preco_medio'] = None
-            self.carteiras[carteira]['valor_total_investido'] = Decimal('0')
+            self.carteiras[carteira]['valor_total_investido'] = self.num.zero
             self.carteiras[carteira]['posicao_carregada'] = True
             if carteira == 'giro_rapido':
-                self.carteiras[carteira]['high_water_mark_lucro'] = Decimal('0')
+                self.carteiras[carteira]['high_water_mark_lucro'] = self.num.zero
 
     def _obter_resumo_posicao(self, carteira: str = 'acumulacao') -> Dict[str, Any]:
         """
@@ -554,7 +560,7 @@ class PositionManager:
             return
 
         if 'high_water_mark_lucro' not in self.carteiras[carteira]:
-            self.carteiras[carteira]['high_water_mark_lucro'] = Decimal('0')
+            self.carteiras[carteira]['high_water_mark_lucro'] = self.num.zero
 
         if lucro_percentual > self.carteiras[carteira]['high_water_mark_lucro']:
             self.carteiras[carteira]['high_water_mark_lucro'] = lucro_percentual
@@ -571,9 +577,9 @@ class PositionManager:
             Decimal: High water mark de lucro
         """
         if carteira not in self.carteiras:
-            return Decimal('0')
+            return self.num.zero
 
-        return self.carteiras[carteira].get('high_water_mark_lucro', Decimal('0'))
+        return self.carteiras[carteira].get('high_water_mark_lucro', self.num.zero)
 
     def forcar_quantidade(self, quantidade: Decimal, carteira: str = 'acumulacao'):
         """
@@ -585,6 +591,7 @@ class PositionManager:
             carteira: Nome da carteira
         """
         if carteira in self.carteiras:
+            quantidade = self.num(quantidade)
             preco_medio_atual = self.carteiras[carteira]['preco_medio']
             quantidade_anterior = self.carteiras[carteira]['quantidade_total']
 
@@ -630,10 +637,10 @@ class PositionManager:
                     WHERE tipo = 'VENDA' AND timestamp >= ?
                 """, (data_limite,))
                 resultado = cursor.fetchone()
-                return Decimal(str(resultado[0])) if resultado and resultado[0] else Decimal('0')
+                return self.num(resultado[0]) if resultado and resultado[0] else self.num.zero
         except Exception as e:
             logger.error(f"Erro ao calcular lucro realizado: {e}")
-            return Decimal('0')
+            return self.num.zero
 
     def get_ultimas_ordens(self, limite: int) -> List[Dict[str, Any]]:
         """Busca as últimas ordens do banco de dados."""
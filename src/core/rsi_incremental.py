@@ -0,0 +1,250 @@
+"""
+RSI Incremental - Estado de Wilder atualizado candle a candle.
+
+Em vez de rodar talib.RSI sobre uma janela inteira a cada ciclo de decisão,
+mantém as médias de ganho/perda (suavização de Wilder) dos candles FECHADOS
+e só as atualiza quando um novo candle fecha (O(1)). O valor exibido inclui
+o candle em formação como um passo provisório, exatamente como o último
+valor de talib.RSI sobre uma janela que termina no candle atual.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import talib
+
+
+class RSIIncremental:
+    """
+    RSI de Wilder incremental para um (par, timeframe, período).
+
+    Convenção das janelas recebidas: o último candle é o que está em
+    formação; todos os anteriores estão fechados.
+
+    Exemplo:
+        rsi = RSIIncremental(periodo=14)
+        valor = rsi.atualizar(timestamps_ms, closes)   # semeia na 1ª chamada
+        valor = rsi.atualizar(timestamps_ms, closes)   # O(1) nas seguintes
+    """
+
+    def __init__(self, periodo: int = 14):
+        """
+        Args:
+            periodo: Período do RSI (padrão 14)
+        """
+        self.periodo = periodo
+
+        # Estado de Wilder dos candles fechados
+        self.media_ganho = 0.0
+        self.media_perda = 0.0
+        self.ultimo_close_fechado: Optional[float] = None
+        self.ts_ultimo_fechado: Optional[int] = None
+        self.semeado = False
+
+        # Cache do valor calculado com o candle em formação
+        self.ts_formando: Optional[int] = None
+        self.chave_valor: Optional[tuple] = None
+        self.valor: Optional[float] = None
+
+    def resetar(self) -> None:
+        """Descarta o estado (próxima atualização semeia de novo)."""
+        self.__init__(self.periodo)
+
+    def _semear(self, closes_fechados: np.ndarray) -> None:
+        """
+        Inicializa as médias exatamente como o TA-Lib: média simples dos
+        primeiros 'periodo' ganhos/perdas e suavização de Wilder no restante.
+        """
+        p = self.periodo
+        deltas = np.diff(closes_fechados)
+        ganhos = np.where(deltas > 0, deltas, 0.0)
+        perdas = np.where(deltas < 0, -deltas, 0.0)
+
+        media_ganho = float(ganhos[:p].sum()) / p
+        media_perda = float(perdas[:p].sum()) / p
+        for ganho, perda in zip(ganhos[p:].tolist(), perdas[p:].tolist()):
+            media_ganho = (media_ganho * (p - 1) + ganho) / p
+            media_perda = (media_perda * (p - 1) + perda) / p
+
+        self.media_ganho = media_ganho
+        self.media_perda = media_perda
+        self.ultimo_close_fechado = float(closes_fechados[-1])
+        self.semeado = True
+
+    def _avancar(self, close: float) -> None:
+        """Incorpora um candle fechado ao estado (O(1))."""
+        p = self.periodo
+        delta = close - self.ultimo_close_fechado
+        ganho = delta if delta > 0 else 0.0
+        perda = -delta if delta < 0 else 0.0
+        self.media_ganho = (self.media_ganho * (p - 1) + ganho) / p
+        self.media_perda = (self.media_perda * (p - 1) + perda) / p
+        self.ultimo_close_fechado = close
+
+    def valor_com_close(self, close_formando: float) -> Optional[float]:
+        """
+        RSI provisório considerando 'close_formando' como fechamento do candle
+        atual, sem alterar o estado. Útil quando o preço atual já é conhecido
+        (modo real) e não é preciso buscar klines.
+        """
+        if not self.semeado:
+            return None
+
+        p = self.periodo
+        delta = close_formando - self.ultimo_close_fechado
+        ganho = delta if delta > 0 else 0.0
+        perda = -delta if delta < 0 else 0.0
+        media_ganho = (self.media_ganho * (p - 1) + ganho) / p
+        media_perda = (self.media_perda * (p - 1) + perda) / p
+
+        total = media_ganho + media_perda
+        # Mesma convenção do TA-Lib quando não há variação
+        return 100.0 * media_ganho / total if total != 0 else 0.0
+
+    def projetar(
+        self,
+        closes_seguintes: np.ndarray,
+        passos: np.ndarray,
+        closes_formando: np.ndarray
+    ) -> np.ndarray:
+        """
+        RSI que atualizar() devolveria em vários momentos futuros, sem alterar
+        o estado (usado para achar a próxima barra em que o RSI cruza um
+        limite sem chamar atualizar() barra a barra).
+
+        Args:
+            closes_seguintes: Fechamentos dos candles que fecham depois do
+                último candle fechado do estado, em ordem
+            passos: Para cada momento, quantos de closes_seguintes já fecharam
+            closes_formando: Para cada momento, fechamento do candle em formação
+
+        Returns:
+            Array float64 com o RSI de cada momento (NaN se não semeado)
+        """
+        if not self.semeado:
+            return np.full(len(passos), np.nan)
+
+        p = self.periodo
+        total_passos = int(passos.max()) + 1 if len(passos) else 1
+        if len(closes_seguintes) < total_passos - 1:
+            raise ValueError("closes_seguintes não cobre todos os passos")
+        medias_ganho = np.empty(total_passos)
+        medias_perda = np.empty(total_passos)
+        ultimos = np.empty(total_passos)
+
+        # Mesma recursão de _avancar, candle a candle
+        media_ganho, media_perda, ultimo = self.media_ganho, self.media_perda, self.ultimo_close_fechado
+        medias_ganho[0], medias_perda[0], ultimos[0] = media_ganho, media_perda, ultimo
+        for passo, close in enumerate(closes_seguintes[:total_passos - 1].tolist(), start=1):
+            delta = close - ultimo
+            media_ganho = (media_ganho * (p - 1) + (delta if delta > 0 else 0.0)) / p
+            media_perda = (media_perda * (p - 1) + (-delta if delta < 0 else 0.0)) / p
+            ultimo = close
+            medias_ganho[passo], medias_perda[passo], ultimos[passo] = media_ganho, media_perda, ultimo
+
+        return rsi_com_formando(medias_ganho[passos], medias_perda[passos], ultimos[passos], closes_formando, p)
+
+    def atualizar(self, timestamps: np.ndarray, closes: np.ndarray) -> Optional[float]:
+        """
+        Atualiza o estado com uma janela de candles e retorna o RSI atual.
+
+        Args:
+            timestamps: Aberturas dos candles (ms), em ordem crescente
+            closes: Fechamentos (float64), mesmo tamanho de timestamps
+
+        Returns:
+            RSI (0-100) ou None se não houver dados suficientes
+        """
+        n = len(closes)
+        if n <= self.periodo:
+            return None
+
+        ts_formando = int(timestamps[-1])
+        close_formando = float(closes[-1])
+
+        # Nada mudou desde a última chamada: devolver cache
+        chave = (ts_formando, close_formando)
+        if chave == self.chave_valor:
+            return self.valor
+
+        # Candles fechados = todos menos o último
+        ts_fechados = timestamps[:-1]
+
+        precisa_semear = (
+            not self.semeado
+            or self.ts_ultimo_fechado is None
+            or (self.ts_formando is not None and ts_formando < self.ts_formando)  # tempo voltou (nova simulação)
+            or int(ts_fechados[0]) > self.ts_ultimo_fechado  # lacuna: janela não cobre o estado
+        )
+
+        if precisa_semear:
+            if n - 1 <= self.periodo:
+                # Poucos candles fechados para semear: cálculo direto na janela
+                self.semeado = False
+                self.ts_ultimo_fechado = None
+                valor = talib.RSI(np.ascontiguousarray(closes, dtype=np.float64), timeperiod=self.periodo)[-1]
+                self.valor = None if np.isnan(valor) else float(valor)
+                self.chave_valor = chave
+                self.ts_formando = ts_formando
+                return self.valor
+            self._semear(closes[:-1])
+            self.ts_ultimo_fechado = int(ts_fechados[-1])
+        else:
+            # Candles que fecharam desde a última chamada (normalmente 0 ou 1)
+            inicio = int(np.searchsorted(ts_fechados, self.ts_ultimo_fechado, side='right'))
+            if inicio < len(ts_fechados):
+                for close in closes[inicio:n - 1].tolist():
+                    self._avancar(close)
+                self.ts_ultimo_fechado = int(ts_fechados[-1])
+
+        self.ts_formando = ts_formando
+        self.chave_valor = chave
+        self.valor = self.valor_com_close(close_formando)
+        return self.valor
+
+
+def medias_wilder(closes_fechados: np.ndarray, periodo: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Médias de ganho/perda de Wilder após cada candle fechado, com as mesmas
+    operações de _semear + _avancar (NaN antes do candle 'periodo').
+
+    Returns:
+        (medias_ganho, medias_perda), arrays do tamanho de closes_fechados
+    """
+    p = periodo
+    n = len(closes_fechados)
+    medias_ganho = np.full(n, np.nan)
+    medias_perda = np.full(n, np.nan)
+    if n <= p:
+        return medias_ganho, medias_perda
+
+    deltas = np.diff(closes_fechados)
+    ganhos = np.where(deltas > 0, deltas, 0.0)
+    perdas = np.where(deltas < 0, -deltas, 0.0)
+    media_ganho = float(ganhos[:p].sum()) / p
+    media_perda = float(perdas[:p].sum()) / p
+    medias_ganho[p], medias_perda[p] = media_ganho, media_perda
+    for indice, (ganho, perda) in enumerate(zip(ganhos[p:].tolist(), perdas[p:].tolist()), start=p + 1):
+        media_ganho = (media_ganho * (p - 1) + ganho) / p
+        media_perda = (media_perda * (p - 1) + perda) / p
+        medias_ganho[indice], medias_perda[indice] = media_ganho, media_perda
+    return medias_ganho, medias_perda
+
+
+def rsi_com_formando(
+    medias_ganho: np.ndarray,
+    medias_perda: np.ndarray,
+    ultimos_fechados: np.ndarray,
+    closes_formando: np.ndarray,
+    periodo: int
+) -> np.ndarray:
+    """valor_com_close vetorizado: RSI de cada estado de Wilder com o candle em formação."""
+    p = periodo
+    delta = closes_formando - ultimos_fechados
+    ganho = np.where(delta > 0, delta, 0.0)
+    perda = np.where(delta < 0, -delta, 0.0)
+    media_ganho = (medias_ganho * (p - 1) + ganho) / p
+    media_perda = (medias_perda * (p - 1) + perda) / p
+    total = media_ganho + media_perda
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total != 0, 100.0 * media_ganho / total, 0.0)
@@ -0,0 +1,461 @@
+"""
+Salto de Barras Ociosas - Event-skipping do loop de simulação.
+
+Na maior parte das barras de um backtest o ciclo de decisão do BotWorker não
+faz nada: nenhum stop dispara, nenhum degrau de DCA é atingido, o RSI está
+acima do limite ou um cooldown está ativo. Depois de cada ciclo completo o
+PlanejadorSaltos lê o estado do bot e monta as condições em que algo pode
+acontecer:
+
+- faixa de preço (inferior, superior): fora dela algum gatilho pode disparar
+  (SL/TSL, novo pico do TSL, promoção SL → TSL, degrau de DCA, camadas de
+  oportunidade extrema, metas e zonas de venda, High-Water Mark, recompras)
+- eventos de tempo: atualização da SMA de referência e fim do cooldown do
+  giro rápido
+- RSI do giro rápido projetado barra a barra a partir do estado do
+  RSIIncremental (sem chamar get_rsi)
+
+e procura, vetorizado sobre os arrays do KlineStore, a primeira barra em que
+alguma delas pode ocorrer. O BotWorker pula direto para ela; as barras do
+meio não mudam nada, então os snapshots delas são gravados em bloco.
+
+Os limites têm uma margem (MARGEM_RELATIVA, MARGEM_RSI): barras perto de um
+gatilho sempre rodam o ciclo completo, que decide com a aritmética exata
+(Decimal ou float). Quando algum estado não pode ser projetado (modo crash,
+comandos na fila, degrau de DCA já ativo, RSI ainda não semeado...) o
+planejador não salta e o loop segue barra a barra.
+"""
+
+import math
+import time
+from datetime import datetime
+from typing import Callable, List
+
+import numpy as np
+
+# Margem relativa aplicada aos limites de preço
+MARGEM_RELATIVA = 1e-9
+
+# Margem (em pontos de RSI) aplicada ao limite de compra do giro rápido
+MARGEM_RSI = 1e-6
+
+# Tamanho inicial dos blocos de busca (cresce x4 a cada bloco sem resultado)
+BLOCO_BUSCA_INICIAL = 256
+
+# Janela extra no fim do cooldown quando o fuso local tem horário de verão
+# (o deslocamento do fuso muda ao longo do histórico)
+FOLGA_HORARIO_VERAO_S = 3600
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _ms_desde_epoch(timestamp_iso: str) -> float:
+    """Timestamp ISO (naive, como o tempo simulado) em ms desde epoch."""
+    return (datetime.fromisoformat(timestamp_iso) - _EPOCH).total_seconds() * 1000
+
+
+def primeira_barra(condicao: Callable[[int, int], np.ndarray], inicio: int, fim: int) -> int:
+    """
+    Primeiro índice em [inicio, fim) onde condicao(a, b) é True.
+
+    condicao(a, b) recebe um intervalo e devolve a máscara booleana dele; a
+    busca avança em blocos crescentes para não avaliar o histórico inteiro
+    quando a resposta está próxima.
+
+    Returns:
+        Índice encontrado ou -1
+    """
+    passo = BLOCO_BUSCA_INICIAL
+    while inicio < fim:
+        bloco_fim = min(inicio + passo, fim)
+        achados = np.flatnonzero(condicao(inicio, bloco_fim))
+        if achados.size:
+            return inicio + int(achados[0])
+        inicio = bloco_fim
+        passo *= 4
+    return -1
+
+
+class _Restricoes:
+    """Condições acumuladas para o próximo salto."""
+
+    __slots__ = ('proxima', 'preco', 'inferior', 'superior', 'horizonte', 'condicoes')
+
+    def __init__(self, proxima: int, preco: float, horizonte: int):
+        self.proxima = proxima
+        self.preco = preco
+        self.inferior = -math.inf
+        self.superior = math.inf
+        self.horizonte = horizonte
+        self.condicoes: List[Callable[[int, int], np.ndarray]] = []
+
+    def gatilho_abaixo(self, preco) -> None:
+        """Algo pode acontecer com o preço <= 'preco'."""
+        limite = float(preco)
+        self.inferior = max(self.inferior, limite + abs(limite) * MARGEM_RELATIVA)
+
+    def gatilho_acima(self, preco) -> None:
+        """Algo pode acontecer com o preço >= 'preco'."""
+        limite = float(preco)
+        self.superior = min(self.superior, limite - abs(limite) * MARGEM_RELATIVA)
+
+    def ate_barra(self, barra: int) -> None:
+        """A barra 'barra' precisa do ciclo completo (evento de tempo)."""
+        self.horizonte = min(self.horizonte, barra)
+
+    def preco_na_faixa(self) -> bool:
+        """O preço da próxima barra ainda está longe de todos os gatilhos."""
+        return self.inferior < self.preco < self.superior
+
+
+class PlanejadorSaltos:
+    """
+    Calcula, após cada ciclo de decisão simulado, a próxima barra em que
+    o ciclo pode fazer alguma coisa.
+
+    Espelha _executar_ciclo_decisao do BotWorker: cada verificação de lá tem
+    aqui a restrição correspondente. Ao mudar o ciclo de decisão, atualize
+    o método equivalente (e rode tests/test_salto_barras.py).
+
+    Exemplo:
+        planejador = PlanejadorSaltos(worker)
+        proxima = planejador.proxima_barra(api.indice_atual - 1)
+        api.avancar_sem_eventos(proxima)
+    """
+
+    def __init__(self, worker):
+        """
+        Args:
+            worker: BotWorker em modo simulação sobre uma SimulatedExchangeAPI
+        """
+        self.worker = worker
+        self.api = worker.exchange_api
+        self.timestamps_ms = self.api.store_base.timestamps
+        self.closes = self.api.store_base.close
+        self.total_barras = self.api.total_barras
+        # datetime.timestamp() de horários naive = ms/1000 + deslocamento do fuso local
+        self._deslocamento_fuso_s = (
+            max(time.timezone, time.altzone) + FOLGA_HORARIO_VERAO_S if time.daylight else time.timezone
+        )
+
+    def proxima_barra(self, indice: int) -> int:
+        """
+        Próxima barra que precisa do ciclo completo.
+
+        Args:
+            indice: Barra que acabou de passar pelo ciclo de decisão
+
+        Returns:
+            Índice da barra (indice + 1 quando não há salto)
+        """
+        proxima = indice + 1
+        if proxima >= self.total_barras:
+            return proxima
+
+        restricoes = _Restricoes(proxima, float(self.closes[proxima]), self.total_barras)
+        if not self._restringir(restricoes) or restricoes.horizonte <= proxima:
+            return proxima
+
+        inferior, superior, condicoes = restricoes.inferior, restricoes.superior, restricoes.condicoes
+        closes = self.closes
+
+        def algum_evento(a: int, b: int) -> np.ndarray:
+            bloco = closes[a:b]
+            mascara = (bloco <= inferior) | (bloco >= superior)
+            for condicao in condicoes:
+                mascara |= condicao(a, b)
+            return mascara
+
+        barra = primeira_barra(algum_evento, proxima, restricoes.horizonte)
+        return restricoes.horizonte if barra < 0 else barra
+
+    # ═══════════════════════════════════════════════════════════════════
+    # RESTRIÇÕES (mesma ordem de _executar_ciclo_decisao)
+    # ═══════════════════════════════════════════════════════════════════
+
+    def _restringir(self, restricoes: _Restricoes) -> bool:
+        """
+        Monta as restrições; False quando o estado não permite saltar ou o
+        preço da próxima barra já está perto de um gatilho.
+        """
+        worker = self.worker
+        if not worker.command_queue.empty():
+            return False
+
+        self._restringir_stops(restricoes)
+        if not restricoes.preco_na_faixa() or not self._restringir_sma(restricoes):
+            return False
+
+        if worker.estrategia_ativa in ['dca', 'ambas']:
+            if not self._restringir_dca(restricoes) or not restricoes.preco_na_faixa():
+                return False
+            self._restringir_vendas(restricoes)
+            if not restricoes.preco_na_faixa():
+                return False
+
+        if worker.estrategia_ativa in ['giro', 'ambas'] and worker.strategy_swing_trade.habilitado:
+            if not self._restringir_giro(restricoes):
+                return False
+
+        return restricoes.preco_na_faixa()
+
+    def _restringir_stops(self, restricoes: _Restricoes) -> None:
+        """SL/TSL ativos: disparo, novo pico e promoção SL → TSL."""
+        worker = self.worker
+        for carteira in ['acumulacao', 'giro_rapido']:
+            stop_ativo = worker.stops_ativos.get(carteira)
+            if not stop_ativo:
+                continue
+
+            if stop_ativo['tipo'] == 'tsl':
+                restricoes.gatilho_abaixo(stop_ativo['nivel_stop'])
+                restricoes.gatilho_acima(stop_ativo['preco_pico'])
+            elif stop_ativo['tipo'] == 'sl':
+                restricoes.gatilho_abaixo(stop_ativo['nivel_stop'])
+                if carteira == 'giro_rapido':
+                    preco_medio = worker.position_manager.get_preco_medio('giro_rapido')
+                    if preco_medio:
+                        restricoes.gatilho_acima(
+                            float(preco_medio) * (1 + float(worker.tsl_gatilho_lucro_pct) / 100)
+                        )
+
+    def _restringir_sma(self, restricoes: _Restricoes) -> bool:
+        """Próxima atualização da SMA de referência (tempo simulado)."""
+        worker = self.worker
+        if worker.serie_sma_simulacao is None or worker.ts_ms_ultima_sma is None:
+            return False
+
+        horas = worker.config.get('INTERVALO_ATUALIZACAO_SMA_HORAS', 1)
+        limite_ms = math.floor(worker.ts_ms_ultima_sma + horas * 3_600_000) - 1
+        restricoes.ate_barra(int(np.searchsorted(self.timestamps_ms, limite_ms, side='left')))
+        return True
+
+    def _restringir_dca(self, restricoes: _Restricoes) -> bool:
+        """Degraus de compra (distância da SMA) e camadas de oportunidade extrema."""
+        worker = self.worker
+        dca = worker.strategy_dca
+        sma = worker.sma_referencia
+        if sma is None:
+            return True  # Sem SMA o DCA não é verificado
+
+        if not dca.habilitado:
+            return dca.ultimo_habilitado_logged is True
+
+        if worker.modo_crash_ativo or sma <= 0:
+            return False
+
+        # Guardião: mudança de estado pendente tem efeitos colaterais (logs, rearme)
+        excedido = worker.gestao_capital.get_alocacao_percentual_ada() > dca.limite_exposicao
+        if excedido != dca.notificou_exposicao_maxima:
+            return False
+
+        if excedido:
+            usadas = dca.state.get_state('oportunidades_extremas_usadas', default=[])
+            preco_medio = worker.position_manager.get_preco_medio()
+            for i, camada in enumerate(dca.gestao_risco.get('compras_de_oportunidade_extrema', [])):
+                if f"camada_{i}" in usadas:
+                    continue
+                tipo = camada.get('tipo', 'absoluto')
+                if tipo == 'absoluto':
+                    restricoes.gatilho_abaixo(camada['preco_alvo'])
+                elif tipo == 'percentual_pm' and preco_medio and preco_medio > 0:
+                    restricoes.gatilho_abaixo(float(preco_medio) * (1 - float(camada['queda_pm_pct']) / 100))
+            return True
+
+        return self._restringir_degraus(restricoes, sma)
+
+    def _restringir_degraus(self, restricoes: _Restricoes, sma) -> bool:
+        """
+        Degraus de compra. Sem degrau ativo, espera a distância da SMA chegar
+        ao menor gatilho. Com degrau ativo, só salta enquanto a compra está
+        bloqueada pela melhora do preço médio ou por cooldown.
+        """
+        worker = self.worker
+        dca = worker.strategy_dca
+        if not dca.gatilhos_degraus:
+            return True
+
+        # Degrau ativo quando distância >= gatilho ⇔ preço <= SMA * (1 - gatilho/100)
+        def preco_do_gatilho(gatilho) -> float:
+            return float(sma) * (1 - float(gatilho) / 100)
+
+        distancia = worker.calcular_distancia_sma(worker.num(restricoes.preco))
+        degrau = dca.encontrar_degrau_ativo(distancia) if distancia is not None else None
+        if degrau is None:
+            restricoes.gatilho_abaixo(preco_do_gatilho(min(gatilho for gatilho, _ in dca.gatilhos_degraus)))
+            return True
+
+        # Mesmo degrau selecionado dentro da faixa
+        gatilho_ativo = degrau['queda_percentual']
+        restricoes.gatilho_acima(preco_do_gatilho(gatilho_ativo))
+        mais_profundos = [gatilho for gatilho, _ in dca.gatilhos_degraus if gatilho > gatilho_ativo]
+        if mais_profundos:
+            restricoes.gatilho_abaixo(preco_do_gatilho(min(mais_profundos)))
+
+        # Filtro RSI e notificações de bloqueio têm estado próprio
+        if dca.usar_filtro_rsi or dca.notifier:
+            return False
+
+        preco_medio = worker.position_manager.get_preco_medio()
+        if preco_medio is not None and preco_medio > 0:
+            limite_melhora = float(preco_medio) * (1 - float(dca.percentual_minimo_melhora_pm) / 100)
+            if restricoes.preco > limite_melhora:
+                restricoes.gatilho_abaixo(limite_melhora)
+                return True  # Bloqueada: preço não melhora o PM
+            restricoes.gatilho_acima(limite_melhora)
+
+        # Bloqueada por cooldown (global ou do degrau) até o último deles acabar
+        fim_cooldown = self._fim_cooldown_dca(degrau)
+        if fim_cooldown > restricoes.proxima:
+            if degrau['nivel'] not in dca.degraus_notificados_bloqueados:
+                return False  # Primeiro bloqueio ainda vai registrar a notificação
+            restricoes.ate_barra(fim_cooldown)
+            return True
+
+        # Sem cooldown: bloqueada por capital (só muda com trades, que sempre
+        # passam pelo ciclo completo). valor_ordem = capital * % (a menos do
+        # arredondamento de quantidade * preço); recusas crescem com o valor
+        percentual_capital = float(degrau['percentual_capital_usar']) / 100
+        valor_ordem = float(worker.gestao_capital.calcular_capital_disponivel('acumulacao')) * percentual_capital
+        if valor_ordem < float(dca.valor_minimo_ordem) * (1 - MARGEM_RELATIVA):
+            return True
+        return worker.gestao_capital.compra_bloqueada(valor_ordem * (1 - MARGEM_RELATIVA), 'acumulacao')
+
+    def _fim_cooldown_dca(self, degrau) -> int:
+        """Primeira barra em que os cooldowns global e do degrau já acabaram."""
+        dca = self.worker.strategy_dca
+        fins_ms = [0.0]
+        ultima_global = dca.state.get_state('ultima_compra_global_ts')
+        if ultima_global:
+            fins_ms.append(_ms_desde_epoch(ultima_global) + float(dca.cooldown_global_minutos) * 60_000)
+        ultima_degrau = dca.state.get_state(f"ultima_compra_degrau_{degrau['nivel']}_ts")
+        if ultima_degrau:
+            fins_ms.append(_ms_desde_epoch(ultima_degrau) + float(degrau['intervalo_horas']) * 3_600_000)
+        # 1ms de folga cobre o arredondamento das horas/minutos decorridos no ciclo
+        return int(np.searchsorted(self.timestamps_ms, math.floor(max(fins_ms)) - 1, side='left'))
+
+    def _restringir_vendas(self, restricoes: _Restricoes) -> None:
+        """Metas, zonas de segurança, High-Water Mark e recompras da acumulação."""
+        worker = self.worker
+        venda = worker.strategy_sell
+        position_manager = worker.position_manager
+        carteira = venda.carteira
+
+        if not position_manager.tem_posicao(carteira):
+            return
+        preco_medio = position_manager.get_preco_medio(carteira)
+        if not preco_medio or preco_medio <= 0:
+            return
+
+        preco_medio = float(preco_medio)
+
+        def preco_com_lucro(lucro_pct) -> float:
+            return preco_medio * (1 + float(lucro_pct) / 100)
+
+        # Recompras pendentes: lucro <= high_water_mark - gatilho
+        for dados_zona in venda.capital_para_recompra.values():
+            restricoes.gatilho_abaixo(preco_com_lucro(dados_zona['high_water_mark'] - dados_zona['gatilho_recompra_pct']))
+
+        # Sem lucro a venda não é verificada além disso
+        if restricoes.preco <= preco_medio:
+            restricoes.gatilho_acima(preco_medio)
+            return
+
+        restricoes.gatilho_abaixo(preco_medio)
+        hwm = venda.high_water_mark_profit
+        restricoes.gatilho_acima(preco_com_lucro(hwm))
+        if venda.metas_ordenadas:
+            restricoes.gatilho_acima(preco_com_lucro(min(meta for meta, _ in venda.metas_ordenadas)))
+        if venda.sell_fallback_enabled:
+            restricoes.gatilho_acima(preco_com_lucro(venda.sell_fallback_percentual))
+
+        if venda.vendas_seguranca:
+            for gatilho_ativacao, gatilho_reversao, zona in venda.gatilhos_zonas:
+                if zona['nome'] in venda.zonas_de_seguranca_acionadas or hwm < gatilho_ativacao:
+                    continue
+                restricoes.gatilho_abaixo(preco_com_lucro(hwm - gatilho_reversao))
+
+    def _restringir_giro(self, restricoes: _Restricoes) -> bool:
+        """Entrada do giro rápido: cooldown e RSI projetado."""
+        worker = self.worker
+        swing = worker.strategy_swing_trade
+
+        if worker.position_manager.tem_posicao('giro_rapido'):
+            return True  # Saída é gerenciada pelos stops
+        if swing.ultimo_status_posicao is not False:
+            return False  # Log de mudança de status pendente
+
+        if swing.ultima_compra_timestamp is not None:
+            fim_cooldown = self._fim_cooldown(swing.ultima_compra_timestamp + swing.cooldown_segundos)
+            if fim_cooldown > restricoes.proxima:
+                restricoes.ate_barra(fim_cooldown)
+                return True
+
+        if not swing.usar_filtro_rsi_entrada:
+            return True
+
+        # Sem capital para a compra o RSI não importa (capital só muda com
+        # trades), mas o estado do RSI continua tendo de seguir o do loop
+        gestao_capital = swing.gestao_capital
+        capital = gestao_capital.calcular_capital_disponivel('giro_rapido')
+        sem_capital = capital <= 0 or capital < swing.valor_minimo_ordem or (
+            not swing.notifier and gestao_capital.compra_bloqueada(capital, 'giro_rapido')
+        )
+        return self._restringir_rsi_giro(restricoes, projetar=not sem_capital)
+
+    def _fim_cooldown(self, liberacao_s: float) -> int:
+        """
+        Primeira barra em que o cooldown do giro rápido pode ter acabado.
+
+        O ciclo compara tempo_simulado_atual.timestamp() (horário local) com
+        liberacao_s; aqui vale o maior deslocamento do fuso, o que só antecipa
+        a barra. 1ms de folga cobre o arredondamento de (agora - última compra).
+        """
+        limite_s = liberacao_s - self._deslocamento_fuso_s - 0.001
+        return int(np.searchsorted(self.timestamps_ms, math.floor(limite_s * 1000), side='left'))
+
+    def _restringir_rsi_giro(self, restricoes: _Restricoes, projetar: bool = True) -> bool:
+        """
+        Barras em que o RSI de entrada pode ficar abaixo do limite (com
+        projetar=False, só o limite de salto que mantém o estado do RSI).
+
+        O RSI de cada barra é projetado do estado atual do RSIIncremental.
+        O salto nunca passa de uma barra em que get_rsi precisaria semear o
+        motor de novo (janela sem o último candle fechado do estado), pois
+        aí o loop barra a barra e o salto chegariam a estados diferentes.
+        """
+        worker = self.worker
+        swing = worker.strategy_swing_trade
+        motor = worker.analise_tecnica.obter_motor_rsi(
+            worker.config.get('par', 'ADA/USDT'), swing.rsi_timeframe_entrada, swing.PERIODO_RSI
+        )
+        if motor is None or not motor.semeado or motor.ts_ultimo_fechado is None:
+            return False
+
+        timeframe = worker.analise_tecnica.normalizar_timeframe_rsi(swing.rsi_timeframe_entrada)
+        store = self.api.obter_kline_store(timeframe)
+        ultimo_fechado = int(np.searchsorted(store.timestamps, motor.ts_ultimo_fechado, side='left'))
+        if ultimo_fechado >= len(store) or int(store.timestamps[ultimo_fechado]) != motor.ts_ultimo_fechado:
+            return False
+
+        # Última barra em que a janela de LIMITE_CANDLES_RSI ainda contém o estado
+        maximo_visiveis = ultimo_fechado + swing.LIMITE_CANDLES_RSI
+        if maximo_visiveis < len(store):
+            restricoes.ate_barra(
+                int(np.searchsorted(self.timestamps_ms, store.timestamps[maximo_visiveis], side='left')) - 1
+            )
+
+        if not projetar:
+            return True
+
+        closes_seguintes = np.ascontiguousarray(store.close[ultimo_fechado + 1:maximo_visiveis], dtype=np.float64)
+        limite = float(swing.rsi_limite_compra) + MARGEM_RSI
+
+        def rsi_abaixo_do_limite(a: int, b: int) -> np.ndarray:
+            visiveis, closes_formando = self.api.candles_visiveis(timeframe, a, b)
+            passos = np.maximum(visiveis - 2 - ultimo_fechado, 0)
+            rsi = motor.projetar(closes_seguintes, passos, np.asarray(closes_formando, dtype=np.float64))
+            return rsi < limite
+
+        restricoes.condicoes.append(rsi_abaixo_do_limite)
+        return True
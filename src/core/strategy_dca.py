@@ -3,10 +3,12 @@
 Strategy DCA - Estratégia Dollar Cost Averaging
 """
 
+import logging
 from decimal import Decimal
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 
+from src.core.numerico import CONTEXTO_DECIMAL, ContextoNumerico
 from src.core.position_manager import PositionManager
 from src.core.gestao_capital import GestaoCapital
 from src.persistencia.state_manager import StateManager
@@ -26,7 +28,8 @@ class StrategyDCA:
         state_manager: StateManager,
         worker=None,
         logger=None,
-        notifier=None
+        notifier=None,
+        contexto_numerico: Optional[ContextoNumerico] = None
     ):
         """
         Inicializa a estratégia DCA
@@ -39,8 +42,10 @@ class StrategyDCA:
             worker: Referência ao BotWorker (para acessar modo crash)
             logger: Logger contextual para esta estratégia
             notifier: Instância do Notifier para notificações
+            contexto_numerico: Tipo numérico dos cálculos (padrão: Decimal)
         """
         self.config = config
+        self.num = contexto_numerico or CONTEXTO_DECIMAL
         self.position_manager = position_manager
         self.gestao_capital = gestao_capital
         self.state = state_manager
@@ -62,8 +67,15 @@ class StrategyDCA:
         # Configurações extraídas
         self.degraus_compra = config.get('DEGRAUS_COMPRA', [])
         self.cooldown_global_minutos = config.get('COOLDOWN_GLOBAL_APOS_COMPRA_MINUTOS', 30)
-        self.percentual_minimo_melhora_pm = Decimal(str(config.get('PERCENTUAL_MINIMO_MELHORA_PM', 2.0)))
+        self.percentual_minimo_melhora_pm = self.num(config.get('PERCENTUAL_MINIMO_MELHORA_PM', 2.0))
         self.gestao_risco = config.get('GESTAO_DE_RISCO', {})
+
+        # Constantes do caminho quente convertidas uma única vez (não por barra)
+        self.gatilhos_degraus = [
+            (self.num(degrau['gatilho_distancia_sma']), degrau) for degrau in self.degraus_compra
+        ]
+        self.limite_exposicao = self.num(self.gestao_risco.get('exposicao_maxima_percentual_capital', 70.0))
+        self.valor_minimo_ordem = self.num(config.get('VALOR_MINIMO_ORDEM', 5.0))
         
         # Configuração do filtro RSI (opcional) - por compatibilidade, padrão = False
         self.usar_filtro_rsi = bool(config.get('usar_filtro_rsi', False))
@@ -71,7 +83,7 @@ class StrategyDCA:
         # Limite de RSI para compras - só é obrigatório se o filtro estiver ativo
         if self.usar_filtro_rsi:
             # Usar get com fallback para evitar KeyError em configs sem chave
-            self.limite_rsi = Decimal(str(config.get('rsi_limite_compra', 35)))
+            self.limite_rsi = self.num(config.get('rsi_limite_compra', 35))
             # Timeframe do RSI - CONFIGURÁVEL (padrão: 4h)
             self.rsi_timeframe = config.get('rsi_timeframe', '4h')
         else:
@@ -84,7 +96,7 @@ class StrategyDCA:
             self.config.get('ESTRATEGIAS', {}).get('dca', True)
         )
         # Cache para evitar spam de logs sobre estado habilitado/desabilitado
-        self._ultimo_habilitado_logged: Optional[bool] = None
+        self.ultimo_habilitado_logged: Optional[bool] = None
     
     def verificar_oportunidade(
         self, 
@@ -111,13 +123,13 @@ class StrategyDCA:
             # Se estratégia DCA estiver desabilitada nas configs, não faz nada
             if not self.habilitado:
                 # Logar apenas quando houver mudança de estado para evitar spam
-                if self._ultimo_habilitado_logged is not True:
+                if self.ultimo_habilitado_logged is not True:
                     self.logger.info("ℹ️ Estratégia DCA está desabilitada nas configurações; pulando verificações DCA.")
-                    self._ultimo_habilitado_logged = True
+                    self.ultimo_habilitado_logged = True
                 return None
             else:
                 # Resetar cache quando estratégia passa a estar habilitada
-                self._ultimo_habilitado_logged = False
+                self.ultimo_habilitado_logged = False
 
             # MODO CRASH: Ignorar todas as restrições
             modo_crash = self.worker.modo_crash_ativo if self.worker else False
@@ -130,22 +142,23 @@ class StrategyDCA:
                 return self._verificar_oportunidades_extremas(preco_atual)
             
             # Buscar degrau ativo baseado na distância da SMA
-            degrau_ativo = self._encontrar_degrau_ativo(distancia_sma)
+            degrau_ativo = self.encontrar_degrau_ativo(distancia_sma)
             if not degrau_ativo:
-                self.logger.debug(f"📊 Nenhum degrau ativo para queda de {distancia_sma:.2f}%")
-                # Log adicional: listar gatilhos configurados para ajudar no debug
-                try:
-                    gatilhos = [float(d.get('gatilho_distancia_sma', 0)) for d in self.degraus_compra]
-                    self.logger.debug(f"🔎 Degraus configurados (gatilhos SMA %): {gatilhos}")
-                except Exception:
-                    pass
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("📊 Nenhum degrau ativo para queda de %.2f%%", distancia_sma)
+                    # Log adicional: listar gatilhos configurados para ajudar no debug
+                    try:
+                        gatilhos = [float(d.get('gatilho_distancia_sma', 0)) for d in self.degraus_compra]
+                        self.logger.debug("🔎 Degraus configurados (gatilhos SMA %%): %s", gatilhos)
+                    except Exception:
+                        pass
                 return None
 
             # Calcula e adiciona a quantidade_ada ao degrau_ativo
-            percentual_capital = Decimal(str(degrau_ativo['percentual_capital_usar']))
+            percentual_capital = self.num(degrau_ativo['percentual_capital_usar'])
             # CORREÇÃO: Usar o capital disponível para a carteira 'acumulacao', não o saldo USDT total
             capital_disponivel_acumulacao = self.gestao_capital.calcular_capital_disponivel('acumulacao')
-            capital_para_usar = capital_disponivel_acumulacao * (percentual_capital / Decimal('100'))
+            capital_para_usar = capital_disponivel_acumulacao * (percentual_capital / self.num.cem)
             degrau_ativo['quantidade_ada'] = capital_para_usar / preco_atual
 
             # Verificação de RSI - SÓ EXECUTA SE O FILTRO ESTIVER ATIVO
@@ -153,14 +166,15 @@ class StrategyDCA:
                 # Buscar RSI usando o timeframe configurável
                 rsi_atual = self.worker.analise_tecnica.get_rsi(
                     par=self.config['par'],
-                    timeframe=self.rsi_timeframe
+                    timeframe=self.rsi_timeframe,
+                    preco_atual=preco_atual
                 )
                 if rsi_atual is None:
                     self.logger.debug(f"📊 Compra bloqueada pelo RSI: RSI não disponível ({self.rsi_timeframe})")
                     return None
                 elif rsi_atual >= self.limite_rsi:
                     motivo = f"RSI({self.rsi_timeframe}) {rsi_atual:.2f} >= {self.limite_rsi}"
-                    self.logger.debug(f"📊 Compra bloqueada pelo RSI: {motivo}")
+                    self.logger.debug("📊 Compra bloqueada pelo RSI: %s", motivo)
                     self._notificar_compra_bloqueada(degrau_ativo, preco_atual, "RSI", motivo)
                     return None
             # Se usar_filtro_rsi = False, a verificação é automaticamente aprovada (ignorada)
@@ -174,7 +188,8 @@ class StrategyDCA:
                     # Log detalhado do motivo (o método já notifica via _notificar_compra_bloqueada)
                     preco_medio_atual = self.position_manager.get_preco_medio()
                     self.logger.debug(
-                        f"❌ Dupla-condição NÃO atendida para degrau {degrau_ativo.get('nivel')} - Preço atual: {preco_atual:.6f}, PM: {preco_medio_atual}"
+                        "❌ Dupla-condição NÃO atendida para degrau %s - Preço atual: %.6f, PM: %s",
+                        degrau_ativo.get('nivel'), preco_atual, preco_medio_atual
                     )
                     return None
             
@@ -182,24 +197,25 @@ class StrategyDCA:
             pode_comprar, motivo_bloqueio = self._verificar_cooldowns(degrau_ativo, tempo_atual)
             if not pode_comprar:
                 # Log do motivo do cooldown para facilitar debug em backtests
-                self.logger.debug(f"🕒 Compra bloqueada por cooldown (degrau {degrau_ativo.get('nivel')}): {motivo_bloqueio}")
+                self.logger.debug("🕒 Compra bloqueada por cooldown (degrau %s): %s", degrau_ativo.get('nivel'), motivo_bloqueio)
                 self._gerenciar_notificacao_bloqueio(degrau_ativo['nivel'], motivo_bloqueio)
                 return None
             
             # Verificar se há capital suficiente
-            quantidade_ada = Decimal(str(degrau_ativo['quantidade_ada']))
+            quantidade_ada = self.num(degrau_ativo['quantidade_ada'])
             valor_ordem = quantidade_ada * preco_atual
 
             # ✅ CORREÇÃO: Verificar se o valor da ordem atinge o mínimo da exchange
-            valor_minimo_ordem = Decimal(str(self.config.get('VALOR_MINIMO_ORDEM', 5.0)))
+            valor_minimo_ordem = self.valor_minimo_ordem
             if valor_ordem < valor_minimo_ordem:
-                self.logger.debug(f"💰 Valor da ordem ${valor_ordem:.2f} abaixo do mínimo de ${valor_minimo_ordem:.2f} para o degrau {degrau_ativo['nivel']}. Ignorando.")
+                self.logger.debug("💰 Valor da ordem $%.2f abaixo do mínimo de $%.2f para o degrau %s. Ignorando.",
+                                  valor_ordem, valor_minimo_ordem, degrau_ativo['nivel'])
                 return None
             
             # IMPORTANTE: Passar 'acumulacao' explicitamente para validar capital da carteira correta
             pode_comprar_capital, motivo = self.gestao_capital.pode_comprar(valor_ordem, carteira='acumulacao')
             if not pode_comprar_capital:
-                self.logger.debug(f"💰 Capital insuficiente para degrau {degrau_ativo['nivel']}: {motivo}")
+                self.logger.debug("💰 Capital insuficiente para degrau %s: %s", degrau_ativo['nivel'], motivo)
                 return None
             
             # Oportunidade encontrada!
@@ -236,9 +252,7 @@ class StrategyDCA:
         """
         try:
             # Obter configuração de exposição máxima
-            limite_exposicao = Decimal(str(
-                self.gestao_risco.get('exposicao_maxima_percentual_capital', 70.0)
-            ))
+            limite_exposicao = self.limite_exposicao
             
             # Verificar alocação atual
             alocacao_atual = self.gestao_capital.get_alocacao_percentual_ada()
@@ -301,15 +315,15 @@ class StrategyDCA:
                 motivo = ""
 
                 if tipo_gatilho == "absoluto":
-                    preco_alvo = Decimal(str(camada['preco_alvo']))
+                    preco_alvo = self.num(camada['preco_alvo'])
                     if preco_atual <= preco_alvo:
                         gatilho_atingido = True
                         motivo = f"Oportunidade Extrema Absoluta (Preço <= {preco_alvo})"
                 
                 elif tipo_gatilho == "percentual_pm":
                     if preco_medio_atual and preco_medio_atual > 0:
-                        queda_pm_pct = Decimal(str(camada['queda_pm_pct']))
-                        preco_alvo_dinamico = preco_medio_atual * (Decimal('1') - queda_pm_pct / Decimal('100'))
+                        queda_pm_pct = self.num(camada['queda_pm_pct'])
+                        preco_alvo_dinamico = preco_medio_atual * (self.num.um - queda_pm_pct / self.num.cem)
                         if preco_atual <= preco_alvo_dinamico:
                             gatilho_atingido = True
                             motivo = f"Oportunidade Extrema Percentual ({queda_pm_pct}% abaixo do PM {preco_medio_atual:.4f})"
@@ -320,13 +334,13 @@ class StrategyDCA:
                 if gatilho_atingido:
                     self.logger.info(f"🚨 {motivo.upper()} DETECTADA!")
                     
-                    percentual_a_usar = Decimal(str(camada['percentual_capital_usar']))
+                    percentual_a_usar = self.num(camada['percentual_capital_usar'])
                     capital_disponivel = self.gestao_capital.calcular_capital_disponivel()
-                    valor_compra_usdt = capital_disponivel * (percentual_a_usar / Decimal('100'))
+                    valor_compra_usdt = capital_disponivel * (percentual_a_usar / self.num.cem)
                     quantidade_ada = valor_compra_usdt / preco_atual
                     
-                    valor_minimo = Decimal(str(self.config.get('VALOR_MINIMO_ORDEM', 5.0)))
-                    if valor_compra_usdt >= valor_minimo and quantidade_ada >= Decimal('1'):
+                    valor_minimo = self.valor_minimo_ordem
+                    if valor_compra_usdt >= valor_minimo and quantidade_ada >= self.num.um:
                         return {
                             'tipo': 'oportunidade_extrema',
                             'degrau': f"extrema_{camada_id}",
@@ -346,7 +360,7 @@ class StrategyDCA:
             self.logger.error(f"❌ Erro ao verificar oportunidades extremas: {e}", exc_info=True)
             return None
     
-    def _encontrar_degrau_ativo(self, distancia_sma: Decimal) -> Optional[Dict[str, Any]]:
+    def encontrar_degrau_ativo(self, distancia_sma: Decimal) -> Optional[Dict[str, Any]]:
         """
         Encontra o degrau mais profundo ativo baseado na distância da SMA.
         
@@ -361,25 +375,20 @@ class StrategyDCA:
         """
         # 1. Iniciar variável degrau_selecionado = None
         degrau_selecionado = None
+        gatilho_selecionado = None
         
-        # 2. Obter lista de degraus
+        # 2. Obter lista de degraus (gatilhos já convertidos no __init__)
         # 3. Iterar sobre cada degrau
-        for degrau in self.degraus_compra:
+        for gatilho_deste_degrau, degrau in self.gatilhos_degraus:
             # 4. Verificar se queda atual é MAIOR OU IGUAL ao gatilho deste degrau
-            gatilho_deste_degrau = Decimal(str(degrau['gatilho_distancia_sma']))
-            
             if distancia_sma >= gatilho_deste_degrau:
                 # Este degrau é um candidato!
                 # 5. Verificar se ele é mais profundo que o degrau_selecionado atual
-                if degrau_selecionado is None:
-                    # Primeiro candidato encontrado
+                #    (primeiro candidato, ou gatilho maior que o do candidato atual)
+                if degrau_selecionado is None or gatilho_deste_degrau > gatilho_selecionado:
+                    # 6. Este degrau é mais profundo - atualizar seleção
                     degrau_selecionado = degrau
-                else:
-                    # Comparar com o candidato atual
-                    gatilho_selecionado = Decimal(str(degrau_selecionado['gatilho_distancia_sma']))
-                    if gatilho_deste_degrau > gatilho_selecionado:
-                        # 6. Este degrau é mais profundo - atualizar seleção
-                        degrau_selecionado = degrau
+                    gatilho_selecionado = gatilho_deste_degrau
         
         # 7. Após o loop, verificar se encontrou algum degrau
         # 8. Se nenhum degrau foi ativado, retornar None
@@ -388,8 +397,7 @@ class StrategyDCA:
         
         # Criar cópia para não modificar config original
         degrau_ativo = degrau_selecionado.copy()
-        queda_necessaria = Decimal(str(degrau_selecionado['gatilho_distancia_sma']))
-        degrau_ativo['queda_percentual'] = queda_necessaria
+        degrau_ativo['queda_percentual'] = gatilho_selecionado
         
         return degrau_ativo
     
@@ -411,7 +419,7 @@ class StrategyDCA:
             bool: True se ambas condições atendidas
         """
         # CONDIÇÃO 1: Verificar se degrau está ativo (queda suficiente desde SMA)
-        queda_necessaria = Decimal(str(degrau['queda_percentual']))
+        queda_necessaria = self.num(degrau['queda_percentual'])
         condicao_sma_ok = distancia_sma >= queda_necessaria
         
         if not condicao_sma_ok:
@@ -422,25 +430,24 @@ class StrategyDCA:
         
         if preco_medio_atual is None or preco_medio_atual <= 0:
             # Sem posição anterior - sempre pode comprar
-            self.logger.debug(f"✅ Sem posição anterior - condição de melhora PM dispensada")
+            self.logger.debug("✅ Sem posição anterior - condição de melhora PM dispensada")
             return True
         
         # Verificar melhora mínima do preço médio
-        percentual_melhora = self.percentual_minimo_melhora_pm / Decimal('100')
-        limite_preco_melhora = preco_medio_atual * (Decimal('1') - percentual_melhora)
+        percentual_melhora = self.percentual_minimo_melhora_pm / self.num.cem
+        limite_preco_melhora = preco_medio_atual * (self.num.um - percentual_melhora)
         condicao_melhora_pm_ok = preco_atual <= limite_preco_melhora
         
         if not condicao_melhora_pm_ok:
             motivo = f"Preço ${preco_atual:.6f} não melhora PM ${preco_medio_atual:.6f} em {self.percentual_minimo_melhora_pm}%"
             self.logger.debug(
-                f"📊 Degrau {degrau['nivel']}: SMA OK ({distancia_sma:.2f}%), "
-                f"mas preço ${preco_atual:.6f} não melhora PM (${preco_medio_atual:.6f}) "
-                f"em {self.percentual_minimo_melhora_pm}%"
+                "📊 Degrau %s: SMA OK (%.2f%%), mas preço $%.6f não melhora PM ($%.6f) em %s%%",
+                degrau['nivel'], distancia_sma, preco_atual, preco_medio_atual, self.percentual_minimo_melhora_pm
             )
             self._notificar_compra_bloqueada(degrau, preco_atual, "Preço Médio (PM)", motivo)
             return False
         
-        self.logger.debug(f"✅ Dupla-condição atendida para degrau {degrau['nivel']}")
+        self.logger.debug("✅ Dupla-condição atendida para degrau %s", degrau['nivel'])
         return True
     
     def _verificar_cooldowns(self, degrau: Dict[str, Any], tempo_atual: Optional[datetime] = None) -> tuple[bool, Optional[str]]:
@@ -469,7 +476,7 @@ class StrategyDCA:
             if minutos_decorridos < self.cooldown_global_minutos:
                 minutos_restantes = int(self.cooldown_global_minutos - minutos_decorridos)
                 motivo = f"cooldown_global:{minutos_restantes}min"
-                self.logger.debug(f"🕒 Cooldown global ativo (faltam {minutos_restantes} min)")
+                self.logger.debug("🕒 Cooldown global ativo (faltam %s min)", minutos_restantes)
                 return (False, motivo)
         
         # VERIFICAÇÃO 2: COOLDOWN POR DEGRAU (intervalo específico do degrau)
@@ -479,13 +486,13 @@ class StrategyDCA:
         if timestamp_degrau_str:
             ultima_compra_degrau = datetime.fromisoformat(timestamp_degrau_str)
             tempo_desde_compra_degrau = agora - ultima_compra_degrau
-            intervalo_horas = Decimal(str(degrau['intervalo_horas']))
-            horas_decorridas = Decimal(str(tempo_desde_compra_degrau.total_seconds() / 3600))
+            intervalo_horas = self.num(degrau['intervalo_horas'])
+            horas_decorridas = self.num(tempo_desde_compra_degrau.total_seconds() / 3600)
 
             if horas_decorridas < intervalo_horas:
                 horas_restantes = float(intervalo_horas - horas_decorridas)
                 motivo = f"cooldown_degrau:{horas_restantes:.1f}h"
-                self.logger.debug(f"🕒 Degrau {nivel_degrau} em cooldown (faltam {horas_restantes:.1f}h)")
+                self.logger.debug("🕒 Degrau %s em cooldown (faltam %.1fh)", nivel_degrau, horas_restantes)
                 return (False, motivo)
         
         # Passou em todas as verificações
@@ -502,9 +509,9 @@ class StrategyDCA:
         if nivel_degrau not in self.degraus_notificados_bloqueados:
             self.degraus_notificados_bloqueados.add(nivel_degrau)
             if motivo and motivo.startswith('cooldown_global'):
-                self.logger.debug(f"🕒 Cooldown global ativo ({motivo})")
+                self.logger.debug("🕒 Cooldown global ativo (%s)", motivo)
             elif motivo and motivo.startswith('cooldown_degrau'):
-                self.logger.debug(f"🕒 Degrau {nivel_degrau} em cooldown ({motivo})")
+                self.logger.debug("🕒 Degrau %s em cooldown (%s)", nivel_degrau, motivo)
     
     def _gerenciar_notificacao_desbloqueio(self, nivel_degrau: int):
         """
@@ -7,6 +7,7 @@ from decimal import Decimal
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from src.core.numerico import CONTEXTO_DECIMAL, ContextoNumerico
 from src.core.position_manager import PositionManager
 from src.persistencia.state_manager import StateManager
 
@@ -27,7 +28,8 @@ class StrategySell:
         position_manager: PositionManager,
         state_manager: StateManager,
         carteira: str = 'acumulacao',
-        logger=None
+        logger=None,
+        contexto_numerico: Optional[ContextoNumerico] = None
     ):
         """
         Inicializa a estratégia de vendas
@@ -38,6 +40,7 @@ class StrategySell:
             state_manager: Gerenciador de estado
             carteira: Nome da carteira ('acumulacao' ou 'giro_rapido')
             logger: Logger contextual (opcional)
+            contexto_numerico: Tipo numérico dos cálculos (padrão: Decimal)
         """
         # Logger contextual (fallback para logger global se não fornecido)
         if logger:
@@ -47,6 +50,7 @@ class StrategySell:
             self.logger, _ = get_loggers()
 
         self.config = config
+        self.num = contexto_numerico or CONTEXTO_DECIMAL
         self.position_manager = position_manager
         self.state = state_manager
         self.carteira = carteira
@@ -54,17 +58,31 @@ class StrategySell:
         # Configurações extraídas
         self.metas_venda = config.get('METAS_VENDA', [])
         self.vendas_seguranca = config.get('VENDAS_DE_SEGURANCA', [])
-        self.valor_minimo_ordem = Decimal(str(config.get('VALOR_MINIMO_ORDEM', 5.0)))
+
+        # Gatilhos convertidos uma única vez (verificados a cada barra com lucro)
+        # Metas em ordem decrescente de lucro; suporta 'gatilho_lucro_pct' (padrão)
+        # ou 'lucro_percentual' (legado)
+        self.metas_ordenadas = sorted(
+            ((self.num(meta.get('gatilho_lucro_pct', meta.get('lucro_percentual', 0))), meta) for meta in self.metas_venda),
+            key=lambda item: item[0],
+            reverse=True
+        )
+        self.gatilhos_zonas = [
+            (self.num(zona['gatilho_ativacao_lucro_pct']), self.num(zona['gatilho_venda_reversao_pct']), zona)
+            for zona in self.vendas_seguranca
+        ]
+        self.fator_step_size = self.num('10')  # Step size da ADA: 0.1
+        self.valor_minimo_ordem = self.num(config.get('VALOR_MINIMO_ORDEM', 5.0))
         # Fallback de venda simples (quando nenhuma meta é configurada ou atingida)
         # Permite ativar uma meta de venda simples para validação de buy+sell
         self.sell_fallback_enabled = bool(config.get('SELL_FALLBACK_ENABLED', False))
         # Percentual de lucro para acionar o fallback (ex: 3 = 3%)
-        self.sell_fallback_percentual = Decimal(str(config.get('SELL_FALLBACK_PERCENTUAL', 3)))
+        self.sell_fallback_percentual = self.num(config.get('SELL_FALLBACK_PERCENTUAL', 3))
         # Percentual da posição a vender quando o fallback aciona (ex: 100 = vende tudo)
-        self.sell_fallback_percentual_venda = Decimal(str(config.get('SELL_FALLBACK_PERCENTUAL_VENDA', 100)))
+        self.sell_fallback_percentual_venda = self.num(config.get('SELL_FALLBACK_PERCENTUAL_VENDA', 100))
         
         # Estado do High-Water Mark
-        self.high_water_mark_profit: Decimal = Decimal('0')
+        self.high_water_mark_profit: Decimal = self.num.zero
         self.zonas_de_seguranca_acionadas: set = set()
         self.capital_para_recompra: Dict[str, Dict] = {}
         
@@ -117,7 +135,7 @@ class StrategySell:
                     if lucro_atual >= self.sell_fallback_percentual:
                         self.logger.info(f"🔎 Fallback de venda ativado - lucro atual {lucro_atual:.2f}% >= {self.sell_fallback_percentual}%")
                         quantidade_total = self.position_manager.get_quantidade_total(self.carteira)
-                        percentual_venda = self.sell_fallback_percentual_venda / Decimal('100')
+                        percentual_venda = self.sell_fallback_percentual_venda / self.num.cem
                         quantidade_venda = quantidade_total * percentual_venda
                         quantidade_venda = self._arredondar_quantidade(quantidade_venda)
                         valor_ordem = quantidade_venda * preco_atual
@@ -157,25 +175,15 @@ class StrategySell:
         Returns:
             Dict com oportunidade de meta fixa ou None
         """
-        # Ordenar metas por lucro percentual (maior para menor)
-        # Suportar ambas as chaves: 'gatilho_lucro_pct' (padrão) ou 'lucro_percentual' (legado)
-        metas_ordenadas = sorted(
-            self.metas_venda,
-            key=lambda x: Decimal(str(x.get('gatilho_lucro_pct', x.get('lucro_percentual', 0)))),
-            reverse=True
-        )
-        
+        # Metas já ordenadas por lucro percentual (maior para menor) no __init__
         # Verificar se alguma meta fixa foi atingida
-        for meta in metas_ordenadas:
-            # Suportar ambas as chaves: 'gatilho_lucro_pct' (padrão) ou 'lucro_percentual' (legado)
-            meta_lucro_pct = Decimal(str(meta.get('gatilho_lucro_pct', meta.get('lucro_percentual', 0))))
-
+        for meta_lucro_pct, meta in self.metas_ordenadas:
             if lucro_atual >= meta_lucro_pct:
                 # Calcular quantidade a vender
                 quantidade_total = self.position_manager.get_quantidade_total(self.carteira)
                 # Usar valor padrão (100%) se percentual_venda não estiver definido
                 percentual_venda_valor = meta.get('percentual_venda', 100)
-                percentual_venda = Decimal(str(percentual_venda_valor)) / Decimal('100')
+                percentual_venda = self.num(percentual_venda_valor) / self.num.cem
                 quantidade_venda = quantidade_total * percentual_venda
 
                 # Arredondar para 0.1 (step size ADA)
@@ -223,23 +231,19 @@ class StrategySell:
 
         quantidade_total = self.position_manager.get_quantidade_total(self.carteira)
         
-        for zona in self.vendas_seguranca:
+        # GATILHO 1: Ativação - High-water mark deve ultrapassar este valor
+        # GATILHO 2: Reversão - Quanto deve cair desde o pico para vender
+        for gatilho_ativacao_pct, gatilho_reversao_pct, zona in self.gatilhos_zonas:
             nome_zona = zona['nome']
             
             # Verificar se zona já foi acionada
             if nome_zona in self.zonas_de_seguranca_acionadas:
                 continue
             
-            # GATILHO 1: Ativação - High-water mark deve ultrapassar este valor
-            gatilho_ativacao_pct = Decimal(str(zona['gatilho_ativacao_lucro_pct']))
-            
             # Verificar se high-water mark "armou" o gatilho da zona
             if self.high_water_mark_profit < gatilho_ativacao_pct:
                 continue
             
-            # GATILHO 2: Reversão - Quanto deve cair desde o pico para vender
-            gatilho_reversao_pct = Decimal(str(zona['gatilho_venda_reversao_pct']))
-            
             # Calcular gatilho de venda baseado na reversão configurada
             gatilho_venda = self.high_water_mark_profit - gatilho_reversao_pct
             
@@ -252,7 +256,7 @@ class StrategySell:
                 self.logger.info(f"   🎯 Gatilho venda: {gatilho_venda:.2f}%")
                 
                 # Calcular quantidade a vender
-                percentual_venda = Decimal(str(zona['percentual_venda_posicao'])) / Decimal('100')
+                percentual_venda = self.num(zona['percentual_venda_posicao']) / self.num.cem
                 quantidade_venda = quantidade_total * percentual_venda
                 
                 # Arredondar para 0.1 (step size ADA)
@@ -278,7 +282,7 @@ class StrategySell:
                     'quantidade_venda': quantidade_venda,
                     'preco_atual': preco_atual,
                     'valor_ordem': valor_ordem,
-                    'gatilho_recompra_drop': Decimal(str(zona['gatilho_recompra_drop_pct'])),
+                    'gatilho_recompra_drop': self.num(zona['gatilho_recompra_drop_pct']),
                     'motivo': f"Venda Segurança {nome_zona}",
                     'reset_hwm': False,  # Vendas de segurança NÃO resetam HWM
                     'zona_config': zona
@@ -310,9 +314,7 @@ class StrategySell:
         Returns:
             Decimal: Quantidade arredondada
         """
-        return (quantidade * Decimal('10')).quantize(
-            Decimal('1'), rounding='ROUND_DOWN'
-        ) / Decimal('10')
+        return self.num.arredondar_para_baixo(quantidade, self.fator_step_size)
     
     def _validar_ordem_minima(self, valor_ordem: Decimal, quantidade: Decimal) -> bool:
         """
@@ -325,7 +327,7 @@ class StrategySell:
         Returns:
             bool: True se ordem é válida
         """
-        return valor_ordem >= self.valor_minimo_ordem and quantidade >= Decimal('1')
+        return valor_ordem >= self.valor_minimo_ordem and quantidade >= self.num.um
     
     def registrar_venda_executada(
         self, 
@@ -345,7 +347,7 @@ class StrategySell:
             # Se foi meta fixa, resetar High-Water Mark e zonas
             if tipo_venda == 'meta_fixa' and oportunidade.get('reset_hwm', True):
                 self.logger.info("🔄 Resetando High-Water Mark após venda de meta fixa")
-                self.high_water_mark_profit = Decimal('0')
+                self.high_water_mark_profit = self.num.zero
                 self.zonas_de_seguranca_acionadas.clear()
                 self.capital_para_recompra.clear()
                 self._salvar_estado_hwm()
@@ -465,7 +467,7 @@ class StrategySell:
             # Carregar High-Water Mark
             hwm_str = self.state.get_state('high_water_mark_profit')
             if hwm_str:
-                self.high_water_mark_profit = Decimal(str(hwm_str))
+                self.high_water_mark_profit = self.num(hwm_str)
             
             # Carregar zonas acionadas
             zonas_str = self.state.get_state('zonas_seguranca_acionadas')
@@ -481,7 +483,7 @@ class StrategySell:
                         for key in ['capital_usdt', 'high_water_mark', 'gatilho_recompra_pct', 
                                   'quantidade_vendida', 'preco_venda']:
                             if key in dados and dados[key] is not None:
-                                dados[key] = Decimal(str(dados[key]))
+                                dados[key] = self.num(dados[key])
                 self.capital_para_recompra = capital_str
             
             self.logger.debug(f"📊 Estado HWM carregado: {self.high_water_mark_profit:.2f}%")
@@ -542,7 +544,7 @@ class StrategySell:
         Reseta completamente o estado da estratégia (para testes ou reset manual)
         """
         self.logger.warning("🔄 Resetando estado da estratégia de vendas")
-        self.high_water_mark_profit = Decimal('0')
+        self.high_water_mark_profit = self.num.zero
         self.zonas_de_seguranca_acionadas.clear()
         self.capital_para_recompra.clear()
         self._salvar_estado_hwm()
@@ -17,6 +17,7 @@ import sys
 # Adicionar path do projeto
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.core.numerico import CONTEXTO_DECIMAL, ContextoNumerico
 from src.core.position_manager import PositionManager
 from src.core.gestao_capital import GestaoCapital
 from src.core.analise_tecnica import AnaliseTecnica
@@ -42,6 +43,10 @@ class StrategySwingTrade:
     - StateManager: Persistência de stops
     """
 
+    # RSI de entrada: período e candles buscados a cada verificação
+    PERIODO_RSI = 14
+    LIMITE_CANDLES_RSI = 100
+
     def __init__(
         self,
         config: Dict[str, Any],
@@ -50,7 +55,8 @@ class StrategySwingTrade:
         analise_tecnica: AnaliseTecnica,
         logger=None,
         notifier=None,
-        exchange_api=None
+        exchange_api=None,
+        contexto_numerico: Optional[ContextoNumerico] = None
     ):
         """
         Inicializa a estratégia de swing trade
@@ -63,6 +69,7 @@ class StrategySwingTrade:
             logger: Logger contextual (opcional)
             notifier: Instância do Notifier para notificações
             exchange_api: API da exchange (para logs apenas)
+            contexto_numerico: Tipo numérico dos cálculos (padrão: Decimal)
         """
         # Logger contextual (fallback para logger global se não fornecido)
         if logger:
@@ -72,6 +79,7 @@ class StrategySwingTrade:
             self.logger, _ = get_loggers()
 
         self.config = config
+        self.num = contexto_numerico or CONTEXTO_DECIMAL
         self.position_manager = position_manager
         self.gestao_capital = gestao_capital
         self.analise_tecnica = analise_tecnica  # CRÍTICO: Para get_rsi()
@@ -88,7 +96,7 @@ class StrategySwingTrade:
         self.estrategia_config = config.get('estrategia_giro_rapido', {})
 
         # Parâmetros de alocação
-        self.alocacao_capital_pct = Decimal(str(self.estrategia_config.get('alocacao_capital_pct', 20)))
+        self.alocacao_capital_pct = self.num(self.estrategia_config.get('alocacao_capital_pct', 20))
 
         # ═══════════════════════════════════════════════════════════════
         # PARÂMETROS DE ENTRADA (RSI)
@@ -104,13 +112,14 @@ class StrategySwingTrade:
             rsi_tf_cleaned = rsi_tf_cleaned[:-1]  # Remove 'h' final
         self.rsi_timeframe_entrada = rsi_tf_cleaned
 
-        self.rsi_limite_compra = Decimal(str(self.estrategia_config.get('rsi_limite_compra', 30)))
+        self.rsi_limite_compra = self.num(self.estrategia_config.get('rsi_limite_compra', 30))
 
         # ═══════════════════════════════════════════════════════════════
         # PARÂMETROS DE SAÍDA (Gerenciados pelo BotWorker)
         # ═══════════════════════════════════════════════════════════════
-        self.stop_loss_inicial_pct = Decimal(str(self.estrategia_config.get('stop_loss_inicial_pct', 2.5)))
-        self.trailing_stop_distancia_pct = Decimal(str(self.estrategia_config.get('trailing_stop_distancia_pct', 0.8)))
+        self.stop_loss_inicial_pct = self.num(self.estrategia_config.get('stop_loss_inicial_pct', 2.5))
+        self.trailing_stop_distancia_pct = self.num(self.estrategia_config.get('trailing_stop_distancia_pct', 0.8))
+        self.valor_minimo_ordem = self.num(self.config.get('VALOR_MINIMO_ORDEM', 5.0))
 
         # Estado interno
         self.ultima_compra_timestamp: Optional[float] = None
@@ -175,7 +184,7 @@ class StrategySwingTrade:
             agora = tempo_atual if tempo_atual is not None else time.time()
             tempo_desde_ultima_compra = agora - self.ultima_compra_timestamp
             if tempo_desde_ultima_compra < self.cooldown_segundos:
-                self.logger.debug(f"⏱️ Cooldown ativo: {int(self.cooldown_segundos - tempo_desde_ultima_compra)}s restantes")
+                self.logger.debug("⏱️ Cooldown ativo: %ds restantes", self.cooldown_segundos - tempo_desde_ultima_compra)
                 return None
 
         # VERIFICAR ENTRADA: RSI < Limite
@@ -190,18 +199,19 @@ class StrategySwingTrade:
         rsi_atual = self.analise_tecnica.get_rsi(
             par=par,
             timeframe=self.rsi_timeframe_entrada,
-            periodo=14,
-            limite_candles=100
+            periodo=self.PERIODO_RSI,
+            limite_candles=self.LIMITE_CANDLES_RSI,
+            preco_atual=preco_atual
         )
 
         if rsi_atual is None:
             self.logger.debug("[SwingTrade] Não conseguiu obter RSI - ignorando compra")
             return None
 
-        rsi_atual = Decimal(str(rsi_atual))
+        rsi_atual = self.num(rsi_atual)
 
         self.logger.debug(
-            f"[SwingTrade] Verificando entrada: RSI={rsi_atual:.2f}, Limite={self.rsi_limite_compra:.2f}"
+            "[SwingTrade] Verificando entrada: RSI=%.2f, Limite=%.2f", rsi_atual, self.rsi_limite_compra
         )
 
         # Não logar RSI em INFO a cada verificação para reduzir spam no terminal.
@@ -209,36 +219,36 @@ class StrategySwingTrade:
 
         # Verificar se RSI atingiu o gatilho
         if rsi_atual < self.rsi_limite_compra:
-            self.logger.debug(f"[SwingTrade] ✅ Gatilho RSI ATINGIDO!")
+            self.logger.debug("[SwingTrade] ✅ Gatilho RSI ATINGIDO!")
 
             # Calcular quanto comprar (100% do capital disponível da carteira giro_rapido)
             capital_disponivel = self.gestao_capital.calcular_capital_disponivel('giro_rapido')
 
-            self.logger.debug(f"💰 Giro Rápido | Capital disponível: ${capital_disponivel:.2f}")
+            self.logger.debug("💰 Giro Rápido | Capital disponível: $%.2f", capital_disponivel)
 
             if capital_disponivel <= 0:
                 self.logger.debug(
-                    f"[SwingTrade] Compra BLOQUEADA. Capital disponível: ${capital_disponivel:.2f} "
-                    f"(alocação: {self.alocacao_capital_pct}%)"
+                    "[SwingTrade] Compra BLOQUEADA. Capital disponível: $%.2f (alocação: %s%%)",
+                    capital_disponivel, self.alocacao_capital_pct
                 )
                 self.logger.debug("⚠️ Oportunidade de compra detectada, mas SEM CAPITAL disponível!")
                 return None
 
             # Verificar valor mínimo de ordem
-            valor_minimo = Decimal(str(self.config.get('VALOR_MINIMO_ORDEM', 5.0)))
+            valor_minimo = self.valor_minimo_ordem
             if capital_disponivel < valor_minimo:
                 self.logger.debug(
-                    f"[SwingTrade] Compra BLOQUEADA. Capital ${capital_disponivel:.2f} < mínimo ${valor_minimo:.2f}"
+                    "[SwingTrade] Compra BLOQUEADA. Capital $%.2f < mínimo $%.2f", capital_disponivel, valor_minimo
                 )
-                self.logger.debug(f"⚠️ Capital disponível (${capital_disponivel:.2f}) abaixo do mínimo (${valor_minimo:.2f})")
+                self.logger.debug("⚠️ Capital disponível ($%.2f) abaixo do mínimo ($%.2f)", capital_disponivel, valor_minimo)
                 return None
 
             # Validar com gestão de capital
             pode_comprar, motivo = self.gestao_capital.pode_comprar(capital_disponivel, 'giro_rapido')
 
             if not pode_comprar:
-                self.logger.debug(f"[SwingTrade] Compra BLOQUEADA pela gestão de capital: {motivo}")
-                self.logger.debug(f"⚠️ Compra bloqueada pela gestão de capital: {motivo}")
+                self.logger.debug("[SwingTrade] Compra BLOQUEADA pela gestão de capital: %s", motivo)
+                self.logger.debug("⚠️ Compra bloqueada pela gestão de capital: %s", motivo)
                 if self.notifier:
                     titulo = "Compra Bloqueada (Giro Rápido)"
                     mensagem = (
@@ -269,7 +279,7 @@ class StrategySwingTrade:
         else:
             # DEBUG: Log quando compra é bloqueada
             self.logger.debug(
-                f"[SwingTrade] Compra bloqueada. RSI {rsi_atual:.2f}% >= limite {self.rsi_limite_compra:.2f}%"
+                "[SwingTrade] Compra bloqueada. RSI %.2f%% >= limite %.2f%%", rsi_atual, self.rsi_limite_compra
             )
 
         return None
@@ -0,0 +1,83 @@
+"""
+Tabela de Trades - Trades da simulação em colunas NumPy.
+
+Os trades de SimulatedExchangeAPI.get_resultados() (lista de dicts) viram
+colunas uma única vez: lado, valores em USDT, taxa, carteira e categoria do
+motivo de saída. Usada pelo resumo que o BotWorker loga no fim da simulação
+e pelas métricas do relatório (src/backtest/analise_resultados.py).
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Categorias de saída do relatório, na ordem de impressão
+CATEGORIAS_SAIDA = ('Stop Loss (SL)', 'Trailing Stop Loss (TSL)', 'Meta de Lucro', 'Outros')
+
+# Carteira assumida quando o trade não informa
+CARTEIRA_PADRAO = 'giro_rapido'
+
+
+def categorizar_motivo(motivo: Optional[str]) -> int:
+    """Índice em CATEGORIAS_SAIDA para o motivo de uma venda."""
+    motivo = (motivo or '').lower()
+    if 'stop loss' in motivo and 'trailing' not in motivo:
+        return 0
+    if 'trailing' in motivo or 'tsl' in motivo:
+        return 1
+    if 'meta' in motivo or 'lucro' in motivo or 'venda' in motivo:
+        return 2
+    return 3
+
+
+def _codificar(valores: List[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """Códigos inteiros por valor distinto (na ordem de aparição) e a lista de valores."""
+    codigos: Dict[Any, int] = {}
+    saida = np.fromiter((codigos.setdefault(v, len(codigos)) for v in valores), dtype=np.int64, count=len(valores))
+    return saida, list(codigos)
+
+
+class TabelaTrades:
+    """
+    Trades de get_resultados() em colunas NumPy.
+
+    Exemplo:
+        tabela = TabelaTrades(resultados['trades'])
+        saidas = analisar_saidas(tabela)
+    """
+
+    def __init__(self, trades: Sequence[Dict[str, Any]]):
+        """
+        Args:
+            trades: Trades em ordem cronológica (dicts da SimulatedExchangeAPI)
+        """
+        self.trades = trades
+        n = len(trades)
+        lados, self._lados = _codificar([t.get('side', '') for t in trades])
+        self.compra = lados == (self._lados.index('BUY') if 'BUY' in self._lados else -1)
+        self.venda = lados == (self._lados.index('SELL') if 'SELL' in self._lados else -1)
+        self.quantidade_usdt = np.fromiter((t.get('quantidade_usdt', 0.0) for t in trades), dtype=np.float64, count=n)
+        self.receita_usdt = np.fromiter((t.get('receita_usdt', 0.0) for t in trades), dtype=np.float64, count=n)
+        self.fee = np.fromiter((t.get('fee', 0.0) for t in trades), dtype=np.float64, count=n)
+        self.carteira, self.carteiras = _codificar([t.get('carteira', CARTEIRA_PADRAO) for t in trades])
+
+        # Motivos se repetem muito: categorizar cada texto distinto uma vez
+        motivos, textos = _codificar([t.get('motivo') if t.get('side') == 'SELL' else None for t in trades])
+        categorias_texto = np.array([categorizar_motivo(texto) for texto in textos], dtype=np.int64)
+        self.categoria = np.where(self.venda, categorias_texto[motivos] if n else motivos, -1)
+
+    def __len__(self) -> int:
+        return len(self.trades)
+
+
+def resumir_trades(tabela: TabelaTrades) -> Dict[str, Any]:
+    """Contagens, volumes e taxas dos trades."""
+    return {
+        'total_trades': len(tabela),
+        'compras': int(tabela.compra.sum()),
+        'vendas': int(tabela.venda.sum()),
+        'volume_comprado': float(tabela.quantidade_usdt[tabela.compra].sum()),
+        'volume_vendido': float(tabela.receita_usdt[tabela.venda].sum()),
+        'taxas_usdt': float(tabela.fee.sum()),
+    }
@@ -0,0 +1,545 @@
+"""
+Download concorrente e retomável de históricos OHLCV da Binance.
+
+BinanceAPI.fetch_ohlcv pagina /api/v3/klines em sequência (1000 candles por
+requisição) e só grava o CSV no final: um histórico de anos em 1m demora e
+qualquer erro no meio perde tudo. Aqui o intervalo de datas é dividido em
+partes de 'candles_por_parte' candles, baixadas em paralelo:
+
+    dados/historicos/.download/<nome_do_csv>/
+        plano.json          símbolo, intervalo, datas e tamanho das partes
+        parte_000000.npz    timestamps_ms + ohlcv (5, n), comprimido
+
+- Cada parte é gravada num arquivo temporário e trocada de forma atômica:
+  uma parte no disco está sempre completa.
+- Ao rodar de novo com o mesmo plano, as partes já gravadas são reaproveitadas
+  e só as que faltam são baixadas (um plano diferente recomeça do zero).
+- Todas as threads passam por um LimitadorPeso: o peso das requisições fica
+  abaixo do limite por minuto da API, e um 429/418 pausa todas as threads
+  pelo Retry-After informado.
+- No final as partes são concatenadas, as lacunas (candles faltando) são
+  listadas e o CSV é gravado junto com o bundle NumPy que os backtests leem
+  (historico_cache.gravar_historico), sem reler o CSV.
+
+Datas são interpretadas em UTC, a mesma âncora do resample do simulador.
+
+Atualização incremental: cada (exchange, símbolo, timeframe) tem UM arquivo,
+sem datas no nome (caminho_historico: dados/historicos/BINANCE_ADAUSDT_1m.csv).
+atualizar_historico() lê o último timestamp do bundle, baixa só os candles
+fechados depois dele e os anexa ao CSV e ao bundle
+(historico_cache.anexar_historico); atualizar_todos() faz isso para todos os
+históricos do diretório (cron noturno).
+
+Uso:
+    resultado = baixar_historico('ADA/USDT', '1m', '2022-01-01', '2024-01-01',
+                                 'dados/historicos/BINANCE_ADAUSDT_1m.csv')
+    resultado = atualizar_historico('ADA/USDT', '1m')  # só os candles novos
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import requests
+
+from src.exchange.historico_cache import anexar_historico, carregar_store_historico, gravar_historico
+from src.utils.logger import get_loggers
+
+logger, _ = get_loggers()
+
+
+URL_BINANCE = 'https://api.binance.com'
+ENDPOINT_KLINES = '/api/v3/klines'
+
+# Máximo de candles por requisição do endpoint de klines
+LIMITE_KLINES = 1000
+
+# Peso de uma requisição de klines e limite de peso por minuto (REQUEST_WEIGHT)
+PESO_KLINES = 2
+LIMITE_PESO_MINUTO = 6000
+
+# Fração do limite usada pelo downloader (folga para o bot e outras chamadas)
+MARGEM_PESO = 0.8
+
+# Tentativas por requisição em erros de rede/5xx (espera dobra a cada falha)
+TENTATIVAS = 5
+ESPERA_INICIAL_S = 1.0
+
+NOME_DIRETORIO_DOWNLOAD = '.download'
+
+DIRETORIO_HISTORICOS = 'dados/historicos'
+
+# Nome canônico dos históricos: <EXCHANGE>_<SIMBOLO>_<timeframe>.csv
+PADRAO_HISTORICO = re.compile(r'^([A-Z]+)_([A-Z0-9]+)_(\d+[mhdw])\.csv$')
+
+UNIDADES_MS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+
+
+class LimitadorPeso:
+    """
+    Janela deslizante do peso das requisições, compartilhada entre threads.
+
+    reservar() bloqueia até o peso caber na janela; registrar_uso() aplica o
+    peso informado pela própria API (X-MBX-USED-WEIGHT-1M), que também conta
+    requisições de outros processos; pausar() segura todas as threads (429).
+    """
+
+    def __init__(self, peso_por_janela: float = LIMITE_PESO_MINUTO * MARGEM_PESO, janela_s: float = 60.0):
+        self.peso_por_janela = peso_por_janela
+        self.janela_s = janela_s
+        self._reservas: deque = deque()
+        self._peso_reservado = 0.0
+        self._pausado_ate = 0.0
+        self._lock = threading.Lock()
+
+    def reservar(self, peso: float) -> None:
+        """Bloqueia até poder gastar 'peso' sem estourar a janela."""
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                while self._reservas and self._reservas[0][0] <= agora - self.janela_s:
+                    self._peso_reservado -= self._reservas.popleft()[1]
+
+                if agora >= self._pausado_ate and (
+                    self._peso_reservado + peso <= self.peso_por_janela or not self._reservas
+                ):
+                    self._reservas.append((agora, peso))
+                    self._peso_reservado += peso
+                    return
+
+                espera = self._pausado_ate - agora
+                if self._reservas:
+                    espera = max(espera, self._reservas[0][0] + self.janela_s - agora)
+            time.sleep(max(espera, 0.001))
+
+    def registrar_uso(self, peso_usado: Optional[int]) -> None:
+        """Peso usado segundo a API: acima do limite, pausa até a janela virar."""
+        if peso_usado is not None and peso_usado >= self.peso_por_janela:
+            self.pausar(self.janela_s - (time.time() % self.janela_s))
+
+    def pausar(self, segundos: float) -> None:
+        """Nenhuma thread reserva peso pelos próximos 'segundos'."""
+        with self._lock:
+            self._pausado_ate = max(self._pausado_ate, time.monotonic() + segundos)
+
+
+def intervalo_em_ms(intervalo: str) -> int:
+    """Duração de um intervalo da Binance (1m, 4h, 1d, 1w...) em ms."""
+    unidade = intervalo[-1:]
+    if unidade not in UNIDADES_MS or not intervalo[:-1].isdigit():
+        raise ValueError(f"Intervalo inválido para download: '{intervalo}'. Use: 1m, 5m, 1h, 4h, 1d, 1w, etc.")
+    return int(intervalo[:-1]) * UNIDADES_MS[unidade]
+
+
+def data_em_ms(data: Any) -> int:
+    """Data 'YYYY-MM-DD' (ou timestamp ISO, ou já em ms) em ms desde epoch, em UTC."""
+    if isinstance(data, (int, np.integer)):
+        return int(data)
+    momento = pd.Timestamp(data)
+    momento = momento.tz_localize('UTC') if momento.tzinfo is None else momento.tz_convert('UTC')
+    return int(momento.value // 1_000_000)
+
+
+def dividir_partes(inicio_ms: int, fim_ms: int, intervalo_ms: int, candles_por_parte: int) -> List[Tuple[int, int]]:
+    """Intervalos [inicio, fim) de até 'candles_por_parte' candles cobrindo [inicio_ms, fim_ms)."""
+    passo = intervalo_ms * candles_por_parte
+    return [(a, min(a + passo, fim_ms)) for a in range(inicio_ms, fim_ms, passo)]
+
+
+def caminho_historico(exchange: str, simbolo: str, intervalo: str, diretorio: str = DIRETORIO_HISTORICOS) -> Path:
+    """Arquivo único de um (exchange, símbolo, timeframe), ex: BINANCE_ADAUSDT_1m.csv."""
+    return Path(diretorio) / f"{exchange.upper()}_{simbolo.replace('/', '').upper()}_{intervalo}.csv"
+
+
+def historicos_existentes(diretorio: str = DIRETORIO_HISTORICOS) -> List[Dict[str, Any]]:
+    """Históricos com nome canônico no diretório: exchange, simbolo, intervalo e caminho."""
+    encontrados = []
+    for caminho in sorted(Path(diretorio).glob('*.csv')):
+        correspondencia = PADRAO_HISTORICO.match(caminho.name)
+        if correspondencia:
+            exchange, simbolo, intervalo = correspondencia.groups()
+            encontrados.append({'exchange': exchange, 'simbolo': simbolo, 'intervalo': intervalo, 'caminho': caminho})
+    return encontrados
+
+
+def encontrar_lacunas(timestamps_ms: np.ndarray, intervalo_ms: int) -> List[Dict[str, int]]:
+    """
+    Buracos na sequência de candles (ex: manutenção da exchange).
+
+    Returns:
+        Lista de {'inicio_ms', 'fim_ms', 'candles'}: primeiro e último candle
+        ausentes e quantos faltam
+    """
+    saltos = np.flatnonzero(np.diff(timestamps_ms) != intervalo_ms)
+    return [
+        {
+            'inicio_ms': int(timestamps_ms[i]) + intervalo_ms,
+            'fim_ms': int(timestamps_ms[i + 1]) - intervalo_ms,
+            'candles': int((timestamps_ms[i + 1] - timestamps_ms[i]) // intervalo_ms) - 1,
+        }
+        for i in saltos.tolist()
+    ]
+
+
+class DownloaderHistorico:
+    """
+    Baixa um histórico de klines em partes concorrentes e retomáveis.
+
+    Args:
+        simbolo: Par (ex: 'ADA/USDT' ou 'ADAUSDT')
+        intervalo: Timeframe da Binance (1m, 5m, 1h, 4h, 1d...)
+        inicio: Data inicial (inclusiva), 'YYYY-MM-DD' ou ms
+        fim: Data final (exclusiva), 'YYYY-MM-DD' ou ms
+        caminho_csv: CSV de destino (o bundle NumPy fica ao lado)
+        base_url: Servidor da API (um servidor local nos testes)
+        workers: Partes baixadas em paralelo
+        candles_por_parte: Candles por arquivo de parte
+        limitador: LimitadorPeso compartilhado (None: um novo, com o limite padrão)
+        anexar: Acrescenta os candles ao CSV existente em vez de gravar um novo
+    """
+
+    def __init__(
+        self,
+        simbolo: str,
+        intervalo: str,
+        inicio: Any,
+        fim: Any,
+        caminho_csv: str,
+        base_url: str = URL_BINANCE,
+        workers: int = 4,
+        candles_por_parte: int = 10 * LIMITE_KLINES,
+        limitador: Optional[LimitadorPeso] = None,
+        anexar: bool = False
+    ):
+        self.simbolo = simbolo.replace('/', '').upper()
+        self.intervalo = intervalo
+        self.intervalo_ms = intervalo_em_ms(intervalo)
+        self.inicio_ms = data_em_ms(inicio)
+        self.fim_ms = data_em_ms(fim)
+        if self.fim_ms <= self.inicio_ms:
+            raise ValueError(f"Data final ({fim}) deve ser posterior à inicial ({inicio})")
+
+        self.caminho_csv = Path(caminho_csv).resolve()
+        self.base_url = base_url.rstrip('/')
+        self.workers = max(1, int(workers))
+        self.candles_por_parte = max(1, int(candles_por_parte))
+        self.limitador = limitador or LimitadorPeso()
+        self.anexar = anexar
+        self.diretorio_partes = self.caminho_csv.parent / NOME_DIRETORIO_DOWNLOAD / self.caminho_csv.name
+        self.partes = dividir_partes(self.inicio_ms, self.fim_ms, self.intervalo_ms, self.candles_por_parte)
+        self._sessoes = threading.local()
+
+    def _plano(self) -> Dict[str, Any]:
+        plano = {
+            'simbolo': self.simbolo,
+            'intervalo': self.intervalo,
+            'inicio_ms': self.inicio_ms,
+            'fim_ms': self.fim_ms,
+            'candles_por_parte': self.candles_por_parte,
+        }
+        if self.anexar:
+            # Na atualização o fim é o último candle fechado (muda a cada
+            # execução): fica fora do plano para a retomada aproveitar as
+            # partes já baixadas; cada parte confere o próprio intervalo
+            del plano['fim_ms']
+        return plano
+
+    def _preparar_diretorio(self) -> None:
+        """Cria o diretório das partes; plano diferente do gravado descarta as partes antigas."""
+        arquivo_plano = self.diretorio_partes / 'plano.json'
+        try:
+            plano_gravado = json.loads(arquivo_plano.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            plano_gravado = None
+
+        if plano_gravado != self._plano():
+            if plano_gravado is not None:
+                logger.info(f"♻️ Plano de download mudou, descartando partes de {self.diretorio_partes}")
+            shutil.rmtree(self.diretorio_partes, ignore_errors=True)
+            self.diretorio_partes.mkdir(parents=True, exist_ok=True)
+            arquivo_plano.write_text(json.dumps(self._plano(), indent=2), encoding='utf-8')
+
+    def _caminho_parte(self, numero: int) -> Path:
+        return self.diretorio_partes / f'parte_{numero:06d}.npz'
+
+    def _sessao(self) -> requests.Session:
+        """Uma requests.Session por thread."""
+        if not hasattr(self._sessoes, 'sessao'):
+            self._sessoes.sessao = requests.Session()
+        return self._sessoes.sessao
+
+    def _requisitar_klines(self, inicio_ms: int, fim_ms: int) -> list:
+        """GET /api/v3/klines respeitando o peso; refaz em 429/418, 5xx e erros de rede."""
+        params = {
+            'symbol': self.simbolo,
+            'interval': self.intervalo,
+            'startTime': inicio_ms,
+            'endTime': fim_ms - 1,
+            'limit': LIMITE_KLINES,
+        }
+        espera = ESPERA_INICIAL_S
+        for tentativa in range(1, TENTATIVAS + 1):
+            self.limitador.reservar(PESO_KLINES)
+            try:
+                resposta = self._sessao().get(f"{self.base_url}{ENDPOINT_KLINES}", params=params, timeout=30)
+            except requests.exceptions.RequestException as e:
+                erro = e
+            else:
+                peso_usado = resposta.headers.get('X-MBX-USED-WEIGHT-1M')
+                self.limitador.registrar_uso(int(peso_usado) if peso_usado and peso_usado.isdigit() else None)
+
+                if resposta.status_code in (418, 429):
+                    retry_after = float(resposta.headers.get('Retry-After') or self.limitador.janela_s)
+                    logger.warning(f"⚠️ Limite da API atingido ({resposta.status_code}), pausando {retry_after:.0f}s")
+                    self.limitador.pausar(retry_after)
+                    continue
+                if resposta.status_code < 500:
+                    resposta.raise_for_status()
+                    return resposta.json()
+                erro = requests.exceptions.HTTPError(f"{resposta.status_code} em {ENDPOINT_KLINES}", response=resposta)
+
+            if tentativa == TENTATIVAS:
+                raise erro
+            logger.debug(f"🔁 Tentativa {tentativa}/{TENTATIVAS} falhou ({erro}), nova tentativa em {espera:.1f}s")
+            time.sleep(espera)
+            espera *= 2
+        raise RuntimeError(f"Limite da API atingido em {TENTATIVAS} tentativas seguidas")
+
+    def _baixar_parte(self, numero: int) -> int:
+        """Pagina os klines de uma parte e grava o .npz; retorna o número de candles."""
+        inicio_ms, fim_ms = self.partes[numero]
+        klines = []
+        cursor = inicio_ms
+        while cursor < fim_ms:
+            pagina = self._requisitar_klines(cursor, fim_ms)
+            if not pagina:
+                break
+            klines.extend(pagina)
+            cursor = int(pagina[-1][0]) + self.intervalo_ms
+            if len(pagina) < LIMITE_KLINES:
+                break
+
+        timestamps = np.array([k[0] for k in klines], dtype=np.int64)
+        ohlcv = np.array([k[1:6] for k in klines], dtype=np.float64).T.reshape(5, len(klines))
+        timestamps, unicos = np.unique(timestamps, return_index=True)
+        ohlcv = ohlcv[:, unicos]
+        dentro = (timestamps >= inicio_ms) & (timestamps < fim_ms)
+        timestamps, ohlcv = timestamps[dentro], ohlcv[:, dentro]
+
+        # Parte que chega até o presente ainda vai ganhar candles: não persistir
+        if fim_ms <= time.time() * 1000:
+            destino = self._caminho_parte(numero)
+            descritor, temporario = tempfile.mkstemp(prefix=f'.{destino.name}.', dir=self.diretorio_partes)
+            try:
+                with os.fdopen(descritor, 'wb') as arquivo:
+                    np.savez_compressed(arquivo, timestamps_ms=timestamps, ohlcv=ohlcv,
+                                        intervalo_parte_ms=np.array([inicio_ms, fim_ms], dtype=np.int64))
+                os.replace(temporario, destino)
+            except Exception:
+                Path(temporario).unlink(missing_ok=True)
+                raise
+        self._partes_memoria[numero] = (timestamps, ohlcv)
+        return len(timestamps)
+
+    def _carregar_parte(self, numero: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Parte já gravada (download anterior), ou None se ausente/ilegível ou
+        gravada para outro intervalo (última parte de uma atualização que
+        terminava antes do fim atual).
+        """
+        try:
+            with np.load(self._caminho_parte(numero)) as arquivo:
+                if tuple(int(v) for v in arquivo['intervalo_parte_ms']) != tuple(self.partes[numero]):
+                    return None
+                return arquivo['timestamps_ms'], arquivo['ohlcv']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def executar(self) -> Dict[str, Any]:
+        """
+        Baixa as partes que faltam, valida e grava CSV + bundle.
+
+        Returns:
+            Dict com caminho, candles, partes (total, baixadas, retomadas) e
+            lacunas (ver encontrar_lacunas)
+
+        Raises:
+            requests.exceptions.RequestException: Parte que falhou em todas as
+                tentativas; as partes já concluídas ficam no disco para a
+                próxima execução
+        """
+        self._preparar_diretorio()
+        self._partes_memoria: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        for numero in range(len(self.partes)):
+            parte = self._carregar_parte(numero)
+            if parte is not None:
+                self._partes_memoria[numero] = parte
+        retomadas = len(self._partes_memoria)
+        pendentes = [n for n in range(len(self.partes)) if n not in self._partes_memoria]
+
+        logger.info(
+            f"⬇️ {self.simbolo} {self.intervalo}: {len(self.partes)} partes "
+            f"({retomadas} já no disco, {len(pendentes)} a baixar com {self.workers} workers)"
+        )
+
+        inicio = time.perf_counter()
+        if pendentes:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futuros = {executor.submit(self._baixar_parte, n): n for n in pendentes}
+                concluidos, restantes = wait(futuros, return_when=FIRST_EXCEPTION)
+                for futuro in restantes:
+                    futuro.cancel()
+                wait(restantes)
+                for futuro in concluidos:
+                    erro = futuro.exception()
+                    if erro is not None:
+                        salvas = len(list(self.diretorio_partes.glob('parte_*.npz')))
+                        logger.error(
+                            f"❌ Parte {futuros[futuro]} falhou: {erro} "
+                            f"({salvas}/{len(self.partes)} partes no disco, rode de novo para retomar)"
+                        )
+                        raise erro
+
+        ordem = range(len(self.partes))
+        timestamps = np.concatenate([self._partes_memoria[n][0] for n in ordem])
+        ohlcv = np.concatenate([self._partes_memoria[n][1] for n in ordem], axis=1)
+        if len(timestamps) == 0 and not self.anexar:
+            raise ValueError(f"Nenhum candle de {self.simbolo} {self.intervalo} no período pedido")
+
+        # Na atualização, o candle anterior ao início (último gravado) entra na validação
+        lacunas = encontrar_lacunas(
+            np.concatenate([[self.inicio_ms - self.intervalo_ms], timestamps]) if self.anexar else timestamps,
+            self.intervalo_ms
+        )
+        for lacuna in lacunas:
+            logger.warning(
+                f"⚠️ Lacuna de {lacuna['candles']} candles: "
+                f"{pd.Timestamp(lacuna['inicio_ms'], unit='ms')} → {pd.Timestamp(lacuna['fim_ms'], unit='ms')}"
+            )
+
+        if self.anexar:
+            anexar_historico(str(self.caminho_csv), timestamps, ohlcv)
+        else:
+            gravar_historico(str(self.caminho_csv), timestamps, ohlcv)
+        shutil.rmtree(self.diretorio_partes, ignore_errors=True)
+        try:
+            self.diretorio_partes.parent.rmdir()
+        except OSError:
+            pass
+
+        logger.info(
+            f"✅ {len(timestamps)} candles {'anexados' if self.anexar else 'baixados'} em {time.perf_counter() - inicio:.1f}s "
+            f"({len(lacunas)} lacunas): {self.caminho_csv}"
+        )
+        return {
+            'caminho': self.caminho_csv,
+            'candles': len(timestamps),
+            'partes': len(self.partes),
+            'partes_baixadas': len(pendentes),
+            'partes_retomadas': retomadas,
+            'lacunas': lacunas,
+        }
+
+
+def baixar_historico(
+    simbolo: str,
+    intervalo: str,
+    inicio: str,
+    fim: str,
+    caminho_csv: str,
+    **opcoes: Any
+) -> Dict[str, Any]:
+    """Atalho para DownloaderHistorico(...).executar() (opções: base_url, workers, candles_por_parte, limitador)."""
+    return DownloaderHistorico(simbolo, intervalo, inicio, fim, caminho_csv, **opcoes).executar()
+
+
+def fim_candles_fechados(intervalo_ms: int) -> int:
+    """Fim exclusivo (ms) que deixa de fora o candle ainda em formação."""
+    return int(time.time() * 1000) - intervalo_ms + 1
+
+
+def atualizar_historico(
+    simbolo: str,
+    intervalo: str,
+    caminho_csv: Optional[str] = None,
+    inicio: Any = None,
+    diretorio: str = DIRETORIO_HISTORICOS,
+    **opcoes: Any
+) -> Dict[str, Any]:
+    """
+    Traz um histórico até o último candle fechado, baixando só o que falta.
+
+    O último timestamp vem do bundle (memmap, sem ler o CSV); os candles
+    seguintes são baixados e anexados. Sem histórico ainda, baixa desde
+    'inicio'.
+
+    Args:
+        simbolo: Par (ex: 'ADA/USDT')
+        intervalo: Timeframe da Binance (1m, 1h, 1d...)
+        caminho_csv: CSV do histórico (None: caminho_historico no diretório)
+        inicio: Data inicial, obrigatória só se o histórico ainda não existe
+        diretorio: Diretório dos históricos (quando caminho_csv é None)
+        **opcoes: Repassadas ao DownloaderHistorico (base_url, workers, limitador...)
+
+    Returns:
+        Resultado do DownloaderHistorico, com 'candles' = candles novos
+        (0 sem requisição nenhuma se já estava em dia)
+    """
+    caminho = Path(caminho_csv) if caminho_csv else caminho_historico('BINANCE', simbolo, intervalo, diretorio)
+    intervalo_ms = intervalo_em_ms(intervalo)
+    fim_ms = fim_candles_fechados(intervalo_ms)
+
+    if not caminho.exists():
+        if inicio is None:
+            raise ValueError(f"{caminho.name} ainda não existe: informe a data inicial do histórico")
+        return DownloaderHistorico(simbolo, intervalo, inicio, fim_ms, str(caminho), **opcoes).executar()
+
+    store = carregar_store_historico(str(caminho))
+    if store is None or len(store) == 0:
+        raise ValueError(f"{caminho.name}: histórico sem cache binário válido, não dá para atualizar")
+    inicio_ms = int(store.timestamps[-1]) + intervalo_ms
+    if inicio_ms >= fim_ms:
+        logger.info(f"✅ {caminho.name} já está em dia (último candle {pd.Timestamp(inicio_ms - intervalo_ms, unit='ms')})")
+        return {'caminho': caminho.resolve(), 'candles': 0, 'partes': 0, 'partes_baixadas': 0,
+                'partes_retomadas': 0, 'lacunas': []}
+
+    return DownloaderHistorico(simbolo, intervalo, inicio_ms, fim_ms, str(caminho), anexar=True, **opcoes).executar()
+
+
+def atualizar_todos(diretorio: str = DIRETORIO_HISTORICOS, **opcoes: Any) -> List[Dict[str, Any]]:
+    """
+    Atualiza todos os históricos da Binance com nome canônico no diretório.
+
+    Um histórico com erro não interrompe os demais (o erro vai no resultado).
+    Todos compartilham o mesmo LimitadorPeso.
+
+    Returns:
+        Um dict por histórico: exchange, simbolo, intervalo, caminho e
+        'resultado' (ver atualizar_historico) ou 'erro'
+    """
+    opcoes.setdefault('limitador', LimitadorPeso())
+    relatorio = []
+    for historico in historicos_existentes(diretorio):
+        if historico['exchange'] != 'BINANCE':
+            logger.info(f"⏭️ {historico['caminho'].name}: atualização só disponível para a Binance")
+            continue
+        item = dict(historico)
+        try:
+            item['resultado'] = atualizar_historico(
+                historico['simbolo'], historico['intervalo'], str(historico['caminho']), **opcoes
+            )
+        except Exception as e:
+            logger.error(f"❌ Falha ao atualizar {historico['caminho'].name}: {e}")
+            item['erro'] = str(e)
+        relatorio.append(item)
+    return relatorio
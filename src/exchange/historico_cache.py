@@ -0,0 +1,583 @@
+"""
+Cache binário dos CSVs históricos usados nos backtests.
+
+Ler e converter o CSV (pd.read_csv + pd.to_datetime) domina o início de cada
+backtest. Na primeira leitura o CSV é convertido para um bundle colunar de
+arquivos NumPy (.npy) ao lado do CSV:
+
+    dados/historicos/.cache_historico/<nome_do_csv>/
+        meta.json          tamanho, mtime e sha256 do CSV + colunas
+        timestamp.npy      datetime64 (índice original)
+        timestamps_ms.npy  int64, ms desde epoch (layout do KlineStore)
+        ohlcv.npy          float64 (5, n): uma linha contígua por coluna OHLCV
+        <coluna>.npy       demais colunas numéricas
+        resamples/<periodo>ms/
+            meta.json          sha256 do CSV de origem + período
+            timestamps_ms.npy  candles do timeframe agregado (layout do KlineStore)
+            ohlcv.npy
+
+Nas leituras seguintes o bundle é carregado em milissegundos. Tamanho e mtime
+iguais aos do meta.json validam o cache direto; se o mtime mudou mas o sha256
+do conteúdo é o mesmo, o cache é reaproveitado. Qualquer outra diferença
+reconstrói o bundle.
+
+carregar_store_historico() abre timestamps_ms.npy e ohlcv.npy com memmap:
+o simulador lê os candles direto das páginas do arquivo, sem cópias em
+DataFrame, e processos paralelos compartilham o mesmo page cache.
+
+Os resamples do simulador (1h, 4h, 1d...) também são gravados no bundle na
+primeira vez que um timeframe é pedido (carregar_store_resampleado): as
+execuções seguintes e os processos do sweep os abrem com memmap em vez de
+agregar o histórico inteiro de novo. Cada resample guarda o sha256 do CSV de
+origem; quando o CSV muda o bundle é reconstruído e os resamples antigos vão
+junto.
+
+Dentro do mesmo processo os dados também ficam memorizados, de forma que o
+simulador e o benchmark Buy & Hold compartilham UM dataset carregado.
+
+Uso:
+    store = carregar_store_historico('dados/historicos/ADA_1m.csv')  # KlineStore
+    df = carregar_historico('dados/historicos/ADA_1m.csv')  # índice = timestamp
+    store_1h = carregar_store_resampleado('dados/historicos/ADA_1m.csv', 3_600_000)
+
+gravar_historico() faz o caminho inverso para dados que já chegam em arrays
+(ex: o downloader): grava o CSV e o bundle juntos, sem reler o CSV.
+anexar_historico() acrescenta só os candles novos ao fim dos dois (atualização
+incremental), sem reformatar nem reler as linhas que já estavam lá.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.exchange.kline_store import COLUNAS_OHLCV, KlineStore
+from src.utils.logger import get_loggers
+
+logger, _ = get_loggers()
+
+
+# Versão do formato do bundle (incrementar ao mudar o layout)
+VERSAO_CACHE = 2
+
+# Diretório do cache, criado ao lado do CSV
+NOME_DIRETORIO_CACHE = '.cache_historico'
+
+# Subdiretório do bundle com os resamples persistidos
+NOME_DIRETORIO_RESAMPLES = 'resamples'
+
+# DataFrames mantidos em memória por processo (LRU)
+MAX_HISTORICOS_MEMORIA = 4
+
+_historicos_memoria: 'OrderedDict[str, Tuple[Tuple[int, int], pd.DataFrame]]' = OrderedDict()
+
+# Arrays mapeados (timestamps_ms, ohlcv) por CSV; mapear não ocupa memória própria
+_colunas_mapeadas: Dict[str, Tuple[Tuple[int, int], Tuple[np.ndarray, np.ndarray]]] = {}
+
+# Resamples mapeados por (CSV, período em ms)
+_resamples_mapeados: Dict[Tuple[str, int], Tuple[Tuple[int, int], Tuple[np.ndarray, np.ndarray]]] = {}
+
+
+def _assinatura(caminho: Path) -> Tuple[int, int]:
+    """(tamanho em bytes, mtime em ns) do arquivo."""
+    info = caminho.stat()
+    return info.st_size, info.st_mtime_ns
+
+
+def _hash_arquivo(caminho: Path) -> str:
+    """sha256 do conteúdo do arquivo (lido em blocos)."""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def diretorio_cache(caminho_csv: str) -> Path:
+    """Diretório do bundle NumPy de um CSV."""
+    caminho = Path(caminho_csv).resolve()
+    return caminho.parent / NOME_DIRETORIO_CACHE / caminho.name
+
+
+def ler_csv_historico(caminho_csv: str) -> pd.DataFrame:
+    """Lê o CSV direto (sem cache), com o timestamp como índice."""
+    dados = pd.read_csv(caminho_csv)
+    dados['timestamp'] = pd.to_datetime(dados['timestamp'])
+    dados.set_index('timestamp', inplace=True)
+    return dados
+
+
+def _ler_meta(destino: Path) -> Optional[Dict[str, Any]]:
+    """meta.json do bundle, ou None se ausente/ilegível/de outra versão."""
+    try:
+        meta = json.loads((destino / 'meta.json').read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get('versao') == VERSAO_CACHE else None
+
+
+def _salvar_bundle(destino: Path, dados: pd.DataFrame, meta: Dict[str, Any]) -> None:
+    """Grava o bundle de um DataFrame (índice timestamp + colunas numéricas)."""
+    indice = dados.index
+    store = KlineStore.from_dataframe(dados)
+    _salvar_arrays_bundle(
+        destino,
+        indice.tz_convert(None).values if indice.tz else indice.values,
+        store.timestamps,
+        store.valores,
+        {coluna: dados[coluna].to_numpy() for coluna in dados.columns if coluna not in COLUNAS_OHLCV},
+        meta
+    )
+
+
+def _salvar_arrays_bundle(
+    destino: Path,
+    timestamp: np.ndarray,
+    timestamps_ms: np.ndarray,
+    ohlcv: np.ndarray,
+    extras: Dict[str, np.ndarray],
+    meta: Dict[str, Any]
+) -> None:
+    """Grava os arrays do bundle num diretório temporário e troca de forma atômica."""
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporario = Path(tempfile.mkdtemp(prefix=f'.{destino.name}.', dir=destino.parent))
+    try:
+        np.save(temporario / 'timestamp.npy', timestamp)
+        np.save(temporario / 'timestamps_ms.npy', timestamps_ms)
+        np.save(temporario / 'ohlcv.npy', np.ascontiguousarray(ohlcv))
+        for coluna, valores in extras.items():
+            np.save(temporario / f'{coluna}.npy', valores)
+        (temporario / 'meta.json').write_text(json.dumps(meta, indent=2), encoding='utf-8')
+
+        if destino.exists():
+            shutil.rmtree(destino)
+        os.replace(temporario, destino)
+    except Exception:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise
+
+
+def _carregar_bundle(destino: Path, meta: Dict[str, Any]) -> pd.DataFrame:
+    """Monta o DataFrame (índice timestamp) a partir dos .npy do bundle."""
+    indice = pd.DatetimeIndex(np.load(destino / 'timestamp.npy'), name='timestamp')
+    if meta.get('tz'):
+        indice = indice.tz_localize('UTC').tz_convert(meta['tz'])
+
+    ohlcv = np.load(destino / 'ohlcv.npy')
+    colunas = {}
+    for coluna in meta['colunas']:
+        if coluna in COLUNAS_OHLCV:
+            colunas[coluna] = ohlcv[COLUNAS_OHLCV.index(coluna)].astype(meta['tipos'][coluna], copy=False)
+        else:
+            colunas[coluna] = np.load(destino / f'{coluna}.npy')
+    return pd.DataFrame(colunas, index=indice)
+
+
+def _garantir_bundle(
+    caminho: Path,
+    assinatura: Tuple[int, int]
+) -> Tuple[Optional[Dict[str, Any]], Optional[pd.DataFrame]]:
+    """
+    Valida o bundle do CSV, (re)construindo-o quando necessário.
+
+    Returns:
+        (meta do bundle válido, ou None se o CSV não pôde ir para o cache;
+        DataFrame lido do CSV, ou None se o bundle já estava válido)
+    """
+    destino = diretorio_cache(str(caminho))
+    tamanho, mtime_ns = assinatura
+    meta = _ler_meta(destino)
+
+    if meta and meta['tamanho'] == tamanho:
+        if meta['mtime_ns'] == mtime_ns:
+            return meta, None
+
+        # mtime mudou (cópia, touch, checkout): conferir o conteúdo
+        if meta['sha256'] == _hash_arquivo(caminho):
+            meta['mtime_ns'] = mtime_ns
+            try:
+                (destino / 'meta.json').write_text(json.dumps(meta, indent=2), encoding='utf-8')
+            except OSError:
+                pass
+            return meta, None
+
+    dados = ler_csv_historico(str(caminho))
+    if not all(pd.api.types.is_numeric_dtype(tipo) for tipo in dados.dtypes):
+        logger.debug(f"📦 {caminho.name}: colunas não numéricas, cache binário ignorado")
+        return None, dados
+    if not set(COLUNAS_OHLCV).issubset(dados.columns):
+        logger.debug(f"📦 {caminho.name}: CSV sem colunas OHLCV, cache binário ignorado")
+        return None, dados
+
+    meta = {
+        'versao': VERSAO_CACHE,
+        'arquivo': caminho.name,
+        'tamanho': tamanho,
+        'mtime_ns': mtime_ns,
+        'sha256': _hash_arquivo(caminho),
+        'linhas': len(dados),
+        'colunas': list(dados.columns),
+        'tipos': {coluna: str(dados[coluna].dtype) for coluna in COLUNAS_OHLCV},
+        'tz': str(dados.index.tz) if dados.index.tz else None,
+    }
+    try:
+        _salvar_bundle(destino, dados, meta)
+        logger.info(f"📦 Cache binário criado: {destino} ({len(dados)} linhas)")
+    except Exception as e:
+        logger.warning(f"⚠️ Não foi possível gravar o cache de {caminho.name}: {e}")
+        return None, dados
+    return meta, dados
+
+
+def carregar_historico(caminho_csv: str, usar_cache: bool = True) -> pd.DataFrame:
+    """
+    Carrega um CSV histórico OHLCV indexado por timestamp.
+
+    O DataFrame devolvido é compartilhado entre chamadas do mesmo processo e
+    não deve ser modificado no lugar.
+
+    Args:
+        caminho_csv: Caminho do CSV (coluna 'timestamp' + colunas numéricas)
+        usar_cache: False lê o CSV direto, sem memória nem bundle em disco
+
+    Returns:
+        DataFrame com índice 'timestamp' (datetime64)
+    """
+    if not usar_cache:
+        return ler_csv_historico(caminho_csv)
+
+    caminho = Path(caminho_csv).resolve()
+    chave = str(caminho)
+    assinatura = _assinatura(caminho)
+
+    memorizado = _historicos_memoria.get(chave)
+    if memorizado and memorizado[0] == assinatura:
+        _historicos_memoria.move_to_end(chave)
+        return memorizado[1]
+
+    try:
+        meta, dados = _garantir_bundle(caminho, assinatura)
+        if dados is None:
+            dados = _carregar_bundle(diretorio_cache(chave), meta)
+    except Exception as e:
+        logger.warning(f"⚠️ Cache de {caminho.name} inválido, lendo o CSV: {e}")
+        dados = ler_csv_historico(chave)
+
+    _historicos_memoria[chave] = (assinatura, dados)
+    _historicos_memoria.move_to_end(chave)
+    while len(_historicos_memoria) > MAX_HISTORICOS_MEMORIA:
+        _historicos_memoria.popitem(last=False)
+    return dados
+
+
+def carregar_store_historico(caminho_csv: str) -> Optional[KlineStore]:
+    """
+    Abre o CSV histórico como KlineStore mapeado em memória (memmap).
+
+    Nenhum candle é copiado: os arrays apontam para o bundle em disco
+    (somente leitura) e as páginas são compartilhadas entre processos.
+
+    Args:
+        caminho_csv: Caminho do CSV (timestamp + OHLCV)
+
+    Returns:
+        KlineStore do timeframe do CSV, ou None se o CSV não puder ser servido
+        pelo cache (colunas não numéricas, timestamps com fuso, falha de
+        escrita); nesse caso use carregar_historico()
+    """
+    caminho = Path(caminho_csv).resolve()
+    chave = str(caminho)
+    assinatura = _assinatura(caminho)
+
+    mapeado = _colunas_mapeadas.get(chave)
+    if mapeado is None or mapeado[0] != assinatura:
+        try:
+            meta, _ = _garantir_bundle(caminho, assinatura)
+            # Resample do simulador ancora em UTC; CSVs com fuso seguem via pandas
+            if meta is None or meta.get('tz'):
+                return None
+            destino = diretorio_cache(chave)
+            mapeado = (assinatura, (
+                np.load(destino / 'timestamps_ms.npy', mmap_mode='r'),
+                np.load(destino / 'ohlcv.npy', mmap_mode='r'),
+            ))
+        except Exception as e:
+            logger.warning(f"⚠️ Cache de {caminho.name} indisponível para memmap: {e}")
+            return None
+        _colunas_mapeadas[chave] = mapeado
+
+    timestamps_ms, ohlcv = mapeado[1]
+    return KlineStore(timestamps_ms, ohlcv)
+
+
+def diretorio_resample(caminho_csv: str, periodo_ms: int) -> Path:
+    """Diretório do resample persistido de um CSV para um período (ms)."""
+    return diretorio_cache(caminho_csv) / NOME_DIRETORIO_RESAMPLES / f'{int(periodo_ms)}ms'
+
+
+def _salvar_resample(destino: Path, store: KlineStore, meta: Dict[str, Any]) -> None:
+    """Grava o resample num diretório temporário e troca de forma atômica."""
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporario = Path(tempfile.mkdtemp(prefix=f'.{destino.name}.', dir=destino.parent))
+    try:
+        np.save(temporario / 'timestamps_ms.npy', store.timestamps)
+        np.save(temporario / 'ohlcv.npy', np.ascontiguousarray(store.valores))
+        (temporario / 'meta.json').write_text(json.dumps(meta, indent=2), encoding='utf-8')
+
+        if destino.exists():
+            shutil.rmtree(destino)
+        try:
+            os.replace(temporario, destino)
+        except OSError:
+            # Outro processo gravou o mesmo resample entre o rmtree e a troca
+            if _ler_meta(destino) is None:
+                raise
+            shutil.rmtree(temporario, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise
+
+
+def carregar_store_resampleado(caminho_csv: str, periodo_ms: int) -> Optional[KlineStore]:
+    """
+    KlineStore do CSV agregado em períodos de 'periodo_ms', persistido no bundle.
+
+    Na primeira chamada o resample é calculado (KlineStore.resamplear) e
+    gravado; nas seguintes, e em outros processos, é aberto com memmap. Vale
+    enquanto o sha256 do CSV for o gravado junto com o resample.
+
+    Args:
+        caminho_csv: Caminho do CSV (timestamp + OHLCV) no timeframe base
+        periodo_ms: Duração de cada candle agregado (ms)
+
+    Returns:
+        KlineStore agregado, ou None se o CSV não puder ser servido pelo cache
+        (ver carregar_store_historico); nesse caso resampleie em memória
+
+    Raises:
+        ValueError: Candles com NaN (ver KlineStore.resamplear)
+    """
+    caminho = Path(caminho_csv).resolve()
+    chave = (str(caminho), int(periodo_ms))
+    assinatura = _assinatura(caminho)
+
+    mapeado = _resamples_mapeados.get(chave)
+    if mapeado is not None and mapeado[0] == assinatura:
+        return KlineStore(*mapeado[1])
+
+    store_base = carregar_store_historico(str(caminho))
+    if store_base is None:
+        return None
+    meta_bundle = _ler_meta(diretorio_cache(str(caminho)))
+    if meta_bundle is None:
+        return None
+    sha256 = meta_bundle['sha256']
+    destino = diretorio_resample(str(caminho), periodo_ms)
+
+    meta = _ler_meta(destino)
+    if not meta or meta.get('sha256') != sha256 or meta.get('periodo_ms') != int(periodo_ms):
+        resampleado = store_base.resamplear(int(periodo_ms))
+        try:
+            _salvar_resample(destino, resampleado, {
+                'versao': VERSAO_CACHE,
+                'sha256': sha256,
+                'periodo_ms': int(periodo_ms),
+                'linhas': len(resampleado),
+            })
+            logger.debug(f"📦 Resample de {periodo_ms} ms salvo: {destino} ({len(resampleado)} candles)")
+        except Exception as e:
+            logger.warning(f"⚠️ Não foi possível gravar o resample de {caminho.name}: {e}")
+            return resampleado
+
+    try:
+        arrays = (
+            np.load(destino / 'timestamps_ms.npy', mmap_mode='r'),
+            np.load(destino / 'ohlcv.npy', mmap_mode='r'),
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Resample de {caminho.name} indisponível para memmap: {e}")
+        return store_base.resamplear(int(periodo_ms))
+
+    _resamples_mapeados[chave] = (assinatura, arrays)
+    return KlineStore(*arrays)
+
+
+def gravar_historico(caminho_csv: str, timestamps_ms: np.ndarray, ohlcv: np.ndarray) -> Dict[str, Any]:
+    """
+    Grava um histórico OHLCV como CSV e já deixa o bundle NumPy pronto.
+
+    O CSV é gravado num arquivo temporário e trocado de forma atômica; o
+    bundle é montado direto dos arrays (sem pd.read_csv) com o tamanho,
+    mtime e sha256 do CSV final, de forma que a primeira leitura do backtest
+    já é servida pelo cache. Os floats são gravados em repr: preços com até
+    8 casas decimais (como os da exchange) são relidos idênticos.
+
+    Args:
+        caminho_csv: Destino do CSV (timestamp, open, high, low, close, volume)
+        timestamps_ms: int64, abertura de cada candle em ms desde epoch (UTC)
+        ohlcv: float64 (5, n) na ordem open, high, low, close, volume
+
+    Returns:
+        meta.json do bundle gravado
+    """
+    caminho = Path(caminho_csv).resolve()
+    dados = _dataframe_ohlcv(timestamps_ms, ohlcv)
+
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(prefix=f'.{caminho.name}.', dir=caminho.parent)
+    try:
+        with os.fdopen(descritor, 'w', encoding='utf-8', newline='') as arquivo:
+            dados.to_csv(arquivo)
+        os.replace(temporario, caminho)
+    except Exception:
+        Path(temporario).unlink(missing_ok=True)
+        raise
+
+    tamanho, mtime_ns = _assinatura(caminho)
+    meta = {
+        'versao': VERSAO_CACHE,
+        'arquivo': caminho.name,
+        'tamanho': tamanho,
+        'mtime_ns': mtime_ns,
+        'sha256': _hash_arquivo(caminho),
+        'linhas': len(dados),
+        'colunas': list(COLUNAS_OHLCV),
+        'tipos': {coluna: 'float64' for coluna in COLUNAS_OHLCV},
+        'tz': None,
+    }
+    _salvar_bundle(diretorio_cache(str(caminho)), dados, meta)
+    logger.info(f"📦 Histórico gravado: {caminho} ({len(dados)} candles, cache binário pronto)")
+    return meta
+
+
+def _dataframe_ohlcv(timestamps_ms: np.ndarray, ohlcv: np.ndarray, tipo_indice: Any = None) -> pd.DataFrame:
+    """DataFrame OHLCV (índice timestamp) no formato em que o CSV é gravado e relido."""
+    indice = pd.to_datetime(np.asarray(timestamps_ms, dtype=np.int64), unit='ms')
+    if tipo_indice is None and len(indice):
+        # Mesma resolução que ler_csv_historico obtém ao reler o CSV
+        tipo_indice = pd.to_datetime(pd.Series([str(indice[0])])).dtype
+    if tipo_indice is not None:
+        indice = indice.astype(tipo_indice)
+    indice.name = 'timestamp'
+    return pd.DataFrame(
+        {coluna: np.asarray(ohlcv[i], dtype=np.float64) for i, coluna in enumerate(COLUNAS_OHLCV)},
+        index=indice
+    )
+
+
+def anexar_historico(caminho_csv: str, timestamps_ms: np.ndarray, ohlcv: np.ndarray) -> Dict[str, Any]:
+    """
+    Acrescenta candles ao fim de um histórico existente (CSV + bundle).
+
+    Só as linhas novas são formatadas: o CSV é copiado, recebe as linhas no
+    fim e é trocado de forma atômica; o bundle é regravado concatenando os
+    arrays mapeados com os novos, sem reler o CSV. Candles com timestamp até
+    o último já gravado são ignorados. Resamples antigos são descartados
+    junto com o bundle (o sha256 do CSV muda) e refeitos sob demanda.
+
+    Args:
+        caminho_csv: CSV existente (timestamp, open, high, low, close, volume)
+        timestamps_ms: int64, abertura de cada candle em ms desde epoch (UTC)
+        ohlcv: float64 (5, n) na ordem open, high, low, close, volume
+
+    Returns:
+        meta.json do bundle (inalterado se não havia candle novo)
+
+    Raises:
+        ValueError: CSV sem bundle válido (colunas não numéricas, fuso) ou com
+            colunas além de timestamp + OHLCV
+    """
+    caminho = Path(caminho_csv).resolve()
+    store = carregar_store_historico(str(caminho))
+    destino = diretorio_cache(str(caminho))
+    meta = _ler_meta(destino) if store is not None else None
+    if meta is None or meta['colunas'] != list(COLUNAS_OHLCV):
+        raise ValueError(f"{caminho.name}: só históricos timestamp + OHLCV com cache binário podem ser atualizados")
+
+    timestamps_ms = np.asarray(timestamps_ms, dtype=np.int64)
+    ohlcv = np.asarray(ohlcv, dtype=np.float64)
+    if len(store):
+        novos = timestamps_ms > store.timestamps[-1]
+        timestamps_ms, ohlcv = timestamps_ms[novos], ohlcv[:, novos]
+    if len(timestamps_ms) == 0:
+        return meta
+
+    indice_antigo = np.load(destino / 'timestamp.npy', mmap_mode='r')
+    dados = _dataframe_ohlcv(timestamps_ms, ohlcv, indice_antigo.dtype if len(indice_antigo) else None)
+
+    descritor, temporario = tempfile.mkstemp(prefix=f'.{caminho.name}.', dir=caminho.parent)
+    try:
+        os.close(descritor)
+        shutil.copyfile(caminho, temporario)
+        with open(temporario, 'rb+') as arquivo:
+            arquivo.seek(0, os.SEEK_END)
+            if arquivo.tell() > 0:
+                arquivo.seek(-1, os.SEEK_END)
+                if arquivo.read(1) != b'\n':
+                    arquivo.write(b'\n')
+            arquivo.write(dados.to_csv(header=False, lineterminator='\n').encode('utf-8'))
+        os.replace(temporario, caminho)
+    except Exception:
+        Path(temporario).unlink(missing_ok=True)
+        raise
+
+    tamanho, mtime_ns = _assinatura(caminho)
+    meta = dict(meta, tamanho=tamanho, mtime_ns=mtime_ns, sha256=_hash_arquivo(caminho),
+                linhas=meta['linhas'] + len(dados))
+    _salvar_arrays_bundle(
+        destino,
+        np.concatenate([indice_antigo, dados.index.values]),
+        np.concatenate([store.timestamps, timestamps_ms]),
+        np.concatenate([store.valores, ohlcv], axis=1),
+        {},
+        meta
+    )
+    logger.info(f"📦 {len(dados)} candles anexados a {caminho.name} ({meta['linhas']} no total)")
+    return meta
+
+
+def obter_store_historico(caminho_csv: str) -> KlineStore:
+    """
+    KlineStore do CSV: mapeado em memória quando possível, senão montado a
+    partir do DataFrame (carregar_historico).
+    """
+    store = carregar_store_historico(caminho_csv)
+    if store is None:
+        store = KlineStore.from_dataframe(carregar_historico(caminho_csv))
+    return store
+
+
+def hash_historico(caminho_csv: str) -> str:
+    """
+    sha256 do conteúdo do CSV.
+
+    Reaproveita o hash do meta.json do bundle quando ele está válido (sem
+    reler o arquivo); sem bundle, calcula o hash direto.
+    """
+    caminho = Path(caminho_csv).resolve()
+    try:
+        meta, _ = _garantir_bundle(caminho, _assinatura(caminho))
+    except Exception:
+        meta = None
+    return meta['sha256'] if meta else _hash_arquivo(caminho)
+
+
+def limpar_cache_historico(caminho_csv: Optional[str] = None) -> None:
+    """
+    Descarta os históricos memorizados e o bundle em disco.
+
+    Args:
+        caminho_csv: CSV cujo cache será removido (None: só limpa a memória)
+    """
+    _historicos_memoria.clear()
+    _colunas_mapeadas.clear()
+    _resamples_mapeados.clear()
+    if caminho_csv:
+        shutil.rmtree(diretorio_cache(caminho_csv), ignore_errors=True)
@@ -0,0 +1,398 @@
+"""
+KlineStore - Armazenamento colunar de candles em arrays NumPy para backtesting.
+
+Cada timeframe (base ou resampleado) é convertido UMA vez para arrays
+contíguos (timestamps int64 em ms + OHLCV float64). A cada barra da
+simulação um cursor monotônico avança até o último candle visível e as
+janelas pedidas pelas estratégias são devolvidas como views (sem cópia).
+
+O último candle visível de um timeframe maior ainda está em formação: o
+CandleEmFormacao o agrega barra a barra a partir do timeframe base (como a
+exchange devolve o candle aberto em tempo real), em vez de expor o candle
+resampleado completo, que já contém barras futuras.
+"""
+
+import mmap
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+
+COLUNAS_OHLCV = ('open', 'high', 'low', 'close', 'volume')
+
+# Um dia em ms (origem dos resamples: meia-noite do primeiro dia, como no pandas)
+DIA_MS = 86_400_000
+
+# Candles base agregados por vez em resamplear()
+BLOCO_RESAMPLE = 1 << 18
+
+# Barras base incorporadas uma a uma pelo CandleEmFormacao; saltos maiores
+# reagregam o candle a partir da abertura
+MAX_PASSOS_INCREMENTAIS = 64
+
+
+def liberar_paginas(*arrays: np.ndarray) -> None:
+    """
+    Tira do RSS do processo as páginas já lidas de arrays mapeados (memmap).
+
+    As páginas continuam no page cache do SO (e nos outros processos); um novo
+    acesso só gera uma falta de página menor. Arrays comuns são ignorados.
+    """
+    if not hasattr(mmap, 'MADV_DONTNEED'):
+        return
+    for array in arrays:
+        base = array
+        while base is not None and not isinstance(base, np.memmap):
+            base = getattr(base, 'base', None)
+        mapa = getattr(base, '_mmap', None)
+        if mapa is not None:
+            mapa.madvise(mmap.MADV_DONTNEED)
+
+
+class JanelaKlines(NamedTuple):
+    """Janela de candles como views NumPy (nenhum dado é copiado)."""
+    timestamps: np.ndarray  # int64, ms desde epoch (abertura do candle)
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class KlineStore:
+    """
+    Candles de um único timeframe em formato colunar.
+
+    Os valores ficam numa matriz float64 (5, n) em ordem C, de forma que cada
+    coluna OHLCV é contígua e qualquer fatia [a:b] é uma view pronta para
+    TA-Lib/NumPy.
+
+    Exemplo:
+        store = KlineStore.from_dataframe(df_4h)
+        janela = store.janela(timestamp_atual_ms, limite=100)
+        rsi = talib.RSI(janela.close, timeperiod=14)
+    """
+
+    def __init__(self, timestamps_ms: np.ndarray, valores: np.ndarray):
+        """
+        Args:
+            timestamps_ms: Array int64 ordenado com a abertura de cada candle (ms)
+            valores: Matriz float64 (5, n) na ordem open, high, low, close, volume
+                (linhas contíguas)
+        """
+        self.timestamps = np.ascontiguousarray(timestamps_ms, dtype=np.int64)
+        # Sem forçar contiguidade 2D: fatias [:, a:b] (ex: walk-forward) continuam
+        # sendo views com cada coluna OHLCV contígua
+        self.valores = np.asarray(valores, dtype=np.float64)
+
+        if self.valores.shape != (len(COLUNAS_OHLCV), len(self.timestamps)):
+            raise ValueError(
+                f"Formato inválido: valores {self.valores.shape} para {len(self.timestamps)} timestamps"
+            )
+
+        # Cursor monotônico: quantidade de candles visíveis no último timestamp consultado
+        self._cursor_ts: Optional[int] = None
+        self._cursor_fim = 0
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'KlineStore':
+        """
+        Constrói o store a partir de um DataFrame indexado por timestamp.
+
+        Args:
+            df: DataFrame com DatetimeIndex e colunas open/high/low/close/volume
+
+        Returns:
+            KlineStore com os dados convertidos
+        """
+        indice = pd.DatetimeIndex(df.index)
+        if indice.tz is not None:
+            indice = indice.tz_convert(None)
+        timestamps_ms = indice.as_unit('ms').asi8
+
+        valores = np.empty((len(COLUNAS_OHLCV), len(df)), dtype=np.float64)
+        for i, coluna in enumerate(COLUNAS_OHLCV):
+            valores[i] = df[coluna].to_numpy(dtype=np.float64)
+
+        return cls(timestamps_ms, valores)
+
+    def to_dataframe(self, inicio: int = 0, fim: Optional[int] = None) -> pd.DataFrame:
+        """
+        Monta um DataFrame (índice 'timestamp') com os candles [inicio:fim].
+
+        Os valores são copiados; usado só por código legado que ainda pede
+        DataFrames (o loop da simulação lê os arrays direto).
+        """
+        valores = self.valores[:, inicio:fim]
+        indice = pd.DatetimeIndex(self.timestamps[inicio:fim].astype('datetime64[ms]'), name='timestamp')
+        return pd.DataFrame({coluna: valores[i] for i, coluna in enumerate(COLUNAS_OHLCV)}, index=indice)
+
+    def resamplear(self, periodo_ms: int) -> 'KlineStore':
+        """
+        Agrega os candles em períodos fixos direto nos arrays.
+
+        Equivale a df.resample(periodo).agg(first/max/min/last/sum).dropna()
+        com a origem padrão do pandas (meia-noite do primeiro dia), sem montar
+        o DataFrame do timeframe base. Processa em blocos cortados na borda
+        de um período, então nem a memória temporária nem as páginas lidas de
+        um store mapeado (memmap) crescem com o histórico.
+
+        Args:
+            periodo_ms: Duração de cada candle agregado (ms)
+
+        Returns:
+            Novo KlineStore no timeframe agregado
+
+        Raises:
+            ValueError: Candles com NaN (o pandas ignora NaN na agregação; use
+                o resample do pandas nesse caso)
+        """
+        ts = self.timestamps
+        n = len(ts)
+        if n == 0:
+            return KlineStore(ts[:0], self.valores[:, :0])
+
+        origem = int(ts[0]) - int(ts[0]) % DIA_MS
+        partes_ts, partes_valores = [], []
+        a = 0
+        while a < n:
+            b = n
+            if a + BLOCO_RESAMPLE < n:
+                # Cortar no início do período que contém a barra a+BLOCO
+                inicio_periodo = origem + (int(ts[a + BLOCO_RESAMPLE]) - origem) // periodo_ms * periodo_ms
+                b = int(np.searchsorted(ts, inicio_periodo, side='left'))
+                if b <= a:
+                    b = int(np.searchsorted(ts, inicio_periodo + periodo_ms, side='left'))
+            bloco_ts, bloco_valores = self._agregar_bloco(a, b, origem, periodo_ms)
+            partes_ts.append(bloco_ts)
+            partes_valores.append(bloco_valores)
+            liberar_paginas(ts, self.valores)
+            a = b
+
+        return KlineStore(np.concatenate(partes_ts), np.concatenate(partes_valores, axis=1))
+
+    def _agregar_bloco(self, a: int, b: int, origem: int, periodo_ms: int):
+        """Agrega os candles [a:b) (bloco começando na borda de um período)."""
+        baldes = self.timestamps[a:b] - origem
+        baldes //= periodo_ms
+        novos = np.empty(len(baldes), dtype=bool)
+        novos[0] = True
+        np.not_equal(baldes[1:], baldes[:-1], out=novos[1:])
+        inicios = np.flatnonzero(novos)
+        ultimos = np.append(inicios[1:], len(baldes)) - 1
+
+        bloco = self.valores[:, a:b]
+        if np.isnan(bloco).any():
+            raise ValueError(f"Candles com NaN entre as posições {a} e {b}")
+
+        valores = np.empty((len(COLUNAS_OHLCV), len(inicios)), dtype=np.float64)
+        valores[0] = bloco[0, inicios]
+        valores[1] = np.maximum.reduceat(bloco[1], inicios)
+        valores[2] = np.minimum.reduceat(bloco[2], inicios)
+        valores[3] = bloco[3, ultimos]
+        # Soma via pandas (soma compensada): volumes idênticos aos do resample
+        valores[4] = pd.Series(bloco[4]).groupby(np.cumsum(novos), sort=False).sum().to_numpy()
+
+        return origem + baldes[inicios] * periodo_ms, valores
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.valores[0]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.valores[1]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.valores[2]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.valores[3]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.valores[4]
+
+    def posicao_ate(self, timestamp_ms: int) -> int:
+        """
+        Retorna quantos candles têm abertura <= timestamp_ms.
+
+        Na simulação o tempo só avança, então o caso comum é O(1): ou o
+        cursor já está na posição correta ou anda poucos candles. Saltos
+        para trás (ex: nova simulação no mesmo store) usam busca binária.
+
+        Args:
+            timestamp_ms: Timestamp atual da simulação (ms)
+
+        Returns:
+            Índice exclusivo do último candle visível
+        """
+        ts = self.timestamps
+        n = len(ts)
+
+        if self._cursor_ts is not None and timestamp_ms >= self._cursor_ts:
+            fim = self._cursor_fim
+            # Caso comum: próximo candle ainda não abriu
+            if fim >= n or ts[fim] > timestamp_ms:
+                self._cursor_ts = timestamp_ms
+                return fim
+            # Avanço curto (uma barra de timeframe maior abriu)
+            if fim + 1 >= n or ts[fim + 1] > timestamp_ms:
+                fim += 1
+            else:
+                fim = int(np.searchsorted(ts, timestamp_ms, side='right'))
+        else:
+            fim = int(np.searchsorted(ts, timestamp_ms, side='right'))
+
+        self._cursor_ts = timestamp_ms
+        self._cursor_fim = fim
+        return fim
+
+    def janela(
+        self,
+        timestamp_ms: Optional[int],
+        limite: int,
+        inicio: Optional[int] = None,
+        fim: Optional[int] = None,
+        descartar_ultimo: bool = False
+    ) -> JanelaKlines:
+        """
+        Retorna os últimos 'limite' candles visíveis em timestamp_ms.
+
+        Args:
+            timestamp_ms: Momento atual da simulação (None = todos os dados)
+            limite: Número máximo de candles
+            inicio: Timestamp mínimo de abertura em ms (opcional)
+            fim: Timestamp máximo de abertura em ms (opcional, nunca além do atual)
+            descartar_ultimo: Exclui o último candle visível (ex: ainda em
+                formação), mantendo 'limite' candles anteriores
+
+        Returns:
+            JanelaKlines com views dos arrays internos
+        """
+        if timestamp_ms is None:
+            pos_fim = len(self.timestamps)
+        else:
+            pos_fim = self.posicao_ate(timestamp_ms)
+        if descartar_ultimo:
+            pos_fim = max(pos_fim - 1, 0)
+
+        if fim:
+            limite_fim = fim if timestamp_ms is None else min(fim, timestamp_ms)
+            pos_fim = min(pos_fim, int(np.searchsorted(self.timestamps, limite_fim, side='right')))
+
+        pos_inicio = 0
+        if inicio:
+            pos_inicio = int(np.searchsorted(self.timestamps, inicio, side='left'))
+
+        if limite is not None and limite >= 0:
+            pos_inicio = max(pos_inicio, pos_fim - limite)
+        pos_inicio = min(pos_inicio, pos_fim)
+
+        valores = self.valores[:, pos_inicio:pos_fim]
+        return JanelaKlines(
+            self.timestamps[pos_inicio:pos_fim],
+            valores[0], valores[1], valores[2], valores[3], valores[4]
+        )
+
+
+class CandleEmFormacao:
+    """
+    Candle em formação de um timeframe maior, agregado a partir das barras base.
+
+    A cada barra base o OHLCV do candle aberto é atualizado em O(1) (abertura
+    da primeira barra, máxima/mínima acumuladas, fechamento da barra atual,
+    volume somado). Os candles já fechados continuam vindo do store
+    resampleado: um candle fechado é exatamente o seu período agregado.
+
+    Exemplo:
+        formacao = CandleEmFormacao(store_1m, store_4h)
+        candle = formacao.atualizar(barras_processadas)
+        if candle >= 0 and not formacao.completo:
+            abertura, maxima, minima, fechamento, volume = formacao.valores
+    """
+
+    def __init__(self, store_base: KlineStore, store_timeframe: KlineStore):
+        """
+        Args:
+            store_base: Candles do timeframe base (as barras da simulação)
+            store_timeframe: Resample de store_base no timeframe maior
+        """
+        self._ts_base = store_base.timestamps
+        self._valores_base = store_base.valores
+        self._ts_timeframe = store_timeframe.timestamps
+
+        # Barras base já incorporadas [0, fim) e candle correspondente
+        self.fim = 0
+        self.candle = -1
+        self.valores = np.full(len(COLUNAS_OHLCV), np.nan)
+        # A última barra incorporada fecha o candle (a próxima abre outro)
+        self.completo = False
+
+    def _reagregar(self, fim: int) -> None:
+        """Monta o candle que contém a barra fim-1 direto dos arrays (saltos e retrocessos)."""
+        ts = int(self._ts_base[fim - 1])
+        self.candle = int(np.searchsorted(self._ts_timeframe, ts, side='right')) - 1
+        if self.candle < 0:
+            return
+        inicio = int(np.searchsorted(self._ts_base, self._ts_timeframe[self.candle], side='left'))
+        bloco = self._valores_base[:, inicio:fim]
+        self.valores = np.array([
+            bloco[0, 0], bloco[1].max(), bloco[2].min(), bloco[3, -1], bloco[4].sum()
+        ], dtype=np.float64)
+
+    def _incorporar(self, barra: int) -> None:
+        """Incorpora a barra base seguinte (O(1))."""
+        ts = self._ts_base[barra]
+        proximo = self.candle + 1
+        if proximo < len(self._ts_timeframe) and self._ts_timeframe[proximo] <= ts:
+            # Abriu um candle novo
+            self.candle = proximo
+            self.valores = self._valores_base[:, barra].astype(np.float64)
+            return
+        valores = self.valores
+        _, maxima, minima, fechamento, volume = self._valores_base[:, barra].tolist()
+        if maxima > valores[1]:
+            valores[1] = maxima
+        if minima < valores[2]:
+            valores[2] = minima
+        valores[3] = fechamento
+        valores[4] += volume
+
+    def atualizar(self, fim: int) -> int:
+        """
+        Avança (ou recua) o candle em formação até a barra base fim-1.
+
+        Args:
+            fim: Barras base processadas (exclusivo)
+
+        Returns:
+            Índice do candle em formação no store do timeframe (-1 se nenhum
+            candle abriu até essa barra)
+        """
+        if fim == self.fim:
+            return self.candle
+
+        if fim <= 0:
+            self.candle = -1
+        elif fim < self.fim or fim - self.fim > MAX_PASSOS_INCREMENTAIS or self.candle < 0:
+            self._reagregar(fim)
+        else:
+            for barra in range(self.fim, fim):
+                self._incorporar(barra)
+        self.fim = fim
+
+        proximo = self.candle + 1
+        self.completo = self.candle >= 0 and fim < len(self._ts_base) and (
+            proximo < len(self._ts_timeframe) and self._ts_base[fim] >= self._ts_timeframe[proximo]
+        )
+        return self.candle
@@ -1,13 +1,268 @@
 
+import numpy as np
 import pandas as pd
+from datetime import datetime, timedelta
 from decimal import Decimal
 import uuid
-from typing import List, Optional
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional, Tuple
 from src.exchange.base import ExchangeAPI
+from src.exchange.historico_cache import carregar_historico, carregar_store_historico, carregar_store_resampleado
+from src.exchange.kline_store import CandleEmFormacao, KlineStore, JanelaKlines, liberar_paginas
 from src.utils.logger import get_loggers
 
 logger, _ = get_loggers()
 
+# Origem dos timestamps (ms) do KlineStore; datetimes das barras são naive em UTC,
+# como os pd.Timestamp lidos do CSV.
+_EPOCH = datetime(1970, 1, 1)
+
+# A cada quantas barras as páginas já lidas do histórico mapeado (memmap)
+# saem do RSS do processo (potência de 2)
+BARRAS_LIBERACAO_PAGINAS = 1 << 16
+
+
+class BarraSimulada:
+    """
+    Barra (vela) da simulação montada direto dos arrays do KlineStore.
+
+    Substitui o dict de `iloc[...].to_dict()`: traz o datetime e o preço de
+    fechamento em Decimal (calculado no primeiro acesso; o modo numérico float
+    usa `close` direto). Mantém acesso por chave (barra['close'],
+    barra['timestamp']) para compatibilidade com scripts antigos.
+    """
+
+    __slots__ = ('indice', 'timestamp_ms', 'timestamp', 'open', 'high', 'low', 'close', 'volume', '_preco_decimal')
+
+    def __init__(self, indice: int, timestamp_ms: int, open_: float, high: float, low: float, close: float, volume: float):
+        self.indice = indice
+        self.timestamp_ms = timestamp_ms
+        self.timestamp = _EPOCH + timedelta(milliseconds=timestamp_ms)
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self._preco_decimal = None
+
+    @property
+    def preco_decimal(self) -> Decimal:
+        if self._preco_decimal is None:
+            self._preco_decimal = Decimal(str(self.close))
+        return self._preco_decimal
+
+    def __getitem__(self, chave: str) -> Any:
+        try:
+            return getattr(self, chave)
+        except AttributeError:
+            raise KeyError(chave)
+
+    def get(self, chave: str, default: Any = None) -> Any:
+        return getattr(self, chave, default)
+
+    def to_dict(self) -> dict:
+        return {
+            'timestamp': self.timestamp,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume
+        }
+
+    def __repr__(self) -> str:
+        return f"BarraSimulada({self.timestamp.isoformat()}, close={self.close})"
+
+
+class HistoricoPortfolio(Sequence):
+    """
+    Snapshots do portfólio (um por barra) guardados de forma compacta.
+
+    Em vez de um dict por barra, guarda só o que muda: sequências de barras
+    consecutivas e os saldos totais após cada trade. Preço e timestamp vêm
+    dos arrays do KlineStore base. Cada item continua sendo o dict de antes
+    ({'timestamp', 'saldo_usdt', 'saldo_ativo', 'preco', 'total_value_quote'}),
+    montado no acesso com as mesmas contas (Decimal ou float).
+    """
+
+    def __init__(self, timestamps_ms: np.ndarray, closes: np.ndarray):
+        self._timestamps_ms = timestamps_ms
+        self._closes = closes
+        self._total = 0
+        # Sequências de barras consecutivas: posição do snapshot -> barra
+        self._inicio_sequencias: List[int] = []
+        self._barra_sequencias: List[int] = []
+        self._ultima_barra: Optional[int] = None
+        # Saldos totais (usdt, ativo) a partir de cada posição
+        self._inicio_saldos: List[int] = []
+        self._saldos: List[Tuple[Any, Any]] = []
+        # Timestamps informados explicitamente (ex: snapshot inicial)
+        self._timestamps_avulsos: Dict[int, Any] = {}
+
+    def registrar(self, indice_barra: int, saldo_usdt: Any, saldo_ativo: Any, timestamp: Optional[Any] = None):
+        """
+        Acrescenta um snapshot.
+
+        Args:
+            indice_barra: Barra base cujo fechamento é o preço do snapshot
+            saldo_usdt: USDT somado das carteiras (Decimal ou float)
+            saldo_ativo: Ativo somado das carteiras (Decimal ou float)
+            timestamp: Timestamp do snapshot (padrão: o da barra, em isoformat)
+        """
+        posicao = self._total
+        if self._ultima_barra is None or indice_barra != self._ultima_barra + 1:
+            self._inicio_sequencias.append(posicao)
+            self._barra_sequencias.append(indice_barra)
+        self._ultima_barra = indice_barra
+
+        if not self._saldos or self._saldos[-1] != (saldo_usdt, saldo_ativo):
+            self._inicio_saldos.append(posicao)
+            self._saldos.append((saldo_usdt, saldo_ativo))
+
+        if timestamp is not None:
+            self._timestamps_avulsos[posicao] = timestamp
+        self._total = posicao + 1
+
+    def registrar_sequencia(self, inicio_barra: int, fim_barra: int, saldo_usdt: Any, saldo_ativo: Any):
+        """
+        Acrescenta um snapshot por barra em [inicio_barra, fim_barra), todos
+        com os mesmos saldos (barras puladas sem trades).
+        """
+        quantidade = fim_barra - inicio_barra
+        if quantidade <= 0:
+            return
+        self.registrar(inicio_barra, saldo_usdt, saldo_ativo)
+        self._ultima_barra = fim_barra - 1
+        self._total += quantidade - 1
+
+    def __len__(self) -> int:
+        return self._total
+
+    def _barra(self, posicao: int) -> int:
+        k = bisect_right(self._inicio_sequencias, posicao) - 1
+        return self._barra_sequencias[k] + posicao - self._inicio_sequencias[k]
+
+    @staticmethod
+    def _valor_total(saldo_usdt: Any, saldo_ativo: Any, preco: float) -> float:
+        if isinstance(saldo_usdt, Decimal):
+            return float(saldo_usdt + saldo_ativo * Decimal(str(preco)))
+        return saldo_usdt + saldo_ativo * preco
+
+    def __getitem__(self, posicao):
+        if isinstance(posicao, slice):
+            return [self[i] for i in range(*posicao.indices(self._total))]
+        if posicao < 0:
+            posicao += self._total
+        if not 0 <= posicao < self._total:
+            raise IndexError('snapshot fora do histórico')
+
+        barra = self._barra(posicao)
+        saldo_usdt, saldo_ativo = self._saldos[bisect_right(self._inicio_saldos, posicao) - 1]
+        preco = float(self._closes[barra])
+        timestamp = self._timestamps_avulsos.get(posicao)
+        if timestamp is None:
+            timestamp = (_EPOCH + timedelta(milliseconds=int(self._timestamps_ms[barra]))).isoformat()
+
+        return {
+            'timestamp': timestamp,
+            'saldo_usdt': float(saldo_usdt),
+            'saldo_ativo': float(saldo_ativo),
+            'preco': preco,
+            'total_value_quote': self._valor_total(saldo_usdt, saldo_ativo, preco),
+        }
+
+    def _barras(self) -> np.ndarray:
+        """Índice da barra base de cada snapshot."""
+        barras = np.empty(self._total, dtype=np.int64)
+        limites = self._inicio_sequencias + [self._total]
+        for k, inicio in enumerate(self._inicio_sequencias):
+            fim = limites[k + 1]
+            barras[inicio:fim] = np.arange(self._barra_sequencias[k], self._barra_sequencias[k] + fim - inicio)
+        return barras
+
+    def timestamps_ms(self) -> np.ndarray:
+        """Timestamp (ms) do candle de cada snapshot, alinhado com valores_totais()."""
+        return np.asarray(self._timestamps_ms)[self._barras()].astype(np.int64, copy=False)
+
+    def valores_totais(self) -> np.ndarray:
+        """Curva de patrimônio (total_value_quote de cada snapshot) em float64."""
+        precos = self._closes[self._barras()]
+
+        curva = np.empty(self._total, dtype=np.float64)
+        limites = self._inicio_saldos + [self._total]
+        for k, (saldo_usdt, saldo_ativo) in enumerate(self._saldos):
+            a, b = limites[k], limites[k + 1]
+            if isinstance(saldo_usdt, Decimal):
+                curva[a:b] = [self._valor_total(saldo_usdt, saldo_ativo, p) for p in precos[a:b].tolist()]
+            else:
+                curva[a:b] = saldo_usdt + saldo_ativo * precos[a:b]
+        return curva
+
+    def saldos_ativo(self) -> np.ndarray:
+        """Saldo do ativo de cada snapshot em float64, alinhado com valores_totais()."""
+        tamanhos = np.diff(self._inicio_saldos + [self._total])
+        return np.repeat(np.array([float(ativo) for _, ativo in self._saldos], dtype=np.float64), tamanhos)
+
+    def exportar_estado(self) -> Dict[str, Any]:
+        """
+        Estado compacto do histórico, sem os arrays de candles (ex: para o
+        cache de resultados). Volta a ser um histórico com restaurar().
+        """
+        return {
+            'total': self._total,
+            'inicio_sequencias': list(self._inicio_sequencias),
+            'barra_sequencias': list(self._barra_sequencias),
+            'ultima_barra': self._ultima_barra,
+            'inicio_saldos': list(self._inicio_saldos),
+            'saldos': list(self._saldos),
+            'timestamps_avulsos': dict(self._timestamps_avulsos),
+        }
+
+    @classmethod
+    def restaurar(cls, estado: Dict[str, Any], timestamps_ms: np.ndarray, closes: np.ndarray) -> 'HistoricoPortfolio':
+        """
+        Remonta um histórico de exportar_estado() sobre os candles base.
+
+        Args:
+            estado: Saída de exportar_estado()
+            timestamps_ms: Timestamps do KlineStore base (os mesmos da simulação)
+            closes: Fechamentos do KlineStore base
+        """
+        historico = cls(timestamps_ms, closes)
+        historico._total = estado['total']
+        historico._inicio_sequencias = list(estado['inicio_sequencias'])
+        historico._barra_sequencias = list(estado['barra_sequencias'])
+        historico._ultima_barra = estado['ultima_barra']
+        historico._inicio_saldos = list(estado['inicio_saldos'])
+        historico._saldos = list(estado['saldos'])
+        historico._timestamps_avulsos = dict(estado['timestamps_avulsos'])
+        return historico
+
+
+class ResamplesSimulacao(dict):
+    """
+    Cache {timeframe: DataFrame} dos resamples, montado sob demanda.
+
+    A simulação lê só os KlineStores; os DataFrames existem para código
+    legado (scripts, testes). Pedir um timeframe que já tem KlineStore monta
+    o DataFrame a partir dos arrays na primeira vez.
+    """
+
+    def __init__(self, api: 'SimulatedExchangeAPI', iniciais: Optional[Dict[str, pd.DataFrame]] = None):
+        super().__init__(iniciais or {})
+        self._api = api
+
+    def __missing__(self, intervalo: str) -> pd.DataFrame:
+        if intervalo == self._api.timeframe_base:
+            return self._api.dados_completos
+        store = self._api.kline_stores.get(intervalo)
+        if store is None:
+            raise KeyError(intervalo)
+        self[intervalo] = store.to_dataframe()
+        return self[intervalo]
+
+
 class SimulatedExchangeAPI(ExchangeAPI):
     """
     Uma classe de API de exchange simulada para backtesting.
@@ -26,20 +281,122 @@ class SimulatedExchangeAPI(ExchangeAPI):
         """
         # Armazenar timeframe base
         self.timeframe_base = timeframe_base
-        
-        # Carregar dados completos com timestamp como índice
-        self.dados_completos = pd.read_csv(caminho_csv)
-        self.dados_completos['timestamp'] = pd.to_datetime(self.dados_completos['timestamp'])
-        self.dados_completos.set_index('timestamp', inplace=True)
-        
-        # Dados para iteração (cópia para não modificar o original)
-        self.dados = self.dados_completos.copy().reset_index()
-        
-        # Cache de dados resampleados por timeframe
-        self.dados_resampled = {}
-        # Adicionar os dados originais ao cache com seu timeframe base
-        self.dados_resampled[timeframe_base] = self.dados_completos.copy()
-        
+
+        # Candles mapeados em memória a partir do cache binário (sem cópias em
+        # DataFrame; o benchmark reaproveita os mesmos arrays). CSVs que não
+        # cabem no cache seguem pelo DataFrame.
+        store_base = carregar_store_historico(caminho_csv)
+        if store_base is not None:
+            self._configurar_store(store_base)
+            # Resamples persistidos no bundle do CSV (ver _resamplear_store)
+            self._caminho_csv = caminho_csv
+        else:
+            self._configurar_dados(carregar_historico(caminho_csv))
+        self._inicializar_conta(saldo_inicial, taxa_pct, alocacao_giro_pct)
+
+    @classmethod
+    def de_store(
+        cls,
+        store_base: KlineStore,
+        saldo_inicial: float,
+        taxa_pct: float,
+        timeframe_base: str = '1m',
+        alocacao_giro_pct: Optional[float] = None
+    ) -> 'SimulatedExchangeAPI':
+        """
+        Cria uma simulação sobre candles já em memória, sem CSV (ex: caminhos
+        sintéticos do Monte Carlo).
+
+        Args:
+            store_base: Candles do timeframe base
+            saldo_inicial: Saldo inicial em USDT
+            taxa_pct: Taxa em %
+            timeframe_base: Timeframe dos candles (usado no resample)
+            alocacao_giro_pct: Alocação inicial do giro rápido (padrão 20%)
+
+        Returns:
+            Nova SimulatedExchangeAPI pronta para rodar
+        """
+        api = object.__new__(cls)
+        api.timeframe_base = timeframe_base
+        api._configurar_store(store_base)
+        api._inicializar_conta(saldo_inicial, taxa_pct, alocacao_giro_pct)
+        return api
+
+    def _configurar_dados(self, dados_completos: pd.DataFrame, dados_resampled: Optional[Dict[str, pd.DataFrame]] = None):
+        """
+        Prepara os dados de mercado a partir de um DataFrame.
+
+        Args:
+            dados_completos: OHLCV no timeframe base, indexado por timestamp
+            dados_resampled: Resamples já calculados para reaproveitar (opcional)
+        """
+        self._configurar_store(KlineStore.from_dataframe(dados_completos), dados_completos, dados_resampled)
+
+    def _configurar_store(
+        self,
+        store_base: KlineStore,
+        dados_completos: Optional[pd.DataFrame] = None,
+        dados_resampled: Optional[Dict[str, pd.DataFrame]] = None
+    ):
+        """
+        Prepara os dados de mercado (KlineStores) da simulação.
+
+        O store base também serve de cursor de barras: arrays contíguos de
+        timestamps (int64 ms) e preços (float64), sem pandas no loop. Os
+        DataFrames (dados_completos, dados) só são montados se pedidos.
+
+        Args:
+            store_base: Candles do timeframe base (podem ser memmap)
+            dados_completos: DataFrame de origem, se já existir (opcional)
+            dados_resampled: Resamples já calculados para reaproveitar (opcional)
+        """
+        self._dados_completos = dados_completos
+        self._dados = None
+        # Resample vetorizado nos arrays, exceto para timestamps com fuso (o
+        # pandas ancora no fuso local) ou candles com NaN (ver _resamplear_store)
+        self._resample_pandas = dados_completos is not None and getattr(dados_completos.index, 'tz', None) is not None
+
+        # Cache de dados resampleados por timeframe (DataFrames sob demanda)
+        self.dados_resampled = ResamplesSimulacao(self, dados_resampled)
+        # CSV cujo bundle guarda os resamples em disco (só quando o store base é o do bundle)
+        self._caminho_csv: Optional[str] = None
+
+        # Stores NumPy por timeframe (construídos sob demanda no resample)
+        self.store_base = store_base
+        self.kline_stores: Dict[str, KlineStore] = {self.timeframe_base: self.store_base}
+        self._timestamps_base_ms = self.store_base.timestamps
+        self._closes_base = self.store_base.close
+        self.total_barras = len(self.store_base)
+        # Candle em formação por intervalo (ver obter_klines_array)
+        self._candles_em_formacao: Dict[str, Optional[CandleEmFormacao]] = {}
+
+    @property
+    def dados_completos(self) -> pd.DataFrame:
+        """OHLCV do timeframe base indexado por timestamp (montado no primeiro acesso)."""
+        if self._dados_completos is None:
+            self._dados_completos = self.store_base.to_dataframe()
+        return self._dados_completos
+
+    @property
+    def dados(self) -> pd.DataFrame:
+        """dados_completos com o timestamp como coluna (compatibilidade)."""
+        if self._dados is None:
+            self._dados = self.dados_completos.reset_index()
+        return self._dados
+
+    def _inicializar_conta(self, saldo_inicial: float, taxa_pct: float, alocacao_giro_pct: Optional[float] = None):
+        """
+        Zera a conta simulada: saldos por carteira, taxa, histórico e cursor.
+
+        Args:
+            saldo_inicial: O saldo inicial em USDT para a simulação.
+            taxa_pct: A porcentagem da taxa de transação (ex: 0.1 para 0.1%).
+            alocacao_giro_pct: Percentual inicial da carteira de giro rápido (padrão 20%).
+        """
+        self.saldo_inicial = saldo_inicial
+        self.taxa_pct = taxa_pct
+
         # Saldos globais (mantidos para compatibilidade)
         self.saldo_usdt = Decimal(str(saldo_inicial))
         self.saldo_ativo = Decimal('0')
@@ -67,8 +424,11 @@ class SimulatedExchangeAPI(ExchangeAPI):
         # Guardar alocacao atual para referência
         self.alocacao_giro_pct = Decimal(str(giro_pct))
 
-        # Histórico do portfólio ao longo do tempo (lista de snapshots)
-        self.portfolio_over_time: List[dict] = []
+        # Histórico do portfólio ao longo do tempo (snapshots compactos)
+        self.portfolio_over_time = HistoricoPortfolio(self._timestamps_base_ms, self._closes_base)
+        # Snapshots em float quando o bot roda em MODO_NUMERICO='float'
+        # (ver definir_contexto_numerico); o livro-razão segue em Decimal
+        self.snapshots_em_float = False
 
         self.taxa = Decimal(str(taxa_pct)) / Decimal('100')
 
@@ -76,23 +436,153 @@ class SimulatedExchangeAPI(ExchangeAPI):
         # Ajustar para o tamanho dos dados caso o CSV seja curto para evitar iniciar
         # além do final do DataFrame (o que faria a simulação terminar imediatamente).
         default_buffer = 200
-        max_valid_index = max(1, len(self.dados) - 1)
-        self.indice_atual = default_buffer if default_buffer < len(self.dados) else max_valid_index
+        max_valid_index = max(1, self.total_barras - 1)
+        self.indice_atual = default_buffer if default_buffer < self.total_barras else max_valid_index
         self.trades_executados = []
+        # Barras puladas pelo salto de barras ociosas (avancar_sem_eventos)
+        self.barras_sem_eventos = 0
+
+    def clonar(
+        self,
+        saldo_inicial: Optional[float] = None,
+        taxa_pct: Optional[float] = None,
+        alocacao_giro_pct: Optional[float] = None
+    ) -> 'SimulatedExchangeAPI':
+        """
+        Cria uma nova simulação sobre os MESMOS dados já carregados.
+
+        Os DataFrames e os arrays dos KlineStores são compartilhados (nada é
+        relido do CSV nem resampleado de novo); apenas conta e cursores são
+        novos. Usado pelo sweep de parâmetros e pelo walk-forward.
+
+        Args:
+            saldo_inicial: Saldo inicial em USDT (padrão: o desta instância)
+            taxa_pct: Taxa em % (padrão: a desta instância)
+            alocacao_giro_pct: Alocação inicial do giro rápido (padrão 20%)
+
+        Returns:
+            Nova SimulatedExchangeAPI pronta para rodar
+        """
+        clone = object.__new__(SimulatedExchangeAPI)
+        clone.timeframe_base = self.timeframe_base
+        clone._dados_completos = self._dados_completos
+        clone._dados = self._dados
+        clone._resample_pandas = self._resample_pandas
+        clone._caminho_csv = self._caminho_csv
+        clone.dados_resampled = ResamplesSimulacao(clone, self.dados_resampled)
+        # Stores novos (cursor próprio) apontando para os mesmos arrays
+        clone.kline_stores = {
+            intervalo: KlineStore(store.timestamps, store.valores)
+            for intervalo, store in self.kline_stores.items()
+        }
+        clone.store_base = clone.kline_stores[self.timeframe_base]
+        clone._timestamps_base_ms = clone.store_base.timestamps
+        clone._closes_base = clone.store_base.close
+        clone.total_barras = self.total_barras
+        clone._candles_em_formacao = {}
+
+        clone._inicializar_conta(
+            self.saldo_inicial if saldo_inicial is None else saldo_inicial,
+            self.taxa_pct if taxa_pct is None else taxa_pct,
+            alocacao_giro_pct
+        )
+        return clone
+
+    def fatiar(
+        self,
+        inicio: pd.Timestamp,
+        fim: pd.Timestamp,
+        barras_aquecimento: int = 200,
+        saldo_inicial: Optional[float] = None,
+        taxa_pct: Optional[float] = None
+    ) -> 'SimulatedExchangeAPI':
+        """
+        Cria uma simulação restrita ao período [inicio, fim), reaproveitando os
+        resamples já calculados (fatias, sem reler o CSV).
+
+        As 'barras_aquecimento' anteriores a 'inicio' ficam disponíveis como
+        histórico para os indicadores, mas a simulação só opera a partir de 'inicio'.
+
+        Args:
+            inicio: Primeiro timestamp operado
+            fim: Timestamp final (exclusivo)
+            barras_aquecimento: Barras base de histórico antes de 'inicio'
+            saldo_inicial: Saldo inicial em USDT (padrão: o desta instância)
+            taxa_pct: Taxa em % (padrão: a desta instância)
+
+        Returns:
+            Nova SimulatedExchangeAPI com os dados da janela
+        """
+        inicio_ms = int(pd.Timestamp(inicio).value // 1_000_000)
+        fim_ms = int(pd.Timestamp(fim).value // 1_000_000)
+        pos_inicio = int(np.searchsorted(self._timestamps_base_ms, inicio_ms, side='left'))
+        pos_fim = int(np.searchsorted(self._timestamps_base_ms, fim_ms, side='left'))
+        pos_dados = max(0, pos_inicio - barras_aquecimento)
+
+        clone = object.__new__(SimulatedExchangeAPI)
+        clone.timeframe_base = self.timeframe_base
+        clone._dados_completos = None if self._dados_completos is None else self._dados_completos.iloc[pos_dados:pos_fim]
+        clone._dados = None
+        clone._resample_pandas = self._resample_pandas
+        # Janela recortada: resamples do CSV inteiro não valem aqui
+        clone._caminho_csv = None
+
+        # Resamples: manter todo o histórico anterior (passado legítimo para os
+        # indicadores) e cortar os candles que abrem depois do fim da janela.
+        # DataFrames são remontados sob demanda a partir dos stores fatiados.
+        clone.dados_resampled = ResamplesSimulacao(clone)
+
+        # KlineStores: fatias (views) dos arrays já construídos
+        clone.kline_stores = {}
+        for intervalo, store in self.kline_stores.items():
+            if intervalo == self.timeframe_base:
+                a, b = pos_dados, pos_fim
+            else:
+                a, b = 0, int(np.searchsorted(store.timestamps, fim_ms, side='left'))
+            clone.kline_stores[intervalo] = KlineStore(store.timestamps[a:b], store.valores[:, a:b])
+        clone.store_base = clone.kline_stores[self.timeframe_base]
+        clone._timestamps_base_ms = clone.store_base.timestamps
+        clone._closes_base = clone.store_base.close
+        clone.total_barras = len(clone.store_base)
+        clone._candles_em_formacao = {}
+
+        clone._inicializar_conta(
+            self.saldo_inicial if saldo_inicial is None else saldo_inicial,
+            self.taxa_pct if taxa_pct is None else taxa_pct
+        )
+        clone.indice_atual = min(pos_inicio - pos_dados, max(0, clone.total_barras - 1))
+        return clone
+
 
     def get_barra_atual(self):
         """
         Retorna a barra (vela) atual do DataFrame e avança o ponteiro.
 
         Returns:
-            Um dicionário representando a linha atual, ou None se os dados terminarem.
+            BarraSimulada da linha atual, ou None se os dados terminarem.
         """
-        if self.indice_atual < len(self.dados):
-            barra = self.dados.iloc[self.indice_atual].to_dict()
-            self.indice_atual += 1
+        i = self.indice_atual
+        if i < self.total_barras:
+            valores = self.store_base.valores
+            barra = BarraSimulada(
+                i,
+                int(self._timestamps_base_ms[i]),
+                float(valores[0, i]),
+                float(valores[1, i]),
+                float(valores[2, i]),
+                float(valores[3, i]),
+                float(valores[4, i])
+            )
+            self.indice_atual = i + 1
+            if not i & (BARRAS_LIBERACAO_PAGINAS - 1):
+                liberar_paginas(self._timestamps_base_ms, valores)
             return barra
         return None
 
+    def _timestamp_barra(self, indice: int) -> pd.Timestamp:
+        """Timestamp (pandas) da barra base no índice informado."""
+        return pd.Timestamp(int(self._timestamps_base_ms[indice]), unit='ms')
+
     def get_dados_historicos_iniciais(self, timeframe: str, limite: int):
         """
         Retorna as primeiras 'limite' linhas dos dados para o cálculo de indicadores,
@@ -122,25 +612,16 @@ class SimulatedExchangeAPI(ExchangeAPI):
             if timeframe_req_td < timeframe_base_td:
                 print(f"⚠️ Aviso de Resample: Timeframe solicitado ({timeframe}) é menor que o timeframe base do CSV ({self.timeframe_base}). Usando o timeframe base como fallback.")
                 # Retornar os dados no timeframe base (fallback) em vez de um DataFrame vazio
-                return self.dados_resampled[self.timeframe_base].head(limite).reset_index()
+                return self.store_base.to_dataframe(0, limite).reset_index()
 
         # Se for o mesmo timeframe, apenas retorna os dados originais
         if timeframe_req_td == timeframe_base_td:
-            return self.dados_completos.head(limite).reset_index()
+            return self.store_base.to_dataframe(0, limite).reset_index()
 
-        # Verificar se já está no cache
-        if timeframe in self.dados_resampled:
-            df_resampled = self.dados_resampled[timeframe]
-            return df_resampled.head(limite).reset_index()
-        
-        # Resamplear os dados para o timeframe solicitado
-        print(f"⏳ Realizando resample de {self.timeframe_base} para {timeframe}...")
-        df_resampled = self._resample_dados(timeframe)
-        
-        # Armazenar no cache
-        self.dados_resampled[timeframe] = df_resampled
-        
-        return df_resampled.head(limite).reset_index()
+        # Resamplear (ou reaproveitar o store já resampleado) e montar só as primeiras linhas
+        if timeframe not in self.kline_stores:
+            print(f"⏳ Realizando resample de {self.timeframe_base} para {timeframe}...")
+        return self.obter_kline_store(timeframe).to_dataframe(0, limite).reset_index()
 
     def get_saldo_disponivel(self, moeda: str) -> Decimal:
         """
@@ -170,8 +651,8 @@ class SimulatedExchangeAPI(ExchangeAPI):
         Returns:
             Um dicionário com informações da ordem simulada.
         """
-        barra_atual = self.dados.iloc[self.indice_atual - 1] # Usa a barra que acabou de ser retornada
-        preco = Decimal(str(barra_atual['close']))
+        indice_barra = self.indice_atual - 1  # Usa a barra que acabou de ser retornada
+        preco = Decimal(str(float(self._closes_base[indice_barra])))
         custo_total = Decimal(str(quantidade))
         taxa_incorpora = custo_total * self.taxa
         custo_liquido = custo_total - taxa_incorpora
@@ -201,7 +682,7 @@ class SimulatedExchangeAPI(ExchangeAPI):
                 'quantidade_usdt': float(custo_total),
                 'quantidade_ativo': float(quantidade_ativo),
                 'fee': float(taxa_incorpora),
-                'timestamp': barra_atual['timestamp'],
+                'timestamp': self._timestamp_barra(indice_barra),
                 'motivo': motivo_compra
             }
             self.trades_executados.append(trade)
@@ -236,8 +717,8 @@ class SimulatedExchangeAPI(ExchangeAPI):
         Returns:
             Um dicionário com informações da ordem simulada.
         """
-        barra_atual = self.dados.iloc[self.indice_atual - 1]
-        preco = Decimal(str(barra_atual['close']))
+        indice_barra = self.indice_atual - 1
+        preco = Decimal(str(float(self._closes_base[indice_barra])))
         quantidade_venda = Decimal(str(quantidade))
 
         # Validar carteira
@@ -277,7 +758,7 @@ class SimulatedExchangeAPI(ExchangeAPI):
                 'quantidade_ativo': float(quantidade_venda),
                 'receita_usdt': float(receita_liquida),
                 'fee': float(taxa_incorpora),
-                'timestamp': barra_atual['timestamp'],
+                'timestamp': self._timestamp_barra(indice_barra),
                 'motivo': motivo_saida
             }
             self.trades_executados.append(trade)
@@ -301,31 +782,74 @@ class SimulatedExchangeAPI(ExchangeAPI):
             logger.warning(f"❌ Tentativa de venda recusada: quantidade={quantidade_venda} vs saldo_ativo={self.saldos_por_carteira[carteira]['saldo_ativo']}")
             raise ValueError("Saldo de ativo insuficiente para executar a ordem de venda.")
 
-    def _resample_dados(self, timeframe: str) -> pd.DataFrame:
+    @staticmethod
+    def _timeframe_pandas(timeframe: str) -> str:
         """
-        Resamplea os dados completos para um timeframe específico.
-        
-        Args:
-            timeframe: O timeframe desejado (ex: '1h', '4h', '1d')
-            
-        Returns:
-            DataFrame resampleado com colunas OHLCV
+        Converte o timeframe do bot para o alias do pandas (ex: '5m' -> '5min').
+
+        Raises:
+            ValueError: Timeframe em formato desconhecido
         """
         # Converter timeframe para formato do pandas resample
         # Normalizar para lowercase (entrada pode ser '1m','5m','1h', etc.)
         timeframe_pandas = timeframe.lower()
 
         # Pandas mudou algumas aliases (ex: 'm' pode ser interpretado como month-end).
-        # Mapear explicitamente minutos 'm' para 'T' (minute) para evitar confusão
-        # onde 'm' seria tratado como mês. Ex: '5m' -> '5T'
+        # Mapear explicitamente minutos 'm' para 'min' para evitar confusão
+        # onde 'm' seria tratado como mês. Ex: '5m' -> '5min'
+        # ('T' foi removido no pandas 3; 'min' funciona em todas as versões)
         if timeframe_pandas.endswith('m'):
-            # evitar interpretar 'm' como mês; usar 'T' para minutos
-            timeframe_pandas = timeframe_pandas[:-1] + 'T'
+            timeframe_pandas = timeframe_pandas[:-1] + 'min'
 
-        # Validar formato - deve terminar com T, h, d, ou s
-        if not timeframe_pandas[-1] in ('T', 'h', 'd', 's'):
+        # Validar formato - deve terminar com min, h, d, ou s
+        if not timeframe_pandas.endswith(('min', 'h', 'd', 's')):
             raise ValueError(f"Timeframe inválido: '{timeframe}'. Use: 1m, 5m, 15m, 30m, 1h, 4h, 1d, etc.")
+        return timeframe_pandas
+
+    def _periodo_ms(self, timeframe: str) -> int:
+        """Duração do timeframe em ms."""
+        return int(pd.to_timedelta(self._timeframe_pandas(timeframe)).total_seconds() * 1000)
+
+    def _resamplear_store(self, timeframe: str) -> Optional[KlineStore]:
+        """
+        Resample vetorizado do store base (sem DataFrame do timeframe base).
+
+        Com o store base vindo do bundle do CSV, o resample é lido do disco
+        (ou calculado e gravado lá na primeira vez): execuções seguintes e
+        processos do sweep não agregam o histórico de novo.
+
+        Returns:
+            KlineStore resampleado, ou None se os candles tiverem NaN (a
+            simulação passa a usar o resample do pandas)
+        """
+        try:
+            periodo_ms = self._periodo_ms(timeframe)
+            if self._caminho_csv is not None:
+                store = carregar_store_resampleado(self._caminho_csv, periodo_ms)
+                if store is not None:
+                    return store
+            return self.store_base.resamplear(periodo_ms)
+        except ValueError as e:
+            logger.debug(f"⚠️ Resample vetorizado indisponível ({e}); usando pandas")
+            self._resample_pandas = True
+            return None
+
+    def _resample_dados(self, timeframe: str) -> pd.DataFrame:
+        """
+        Resamplea os dados completos para um timeframe específico.
         
+        Args:
+            timeframe: O timeframe desejado (ex: '1h', '4h', '1d')
+            
+        Returns:
+            DataFrame resampleado com colunas OHLCV
+        """
+        timeframe_pandas = self._timeframe_pandas(timeframe)
+        if not self._resample_pandas:
+            store = self._resamplear_store(timeframe)
+            if store is not None:
+                return store.to_dataframe()
+
         # Resamplear com as agregações corretas
         df_resampled = self.dados_completos.resample(timeframe_pandas).agg({
             'open': 'first',
@@ -346,7 +870,8 @@ class SimulatedExchangeAPI(ExchangeAPI):
         intervalo: str,
         limite: int = 500,
         inicio: Optional[int] = None,
-        fim: Optional[int] = None
+        fim: Optional[int] = None,
+        apenas_fechados: bool = False
     ) -> List[List]:
         """
         Obtém histórico de candlesticks (klines) para um símbolo e intervalo.
@@ -354,6 +879,8 @@ class SimulatedExchangeAPI(ExchangeAPI):
 
         CORREÇÃO: Respeita o timestamp atual da simulação para evitar lookahead bias.
         Garante que a estratégia nunca veja dados além do momento atual.
+        Como na Binance, o último candle é o que está em formação, com o OHLCV
+        acumulado só até a barra atual.
 
         Args:
             simbolo: Par (ex: ADAUSDT) - ignorado na simulação
@@ -361,6 +888,7 @@ class SimulatedExchangeAPI(ExchangeAPI):
             limite: Número de candles (máx)
             inicio: Timestamp início em ms (opcional)
             fim: Timestamp fim em ms (opcional)
+            apenas_fechados: Omite o candle em formação
 
         Returns:
             Lista de klines: [
@@ -376,104 +904,26 @@ class SimulatedExchangeAPI(ExchangeAPI):
                 ]
             ]
         """
-        # Verificar se o intervalo solicitado é menor que o timeframe base do CSV.
-        # Nesse caso, não podemos resamplear para uma resolução mais alta — em vez disso,
-        # usar o timeframe base como fallback para evitar retornar DataFrames vazios
-        # e permitir que a simulação continue.
-        try:
-            timeframe_base_td = pd.to_timedelta(self.timeframe_base)
-            timeframe_req_td = pd.to_timedelta(intervalo)
-        except Exception:
-            timeframe_base_td = None
-            timeframe_req_td = None
-
-        if timeframe_req_td is not None and timeframe_base_td is not None and timeframe_req_td < timeframe_base_td:
-            # Fallback para timeframe base
-            logger.debug(f"⚠️ obter_klines: intervalo solicitado ({intervalo}) é menor que o timeframe base ({self.timeframe_base}); usando timeframe base como fallback.")
-            df_resampled = self.dados_resampled[self.timeframe_base]
-        else:
-            # Verificar se já está no cache
-            if intervalo not in self.dados_resampled:
-                df_resampled = self._resample_dados(intervalo)
-                self.dados_resampled[intervalo] = df_resampled
-            else:
-                df_resampled = self.dados_resampled[intervalo]
-
-        # CORREÇÃO CRÍTICA: Obter o timestamp atual da simulação
-        # para não retornar dados futuros (lookahead bias)
-        if self.indice_atual > 0 and self.indice_atual <= len(self.dados):
-            timestamp_atual = pd.to_datetime(self.dados.iloc[self.indice_atual - 1]['timestamp'])
-        else:
-            # Se ainda não iniciou a simulação, usar o último timestamp disponível
-            timestamp_atual = df_resampled.index[-1]
-
-        # Aplicar filtro de tempo: queremos as barras RESAMPLEADAS até o timestamp atual
-        df_filtrado = df_resampled.copy()
-
-        # CRÍTICO: Limitar ao timestamp atual da simulação (evita ver o futuro!)
-        # Alguns cenários (timezones, alinhamento de labels) podem produzir DataFrames vazios
-        # ao usar uma máscara booleana direta. Usar searchsorted como fallback para obter
-        # o último índice resampleado <= timestamp_atual.
-        try:
-            # Normalizar tipos (remover tz para evitar comparação inválida)
-            if isinstance(timestamp_atual, pd.Timestamp) and timestamp_atual.tzinfo is not None:
-                timestamp_atual = timestamp_atual.tz_convert(None)
-
-            # Máscara rápida
-            df_filtrado = df_filtrado[df_filtrado.index <= timestamp_atual]
-
-            # Se vazio, usar searchsorted para obter tudo até o último bucket concluído
-            if df_filtrado.empty:
-                pos = df_resampled.index.searchsorted(timestamp_atual, side='right') - 1
-                if pos >= 0:
-                    df_filtrado = df_resampled.iloc[:pos+1]
-                else:
-                    df_filtrado = df_resampled.iloc[0:0]
-        except Exception:
-            # Em caso de qualquer erro de comparação, usar fallback seguro via searchsorted
-            try:
-                pos = df_resampled.index.searchsorted(timestamp_atual, side='right') - 1
-                if pos >= 0:
-                    df_filtrado = df_resampled.iloc[:pos+1]
-                else:
-                    df_filtrado = df_resampled.iloc[0:0]
-            except Exception:
-                # Como último recurso, retornar os últimos 'limite' candles do resample sem filtrar
-                df_filtrado = df_resampled.tail(limite)
-
-        # Aplicar filtro de início se fornecido (somente se não limita ao futuro)
-        if inicio:
-            inicio_dt = pd.to_datetime(inicio, unit='ms')
-            df_filtrado = df_filtrado[df_filtrado.index >= inicio_dt]
-
-        # Aplicar filtro de fim se fornecido (somente se não limita ao futuro)
-        if fim:
-            fim_dt = pd.to_datetime(fim, unit='ms')
-            # Limitar ao mínimo entre o fim solicitado e o timestamp atual
-            fim_dt_limitado = min(fim_dt, timestamp_atual)
-            df_filtrado = df_filtrado[df_filtrado.index <= fim_dt_limitado]
-
-        # Limitar número de resultados aos últimos 'limite' candles
-        df_filtrado = df_filtrado.tail(limite)
-
-        logger.debug(
-            f"📊 Klines obtidas: {len(df_filtrado)} candles para {intervalo} "
-            f"(limite: {limite}, timestamp_atual: {timestamp_atual})"
-        )
+        janela = self.obter_klines_array(simbolo, intervalo, limite, inicio, fim, apenas_fechados)
 
         # Converter para formato de klines (similar ao retornado pela Binance)
         klines = []
-        for timestamp, row in df_filtrado.iterrows():
-            timestamp_ms = int(timestamp.timestamp() * 1000)
-            # Calcular timestamp de fechamento (início do próximo candle - 1ms)
+        for timestamp_ms, o, h, l, c, v in zip(
+            janela.timestamps.tolist(),
+            janela.open.tolist(),
+            janela.high.tolist(),
+            janela.low.tolist(),
+            janela.close.tolist(),
+            janela.volume.tolist()
+        ):
             # Simplificação: usar o mesmo timestamp para abertura e fechamento
             klines.append([
                 timestamp_ms,                    # timestamp abertura
-                str(row['open']),                # open
-                str(row['high']),                # high
-                str(row['low']),                 # low
-                str(row['close']),               # close
-                str(row['volume']),              # volume
+                str(o),                          # open
+                str(h),                          # high
+                str(l),                          # low
+                str(c),                          # close
+                str(v),                          # volume
                 timestamp_ms,                    # timestamp fechamento
                 '0',                             # quote asset volume (não usado)
                 0,                               # number of trades
@@ -484,6 +934,111 @@ class SimulatedExchangeAPI(ExchangeAPI):
 
         return klines
 
+    def obter_klines_array(
+        self,
+        simbolo: str,
+        intervalo: str,
+        limite: int = 500,
+        inicio: Optional[int] = None,
+        fim: Optional[int] = None,
+        apenas_fechados: bool = False
+    ) -> JanelaKlines:
+        """
+        Versão NumPy de obter_klines: retorna views dos arrays do KlineStore.
+
+        Mesma semântica de obter_klines (fallback para o timeframe base,
+        filtros inicio/fim, proteção contra lookahead e candle em formação),
+        mas sem montar listas nem converter valores para string. Os arrays
+        retornados NÃO devem ser modificados, pois compartilham memória com o
+        store (só o candle em formação é montado à parte).
+
+        Args:
+            simbolo: Par (ex: ADAUSDT) - ignorado na simulação
+            intervalo: 1h, 4h, 1d, etc.
+            limite: Número de candles (máx)
+            inicio: Timestamp início em ms (opcional)
+            fim: Timestamp fim em ms (opcional)
+            apenas_fechados: Omite o candle em formação
+
+        Returns:
+            JanelaKlines (timestamps, open, high, low, close, volume)
+        """
+        store = self.obter_kline_store(intervalo)
+
+        # CORREÇÃO CRÍTICA: Limitar ao timestamp atual da simulação (evita ver o futuro!)
+        timestamp_atual_ms = self._timestamp_atual_ms()
+
+        formacao = self._candle_em_formacao(intervalo) if timestamp_atual_ms is not None else None
+        if formacao is None:
+            janela = store.janela(timestamp_atual_ms, limite, inicio, fim)
+        else:
+            candle = formacao.atualizar(self.indice_atual)
+            aberto = candle >= 0 and not formacao.completo
+            janela = store.janela(timestamp_atual_ms, limite, inicio, fim, descartar_ultimo=apenas_fechados and aberto)
+            if aberto and not apenas_fechados and len(janela) and janela.timestamps[-1] == store.timestamps[candle]:
+                # O resample tem o candle completo (barras futuras): usar o parcial
+                valores = np.vstack(janela[1:])
+                valores[:, -1] = formacao.valores
+                janela = JanelaKlines(janela.timestamps, *valores)
+
+        logger.debug(
+            f"📊 Klines obtidas: {len(janela)} candles para {intervalo} "
+            f"(limite: {limite}, timestamp_atual_ms: {timestamp_atual_ms})"
+        )
+        return janela
+
+    def _candle_em_formacao(self, intervalo: str) -> Optional[CandleEmFormacao]:
+        """CandleEmFormacao de um intervalo maior que o base (None para o próprio timeframe base)."""
+        if intervalo not in self._candles_em_formacao:
+            store = self.obter_kline_store(intervalo)
+            mesmo_base = store is self.store_base or np.may_share_memory(store.timestamps, self._timestamps_base_ms)
+            self._candles_em_formacao[intervalo] = None if mesmo_base else CandleEmFormacao(self.store_base, store)
+        return self._candles_em_formacao[intervalo]
+
+    def _timestamp_atual_ms(self) -> Optional[int]:
+        """Timestamp (ms) da última barra processada, ou None se fora da simulação."""
+        if 0 < self.indice_atual <= len(self._timestamps_base_ms):
+            return int(self._timestamps_base_ms[self.indice_atual - 1])
+        # Se ainda não iniciou a simulação, usar todos os dados disponíveis
+        return None
+
+    def obter_kline_store(self, intervalo: str) -> KlineStore:
+        """
+        Retorna (construindo na primeira chamada) o KlineStore de um intervalo.
+
+        Usado também para pré-calcular séries vetorizadas (ex: SMA de referência).
+
+        Se o intervalo solicitado for menor que o timeframe base do CSV, não é
+        possível resamplear para uma resolução mais alta — usa o timeframe base
+        como fallback para permitir que a simulação continue.
+        """
+        store = self.kline_stores.get(intervalo)
+        if store is not None:
+            return store
+
+        try:
+            timeframe_base_td = pd.to_timedelta(self.timeframe_base)
+            timeframe_req_td = pd.to_timedelta(intervalo)
+        except Exception:
+            timeframe_base_td = None
+            timeframe_req_td = None
+
+        if timeframe_req_td is not None and timeframe_base_td is not None and timeframe_req_td < timeframe_base_td:
+            logger.debug(f"⚠️ obter_klines: intervalo solicitado ({intervalo}) é menor que o timeframe base ({self.timeframe_base}); usando timeframe base como fallback.")
+            store = KlineStore(self.store_base.timestamps, self.store_base.valores)
+        elif dict.__contains__(self.dados_resampled, intervalo):
+            store = KlineStore.from_dataframe(self.dados_resampled[intervalo])
+        else:
+            # Direto nos arrays: nenhum DataFrame do timeframe base é montado
+            store = None if self._resample_pandas else self._resamplear_store(intervalo)
+            if store is None:
+                df_resampled = self._resample_dados(intervalo)
+                self.dados_resampled[intervalo] = df_resampled
+                store = KlineStore.from_dataframe(df_resampled)
+
+        self.kline_stores[intervalo] = store
+        return store
+
     def get_resultados(self):
         """
         Retorna os resultados finais da simulação.
@@ -498,6 +1053,40 @@ class SimulatedExchangeAPI(ExchangeAPI):
             'portfolio_over_time': self.portfolio_over_time
         }
 
+    def exportar_estado_conta(self) -> Dict[str, Any]:
+        """
+        Estado mutável da simulação (saldos por carteira, trades, histórico do
+        portfólio e cursor), sem os candles. Usado nos checkpoints do backtest.
+        """
+        return {
+            'saldo_usdt': self.saldo_usdt,
+            'saldo_ativo': self.saldo_ativo,
+            'saldos_por_carteira': {carteira: dict(saldos) for carteira, saldos in self.saldos_por_carteira.items()},
+            'alocacao_giro_pct': self.alocacao_giro_pct,
+            'trades_executados': list(self.trades_executados),
+            'portfolio': self.portfolio_over_time.exportar_estado(),
+            'indice_atual': self.indice_atual,
+            'barras_sem_eventos': self.barras_sem_eventos,
+        }
+
+    def restaurar_estado_conta(self, estado: Dict[str, Any]):
+        """
+        Aplica um estado de exportar_estado_conta() sobre os mesmos candles.
+
+        Args:
+            estado: Saída de exportar_estado_conta()
+        """
+        self.saldo_usdt = estado['saldo_usdt']
+        self.saldo_ativo = estado['saldo_ativo']
+        self.saldos_por_carteira = {carteira: dict(saldos) for carteira, saldos in estado['saldos_por_carteira'].items()}
+        self.alocacao_giro_pct = estado['alocacao_giro_pct']
+        self.trades_executados = list(estado['trades_executados'])
+        self.portfolio_over_time = HistoricoPortfolio.restaurar(
+            estado['portfolio'], self._timestamps_base_ms, self._closes_base
+        )
+        self.indice_atual = estado['indice_atual']
+        self.barras_sem_eventos = estado['barras_sem_eventos']
+
     def reconfigurar_alocacao_inicial(self, alocacao_giro_pct: float):
         """
         Reconfigura a alocação inicial entre carteiras durante a simulação.
@@ -522,38 +1111,99 @@ class SimulatedExchangeAPI(ExchangeAPI):
         except Exception as e:
             logger.error(f"❌ Erro ao reconfigurar alocação inicial: {e}")
 
+    def definir_contexto_numerico(self, contexto_numerico) -> None:
+        """
+        Informa o modo numérico do bot que opera esta conta.
+
+        Ordens e saldos continuam em Decimal em qualquer modo; no modo float
+        apenas o snapshot de cada barra é calculado em float.
+
+        Args:
+            contexto_numerico: ContextoNumerico do BotWorker
+        """
+        self.snapshots_em_float = not contexto_numerico.exato
+
     def record_snapshot(self, timestamp: Optional[str] = None):
         """
         Registra um snapshot do portfólio no momento atual da simulação.
 
         O snapshot contém: timestamp, saldo_usdt, saldo_ativo, valor_total_em_quote.
+        Só os saldos totais são guardados (ver HistoricoPortfolio); preço e
+        valor total saem do candle base no acesso.
+
+        Args:
+            timestamp: Timestamp do snapshot (padrão: o do último candle processado)
         """
         try:
-            # Obter preço atual da simulação (preço do último candle processado)
-            preco = Decimal(str(self.get_preco_atual(self._par_stub() if hasattr(self, '_par_stub') else 'ADA/USDT')))
+            # Preço atual da simulação: último candle processado (como get_preco_atual)
+            indice_preco = self.indice_atual if self.indice_atual == 0 else self.indice_atual - 1
+            indice_preco = min(indice_preco, self.total_barras - 1)
 
-            # Sumarizar saldos
+            saldo_usdt_total, saldo_ativo_total = self._saldos_totais()
+            self.portfolio_over_time.registrar(indice_preco, saldo_usdt_total, saldo_ativo_total, timestamp)
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao gravar snapshot do portfólio: {e}")
+
+    def _saldos_totais(self) -> Tuple[Any, Any]:
+        """(USDT, ativo) somados das carteiras, em float no modo numérico float."""
+        if self.snapshots_em_float:
+            saldo_usdt_total = 0.0
+            saldo_ativo_total = 0.0
+            for dados in self.saldos_por_carteira.values():
+                saldo_usdt_total += float(dados['saldo_usdt'])
+                saldo_ativo_total += float(dados['saldo_ativo'])
+        else:
+            # Sumarizar saldos (sempre Decimal nas carteiras)
             saldo_usdt_total = Decimal('0')
             saldo_ativo_total = Decimal('0')
-            for carteira, dados in self.saldos_por_carteira.items():
-                saldo_usdt_total += Decimal(str(dados.get('saldo_usdt', 0)))
-                saldo_ativo_total += Decimal(str(dados.get('saldo_ativo', 0)))
-
-            # Valor do ativo convertido para quote
-            valor_ativo_em_quote = saldo_ativo_total * preco
-            total_value_quote = float((saldo_usdt_total + valor_ativo_em_quote))
-
-            snap = {
-                'timestamp': timestamp or (self.dados.iloc[self.indice_atual - 1]['timestamp'] if self.indice_atual > 0 else None),
-                'saldo_usdt': float(saldo_usdt_total),
-                'saldo_ativo': float(saldo_ativo_total),
-                'preco': float(preco),
-                'total_value_quote': total_value_quote
-            }
+            for dados in self.saldos_por_carteira.values():
+                saldo_usdt_total += dados['saldo_usdt']
+                saldo_ativo_total += dados['saldo_ativo']
+        return saldo_usdt_total, saldo_ativo_total
 
-            self.portfolio_over_time.append(snap)
-        except Exception as e:
-            logger.warning(f"⚠️ Falha ao gravar snapshot do portfólio: {e}")
+    def avancar_sem_eventos(self, indice: int):
+        """
+        Avança o cursor até a barra 'indice' sem ciclo de decisão.
+
+        Usado pelo salto de barras ociosas do BotWorker: nas barras puladas
+        nenhum trade acontece, então os snapshots delas (um por barra, como
+        no loop normal) são gravados em bloco com os saldos atuais.
+
+        Args:
+            indice: Próxima barra a ser entregue por get_barra_atual
+        """
+        inicio = self.indice_atual
+        fim = min(indice, self.total_barras)
+        if fim <= inicio:
+            return
+
+        saldo_usdt_total, saldo_ativo_total = self._saldos_totais()
+        self.portfolio_over_time.registrar_sequencia(inicio, fim, saldo_usdt_total, saldo_ativo_total)
+        self.indice_atual = fim
+        self.barras_sem_eventos += fim - inicio
+
+        # Mesma liberação periódica de páginas de get_barra_atual
+        if ((fim - 1) & ~(BARRAS_LIBERACAO_PAGINAS - 1)) >= inicio:
+            liberar_paginas(self._timestamps_base_ms, self.store_base.valores)
+
+    def candles_visiveis(self, intervalo: str, inicio: int, fim: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Visão de um timeframe a partir das barras base [inicio, fim), sem
+        mover o cursor.
+
+        Args:
+            intervalo: Timeframe (ex: 15m)
+            inicio: Primeira barra base
+            fim: Barra base final (exclusiva)
+
+        Returns:
+            (candles visíveis em cada barra, o último em formação;
+             fechamento do candle em formação como obter_klines_array o
+             devolveria nessa barra: o da própria barra base)
+        """
+        store = self.obter_kline_store(intervalo)
+        visiveis = np.searchsorted(store.timestamps, self._timestamps_base_ms[inicio:fim], side='right')
+        return visiveis, self._closes_base[inicio:fim]
 
     def _par_stub(self):
         """Retorno auxiliar para compatibilidade com get_preco_atual assinatura (ignorado)."""
@@ -576,11 +1226,10 @@ class SimulatedExchangeAPI(ExchangeAPI):
         indice_a_usar = self.indice_atual if self.indice_atual == 0 else self.indice_atual - 1
         
         # Garantir que o índice não saia dos limites
-        if indice_a_usar >= len(self.dados):
-            indice_a_usar = len(self.dados) - 1
-            
-        barra_atual = self.dados.iloc[indice_a_usar]
-        return float(barra_atual['close'])
+        if indice_a_usar >= self.total_barras:
+            indice_a_usar = self.total_barras - 1
+
+        return float(self._closes_base[indice_a_usar])
 
     def get_info_conta(self):
         raise NotImplementedError
@@ -0,0 +1,286 @@
+"""
+Armazenamento - Backends plugáveis para o estado operacional do bot.
+
+O StateManager delega a leitura/escrita do estado a um backend:
+- ArmazenamentoEstadoJSON: arquivo JSON com escrita atômica (modo real),
+  com journal append-only para as alterações entre snapshots
+- ArmazenamentoEstadoMemoria: apenas em memória (backtest), sem I/O a cada
+  alteração; pode exportar o estado para disco ao final, se solicitado
+
+Para o banco de dados, o equivalente é DatabaseManager(..., em_memoria=True).
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def escrever_json_atomico(
+    caminho: Path,
+    dados: dict,
+    indent: Optional[int] = 2,
+    sincronizar: bool = False
+) -> None:
+    """
+    Escreve um dict em JSON usando escrita atômica (write + rename).
+
+    Args:
+        caminho: Arquivo de destino
+        dados: Conteúdo (serializável em JSON)
+        indent: Indentação do JSON (None = compacto)
+        sincronizar: os.fsync do arquivo e do diretório, para que o conteúdo
+            sobreviva a uma queda de energia (e não só ao fim do processo)
+    """
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = caminho.with_suffix(caminho.suffix + '.tmp')
+
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, indent=indent, ensure_ascii=False)
+        if sincronizar:
+            f.flush()
+            os.fsync(f.fileno())
+
+    # Rename atômico (sobrescreve o arquivo original)
+    temp_path.replace(caminho)
+    if sincronizar:
+        _sincronizar_diretorio(caminho.parent)
+
+
+def _sincronizar_diretorio(diretorio: Path) -> None:
+    """fsync do diretório (persiste o rename). Ignorado onde não é suportado (Windows)."""
+    try:
+        fd = os.open(diretorio, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class ArmazenamentoEstado(ABC):
+    """Interface de persistência do estado operacional."""
+
+    @abstractmethod
+    def carregar(self) -> dict:
+        """Retorna o estado persistido (dict vazio se não houver)."""
+
+    @abstractmethod
+    def salvar(self, estado: dict, sincronizar: bool = False) -> None:
+        """Persiste o estado completo (sincronizar=True: durável no disco, com fsync)."""
+
+    @property
+    @abstractmethod
+    def descricao(self) -> str:
+        """Descrição curta para logs e __repr__."""
+
+    # Journal de alterações entre flushes (apenas backends em arquivo)
+    suporta_journal = False
+
+    def anexar_journal(self, entrada: dict) -> None:
+        """Registra uma alteração ainda não consolidada no snapshot."""
+
+    def limpar_journal(self) -> None:
+        """Descarta o journal (após um snapshot completo)."""
+
+    def exportar(self, estado: dict, caminho: Path) -> None:
+        """
+        Grava o estado em um arquivo JSON (ex: ao final de um backtest).
+
+        Args:
+            estado: Estado atual
+            caminho: Arquivo de destino
+        """
+        escrever_json_atomico(Path(caminho), estado)
+        logger.info(f"💾 Estado exportado: {caminho}")
+
+
+class ArmazenamentoEstadoJSON(ArmazenamentoEstado):
+    """
+    Estado em arquivo JSON (snapshot) + journal append-only opcional.
+
+    O snapshot usa escrita atômica (write + rename) para evitar corrupção em
+    caso de interrupção durante a escrita. Entre snapshots, o StateManager
+    pode anexar as alterações ao journal (<estado>.json.journal, uma linha
+    JSON por alteração); ao carregar, o journal é reaplicado sobre o snapshot.
+    """
+
+    suporta_journal = True
+
+    def __init__(self, caminho: Path):
+        """
+        Args:
+            caminho: Caminho completo para o arquivo JSON de estado
+        """
+        self.caminho = Path(caminho)
+        self.caminho_journal = self.caminho.with_suffix(self.caminho.suffix + '.journal')
+        self._arquivo_journal = None
+
+        # Garante que o diretório existe
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def descricao(self) -> str:
+        return str(self.caminho)
+
+    def carregar(self) -> dict:
+        """
+        Carrega o estado do arquivo JSON.
+
+        Trata casos especiais:
+        - Arquivo não existe: cria estado vazio
+        - JSON corrompido: cria backup e reinicia estado
+        - Permissões: loga erro e continua com estado vazio
+        """
+        if not self.caminho.exists():
+            logger.info(f"📄 Arquivo de estado não encontrado. Criando novo: {self.caminho}")
+            estado = {}
+            if self._reaplicar_journal(estado):
+                logger.warning(f"⚠️ Snapshot ausente; estado reconstruído do journal ({len(estado)} chaves)")
+            self.salvar(estado)
+            self.limpar_journal()
+            return estado
+
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                estado = json.load(f)
+
+            logger.info(f"📖 Estado carregado: {len(estado)} chaves encontradas")
+
+            # Alterações que não chegaram ao snapshot (ex: crash entre flushes)
+            if self._reaplicar_journal(estado):
+                self.salvar(estado)
+                self.limpar_journal()
+            return estado
+
+        except json.JSONDecodeError:
+            # JSON corrompido - cria backup e reinicia
+            backup_path = self.caminho.with_suffix('.json.corrupted')
+            logger.error(f"❌ JSON corrompido! Criando backup em: {backup_path}")
+
+            try:
+                self.caminho.rename(backup_path)
+            except Exception as backup_error:
+                logger.error(f"Erro ao criar backup: {backup_error}")
+
+            # Recuperar o que houver no journal (melhor que perder tudo)
+            estado = {}
+            self._reaplicar_journal(estado)
+            self.salvar(estado)
+            self.limpar_journal()
+            return estado
+
+        except PermissionError as e:
+            logger.error(f"❌ Erro de permissão ao ler estado: {e}")
+            return {}
+
+        except Exception as e:
+            logger.error(f"❌ Erro inesperado ao carregar estado: {e}")
+            return {}
+
+    def _reaplicar_journal(self, estado: dict) -> int:
+        """
+        Aplica as entradas do journal sobre o estado carregado.
+
+        Uma última linha incompleta (crash no meio da escrita) é ignorada.
+
+        Returns:
+            Quantidade de entradas aplicadas
+        """
+        if not self.caminho_journal.exists():
+            return 0
+
+        aplicadas = 0
+        try:
+            with open(self.caminho_journal, 'r', encoding='utf-8') as f:
+                for linha in f:
+                    try:
+                        entrada = json.loads(linha)
+                    except json.JSONDecodeError:
+                        logger.warning("⚠️ Entrada incompleta no journal de estado ignorada")
+                        continue
+                    if entrada.get('op') == 'set':
+                        estado[entrada['k']] = entrada['v']
+                    elif entrada.get('op') == 'del':
+                        estado.pop(entrada['k'], None)
+                    elif entrada.get('op') == 'clear':
+                        estado.clear()
+                    aplicadas += 1
+        except Exception as e:
+            logger.error(f"❌ Erro ao reaplicar journal de estado: {e}")
+
+        if aplicadas:
+            logger.info(f"📜 Journal de estado reaplicado: {aplicadas} alterações")
+        return aplicadas
+
+    def anexar_journal(self, entrada: dict) -> None:
+        """
+        Anexa uma alteração ao journal (uma linha JSON, sem reescrever o snapshot).
+
+        A linha é entregue ao sistema operacional (flush), sem fsync: sobrevive
+        a um crash do processo, não a uma queda de energia. Por isso só
+        alterações não críticas passam pelo journal; as críticas vão direto
+        para um snapshot sincronizado (ver StateManager).
+        """
+        if self._arquivo_journal is None:
+            self._arquivo_journal = open(self.caminho_journal, 'a', encoding='utf-8')
+        self._arquivo_journal.write(json.dumps(entrada, ensure_ascii=False) + '\n')
+        self._arquivo_journal.flush()
+
+    def limpar_journal(self) -> None:
+        """Remove o journal (o snapshot já contém todas as alterações)."""
+        if self._arquivo_journal is not None:
+            self._arquivo_journal.close()
+            self._arquivo_journal = None
+        try:
+            self.caminho_journal.unlink()
+        except FileNotFoundError:
+            pass
+
+    def salvar(self, estado: dict, sincronizar: bool = False) -> None:
+        """Persiste o estado no arquivo JSON (escrita atômica, fsync se sincronizar)."""
+        try:
+            escrever_json_atomico(self.caminho, estado, sincronizar=sincronizar)
+
+        except PermissionError as e:
+            logger.error(f"❌ Erro de permissão ao salvar estado: {e}")
+            raise
+
+        except Exception as e:
+            logger.error(f"❌ Erro ao salvar estado: {e}")
+            raise
+
+
+class ArmazenamentoEstadoMemoria(ArmazenamentoEstado):
+    """
+    Estado apenas em memória (backtests).
+
+    salvar() não faz I/O: o StateManager já mantém o dict atualizado. Use
+    StateManager.exportar() para gravar o estado final em disco.
+    """
+
+    def __init__(self, estado_inicial: Optional[dict] = None):
+        """
+        Args:
+            estado_inicial: Estado de partida (opcional, é copiado)
+        """
+        self.estado_inicial = dict(estado_inicial) if estado_inicial else {}
+        self.total_salvamentos = 0
+
+    @property
+    def descricao(self) -> str:
+        return 'memória'
+
+    def carregar(self) -> dict:
+        return dict(self.estado_inicial)
+
+    def salvar(self, estado: dict, sincronizar: bool = False) -> None:
+        self.total_salvamentos += 1
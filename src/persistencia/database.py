@@ -9,35 +9,85 @@ from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
 from typing import Optional, Dict, List, Any
+import os
 import shutil
+import tempfile
+import threading
 from src.utils.logger import get_loggers
 from src.utils.conversoes import decimal_para_float
 
 logger, _ = get_loggers()
 
 
+@contextmanager
+def _arquivo_temporario_sqlite():
+    """Caminho de um arquivo temporário para o banco (removido ao sair)."""
+    fd, caminho = tempfile.mkstemp(prefix='bot_db_', suffix='.sqlite')
+    os.close(fd)
+    try:
+        yield caminho
+    finally:
+        os.unlink(caminho)
+
+
+def serializar_via_backup(conn: sqlite3.Connection) -> bytes:
+    """
+    Equivalente a conn.serialize() (Python 3.11+) para o Python 3.10: copia
+    o banco para um arquivo temporário com a API de backup e lê os bytes.
+    """
+    with _arquivo_temporario_sqlite() as caminho:
+        destino = sqlite3.connect(caminho)
+        try:
+            conn.backup(destino)
+        finally:
+            destino.close()
+        return Path(caminho).read_bytes()
+
+
+def restaurar_via_backup(conn: sqlite3.Connection, conteudo: bytes) -> None:
+    """Equivalente a conn.deserialize(conteudo) para o Python 3.10 (ver serializar_via_backup)."""
+    with _arquivo_temporario_sqlite() as caminho:
+        Path(caminho).write_bytes(conteudo)
+        origem = sqlite3.connect(caminho)
+        try:
+            origem.backup(conn)
+        finally:
+            origem.close()
+
+
 class DatabaseManager:
     """Gerencia todas as operações com o banco de dados SQLite."""
 
-    def __init__(self, db_path: Path, backup_dir: Path):
+    def __init__(self, db_path: Path, backup_dir: Path, em_memoria: bool = False):
         """
         Inicializa o gerenciador de banco de dados.
 
         Args:
             db_path: Caminho para o arquivo do banco de dados
             backup_dir: Diretório para backups
+            em_memoria: Usar um banco SQLite em memória (backtests). Nada é
+                gravado em disco; exportar() copia o banco para db_path se pedido.
         """
         self.db_path = db_path
         self.backup_dir = backup_dir
-        self.backup_dir.mkdir(parents=True, exist_ok=True)
-        
+        self.em_memoria = em_memoria
+
         # SQLite não permite compartilhar conexões entre threads
         # Usar sempre context manager para evitar problemas de thread
         self.conn = None
 
+        # Em memória: uma única conexão mantida aberta (o banco some ao fechá-la),
+        # serializada por lock no lugar de uma conexão nova por operação
+        self._conn_memoria: Optional[sqlite3.Connection] = None
+        self._lock_memoria = threading.RLock()
+        if em_memoria:
+            self._conn_memoria = sqlite3.connect(':memory:', check_same_thread=False)
+        else:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+
         # Criar banco e tabelas se não existirem
         self._criar_banco()
-        logger.info(f"✅ DatabaseManager inicializado: {db_path}")
+        logger.info(f"✅ DatabaseManager inicializado: {':memory:' if em_memoria else db_path}")
 
     def connect(self):
         """
@@ -45,6 +95,8 @@ class DatabaseManager:
         Mantido para compatibilidade, mas não recomendado.
         """
         logger.warning("⚠️ connect() deprecated: use context manager para thread safety")
+        if self._conn_memoria is not None:
+            return self._conn_memoria
         return sqlite3.connect(self.db_path)
     
     def close(self):
@@ -75,6 +127,20 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM ordens")
         """
+        if self._conn_memoria is not None:
+            with self._lock_memoria:
+                conn = self._conn_memoria
+                try:
+                    yield conn
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    # Conexão compartilhada: desfazer row_factory definido pelo chamador
+                    conn.row_factory = None
+            return
+
         conn = sqlite3.connect(self.db_path)
         try:
             yield conn
@@ -492,11 +558,67 @@ class DatabaseManager:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = self.backup_dir / f"trading_bot_backup_{timestamp}.db"
 
-        shutil.copy2(self.db_path, backup_path)
+        if self.em_memoria:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            self.exportar(backup_path)
+        else:
+            shutil.copy2(self.db_path, backup_path)
         logger.info(f"💾 Backup criado: {backup_path}")
 
         return str(backup_path)
 
+    def exportar(self, caminho: Optional[Path] = None) -> str:
+        """
+        Copia o banco inteiro para um arquivo SQLite (ex: ao final de um
+        backtest em memória). Usa a API de backup do SQLite.
+
+        Args:
+            caminho: Arquivo de destino (padrão: db_path)
+
+        Returns:
+            Caminho do arquivo gravado
+        """
+        destino_path = Path(caminho or self.db_path)
+        destino_path.parent.mkdir(parents=True, exist_ok=True)
+
+        destino = sqlite3.connect(destino_path)
+        try:
+            with self._conectar() as conn:
+                conn.backup(destino)
+        finally:
+            destino.close()
+
+        logger.info(f"💾 Banco exportado: {destino_path}")
+        return str(destino_path)
+
+    def serializar(self) -> bytes:
+        """
+        Conteúdo do banco no formato de arquivo SQLite, em bytes (ex: checkpoint
+        de um backtest em memória). Volta a ser um banco com restaurar_serializado().
+
+        Connection.serialize() só existe a partir do Python 3.11; antes disso
+        o banco passa por um arquivo temporário via API de backup (mesmos bytes).
+        """
+        with self._conectar() as conn:
+            if hasattr(conn, 'serialize'):
+                return conn.serialize()
+            return serializar_via_backup(conn)
+
+    def restaurar_serializado(self, conteudo: bytes) -> None:
+        """
+        Substitui o banco em memória pelo conteúdo de serializar().
+
+        Raises:
+            RuntimeError: Se o banco não estiver em memória
+        """
+        if self._conn_memoria is None:
+            raise RuntimeError("restaurar_serializado() só se aplica ao banco em memória")
+        with self._lock_memoria:
+            if hasattr(self._conn_memoria, 'deserialize'):
+                self._conn_memoria.deserialize(conteudo)
+            else:
+                restaurar_via_backup(self._conn_memoria, conteudo)
+
     def registrar_conversao_bnb(self, dados: Dict[str, Any]):
         """Registra uma conversão de USDT para BNB."""
         with self._conectar() as conn:
@@ -9,12 +9,14 @@ Data: 2025-10-14
 """
 
 import json
-import os
+import threading
+import time
 from pathlib import Path
-from typing import Any, Optional
-from datetime import datetime
+from typing import Any, Iterable, Optional
 import logging
 
+from src.persistencia.armazenamento import ArmazenamentoEstado, ArmazenamentoEstadoJSON
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,96 +27,174 @@ class StateManager:
     O estado é salvo imediatamente a cada alteração para garantir
     consistência mesmo em caso de interrupções (systemd restart, crashes, etc).
 
+    Com intervalo_flush_segundos > 0 as escritas são agrupadas: o snapshot
+    completo é gravado no máximo uma vez por intervalo (ou na hora, para
+    chaves críticas) e cada alteração intermediária vira uma linha no journal,
+    reaplicado na próxima inicialização se o bot cair antes do flush.
+
+    Alterações críticas e snapshots do agrupamento são gravados com fsync
+    (duráveis mesmo após queda de energia); o journal recebe apenas flush.
+
+    A persistência é delegada a um backend (ver src/persistencia/armazenamento.py):
+    arquivo JSON por padrão, ou memória nos backtests.
+
     Exemplos de uso:
         state = StateManager('dados/bot_state.json')
         state.set_state('ultima_compra_global_ts', datetime.now().isoformat())
         timestamp = state.get_state('ultima_compra_global_ts')
+
+        # Produção: no máximo 1 snapshot a cada 5s, stops gravados na hora
+        state = StateManager('dados/bot_state.json', intervalo_flush_segundos=5,
+                             chaves_criticas={'stops_ativos_persistentes'})
+
+        # Backtest: nenhum I/O por alteração (ArmazenamentoEstadoMemoria)
+        state = StateManager(armazenamento=ArmazenamentoEstadoMemoria())
     """
 
-    def __init__(self, state_file_path: str):
+    def __init__(
+        self,
+        state_file_path: Optional[str] = None,
+        armazenamento: Optional[ArmazenamentoEstado] = None,
+        intervalo_flush_segundos: float = 0.0,
+        chaves_criticas: Optional[Iterable[str]] = None
+    ):
         """
         Inicializa o StateManager com o caminho do arquivo JSON.
 
         Args:
             state_file_path: Caminho completo para o arquivo JSON de estado
+            armazenamento: Backend de persistência (padrão: JSON em state_file_path)
+            intervalo_flush_segundos: Intervalo mínimo entre snapshots completos.
+                0 = salvar a cada alteração (comportamento original). > 0 =
+                alterações agrupadas; entre snapshots vão para o journal.
+            chaves_criticas: Chaves que forçam snapshot imediato (ex: stops)
         """
-        self.state_file_path = Path(state_file_path)
+        if armazenamento is None:
+            if state_file_path is None:
+                raise ValueError("Informe state_file_path ou armazenamento")
+            armazenamento = ArmazenamentoEstadoJSON(Path(state_file_path))
+
+        self.armazenamento = armazenamento
+        self.state_file_path = Path(state_file_path) if state_file_path else None
         self.state: dict = {}
 
-        # Garante que o diretório existe
-        self.state_file_path.parent.mkdir(parents=True, exist_ok=True)
+        # Agrupamento de escritas (write-coalescing)
+        self.intervalo_flush_segundos = max(0.0, float(intervalo_flush_segundos or 0))
+        self.chaves_criticas = set(chaves_criticas or ())
+        self._chaves_sujas: set = set()
+        self._ultimo_flush = time.monotonic()
+        self._lock = threading.RLock()
+        self._metricas = {
+            'flushes': 0,
+            'alteracoes': 0,
+            'entradas_journal': 0,
+            'latencia_total_ms': 0.0,
+            'latencia_max_ms': 0.0,
+            'ultima_latencia_ms': 0.0,
+        }
 
         # Carrega estado existente ou cria novo
         self._load_state()
 
-        logger.info(f"✅ StateManager inicializado: {self.state_file_path}")
+        if self.coalescendo:
+            logger.info(
+                f"✅ StateManager inicializado: {self.armazenamento.descricao} "
+                f"(flush a cada {self.intervalo_flush_segundos:g}s, journal ativo)"
+            )
+        else:
+            logger.info(f"✅ StateManager inicializado: {self.armazenamento.descricao}")
 
-    def _load_state(self) -> None:
-        """
-        Carrega o estado do arquivo JSON.
+    @property
+    def coalescendo(self) -> bool:
+        """True se as escritas são agrupadas (intervalo > 0 e backend com journal)."""
+        return self.intervalo_flush_segundos > 0 and self.armazenamento.suporta_journal
 
-        Trata casos especiais:
-        - Arquivo não existe: cria estado vazio
-        - JSON corrompido: cria backup e reinicia estado
-        - Permissões: loga erro e continua com estado vazio
-        """
-        if not self.state_file_path.exists():
-            logger.info(f"📄 Arquivo de estado não encontrado. Criando novo: {self.state_file_path}")
-            self.state = {}
-            self._save_state()
-            return
-
-        try:
-            with open(self.state_file_path, 'r', encoding='utf-8') as f:
-                self.state = json.load(f)
+    @property
+    def tem_alteracoes_pendentes(self) -> bool:
+        """True se há alterações apenas no journal (ainda não no snapshot)."""
+        return bool(self._chaves_sujas)
 
-            logger.info(f"📖 Estado carregado: {len(self.state)} chaves encontradas")
-
-        except json.JSONDecodeError as e:
-            # JSON corrompido - cria backup e reinicia
-            backup_path = self.state_file_path.with_suffix('.json.corrupted')
-            logger.error(f"❌ JSON corrompido! Criando backup em: {backup_path}")
+    def _load_state(self) -> None:
+        """Carrega o estado do backend (arquivo ausente/corrompido tratado por ele)."""
+        self.state = self.armazenamento.carregar()
 
-            try:
-                self.state_file_path.rename(backup_path)
-            except Exception as backup_error:
-                logger.error(f"Erro ao criar backup: {backup_error}")
+    def _save_state(self, sincronizar: bool = False) -> None:
+        """Persiste o estado atual no backend (sincronizar=True: com fsync)."""
+        self.armazenamento.salvar(self.state, sincronizar=sincronizar)
 
-            self.state = {}
-            self._save_state()
+    def _registrar_alteracao(self, entrada: dict, critico: bool) -> None:
+        """
+        Persiste uma alteração: snapshot imediato (modo original, chave crítica
+        ou intervalo vencido) ou apenas uma linha no journal. Alterações
+        críticas nunca ficam só no journal: vão para um snapshot com fsync.
+        """
+        self._metricas['alteracoes'] += 1
 
-        except PermissionError as e:
-            logger.error(f"❌ Erro de permissão ao ler estado: {e}")
-            self.state = {}
+        if not self.coalescendo:
+            self._save_state(sincronizar=critico)
+            return
 
-        except Exception as e:
-            logger.error(f"❌ Erro inesperado ao carregar estado: {e}")
-            self.state = {}
+        with self._lock:
+            if 'k' in entrada:
+                self._chaves_sujas.add(entrada['k'])
+            if critico or time.monotonic() - self._ultimo_flush >= self.intervalo_flush_segundos:
+                self.flush()
+            else:
+                self.armazenamento.anexar_journal(entrada)
+                self._metricas['entradas_journal'] += 1
 
-    def _save_state(self) -> None:
+    def flush(self) -> None:
         """
-        Persiste o estado atual no arquivo JSON.
+        Grava o snapshot completo agora (com fsync) e descarta o journal.
 
-        Usa escrita atômica (write + rename) para evitar corrupção
-        em caso de interrupção durante a escrita.
+        Chamado automaticamente (chave crítica / intervalo vencido) e no
+        encerramento do bot. O fsync vem antes de apagar o journal, senão uma
+        queda de energia poderia perder os dois.
         """
-        try:
-            # Escreve em arquivo temporário primeiro
-            temp_path = self.state_file_path.with_suffix('.json.tmp')
-
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(self.state, f, indent=2, ensure_ascii=False)
+        with self._lock:
+            inicio = time.perf_counter()
+            self._save_state(sincronizar=True)
+            self.armazenamento.limpar_journal()
+            latencia_ms = (time.perf_counter() - inicio) * 1000
+
+            self._chaves_sujas.clear()
+            self._ultimo_flush = time.monotonic()
+            self._metricas['flushes'] += 1
+            self._metricas['latencia_total_ms'] += latencia_ms
+            self._metricas['ultima_latencia_ms'] = latencia_ms
+            self._metricas['latencia_max_ms'] = max(self._metricas['latencia_max_ms'], latencia_ms)
+
+    def flush_se_necessario(self) -> bool:
+        """
+        Grava o snapshot se houver alterações pendentes e o intervalo venceu.
+        Deve ser chamado periodicamente (ex: a cada ciclo do bot) para que o
+        journal não cresça quando não há novas alterações.
 
-            # Rename atômico (sobrescreve o arquivo original)
-            temp_path.replace(self.state_file_path)
+        Returns:
+            True se um flush foi feito
+        """
+        with self._lock:
+            if not self._chaves_sujas:
+                return False
+            if time.monotonic() - self._ultimo_flush < self.intervalo_flush_segundos:
+                return False
+            self.flush()
+            return True
 
-        except PermissionError as e:
-            logger.error(f"❌ Erro de permissão ao salvar estado: {e}")
-            raise
+    def obter_metricas(self) -> dict:
+        """
+        Métricas de persistência (flushes, latência, journal).
 
-        except Exception as e:
-            logger.error(f"❌ Erro ao salvar estado: {e}")
-            raise
+        Returns:
+            Dict com flushes, alteracoes, entradas_journal, chaves_pendentes,
+            latencia_media_ms, latencia_max_ms e ultima_latencia_ms
+        """
+        with self._lock:
+            metricas = dict(self._metricas)
+            metricas['chaves_pendentes'] = len(self._chaves_sujas)
+        flushes = metricas['flushes']
+        metricas['latencia_media_ms'] = metricas.pop('latencia_total_ms') / flushes if flushes else 0.0
+        return metricas
 
     def get_state(self, key: str, default: Any = None) -> Any:
         """
@@ -137,13 +217,16 @@ class StateManager:
 
         return value
 
-    def set_state(self, key: str, value: Any) -> None:
+    def set_state(self, key: str, value: Any, critico: Optional[bool] = None) -> None:
         """
-        Define um valor no estado e persiste imediatamente.
+        Define um valor no estado e persiste (imediatamente, ou via journal
+        quando as escritas são agrupadas).
 
         Args:
             key: Chave do estado
             value: Valor a armazenar (deve ser serializável em JSON)
+            critico: Força (True) ou dispensa (False) o snapshot imediato;
+                None = decidir por chaves_criticas
 
         Raises:
             TypeError: Se o valor não for serializável em JSON
@@ -159,7 +242,10 @@ class StateManager:
             raise TypeError(f"Valor não serializável em JSON: {type(value)}")
 
         self.state[key] = value
-        self._save_state()
+        self._registrar_alteracao(
+            {'op': 'set', 'k': key, 'v': value},
+            key in self.chaves_criticas if critico is None else critico
+        )
 
         logger.debug(f"💾 Estado salvo: {key} = {value}")
 
@@ -175,7 +261,7 @@ class StateManager:
         """
         if key in self.state:
             del self.state[key]
-            self._save_state()
+            self._registrar_alteracao({'op': 'del', 'k': key}, key in self.chaves_criticas)
             logger.debug(f"🗑️ Estado removido: {key}")
             return True
 
@@ -188,7 +274,7 @@ class StateManager:
         Remove todas as chaves e persiste estado vazio.
         """
         self.state = {}
-        self._save_state()
+        self._registrar_alteracao({'op': 'clear'}, critico=True)
         logger.warning("⚠️ Todo o estado foi limpo!")
 
     def get_all_state(self) -> dict:
@@ -200,6 +286,28 @@ class StateManager:
         """
         return self.state.copy()
 
+    def restaurar(self, estado: dict) -> None:
+        """
+        Substitui o estado inteiro e grava o snapshot (ex: ao retomar um
+        checkpoint de backtest).
+
+        Args:
+            estado: Estado completo (como em get_all_state())
+        """
+        with self._lock:
+            self.state = dict(estado)
+            self.flush()
+
+    def exportar(self, caminho: str) -> None:
+        """
+        Grava o estado atual em um arquivo JSON, independente do backend
+        (ex: estado final de um backtest em memória).
+
+        Args:
+            caminho: Arquivo de destino
+        """
+        self.armazenamento.exportar(self.state, Path(caminho))
+
     def __repr__(self) -> str:
         """Representação string do StateManager."""
-        return f"StateManager(file={self.state_file_path}, keys={len(self.state)})"
+        return f"StateManager(file={self.armazenamento.descricao}, keys={len(self.state)})"
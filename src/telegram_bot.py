@@ -140,6 +140,19 @@ class TelegramBot:
             f"- Cooldown Global Restante: {cooldown_global} min\n"
             f"- Degraus Bloqueados: {degraus_bloqueados if degraus_bloqueados else 'Nenhum'}\n"
         )
+
+        perfil_ciclo = status_dict.get('perfil_ciclo')
+        if perfil_ciclo:
+            message += (
+                f"\n**Perfil do Ciclo:** {perfil_ciclo['ciclos']} ciclos, "
+                f"{perfil_ciclo['media_ciclo_us'] / 1000:.2f} ms/ciclo\n"
+            )
+            for etapa in perfil_ciclo['etapas']:
+                if etapa['chamadas']:
+                    message += (
+                        f"- {etapa['etapa'].replace('_', ' ')}: {etapa['media_us'] / 1000:.2f} ms x {etapa['chamadas']} "
+                        f"({etapa['percentual']:.1f}%)\n"
+                    )
         return message
 
     async def _handle_bot_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE, command_name: str):
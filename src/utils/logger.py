@@ -7,13 +7,15 @@ Logger centralizado com suporte a:
 - Timestamps diferentes para console e arquivo
 - Cores no console
 - Sistema de ícones padronizado
+- Perfil de simulação (backtest): sem registros DEBUG/INFO no caminho quente
+  e eventos de trade num destino estruturado compacto
 """
 
 import logging
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from colorama import Fore, Style, init
 
 from .constants import Icones, LogConfig
@@ -52,6 +54,15 @@ class ColoredFormatter(logging.Formatter):
         return result
 
 
+class ContextFormatter(logging.Formatter):
+    """Formatter sem cores (adiciona context se não existir)"""
+
+    def format(self, record):
+        if not hasattr(record, 'context'):
+            record.context = ''
+        return super().format(record)
+
+
 class Logger:
     """
     Sistema de logging centralizado e configurável
@@ -148,12 +159,6 @@ class Logger:
         file_handler.setLevel(nivel)
 
         # Formatter customizado para arquivo (adiciona context se não existir)
-        class ContextFormatter(logging.Formatter):
-            def format(self, record):
-                if not hasattr(record, 'context'):
-                    record.context = ''
-                return super().format(record)
-
         formatter = ContextFormatter(formato, datefmt=formato_data)
         file_handler.setFormatter(formatter)
 
@@ -162,30 +167,36 @@ class Logger:
     # ═══════════════════════════════════════════════════════════
     # MÉTODOS DE LOG BÁSICOS
     # ═══════════════════════════════════════════════════════════
+    # Argumentos extras seguem o estilo do logging ('%.2f', valor): a
+    # mensagem só é formatada se o registro passar do nível do logger
 
-    def debug(self, mensagem: str):
+    def isEnabledFor(self, nivel: int) -> bool:
+        """Se um registro deste nível seria emitido (mesma API do logging)"""
+        return self.logger.isEnabledFor(nivel)
+
+    def debug(self, mensagem: str, *args, **kwargs):
         """Log nível DEBUG"""
-        self.logger.debug(mensagem)
+        self.logger.debug(mensagem, *args, **kwargs)
 
-    def info(self, mensagem: str):
+    def info(self, mensagem: str, *args, **kwargs):
         """Log nível INFO"""
-        self.logger.info(mensagem)
+        self.logger.info(mensagem, *args, **kwargs)
 
-    def warning(self, mensagem: str):
+    def warning(self, mensagem: str, *args, **kwargs):
         """Log nível WARNING"""
-        self.logger.warning(mensagem)
+        self.logger.warning(mensagem, *args, **kwargs)
 
-    def error(self, mensagem: str, exc_info: bool = False):
+    def error(self, mensagem: str, *args, exc_info: bool = False, **kwargs):
         """Log nível ERROR"""
-        self.logger.error(mensagem, exc_info=exc_info)
+        self.logger.error(mensagem, *args, exc_info=exc_info, **kwargs)
 
-    def critical(self, mensagem: str):
+    def critical(self, mensagem: str, *args, **kwargs):
         """Log nível CRITICAL"""
-        self.logger.critical(mensagem)
+        self.logger.critical(mensagem, *args, **kwargs)
 
-    def exception(self, mensagem: str):
+    def exception(self, mensagem: str, *args, **kwargs):
         """Log exceção com traceback"""
-        self.logger.exception(mensagem)
+        self.logger.exception(mensagem, *args, **kwargs)
 
     # ═══════════════════════════════════════════════════════════
     # MÉTODOS ESPECIALIZADOS COM ÍCONES
@@ -369,6 +380,96 @@ def get_loggers(
     return _bot_logger_global, _panel_logger_global
 
 
+# ═══════════════════════════════════════════════════════════════════
+# PERFIL DE SIMULAÇÃO
+# ═══════════════════════════════════════════════════════════════════
+
+class SinkEventosTrade:
+    """
+    Destino compacto dos eventos de trade no perfil de simulação.
+
+    Cada evento é uma tupla (sem formatação de texto nem LogRecord); os dicts
+    só são montados quando os eventos são lidos.
+    """
+
+    CAMPOS = ('timestamp', 'tipo', 'carteira', 'preco', 'quantidade', 'meta', 'lucro_usdt', 'observacao')
+
+    def __init__(self):
+        self._eventos: List[Tuple] = []
+
+    def registrar(self, timestamp, tipo: str, carteira: str, preco, quantidade,
+                  meta: Optional[str] = None, lucro_usdt=None, observacao: Optional[str] = None):
+        """Guarda um evento de trade (valores como recebidos, sem conversão)"""
+        self._eventos.append((timestamp, tipo, carteira, preco, quantidade, meta, lucro_usdt, observacao))
+
+    def obter_eventos(self) -> List[Dict[str, Any]]:
+        """Eventos como dicts na ordem em que ocorreram"""
+        return [dict(zip(self.CAMPOS, evento)) for evento in self._eventos]
+
+    def __len__(self) -> int:
+        return len(self._eventos)
+
+
+class PerfilLogSimulacao:
+    """
+    Perfil de logging para o loop de simulação (backtest).
+
+    Enquanto ativo:
+    - O nível do logger principal sobe para `nivel` (padrão WARNING): chamadas
+      debug/info são descartadas em isEnabledFor, antes de criar o LogRecord e
+      de formatar argumentos no estilo '%s' (f-strings no chamador ainda são
+      avaliadas; no caminho quente use argumentos ou isEnabledFor)
+    - O console usa ContextFormatter (sem cores)
+    - Eventos de trade vão para `eventos` (SinkEventosTrade) em vez do log
+
+    Uso:
+        perfil = PerfilLogSimulacao()
+        eventos = perfil.ativar()
+        ...
+        perfil.desativar()
+
+    ou como context manager (`with PerfilLogSimulacao() as eventos:`).
+    Nunca abaixa um nível já mais alto (ex: silenciar_logs_simulacao(ERROR)).
+    """
+
+    def __init__(self, nivel: int = logging.WARNING):
+        self.nivel = nivel
+        self.eventos = SinkEventosTrade()
+        self._nivel_anterior: Optional[int] = None
+        self._formatters_anteriores: List[Tuple[logging.Handler, logging.Formatter]] = []
+
+    def ativar(self) -> SinkEventosTrade:
+        """Aplica o perfil e devolve o destino dos eventos de trade"""
+        logger = get_loggers()[0].logger
+        self._nivel_anterior = logger.level
+        logger.setLevel(max(logger.level, self.nivel))
+
+        self._formatters_anteriores = []
+        for handler in logger.handlers:
+            formatter = handler.formatter
+            if isinstance(formatter, ColoredFormatter):
+                self._formatters_anteriores.append((handler, formatter))
+                handler.setFormatter(ContextFormatter(formatter._fmt, datefmt=formatter.datefmt))
+        return self.eventos
+
+    def desativar(self):
+        """Restaura nível e formatters anteriores"""
+        if self._nivel_anterior is None:
+            return
+        get_loggers()[0].logger.setLevel(self._nivel_anterior)
+        for handler, formatter in self._formatters_anteriores:
+            handler.setFormatter(formatter)
+        self._nivel_anterior = None
+        self._formatters_anteriores = []
+
+    def __enter__(self) -> SinkEventosTrade:
+        return self.ativar()
+
+    def __exit__(self, *exc):
+        self.desativar()
+        return False
+
+
 def reset_loggers():
     """Reseta os loggers globais (útil para testes)"""
     global _bot_logger_global, _panel_logger_global
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Teste: Análise vetorizada de trades e da curva de patrimônio
+============================================================
+
+PROBLEMA ORIGINAL:
+- O relatório do backtest percorria os trades como lista de dicts: FIFO com
+  listas de Decimal e um list comprehension (ou sum) por estatística
+- Nenhuma métrica de risco além do retorno (sem drawdown, Sharpe/Sortino,
+  tempo exposto ou giro no relatório)
+
+CORREÇÃO:
+- src/backtest/analise_resultados.py monta os trades em colunas NumPy uma vez;
+  emparelhamento FIFO vetorizado por carteira e lucro por motivo de saída
+- Métricas da curva: drawdown, tempo submerso, Sharpe/Sortino diários,
+  tempo exposto e giro; seção "Risco e Exposição" no relatório
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.analise_resultados import (
+    analisar_curva,
+    analisar_resultados,
+    analisar_saidas,
+    calcular_sharpe_sortino,
+    colunas_curva,
+    retornos_diarios,
+)
+from src.backtest.executor import executar_simulacao, silenciar_logs_simulacao
+from src.core.tabela_trades import CATEGORIAS_SAIDA, TabelaTrades, categorizar_motivo, resumir_trades
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+MOTIVOS = ['Stop Loss acionado', 'Trailing Stop (TSL) atingido', 'Meta de lucro 2%', 'venda parcial', None, 'manual']
+
+
+def _fifo_referencia(trades):
+    """FIFO em Python puro, como o relatório fazia antes."""
+    saidas = {nome: {'count': 0, 'lucros': []} for nome in CATEGORIAS_SAIDA}
+    abertas = {}
+    for trade in trades:
+        carteira = trade.get('carteira', 'giro_rapido')
+        if trade['side'] == 'BUY':
+            abertas.setdefault(carteira, []).append(trade['quantidade_usdt'])
+        elif trade['side'] == 'SELL':
+            categoria = CATEGORIAS_SAIDA[categorizar_motivo(trade.get('motivo'))]
+            saidas[categoria]['count'] += 1
+            if abertas.get(carteira):
+                saidas[categoria]['lucros'].append(trade['receita_usdt'] - abertas[carteira].pop(0))
+    return saidas
+
+
+def _trades_aleatorios(rng, n):
+    trades = []
+    for _ in range(n):
+        carteira = ['acumulacao', 'giro_rapido', None][rng.integers(3)]
+        if rng.random() < 0.5:
+            trade = {'side': 'BUY', 'quantidade_usdt': float(rng.uniform(5, 50)), 'fee': 0.01}
+        else:
+            trade = {'side': 'SELL', 'receita_usdt': float(rng.uniform(5, 50)), 'fee': 0.02,
+                     'motivo': MOTIVOS[rng.integers(len(MOTIVOS))]}
+        if carteira:
+            trade['carteira'] = carteira
+        trades.append(trade)
+    return trades
+
+
+def test_fifo_vetorizado():
+    """Mesmo emparelhamento do FIFO em Python, com vendas sem compra e várias carteiras."""
+    print("=" * 80)
+    print("🧪 TESTE: FIFO vetorizado por carteira")
+    print("=" * 80)
+
+    rng = np.random.default_rng(21)
+    for n in [0, 1, 7, 300, 2000]:
+        trades = _trades_aleatorios(rng, n)
+        saidas = analisar_saidas(TabelaTrades(trades))
+        referencia = _fifo_referencia(trades)
+        for nome in CATEGORIAS_SAIDA:
+            assert saidas[nome]['count'] == referencia[nome]['count'], (n, nome)
+            assert np.allclose(saidas[nome]['lucro_lista'], referencia[nome]['lucros']), (n, nome)
+            assert np.isclose(saidas[nome]['lucro_total'], sum(referencia[nome]['lucros'])), (n, nome)
+            assert len(saidas[nome]['trades']) == saidas[nome]['count']
+
+    # Venda antes de qualquer compra não consome a compra seguinte
+    trades = [
+        {'side': 'SELL', 'receita_usdt': 9.0, 'motivo': 'Stop Loss'},
+        {'side': 'BUY', 'quantidade_usdt': 10.0},
+        {'side': 'BUY', 'quantidade_usdt': 20.0, 'carteira': 'acumulacao'},
+        {'side': 'SELL', 'receita_usdt': 12.0, 'motivo': 'Meta de lucro'},
+        {'side': 'SELL', 'receita_usdt': 18.0, 'motivo': 'Trailing stop', 'carteira': 'acumulacao'},
+    ]
+    saidas = analisar_saidas(TabelaTrades(trades))
+    assert saidas['Stop Loss (SL)']['count'] == 1 and saidas['Stop Loss (SL)']['lucro_lista'] == []
+    assert saidas['Meta de Lucro']['lucro_lista'] == [2.0]
+    assert saidas['Trailing Stop Loss (TSL)']['lucro_lista'] == [-2.0]
+
+    resumo = resumir_trades(TabelaTrades(trades))
+    assert (resumo['compras'], resumo['vendas'], resumo['total_trades']) == (2, 3, 5)
+    assert resumo['volume_comprado'] == 30.0 and resumo['volume_vendido'] == 39.0
+
+    print("   ✅ Vendas emparelhadas como no FIFO em Python")
+
+
+def test_metricas_da_curva():
+    """Retornos diários, Sharpe/Sortino, exposição e giro numa curva montada à mão."""
+    print("=" * 80)
+    print("🧪 TESTE: Métricas da curva de patrimônio")
+    print("=" * 80)
+
+    dia = 86_400_000
+    # Dois pontos por dia; vale o último de cada dia
+    timestamps = np.repeat(np.arange(4, dtype=np.int64) * dia, 2) + np.tile([0, dia // 2], 4)
+    valores = np.array([100, 101, 104, 110, 108, 99, 103, 121], dtype=np.float64)
+    retornos = retornos_diarios(valores, timestamps)
+    assert np.allclose(retornos, [0.01, 110 / 101 - 1, 99 / 110 - 1, 121 / 99 - 1])
+
+    razoes = calcular_sharpe_sortino(retornos)
+    assert np.isclose(razoes['sharpe'], retornos.mean() / retornos.std(ddof=1) * np.sqrt(365))
+    assert np.isclose(razoes['sortino'], retornos.mean() / np.sqrt(np.mean(np.minimum(retornos, 0) ** 2)) * np.sqrt(365))
+    assert calcular_sharpe_sortino(np.array([0.01])) == {'sharpe': None, 'sortino': None}
+    assert calcular_sharpe_sortino(np.array([0.01, 0.02]))['sortino'] is None
+
+    snapshots = [
+        {'timestamp': pd.Timestamp(int(ts), unit='ms'), 'total_value_quote': v, 'saldo_ativo': 1.0 if i % 2 else 0.0}
+        for i, (ts, v) in enumerate(zip(timestamps, valores))
+    ]
+    curva = analisar_curva(snapshots, volume_negociado=valores.mean() * 3)
+    assert np.isclose(curva['drawdown_max_pct'], 10.0)
+    assert curva['exposicao_pct'] == 50.0
+    assert np.isclose(curva['giro_carteira'], 3.0)
+    assert np.isclose(curva['sharpe'], razoes['sharpe'])
+
+    print(f"   ✅ Sharpe {razoes['sharpe']:.2f} | Sortino {razoes['sortino']:.2f}")
+
+
+def test_simulacao_real():
+    """Colunas do HistoricoPortfolio iguais às dos snapshots; resumo igual ao dos dicts."""
+    print("=" * 80)
+    print("🧪 TESTE: Análise de uma simulação")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    rng = np.random.default_rng(4)
+    n_barras = 3 * 1440
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.003, n_barras)))).round(6)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = Path(tmp) / 'analise_1m.csv'
+        pd.DataFrame({
+            'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+            'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+            'volume': np.ones(n_barras),
+        }).to_csv(caminho, index=False)
+        resultados = executar_simulacao(config, SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m'), ['ambas'])
+
+    trades = resultados['trades']
+    historico = resultados['portfolio_over_time']
+    assert len(trades) > 0
+
+    compactas = colunas_curva(historico)
+    snapshots = colunas_curva(list(historico))
+    for compacta, snapshot in zip(compactas, snapshots):
+        assert np.allclose(compacta, snapshot)
+
+    analise = analisar_resultados(resultados)
+    assert analise['trades']['compras'] == sum(t['side'] == 'BUY' for t in trades)
+    assert np.isclose(analise['trades']['taxas_usdt'], sum(float(t['fee']) for t in trades))
+    vendas = sum(t['side'] == 'SELL' for t in trades)
+    assert sum(info['count'] for info in analise['saidas'].values()) == vendas
+    assert 0 < analise['curva']['exposicao_pct'] <= 100
+
+    print(f"   ✅ {len(trades)} trades | exposto {analise['curva']['exposicao_pct']:.1f}% | "
+          f"DD {analise['curva']['drawdown_max_pct']:.2f}%")
+
+
+if __name__ == '__main__':
+    test_fifo_vetorizado()
+    test_metricas_da_curva()
+    test_simulacao_real()
+    print("\n✅ Todos os testes passaram!")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Teste: Suíte de benchmarks do backtest
+======================================
+
+PROBLEMA ORIGINAL:
+- Não havia forma reproduzível de medir a velocidade do backtest, só
+  scripts avulsos; regressões de desempenho passavam despercebidas
+
+CORREÇÃO:
+- benchmarks/ mede os componentes quentes e o BotWorker.run completo sobre
+  dados GBM sintéticos, grava JSON com informações da máquina e compara
+  com uma baseline acusando regressões
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.comparacao import comparar_resultados
+from benchmarks.dados_sinteticos import gerar_ohlcv_gbm
+from benchmarks.suite import carregar_resultados, executar_suite, salvar_resultados
+
+
+def _relatorio(tempos: dict, processador: str = 'cpu') -> dict:
+    return {
+        'versao': 1,
+        'maquina': {'processador': processador, 'nucleos': 4, 'python': '3.11', 'numpy': '2', 'pandas': '3'},
+        'resultados': {nome: {'us_por_operacao': us} for nome, us in tempos.items()},
+    }
+
+
+def test_gbm_consistente_e_reproduzivel():
+    """Candles com low <= open/close <= high e mesma semente = mesmos dados."""
+    print("=" * 80)
+    print("🧪 TESTE: Dados GBM sintéticos")
+    print("=" * 80)
+
+    df = gerar_ohlcv_gbm(5000, seed=7)
+    assert len(df) == 5000
+    assert list(df.columns) == ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+    assert (df['low'] <= df[['open', 'close']].min(axis=1)).all()
+    assert (df['high'] >= df[['open', 'close']].max(axis=1)).all()
+    assert (df['close'] > 0).all()
+
+    assert gerar_ohlcv_gbm(5000, seed=7).equals(df)
+    assert not np.array_equal(gerar_ohlcv_gbm(5000, seed=8)['close'].values, df['close'].values)
+
+    print("   ✅ Candles consistentes e reproduzíveis pela semente")
+
+
+def test_comparacao_com_baseline():
+    """Regressão, melhora, estável, novos/ausentes e aviso de máquina diferente."""
+    print("=" * 80)
+    print("🧪 TESTE: Comparação com baseline")
+    print("=" * 80)
+
+    baseline = _relatorio({'lento': 10.0, 'rapido': 10.0, 'igual': 10.0, 'removido': 5.0})
+    atual = _relatorio({'lento': 12.0, 'rapido': 5.0, 'igual': 10.5, 'novo': 1.0}, processador='outra')
+
+    comparacao = comparar_resultados(baseline, atual, tolerancia=0.15)
+    situacoes = {linha['nome']: linha['situacao'] for linha in comparacao['linhas']}
+    assert situacoes == {
+        'lento': 'regressao', 'rapido': 'melhora', 'igual': 'estavel',
+        'removido': 'ausente', 'novo': 'novo',
+    }, situacoes
+    assert comparacao['regressoes'] == ['lento']
+    assert comparacao['maquina_diferente'] == ['processador']
+
+    # Com tolerância maior, a piora de 20% deixa de ser regressão
+    assert comparar_resultados(baseline, atual, tolerancia=0.25)['regressoes'] == []
+
+    print("   ✅ Situações classificadas e regressão acusada só acima da tolerância")
+
+
+def test_suite_reduzida_gera_json():
+    """Suíte pequena roda offline e o JSON salvo volta igual."""
+    print("=" * 80)
+    print("🧪 TESTE: Suíte reduzida e JSON de resultados")
+    print("=" * 80)
+
+    operacoes = {'obter_klines': 50, 'get_rsi': 50, 'ciclo_decisao': 50, 'registrar_ordem': 20, 'set_state': 20}
+    relatorio = executar_suite(barras=[2000], repeticoes=1, operacoes=operacoes, progresso=lambda _: None)
+
+    esperados = {
+        'obter_klines', 'get_rsi', 'ciclo_decisao', 'registrar_ordem_memoria', 'registrar_ordem_arquivo',
+        'set_state_memoria', 'set_state_arquivo', 'bot_run_2k',
+        'ciclo_log_padrao', 'ciclo_log_simulacao',
+    }
+    assert set(relatorio['resultados']) == esperados, set(relatorio['resultados'])
+    for nome, medicao in relatorio['resultados'].items():
+        assert medicao['segundos'] > 0, nome
+        assert medicao['us_por_operacao'] > 0, nome
+    assert relatorio['resultados']['bot_run_2k']['operacoes'] == 2000
+    assert 'fracao_logging_pct' in relatorio['resultados']['ciclo_log_padrao']
+    assert 'python' in relatorio['maquina']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = salvar_resultados(relatorio, Path(tmp) / 'sub' / 'resultado.json')
+        assert carregar_resultados(caminho) == relatorio
+
+    comparacao = comparar_resultados(relatorio, relatorio)
+    assert comparacao['regressoes'] == [] and comparacao['maquina_diferente'] == []
+
+    print(f"   ✅ {len(esperados)} benchmarks medidos e JSON salvo/carregado")
+
+
+if __name__ == '__main__':
+    test_gbm_consistente_e_reproduzivel()
+    test_comparacao_com_baseline()
+    test_suite_reduzida_gera_json()
+    print("\n✅ Todos os testes passaram!")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Teste: Cache binário dos CSVs históricos
+========================================
+
+FUNCIONALIDADE:
+- carregar_historico() converte o CSV para um bundle NumPy na primeira
+  leitura e serve as leituras seguintes a partir dele
+- O DataFrame do cache é idêntico ao lido do CSV
+- Mudança de conteúdo invalida o cache; só mudar o mtime não
+- Simulador e benchmark compartilham os mesmos arrays (memmap) no processo
+- Resamples do simulador persistidos no bundle e invalidados junto com o CSV
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.exchange.historico_cache import (
+    carregar_historico,
+    carregar_store_historico,
+    carregar_store_resampleado,
+    diretorio_cache,
+    diretorio_resample,
+    ler_csv_historico,
+    limpar_cache_historico,
+)
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+
+def _criar_csv(caminho: Path, n_barras: int = 2000, semente: int = 3) -> Path:
+    rng = np.random.default_rng(semente)
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.003, n_barras)))).round(6)
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+        'volume': np.ones(n_barras),
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def test_cache_criado_e_reaproveitado():
+    """Primeira leitura grava o bundle; a seguinte é servida por ele, sem diferenças."""
+    print("=" * 80)
+    print("🧪 TESTE: Criação e leitura do cache binário")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp) / 'ada_1m.csv')
+        limpar_cache_historico()
+
+        primeiro = carregar_historico(str(caminho))
+        assert (diretorio_cache(str(caminho)) / 'meta.json').exists()
+
+        limpar_cache_historico()
+        do_cache = carregar_historico(str(caminho))
+        assert do_cache is not primeiro
+        pd.testing.assert_frame_equal(do_cache, ler_csv_historico(str(caminho)))
+
+        assert carregar_historico(str(caminho)) is do_cache, "Segunda chamada no processo deve reaproveitar"
+        limpar_cache_historico()
+
+    print("   ✅ Bundle NumPy idêntico ao CSV")
+
+
+def test_invalidacao():
+    """Conteúdo novo reconstrói o cache; só tocar no arquivo mantém."""
+    print("=" * 80)
+    print("🧪 TESTE: Invalidação por conteúdo e mtime")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp) / 'ada_1m.csv')
+        limpar_cache_historico()
+        carregar_historico(str(caminho))
+
+        # Mesmo conteúdo, mtime diferente: cache continua válido
+        info = caminho.stat()
+        os.utime(caminho, ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+        limpar_cache_historico()
+        pd.testing.assert_frame_equal(carregar_historico(str(caminho)), ler_csv_historico(str(caminho)))
+
+        # Conteúdo diferente: cache reconstruído
+        _criar_csv(caminho, n_barras=1500, semente=9)
+        novo = carregar_historico(str(caminho))
+        assert len(novo) == 1500
+        pd.testing.assert_frame_equal(novo, ler_csv_historico(str(caminho)))
+
+        limpar_cache_historico()
+        assert len(carregar_historico(str(caminho))) == 1500
+        limpar_cache_historico(str(caminho))
+        assert not diretorio_cache(str(caminho)).exists()
+
+    print("   ✅ Cache invalidado só quando o conteúdo muda")
+
+
+def test_simulador_usa_memmap():
+    """SimulatedExchangeAPI lê os candles mapeados, sem montar DataFrames."""
+    print("=" * 80)
+    print("🧪 TESTE: Dataset mapeado e compartilhado no processo")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp) / 'ada_1m.csv')
+        limpar_cache_historico()
+
+        api = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m')
+        api.obter_kline_store('1h')
+        assert isinstance(api.store_base.valores.base, np.memmap)
+        assert api._dados_completos is None, "DataFrame base não deve ser montado"
+        assert np.shares_memory(carregar_store_historico(str(caminho)).valores, api.store_base.valores)
+        assert api.total_barras == 2000
+
+        # Compatibilidade: DataFrames continuam disponíveis sob demanda
+        pd.testing.assert_frame_equal(api.dados_completos, ler_csv_historico(str(caminho)), check_index_type=False)
+        assert len(api.dados_resampled['1h']) == len(api.obter_kline_store('1h'))
+        limpar_cache_historico()
+
+    print("   ✅ Um único mapeamento por processo")
+
+
+def test_resamples_persistidos():
+    """Resample gravado na primeira simulação, lido do disco nas seguintes e refeito se o CSV mudar."""
+    print("=" * 80)
+    print("🧪 TESTE: Cache persistente de resamples")
+    print("=" * 80)
+
+    hora_ms = 3_600_000
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp) / 'ada_1m.csv')
+        limpar_cache_historico()
+
+        api = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m')
+        store_1h = api.obter_kline_store('1h')
+        assert (diretorio_resample(str(caminho), hora_ms) / 'meta.json').exists()
+        esperado = carregar_store_historico(str(caminho)).resamplear(hora_ms)
+        assert np.array_equal(store_1h.timestamps, esperado.timestamps)
+        assert np.array_equal(store_1h.valores, esperado.valores)
+
+        # Outra execução (memória do processo limpa): lido do disco com memmap
+        limpar_cache_historico()
+        outra = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m').obter_kline_store('1h')
+        assert isinstance(outra.valores.base, np.memmap)
+        assert np.array_equal(outra.valores, esperado.valores)
+
+        # Fatias do walk-forward não gravam resamples da janela
+        janela = api.fatiar(pd.Timestamp('2024-01-01 10:00'), pd.Timestamp('2024-01-01 20:00'))
+        janela.obter_kline_store('4h')
+        assert not diretorio_resample(str(caminho), 4 * hora_ms).exists()
+
+        # CSV novo: bundle reconstruído e resample refeito com os dados novos
+        _criar_csv(caminho, n_barras=1500, semente=9)
+        novo = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m').obter_kline_store('1h')
+        esperado = ler_csv_historico(str(caminho)).resample('1h').agg({'close': 'last'})
+        assert np.array_equal(novo.close, esperado['close'].to_numpy())
+        assert np.array_equal(carregar_store_resampleado(str(caminho), hora_ms).close, novo.close)
+        limpar_cache_historico(str(caminho))
+
+    print("   ✅ Resamples reaproveitados entre execuções e invalidados com o CSV")
+
+
+if __name__ == '__main__':
+    test_cache_criado_e_reaproveitado()
+    test_invalidacao()
+    test_simulador_usa_memmap()
+    test_resamples_persistidos()
+    print("\n✅ Todos os testes passaram!")
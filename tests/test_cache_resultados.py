@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Teste: Cache de resultados do backtest
+======================================
+
+PROBLEMA ORIGINAL:
+- No laboratório a mesma configuração (mesmo JSON, CSV, timeframe, taxa e
+  saldo) era simulada de novo a cada execução, e o sweep re-simulava pontos
+  da grade já vistos
+
+CORREÇÃO:
+- CacheResultados (src/backtest/cache_resultados.py) calcula uma impressão
+  digital da config canônica, do sha256 do CSV e da versão do motor
+- Execução repetida devolve trades, saldos e portfolio_over_time do disco
+- Diretório com limite de tamanho (LRU); backtest.py --no-cache desativa
+- Execução interrompida (Ctrl+C ou erro no meio) não vai para o cache
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.cache_resultados import CacheResultados
+from src.backtest.executor import ERRO_SIMULACAO_INCOMPLETA, executar_simulacao, silenciar_logs_simulacao
+from src.backtest.sweep import avaliar_combinacao
+from src.core.bot_worker import BotWorker
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+
+def _criar_csv(diretorio: Path, n_barras: int = 3 * 1440) -> Path:
+    rng = np.random.default_rng(17)
+    # Queda e recuperação: gera compras do DCA e vendas
+    tendencia = np.concatenate([np.full(n_barras // 2, -0.0002), np.full(n_barras - n_barras // 2, 0.0003)])
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.003, n_barras) + tendencia))).round(6)
+    caminho = diretorio / 'cache_1m.csv'
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+        'volume': np.ones(n_barras),
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def _config() -> dict:
+    return json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+
+
+def test_impressao_digital():
+    """Estável para caminhos temporários e 30 x 30.0; muda com parâmetro, saldo, taxa e estratégias."""
+    print("=" * 80)
+    print("🧪 TESTE: Impressão digital da execução")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp))
+        cache = CacheResultados(str(caminho))
+        api = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m')
+
+        base = _config()
+        impressao = cache.impressao_digital(base, api, ['ambas'])
+
+        equivalente = _config()
+        equivalente['DATABASE_PATH'] = '/tmp/outro/backtest.db'
+        equivalente['PERFIL_CICLO_DECISAO'] = True
+        equivalente['_comentario_novo'] = 'não afeta a simulação'
+        equivalente['estrategia_giro_rapido']['rsi_limite_compra'] = float(base['estrategia_giro_rapido']['rsi_limite_compra'])
+        assert cache.impressao_digital(equivalente, api.clonar(), ['ambas']) == impressao
+
+        alterada = _config()
+        alterada['estrategia_giro_rapido']['rsi_limite_compra'] += 1
+        impressoes = {
+            cache.impressao_digital(alterada, api, ['ambas']),
+            cache.impressao_digital(base, api.clonar(saldo_inicial=2000), ['ambas']),
+            cache.impressao_digital(base, api.clonar(taxa_pct=0.075), ['ambas']),
+            cache.impressao_digital(base, api, ['dca']),
+        }
+        assert len(impressoes) == 4 and impressao not in impressoes
+
+        # Mesmo conteúdo de CSV em outro arquivo: mesma impressão
+        copia = Path(tmp) / 'copia' / 'cache_1m.csv'
+        copia.parent.mkdir()
+        copia.write_bytes(caminho.read_bytes())
+        cache_copia = CacheResultados(str(copia))
+        api_copia = SimulatedExchangeAPI(str(copia), 1000, 0.1, '1m')
+        assert cache_copia.impressao_digital(base, api_copia, ['ambas']) == impressao
+
+    print("   ✅ Impressão ignora o que não muda o resultado e separa o que muda")
+
+
+def test_resultado_reaproveitado():
+    """Acerto devolve os mesmos trades, saldos, curva de patrimônio e extras."""
+    print("=" * 80)
+    print("🧪 TESTE: Resultado reaproveitado do cache")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp))
+        cache = CacheResultados(str(caminho))
+        api_base = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m')
+        config = _config()
+
+        api = api_base.clonar()
+        impressao = cache.impressao_digital(config, api, ['ambas'])
+        assert cache.obter(impressao, api) is None
+        resultados = executar_simulacao(config, api, ['ambas'])
+        assert len(resultados['trades']) > 0, "Cenário sem trades não testa o cache"
+        cache.salvar(impressao, resultados, {'saidas_por_motivo': {'Outros': {'count': 1}}})
+        assert (Path(tmp) / '.cache_resultados' / f'{impressao}.pkl').exists()
+
+        nova_api = api_base.clonar()
+        entrada = cache.obter(cache.impressao_digital(config, nova_api, ['ambas']), nova_api)
+        assert entrada is not None
+        reaproveitado = entrada['resultados']
+        assert reaproveitado['trades'] == resultados['trades']
+        assert reaproveitado['saldo_final_usdt'] == resultados['saldo_final_usdt']
+        assert reaproveitado['saldo_final_ativo'] == resultados['saldo_final_ativo']
+        historico, original = reaproveitado['portfolio_over_time'], resultados['portfolio_over_time']
+        assert len(historico) == len(original)
+        assert np.array_equal(historico.valores_totais(), original.valores_totais())
+        assert historico[0] == original[0] and historico[-1] == original[-1]
+        assert entrada['extras'] == {'saidas_por_motivo': {'Outros': {'count': 1}}}
+
+        # Sweep: o mesmo ponto da grade sai do cache com as mesmas métricas
+        parametros = {'estrategia_giro_rapido.rsi_limite_compra': 30}
+        primeira = avaliar_combinacao(api_base.clonar(), config, parametros, ['ambas'], 0, cache)
+        segunda = avaliar_combinacao(api_base.clonar(), config, parametros, ['ambas'], 1, cache)
+        assert primeira['erro'] is None and not primeira['em_cache']
+        assert segunda['em_cache'] and segunda['metricas'] == primeira['metricas']
+
+    print(f"   ✅ {len(resultados['trades'])} trades e {len(historico):,} snapshots reaproveitados")
+
+
+def test_limite_lru():
+    """Acima do limite, sai a entrada usada há mais tempo (acerto renova)."""
+    print("=" * 80)
+    print("🧪 TESTE: Limite de tamanho (LRU)")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp), n_barras=600)
+        api_base = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m')
+        resultados = executar_simulacao(_config(), api_base.clonar(), ['ambas'])
+
+        cache = CacheResultados(str(caminho))
+        for nome in ('a', 'b'):
+            cache.salvar(nome, resultados)
+        tamanho = (cache.diretorio / 'a.pkl').stat().st_size
+        # 'a' mais antiga no mtime, mas acessada agora: 'b' é a menos recente
+        os.utime(cache.diretorio / 'a.pkl', ns=(1, 1))
+        os.utime(cache.diretorio / 'b.pkl', ns=(2, 2))
+        assert cache.obter('a', api_base.clonar()) is not None
+
+        cache.limite_bytes = int(tamanho * 2.5)
+        cache.salvar('c', resultados)
+        assert sorted(p.stem for p in cache.diretorio.glob('*.pkl')) == ['a', 'c']
+
+        cache.limpar()
+        assert cache.obter('a', api_base.clonar()) is None
+
+    print("   ✅ Entrada menos usada descartada ao passar do limite")
+
+
+def test_execucao_interrompida_fora_do_cache():
+    """Ctrl+C no meio do loop: resultado parcial marcado como incompleto e não gravado."""
+    print("=" * 80)
+    print("🧪 TESTE: Execução interrompida não vai para o cache")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    ciclo_original = BotWorker._executar_ciclo_decisao
+
+    def interromper_na_barra_500(worker, *args, **kwargs):
+        if worker.exchange_api.indice_atual >= 500:
+            raise KeyboardInterrupt
+        return ciclo_original(worker, *args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp), n_barras=1440)
+        cache = CacheResultados(str(caminho))
+        api_base = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m')
+        config = _config()
+        parametros = {'estrategia_giro_rapido.rsi_limite_compra': 30}
+
+        BotWorker._executar_ciclo_decisao = interromper_na_barra_500
+        try:
+            api = api_base.clonar()
+            resultados = executar_simulacao(config, api, ['ambas'])
+            assert not resultados['simulacao_completa'] and api.indice_atual < api.total_barras
+
+            parcial = avaliar_combinacao(api_base.clonar(), config, parametros, ['ambas'], 0, cache)
+            assert parcial['erro'] == ERRO_SIMULACAO_INCOMPLETA and parcial['metricas'] == {}
+            assert not parcial['em_cache']
+            assert not list(cache.diretorio.glob('*.pkl')), "Resultado parcial não pode ser gravado"
+        finally:
+            BotWorker._executar_ciclo_decisao = ciclo_original
+
+        # Execução completa do mesmo ponto: simulada de novo e aí sim gravada
+        completa = avaliar_combinacao(api_base.clonar(), config, parametros, ['ambas'], 1, cache)
+        assert not completa['em_cache'] and len(list(cache.diretorio.glob('*.pkl'))) == 1
+        assert executar_simulacao(config, api_base.clonar(), ['ambas'])['simulacao_completa']
+
+    print("   ✅ Execução parcial descartada; a completa é gravada")
+
+
+if __name__ == '__main__':
+    test_impressao_digital()
+    test_resultado_reaproveitado()
+    test_execucao_interrompida_fora_do_cache()
+    test_limite_lru()
+    print("\n✅ Todos os testes passaram!")
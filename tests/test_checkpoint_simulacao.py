@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Teste: Checkpoints e retomada do backtest
+=========================================
+
+PROBLEMA ORIGINAL:
+- Um backtest longo morria por inteiro em qualquer exceção ou Ctrl+C no
+  _run_simulacao; testar uma mudança de parâmetro a partir de uma data exigia
+  simular todo o prefixo de novo
+
+CORREÇÃO:
+- CHECKPOINT_DIRETORIO grava o estado completo (simulador, banco em memória,
+  StateManager, carteiras, stops, cooldowns/HWM, motores de RSI) a cada N
+  barras ou T segundos, em arquivos binários comprimidos
+- CHECKPOINT_RETOMAR (backtest.py --resume) continua do checkpoint; com outra
+  config vira um fork a partir daquela data (--resume-em)
+- Banco em memória copiado com serialize()/deserialize() no Python 3.11+ e
+  pela API de backup no 3.10 (mesmos bytes)
+"""
+
+import json
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.executor import preparar_config_simulacao, silenciar_logs_simulacao
+from src.core.bot_worker import BotWorker
+from src.core.checkpoint_simulacao import (
+    AgendadorCheckpoints,
+    carregar_checkpoint,
+    data_checkpoint,
+    listar_checkpoints,
+    localizar_checkpoint,
+)
+from src.exchange.simulated_api import SimulatedExchangeAPI
+from src.persistencia.database import restaurar_via_backup, serializar_via_backup
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+
+def _criar_csv(diretorio: Path, n_barras: int = 4 * 1440) -> Path:
+    rng = np.random.default_rng(18)
+    # Queda e recuperação: DCA, vendas, stops do giro e cooldowns ao longo do período
+    tendencia = np.concatenate([np.full(n_barras // 2, -0.0002), np.full(n_barras - n_barras // 2, 0.0003)])
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.003, n_barras) + tendencia))).round(6)
+    caminho = diretorio / 'checkpoint_1m.csv'
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+        'volume': np.ones(n_barras),
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def _rodar(caminho: Path, diretorio: Path, **chaves) -> dict:
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    preparar_config_simulacao(config, ['ambas'], diretorio)
+    config.update(chaves)
+    api = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m')
+    BotWorker(config=config, exchange_api=api, modo_simulacao=True).run()
+    return api.get_resultados()
+
+
+def _trades(resultados: dict) -> list:
+    # 'id' é um uuid novo a cada ordem
+    return [{chave: valor for chave, valor in trade.items() if chave != 'id'} for trade in resultados['trades']]
+
+
+def test_retomada_reproduz_execucao_completa():
+    """Retomar de qualquer checkpoint dá os mesmos trades e snapshots da execução direta."""
+    print("=" * 80)
+    print("🧪 TESTE: Retomada a partir de checkpoints")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        caminho = _criar_csv(tmp)
+        direto = _rodar(caminho, tmp / 'direto')
+        com_checkpoints = _rodar(
+            caminho, tmp / 'gravando',
+            CHECKPOINT_DIRETORIO=str(tmp / 'ckpt'), CHECKPOINT_INTERVALO_BARRAS=1500, CHECKPOINT_INTERVALO_SEGUNDOS=0,
+        )
+        checkpoints = listar_checkpoints(tmp / 'ckpt')
+        assert len(checkpoints) >= 3, checkpoints
+        assert _trades(com_checkpoints) == _trades(direto), "Gravar checkpoints não pode mudar o resultado"
+        assert len(direto['trades']) > 0
+
+        estado = carregar_checkpoint(checkpoints[1])
+        assert estado['indice'] >= 200 + 2 * 1500
+        assert set(estado['componentes']) >= {'worker', 'position_manager', 'strategy_sell', 'analise_tecnica'}
+
+        curva_direta = direto['portfolio_over_time']
+        for checkpoint in (checkpoints[0], checkpoints[len(checkpoints) // 2], checkpoints[-1]):
+            retomado = _rodar(caminho, tmp / checkpoint.stem, CHECKPOINT_RETOMAR=str(checkpoint))
+            assert _trades(retomado) == _trades(direto), checkpoint.name
+            assert retomado['saldo_final_usdt'] == direto['saldo_final_usdt']
+            curva = retomado['portfolio_over_time']
+            assert len(curva) == len(curva_direta)
+            assert np.array_equal(curva.valores_totais(), curva_direta.valores_totais())
+            assert curva[0] == curva_direta[0] and curva[-1] == curva_direta[-1]
+
+    print(f"   ✅ {len(checkpoints)} checkpoints; retomadas iguais à execução direta "
+          f"({len(direto['trades'])} trades)")
+
+
+def test_fork_com_outra_config():
+    """Fork por data usa a config nova só depois do checkpoint; histórico incompatível é recusado."""
+    print("=" * 80)
+    print("🧪 TESTE: Fork a partir de uma data e validações")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        caminho = _criar_csv(tmp)
+        original = _rodar(
+            caminho, tmp / 'original',
+            CHECKPOINT_DIRETORIO=str(tmp / 'ckpt'), CHECKPOINT_INTERVALO_BARRAS=1500, CHECKPOINT_INTERVALO_SEGUNDOS=0,
+        )
+        checkpoints = listar_checkpoints(tmp / 'ckpt')
+
+        # --resume-em: último checkpoint até a data
+        alvo = checkpoints[len(checkpoints) // 2]
+        data_alvo = data_checkpoint(alvo)
+        assert localizar_checkpoint(str(tmp / 'ckpt'), data_alvo) == alvo
+        assert localizar_checkpoint(str(tmp / 'ckpt')) == checkpoints[-1]
+        try:
+            localizar_checkpoint(str(tmp / 'ckpt'), datetime(2000, 1, 1))
+            assert False, "Data anterior a todos os checkpoints deveria falhar"
+        except FileNotFoundError:
+            pass
+
+        fork = _rodar(
+            caminho, tmp / 'fork',
+            CHECKPOINT_RETOMAR=str(tmp / 'ckpt'), CHECKPOINT_RETOMAR_EM=data_alvo.isoformat(),
+            estrategia_giro_rapido={**json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))['estrategia_giro_rapido'],
+                                    'rsi_limite_compra': 60},
+        )
+        antes = [t for t in _trades(original) if pd.Timestamp(t['timestamp']) < pd.Timestamp(data_alvo)]
+        assert _trades(fork)[:len(antes)] == antes, "Prefixo do fork deve ser o da execução original"
+        assert _trades(fork) != _trades(original), "Parâmetro novo deveria mudar os trades após o checkpoint"
+
+        # Checkpoint de outro histórico (timestamps deslocados)
+        outro = tmp / 'outro.csv'
+        dados = pd.read_csv(caminho)
+        dados['timestamp'] = pd.to_datetime(dados['timestamp']) + pd.Timedelta(days=1)
+        dados.to_csv(outro, index=False)
+        try:
+            _rodar(outro, tmp / 'outro', CHECKPOINT_RETOMAR=str(alvo))
+            assert False, "Checkpoint de outro histórico deveria ser recusado"
+        except ValueError:
+            pass
+
+    print(f"   ✅ Fork em {data_alvo:%Y-%m-%d %H:%M} mantém {len(antes)} trades do prefixo e diverge depois")
+
+
+def test_agendador_mantem_os_mais_recentes():
+    """Intervalo por barras e limite de arquivos no diretório."""
+    print("=" * 80)
+    print("🧪 TESTE: AgendadorCheckpoints")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        caminho = _criar_csv(tmp, n_barras=2 * 1440)
+        _rodar(
+            caminho, tmp / 'run',
+            CHECKPOINT_DIRETORIO=str(tmp / 'ckpt'), CHECKPOINT_INTERVALO_BARRAS=500,
+            CHECKPOINT_INTERVALO_SEGUNDOS=0, CHECKPOINT_MANTER=2,
+        )
+        checkpoints = listar_checkpoints(tmp / 'ckpt')
+        assert len(checkpoints) == 2, checkpoints
+        indices = [carregar_checkpoint(c)['indice'] for c in checkpoints]
+        assert indices[1] - indices[0] >= 500, indices
+
+        # Sem intervalo vencido, nada é gravado
+        agendador = AgendadorCheckpoints(tmp / 'vazio', intervalo_barras=10_000)
+        agendador.iniciar(0)
+        assert agendador.ultimo is None and not (tmp / 'vazio').exists()
+
+    print(f"   ✅ Apenas os 2 mais recentes mantidos (barras {indices[0]:,} e {indices[1]:,})")
+
+
+def test_banco_serializado_sem_serialize():
+    """Caminho do Python 3.10 (API de backup) reproduz o banco em memória."""
+    print("=" * 80)
+    print("🧪 TESTE: Snapshot do banco sem Connection.serialize()")
+    print("=" * 80)
+
+    origem = sqlite3.connect(':memory:')
+    origem.execute("CREATE TABLE ordens (id INTEGER PRIMARY KEY, lado TEXT, preco REAL)")
+    origem.executemany("INSERT INTO ordens (lado, preco) VALUES (?, ?)",
+                       [('BUY', 0.5), ('SELL', 0.52), ('BUY', 0.48)])
+    origem.commit()
+
+    conteudo = serializar_via_backup(origem)
+    assert conteudo.startswith(b'SQLite format 3')
+
+    destino = sqlite3.connect(':memory:')
+    destino.execute("CREATE TABLE lixo (x)")
+    restaurar_via_backup(destino, conteudo)
+    assert destino.execute("SELECT lado, preco FROM ordens ORDER BY id").fetchall() == \
+        [('BUY', 0.5), ('SELL', 0.52), ('BUY', 0.48)]
+    assert destino.execute("SELECT name FROM sqlite_master").fetchall() == [('ordens',)]
+
+    # Bytes compatíveis com o deserialize() do Python 3.11+
+    if hasattr(sqlite3.Connection, 'deserialize'):
+        outra = sqlite3.connect(':memory:')
+        outra.deserialize(conteudo)
+        assert outra.execute("SELECT COUNT(*) FROM ordens").fetchone() == (3,)
+
+    print("   ✅ Banco restaurado pela API de backup")
+
+
+if __name__ == '__main__':
+    test_retomada_reproduz_execucao_completa()
+    test_fork_com_outra_config()
+    test_agendador_mantem_os_mais_recentes()
+    test_banco_serializado_sem_serialize()
+    print("\n✅ Todos os testes passaram!")
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Teste: Download concorrente e retomável de históricos
+=====================================================
+
+PROBLEMA ORIGINAL:
+- download_data.py usava BinanceAPI.fetch_ohlcv: páginas de 1000 candles em
+  sequência e o CSV só era gravado no final (qualquer erro perdia tudo)
+
+CORREÇÃO:
+- src/exchange/download_historico.py divide o período em partes baixadas em
+  paralelo dentro do limite de peso da API, grava cada parte de forma
+  atômica e retoma das partes já concluídas
+- Lacunas listadas; CSV gravado junto com o bundle NumPy dos backtests
+- Um arquivo por (exchange, par, timeframe), sem datas no nome;
+  atualizar_historico/atualizar_todos anexam só os candles novos
+- Atualização interrompida retoma das partes salvas mesmo com o fim (último
+  candle fechado) diferente: fim_ms fica fora do plano no modo anexar e cada
+  parte confere o próprio intervalo
+
+Os testes usam um servidor HTTP local no lugar de /api/v3/klines.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import requests
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.exchange import download_historico
+from src.exchange.download_historico import (
+    LimitadorPeso,
+    atualizar_historico,
+    atualizar_todos,
+    baixar_historico,
+    caminho_historico,
+    data_em_ms,
+    fim_candles_fechados,
+    intervalo_em_ms,
+)
+from src.exchange.historico_cache import (
+    _hash_arquivo,
+    _ler_meta,
+    carregar_historico,
+    carregar_store_historico,
+    diretorio_cache,
+    ler_csv_historico,
+    limpar_cache_historico,
+)
+
+MINUTO_MS = 60_000
+
+
+class ServidorKlines(ThreadingHTTPServer):
+    """Imitação de /api/v3/klines: candles determinísticos (lacuna de 30 min em 2024-01-02)."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), HandlerKlines)
+        self.lacuna = (data_em_ms('2024-01-02 10:00'), data_em_ms('2024-01-02 10:29'))
+        self.falhar_a_partir_de = None
+        self.responder_429 = 0
+        self.requisicoes = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def candles(self, inicio_ms: int, fim_ms: int, limite: int, intervalo_ms: int = MINUTO_MS) -> list:
+        primeiro = -(-inicio_ms // intervalo_ms) * intervalo_ms
+        timestamps = np.arange(primeiro, fim_ms + 1, intervalo_ms, dtype=np.int64)
+        timestamps = timestamps[(timestamps < self.lacuna[0]) | (timestamps > self.lacuna[1])][:limite]
+        return [self.candle(int(ts)) for ts in timestamps]
+
+    @staticmethod
+    def candle(ts: int) -> list:
+        preco = round(0.5 + 0.1 * np.sin(ts / 3.7e7), 8)
+        return [ts, f'{preco:.8f}', f'{preco * 1.001:.8f}', f'{preco * 0.999:.8f}', f'{preco:.8f}',
+                f'{ts % 997 + 0.5:.8f}', ts + MINUTO_MS - 1, '0', 0, '0', '0', '0']
+
+
+class HandlerKlines(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {chave: valores[0] for chave, valores in parse_qs(url.query).items()}
+        servidor = self.server
+        with servidor._lock:
+            servidor.requisicoes.append((time.monotonic(), int(params['startTime'])))
+            responder_429 = servidor.responder_429 > 0
+            servidor.responder_429 -= responder_429
+
+        if url.path != '/api/v3/klines':
+            self._responder(404, b'{}')
+        elif responder_429:
+            self._responder(429, b'{"code":-1003}', {'Retry-After': '0.2'})
+        elif servidor.falhar_a_partir_de is not None and int(params['startTime']) >= servidor.falhar_a_partir_de:
+            self._responder(500, b'{}')
+        else:
+            corpo = servidor.candles(int(params['startTime']), int(params['endTime']), int(params['limit']),
+                                     intervalo_em_ms(params['interval']))
+            self._responder(200, json.dumps(corpo).encode(), {'X-MBX-USED-WEIGHT-1M': '2'})
+
+    def _responder(self, status: int, corpo: bytes, cabecalhos: dict = None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(corpo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def _iniciar_servidor() -> ServidorKlines:
+    servidor = ServidorKlines()
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def test_download_retomavel():
+    """Parte com erro interrompe; a segunda execução só baixa o que falta e grava CSV + bundle."""
+    print("=" * 80)
+    print("🧪 TESTE: Download em partes, falha e retomada")
+    print("=" * 80)
+
+    download_historico.ESPERA_INICIAL_S = 0.01
+    servidor = _iniciar_servidor()
+    inicio, fim = data_em_ms('2024-01-01'), data_em_ms('2024-01-04')
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            caminho = Path(tmp) / 'BINANCE_ADAUSDT_1m.csv'
+            opcoes = {'base_url': servidor.url, 'workers': 3, 'candles_por_parte': 1500}
+
+            # Terceira parte (a partir de 2024-01-03 02:00) sempre falha
+            servidor.falhar_a_partir_de = inicio + 3000 * MINUTO_MS
+            try:
+                baixar_historico('ADA/USDT', '1m', '2024-01-01', '2024-01-04', str(caminho), **opcoes)
+                raise AssertionError("Download deveria falhar na terceira parte")
+            except requests.exceptions.HTTPError:
+                pass
+            partes = caminho.parent / '.download' / caminho.name
+            assert sorted(p.name for p in partes.glob('parte_*.npz')) == ['parte_000000.npz', 'parte_000001.npz']
+            assert not caminho.exists()
+
+            servidor.falhar_a_partir_de = None
+            servidor.requisicoes.clear()
+            resultado = baixar_historico('ADA/USDT', '1m', '2024-01-01', '2024-01-04', str(caminho), **opcoes)
+            assert (resultado['partes'], resultado['partes_retomadas'], resultado['partes_baixadas']) == (3, 2, 1)
+            assert min(inicio_req for _, inicio_req in servidor.requisicoes) == inicio + 3000 * MINUTO_MS
+            assert len(servidor.requisicoes) == 2, "Parte de 1320 candles = 2 páginas"
+            assert not partes.parent.exists(), "Partes removidas após gravar o CSV"
+
+            # Conteúdo: todos os candles do período, menos a lacuna
+            esperado = servidor.candles(inicio, fim - 1, 10**6)
+            assert resultado['candles'] == len(esperado) == 3 * 1440 - 30
+            assert resultado['lacunas'] == [{'inicio_ms': servidor.lacuna[0], 'fim_ms': servidor.lacuna[1], 'candles': 30}]
+            dados = ler_csv_historico(str(caminho))
+            assert np.array_equal(dados.index.as_unit('ms').asi8, [c[0] for c in esperado])
+            assert np.array_equal(dados['close'].to_numpy(), [float(c[4]) for c in esperado])
+
+            # Bundle já pronto e válido para o CSV gravado
+            meta = _ler_meta(diretorio_cache(str(caminho)))
+            assert meta['sha256'] == _hash_arquivo(caminho)
+            limpar_cache_historico()
+            pd.testing.assert_frame_equal(carregar_historico(str(caminho)), dados)
+            store = carregar_store_historico(str(caminho))
+            assert isinstance(store.valores.base, np.memmap)
+            assert np.array_equal(store.timestamps, [c[0] for c in esperado])
+            limpar_cache_historico(str(caminho))
+    finally:
+        servidor.shutdown()
+        download_historico.ESPERA_INICIAL_S = 1.0
+
+    print(f"   ✅ {resultado['candles']} candles, 1 parte baixada na retomada, lacuna de 30 candles detectada")
+
+
+def test_limite_de_peso():
+    """Workers respeitam a janela de peso e um 429 pausa e refaz a requisição."""
+    print("=" * 80)
+    print("🧪 TESTE: Limite de peso da API")
+    print("=" * 80)
+
+    servidor = _iniciar_servidor()
+    servidor.responder_429 = 1
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            caminho = Path(tmp) / 'BINANCE_ADAUSDT_1m.csv'
+            # 4 requisições (peso 2) a cada 0,25s; 12 partes de uma página
+            limitador = LimitadorPeso(peso_por_janela=8, janela_s=0.25)
+            inicio = time.perf_counter()
+            resultado = baixar_historico(
+                'ADAUSDT', '1m', '2024-01-01', '2024-01-01 02:00', str(caminho),
+                base_url=servidor.url, workers=8, candles_por_parte=10, limitador=limitador
+            )
+            duracao = time.perf_counter() - inicio
+
+            assert resultado['candles'] == 120 and resultado['partes_baixadas'] == 12
+            assert len(servidor.requisicoes) == 13, "429 refeito uma vez"
+            assert duracao >= 0.5, f"13 requisições a 4 por janela levam ao menos 3 janelas ({duracao:.2f}s)"
+
+            envios = np.array([momento for momento, _ in servidor.requisicoes])
+            por_janela = np.searchsorted(envios, envios + 0.2) - np.arange(len(envios))
+            assert por_janela.max() <= 5, f"Até 4 requisições por janela (+1 de folga): {por_janela.max()}"
+            limpar_cache_historico(str(caminho))
+    finally:
+        servidor.shutdown()
+
+    print(f"   ✅ 13 requisições em {duracao:.2f}s, no máximo {por_janela.max()} por janela")
+
+
+def test_atualizacao_incremental():
+    """update só pede os candles depois do último gravado e fica igual a um download completo."""
+    print("=" * 80)
+    print("🧪 TESTE: Atualização incremental dos históricos")
+    print("=" * 80)
+
+    servidor = _iniciar_servidor()
+    dia_ms = intervalo_em_ms('1d')
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            caminho = caminho_historico('binance', 'ADA/USDT', '1d', tmp)
+            assert caminho.name == 'BINANCE_ADAUSDT_1d.csv'
+            baixar_historico('ADA/USDT', '1d', '2024-01-01', '2025-01-01', str(caminho), base_url=servidor.url)
+            assert len(ler_csv_historico(str(caminho))) == 366
+
+            # Arquivos fora do padrão (com datas, outras exchanges) não entram no update
+            (Path(tmp) / 'BINANCE_ADAUSDT_1d_2024-01-01_2025-01-01.csv').write_text('timestamp,close\n')
+            (Path(tmp) / 'KUCOIN_XRPUSDT_1d.csv').write_text('timestamp,close\n')
+
+            servidor.requisicoes.clear()
+            relatorio = atualizar_todos(tmp, base_url=servidor.url)
+            assert [item['caminho'].name for item in relatorio] == ['BINANCE_ADAUSDT_1d.csv']
+            resultado = relatorio[0]['resultado']
+            assert min(inicio_req for _, inicio_req in servidor.requisicoes) == data_em_ms('2025-01-01')
+
+            # Só candles fechados: o de hoje (em formação) fica de fora
+            esperado = servidor.candles(data_em_ms('2024-01-01'), fim_candles_fechados(dia_ms) - 1, 10**6, dia_ms)
+            assert resultado['candles'] == len(esperado) - 366 and resultado['lacunas'] == []
+            assert esperado[-1][0] + 2 * dia_ms > time.time() * 1000
+
+            # Mesmo conteúdo e bundle de um download completo do período
+            completo = Path(tmp) / 'completo' / 'BINANCE_ADAUSDT_1d.csv'
+            baixar_historico('ADA/USDT', '1d', '2024-01-01', fim_candles_fechados(dia_ms), str(completo),
+                             base_url=servidor.url)
+            assert caminho.read_bytes() == completo.read_bytes()
+            assert _ler_meta(diretorio_cache(str(caminho)))['sha256'] == _hash_arquivo(caminho)
+            limpar_cache_historico()
+            pd.testing.assert_frame_equal(carregar_historico(str(caminho)), ler_csv_historico(str(completo)))
+
+            # Já em dia: nenhuma requisição
+            servidor.requisicoes.clear()
+            assert atualizar_historico('ADA/USDT', '1d', diretorio=tmp, base_url=servidor.url)['candles'] == 0
+            assert servidor.requisicoes == []
+            limpar_cache_historico()
+    finally:
+        servidor.shutdown()
+
+    print(f"   ✅ {resultado['candles']} candles novos anexados; arquivo igual ao download completo")
+
+
+def test_atualizacao_interrompida_retoma():
+    """Update que falhou no meio retoma das partes já salvas, mesmo com outro último candle fechado."""
+    print("=" * 80)
+    print("🧪 TESTE: Retomada de atualização interrompida")
+    print("=" * 80)
+
+    download_historico.ESPERA_INICIAL_S = 0.01
+    servidor = _iniciar_servidor()
+    dia_ms = intervalo_em_ms('1d')
+    fim_original = download_historico.fim_candles_fechados
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            caminho = caminho_historico('binance', 'ADA/USDT', '1d', tmp)
+            baixar_historico('ADA/USDT', '1d', '2024-01-01', '2024-03-01', str(caminho), base_url=servidor.url)
+            opcoes = {'diretorio': tmp, 'base_url': servidor.url, 'workers': 1, 'candles_por_parte': 100}
+            inicio_update = data_em_ms('2024-03-01')
+
+            # Primeira tentativa "dias antes" (outro fim) e falha na terceira parte
+            download_historico.fim_candles_fechados = lambda intervalo_ms: fim_original(intervalo_ms) - 3 * intervalo_ms
+            servidor.falhar_a_partir_de = inicio_update + 200 * dia_ms
+            try:
+                atualizar_historico('ADA/USDT', '1d', **opcoes)
+                raise AssertionError("Atualização deveria falhar na terceira parte")
+            except requests.exceptions.HTTPError:
+                pass
+            partes = caminho.parent / '.download' / caminho.name
+            assert sorted(p.name for p in partes.glob('parte_*.npz')) == ['parte_000000.npz', 'parte_000001.npz']
+            assert len(ler_csv_historico(str(caminho))) == 60, "CSV intacto até a atualização terminar"
+
+            download_historico.fim_candles_fechados = fim_original
+            servidor.falhar_a_partir_de = None
+            servidor.requisicoes.clear()
+            resultado = atualizar_historico('ADA/USDT', '1d', **opcoes)
+            assert resultado['partes_retomadas'] == 2
+            assert resultado['partes_baixadas'] == resultado['partes'] - 2
+            assert min(inicio_req for _, inicio_req in servidor.requisicoes) == inicio_update + 200 * dia_ms
+            assert not partes.parent.exists(), "Partes removidas após gravar o CSV"
+
+            completo = Path(tmp) / 'completo' / 'BINANCE_ADAUSDT_1d.csv'
+            baixar_historico('ADA/USDT', '1d', '2024-01-01', fim_candles_fechados(dia_ms), str(completo),
+                             base_url=servidor.url)
+            assert caminho.read_bytes() == completo.read_bytes()
+            limpar_cache_historico()
+    finally:
+        download_historico.fim_candles_fechados = fim_original
+        servidor.shutdown()
+        download_historico.ESPERA_INICIAL_S = 1.0
+
+    print(f"   ✅ 2 partes retomadas, {resultado['partes_baixadas']} baixadas; arquivo igual ao download completo")
+
+
+if __name__ == '__main__':
+    test_download_retomavel()
+    test_limite_de_peso()
+    test_atualizacao_incremental()
+    test_atualizacao_interrompida_retoma()
+    print("\n✅ Todos os testes passaram!")
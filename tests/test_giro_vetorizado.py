@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Teste: Motor vetorizado do giro rápido
+======================================
+
+FUNCIONALIDADE:
+- MotorGiroVetorizado reproduz o giro rápido do BotWorker (RSI + cooldown,
+  SL inicial, promoção para TSL, trailing) sobre os arrays NumPy
+- Mesmos trades (lado, barra, motivo, preço) que a simulação completa
+- triar_grade_giro() ranqueia uma grade inteira sem rodar o BotWorker;
+  confirmar_finalistas() roda só as melhores no BotWorker
+"""
+
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.executor import calcular_metricas, executar_simulacao, silenciar_logs_simulacao
+from src.backtest.giro_vetorizado import MotorGiroVetorizado, confirmar_finalistas, triar_grade_giro
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+
+def _criar_csv(diretorio: Path, dias: int = 5) -> Path:
+    n_barras = dias * 1440
+    rng = np.random.default_rng(23)
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.003, n_barras)))).round(6)
+    caminho = diretorio / 'giro_1m.csv'
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+        'volume': np.ones(n_barras),
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def _config(**giro) -> dict:
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    config['MODO_NUMERICO'] = 'float'
+    config['estrategia_giro_rapido'].update(giro)
+    return config
+
+
+def test_mesmos_trades_que_o_bot_worker():
+    """Trades e métricas do motor vetorizado batem com o BotWorker em modo giro."""
+    print("=" * 80)
+    print("🧪 TESTE: Motor vetorizado x BotWorker (giro rápido)")
+    print("=" * 80)
+
+    silenciar_logs_simulacao(logging.ERROR)
+    cenarios = [
+        _config(),
+        _config(rsi_limite_compra=40, stop_loss_inicial_pct=6, trailing_stop_distancia_pct=2,
+                tsl_gatilho_lucro_pct=1.5, cooldown_compra_segundos=3600),
+        _config(rsi_timeframe_entrada='15m', rsi_limite_compra=35, alocacao_capital_pct=60, tsl_gatilho_lucro_pct=0.5),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api = SimulatedExchangeAPI(str(_criar_csv(Path(tmp))), 1000, 0.1, '1m')
+        motor = MotorGiroVetorizado(api.clonar())
+
+        for config in cenarios:
+            vetorizado = motor.simular(config)
+            completo = executar_simulacao(config, api.clonar(), ['giro_rapido'])
+
+            chave = lambda t: (t['side'], t['carteira'], t['timestamp'], t['motivo'], t['preco'])
+            assert [chave(t) for t in vetorizado['trades']] == [chave(t) for t in completo['trades']]
+            assert vetorizado['trades'], "Cenário sem trades não testa nada"
+            assert set(vetorizado['trades'][-1]) == set(completo['trades'][-1])
+
+            metricas_v = motor.calcular_metricas(vetorizado)
+            metricas_c = calcular_metricas(completo, 1000)
+            for nome in ('retorno_pct', 'drawdown_max_pct', 'taxas_usdt', 'valor_final'):
+                assert abs(metricas_v[nome] - metricas_c[nome]) < 1e-6, nome
+
+            print(f"   ✅ {len(vetorizado['trades'])} trades idênticos "
+                  f"(retorno {metricas_v['retorno_pct']:+.2f}%)")
+
+
+def test_triagem_e_confirmacao():
+    """A grade é ranqueada pelo motor e as finalistas confirmadas no BotWorker."""
+    print("=" * 80)
+    print("🧪 TESTE: Triagem vetorizada + confirmação das finalistas")
+    print("=" * 80)
+
+    silenciar_logs_simulacao(logging.ERROR)
+    config = _config()
+    grade = {
+        'estrategia_giro_rapido.rsi_limite_compra': [25, 35, 45],
+        'estrategia_giro_rapido.trailing_stop_distancia_pct': [0.5, 1.5],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api = SimulatedExchangeAPI(str(_criar_csv(Path(tmp), dias=3)), 1000, 0.1, '1m')
+        triagem = triar_grade_giro(api, config, grade)
+
+        assert len(triagem) == 6 and all(r['erro'] is None for r in triagem)
+        retornos = [r['metricas']['retorno_pct'] for r in triagem]
+        assert retornos == sorted(retornos, reverse=True)
+
+        confirmados = confirmar_finalistas(api, config, triagem[:2])
+
+    assert len(confirmados) == 2
+    for resultado in confirmados:
+        assert resultado['erro'] is None
+        assert abs(resultado['metricas']['retorno_pct'] - resultado['metricas_triagem']['retorno_pct']) < 1e-6
+
+    print(f"   ✅ Melhor combinação: {confirmados[0]['parametros']}")
+
+
+if __name__ == '__main__':
+    test_mesmos_trades_que_o_bot_worker()
+    test_triagem_e_confirmacao()
+    print("\n✅ Todos os testes passaram!")
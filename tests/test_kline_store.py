@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Teste: KlineStore NumPy na SimulatedExchangeAPI
+===============================================
+
+PROBLEMA ORIGINAL:
+- obter_klines copiava o DataFrame resampleado inteiro, aplicava máscara
+  booleana e montava listas via iterrows a cada chamada (O(n) por barra)
+
+CORREÇÃO:
+- Cada timeframe vira um KlineStore (arrays int64/float64) construído uma vez
+- Um cursor monotônico localiza o último candle visível
+- obter_klines_array devolve views (sem cópia); obter_klines continua
+  devolvendo a mesma lista de listas por compatibilidade
+- O candle em formação de timeframes maiores só agrega as barras já
+  processadas (CandleEmFormacao), sem o lookahead do candle resampleado
+"""
+
+import sys
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.exchange.kline_store import CandleEmFormacao, KlineStore
+from src.exchange.simulated_api import HistoricoPortfolio, SimulatedExchangeAPI
+
+
+def _criar_csv_sintetico(diretorio: Path, n_barras: int = 3000) -> Path:
+    """Gera um CSV 1m com passeio aleatório reprodutível."""
+    rng = np.random.default_rng(7)
+    close = 0.5 * np.exp(np.cumsum(rng.normal(0, 0.002, n_barras)))
+    open_ = np.concatenate([[0.5], close[:-1]])
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+        'open': open_.round(6),
+        'high': (np.maximum(open_, close) * 1.001).round(6),
+        'low': (np.minimum(open_, close) * 0.999).round(6),
+        'close': close.round(6),
+        'volume': rng.integers(100, 1000, n_barras),
+    })
+    caminho = diretorio / 'sintetico_1m.csv'
+    df.to_csv(caminho, index=False)
+    return caminho
+
+
+def _klines_referencia(api: SimulatedExchangeAPI, intervalo: str, limite: int):
+    """
+    Referência em pandas: resample só das barras já processadas (o último
+    candle fica parcial, como o candle em formação da exchange).
+    """
+    base = api.dados_completos.iloc[:api.indice_atual]
+    if intervalo == api.timeframe_base:
+        df = base.tail(limite)
+    else:
+        df = base.resample(api._timeframe_pandas(intervalo)).agg({
+            'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'
+        }).dropna().tail(limite)
+        df['volume'] = df['volume'].astype(float)
+    return [
+        [int(ts.timestamp() * 1000), str(row['open']), str(row['high']), str(row['low']),
+         str(row['close']), str(row['volume'])]
+        for ts, row in df.iterrows()
+    ]
+
+
+def test_obter_klines_igual_a_implementacao_pandas():
+    """obter_klines deve devolver exatamente o mesmo conteúdo da versão pandas."""
+    print("=" * 80)
+    print("🧪 TESTE: obter_klines (KlineStore) vs implementação pandas")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api = SimulatedExchangeAPI(str(_criar_csv_sintetico(Path(tmp))), 1000, 0.1, '1m')
+
+        for intervalo in ('1m', '5m', '1h', '4h'):
+            api.obter_klines('ADAUSDT', intervalo, 10)  # garante resample em cache
+            for indice in (201, 202, 260, 1500, 1501, 2999):
+                api.indice_atual = indice
+                klines = api.obter_klines('ADAUSDT', intervalo, 50)
+                referencia = _klines_referencia(api, intervalo, 50)
+
+                assert [k[:6] for k in klines] == referencia, \
+                    f"Klines divergentes para {intervalo} no índice {indice}"
+                assert all(k[0] == k[6] for k in klines), "Timestamp de fechamento deve repetir a abertura"
+
+            print(f"   ✅ {intervalo}: idêntico à referência")
+
+
+def test_candle_em_formacao():
+    """Barra a barra ou aos saltos, o candle em formação só vê o passado; 'apenas_fechados' o omite."""
+    print("=" * 80)
+    print("🧪 TESTE: Candle em formação (CandleEmFormacao)")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api = SimulatedExchangeAPI(str(_criar_csv_sintetico(Path(tmp))), 1000, 0.1, '1m')
+        store_4h = api.obter_kline_store('4h')
+        base = api.store_base
+
+        incremental = CandleEmFormacao(base, store_4h)
+        aos_saltos = CandleEmFormacao(base, store_4h)
+        for fim in range(1, len(base) + 1):
+            candle = incremental.atualizar(fim)
+            inicio = int(np.searchsorted(base.timestamps, store_4h.timestamps[candle]))
+            bloco = base.valores[:, inicio:fim]
+            esperado = [bloco[0, 0], bloco[1].max(), bloco[2].min(), bloco[3, -1], bloco[4].sum()]
+            assert np.allclose(incremental.valores, esperado), fim
+            # Completo só na última barra do período de 4h
+            assert incremental.completo == (fim < len(base) and (fim - inicio) == 240), fim
+            if fim % 97 == 0:
+                aos_saltos.atualizar(fim)
+                assert np.allclose(aos_saltos.valores, incremental.valores) and aos_saltos.candle == candle
+        aos_saltos.atualizar(10)  # retrocesso (nova simulação)
+        assert aos_saltos.candle == 0
+        assert aos_saltos.valores[0] == base.open[0] and aos_saltos.valores[3] == base.close[9]
+
+        # Janelas: o último candle muda a cada barra; fechados batem com o resample
+        api.indice_atual = 300  # 1h de um candle de 4h em formação
+        janela = api.obter_klines_array('ADAUSDT', '4h', 10)
+        fechados = api.obter_klines_array('ADAUSDT', '4h', 10, apenas_fechados=True)
+        assert len(janela) == 2 and len(fechados) == 1
+        assert janela.close[-1] == base.close[299] and janela.close[-1] != store_4h.close[1]
+        assert fechados.timestamps[-1] == janela.timestamps[0] and fechados.close[-1] == store_4h.close[0]
+        assert not np.shares_memory(janela.close, store_4h.close)
+
+        api.indice_atual = 480  # última barra do segundo candle: já completo
+        assert np.shares_memory(api.obter_klines_array('ADAUSDT', '4h', 10).close, store_4h.valores)
+        assert len(api.obter_klines_array('ADAUSDT', '4h', 10, apenas_fechados=True)) == 2
+
+    print("   ✅ Candle parcial idêntico à agregação das barras já vistas")
+
+
+def test_janela_e_view_sem_copia():
+    """As janelas devolvidas devem compartilhar memória com o store."""
+    print("=" * 80)
+    print("🧪 TESTE: Janelas do KlineStore são views")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api = SimulatedExchangeAPI(str(_criar_csv_sintetico(Path(tmp))), 1000, 0.1, '1m')
+        api.indice_atual = 1000
+
+        janela = api.obter_klines_array('ADAUSDT', '5m', 100)
+        store = api.kline_stores['5m']
+
+        assert len(janela) == 100
+        assert np.shares_memory(janela.close, store.valores), "close deve ser view do store"
+        assert janela.close.flags['C_CONTIGUOUS'], "close deve ser contíguo (TA-Lib)"
+        assert janela.timestamps[-1] <= int(api.dados['timestamp'].iloc[999].timestamp() * 1000), \
+            "Janela não pode conter candles futuros"
+
+    print("   ✅ Views contíguas e sem lookahead")
+
+
+def test_cursor_monotonico_e_retrocesso():
+    """O cursor deve acertar tanto avançando quanto voltando no tempo."""
+    print("=" * 80)
+    print("🧪 TESTE: Cursor do KlineStore")
+    print("=" * 80)
+
+    timestamps = np.arange(0, 100_000, 1000, dtype=np.int64)
+    store = KlineStore(timestamps, np.ones((5, len(timestamps))))
+
+    for ts in list(range(0, 100_000, 250)) + [50_500, 10, 99_999, 150_000, -1]:
+        esperado = int(np.searchsorted(timestamps, ts, side='right'))
+        assert store.posicao_ate(ts) == esperado, f"Cursor incorreto para ts={ts}"
+
+    print("   ✅ Cursor consistente com searchsorted")
+
+
+def test_barra_simulada_igual_ao_dataframe():
+    """get_barra_atual (cursor colunar) deve reproduzir a linha do DataFrame."""
+    print("=" * 80)
+    print("🧪 TESTE: BarraSimulada vs iloc().to_dict()")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api = SimulatedExchangeAPI(str(_criar_csv_sintetico(Path(tmp), 500)), 1000, 0.1, '1m')
+        api.indice_atual = 0
+
+        for i in range(len(api.dados)):
+            barra = api.get_barra_atual()
+            esperado = api.dados.iloc[i].to_dict()
+
+            assert barra.timestamp == esperado['timestamp'].to_pydatetime(), f"Timestamp divergente na barra {i}"
+            for coluna in ('open', 'high', 'low', 'close', 'volume'):
+                assert barra[coluna] == esperado[coluna], f"{coluna} divergente na barra {i}"
+            assert barra.preco_decimal == Decimal(str(esperado['close']))
+            assert api.get_preco_atual('ADA/USDT') == esperado['close']
+
+        assert api.get_barra_atual() is None, "Cursor deve terminar após a última barra"
+
+    print("   ✅ Barras idênticas às do DataFrame")
+
+
+def test_resample_vetorizado_igual_ao_pandas():
+    """KlineStore.resamplear deve reproduzir df.resample().agg().dropna()."""
+    print("=" * 80)
+    print("🧪 TESTE: Resample nos arrays vs pandas")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        df = pd.read_csv(_criar_csv_sintetico(Path(tmp), 5000))
+    # Lacuna de 300 barras e início fora da meia-noite
+    df = df.drop(df.index[1200:1500]).astype({'volume': float})
+    df['timestamp'] = pd.to_datetime(df['timestamp']) + pd.Timedelta(minutes=37)
+    df = df.set_index('timestamp')
+    store = KlineStore.from_dataframe(df)
+
+    for intervalo, alias in (('5m', '5min'), ('1h', '1h'), ('4h', '4h'), ('7h', '7h'), ('1d', '1d')):
+        referencia = df.resample(alias).agg({
+            'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'
+        }).dropna()
+        resultado = store.resamplear(int(pd.Timedelta(alias).total_seconds() * 1000))
+        esperado = KlineStore.from_dataframe(referencia)
+
+        assert np.array_equal(resultado.timestamps, esperado.timestamps), f"Candles divergentes em {intervalo}"
+        assert np.array_equal(resultado.valores, esperado.valores), f"OHLCV divergente em {intervalo}"
+
+    valores = store.valores.copy()
+    valores[3, 10] = np.nan
+    try:
+        KlineStore(store.timestamps, valores).resamplear(3_600_000)
+        assert False, "NaN deveria cair no resample do pandas"
+    except ValueError:
+        pass
+
+    print("   ✅ Mesmos candles que o resample do pandas")
+
+
+def test_historico_portfolio_compacto():
+    """Snapshots guardados por saldos + barras devolvem os mesmos dicts de antes."""
+    print("=" * 80)
+    print("🧪 TESTE: HistoricoPortfolio (snapshots compactos)")
+    print("=" * 80)
+
+    timestamps = np.arange(0, 10 * 60_000, 60_000, dtype=np.int64)
+    closes = np.linspace(0.5, 0.6, 10)
+    historico = HistoricoPortfolio(timestamps, closes)
+
+    historico.registrar(3, Decimal('100'), Decimal('0'), timestamp='inicial')
+    historico.registrar(3, Decimal('100'), Decimal('0'))
+    for barra in range(4, 8):
+        historico.registrar(barra, Decimal('40'), Decimal('110.5'))
+    historico.registrar(9, Decimal('95.2'), Decimal('0'))
+
+    assert len(historico) == 7
+    assert historico[0]['timestamp'] == 'inicial'
+    assert historico[1]['timestamp'] == '1970-01-01T00:03:00'
+    assert historico[-1]['preco'] == float(closes[9])
+
+    snap = historico[4]
+    preco = float(closes[6])
+    assert snap == {
+        'timestamp': '1970-01-01T00:06:00', 'saldo_usdt': 40.0, 'saldo_ativo': 110.5, 'preco': preco,
+        'total_value_quote': float(Decimal('40') + Decimal('110.5') * Decimal(str(preco))),
+    }
+    assert list(historico.valores_totais()) == [s['total_value_quote'] for s in historico]
+
+    em_float = HistoricoPortfolio(timestamps, closes)
+    for barra in range(10):
+        em_float.registrar(barra, 30.0, 100.0 + barra // 5)
+    assert list(em_float.valores_totais()) == [30.0 + (100.0 + b // 5) * closes[b] for b in range(10)]
+
+    print("   ✅ Snapshots e curva de patrimônio consistentes")
+
+
+if __name__ == '__main__':
+    test_obter_klines_igual_a_implementacao_pandas()
+    test_candle_em_formacao()
+    test_janela_e_view_sem_copia()
+    test_cursor_monotonico_e_retrocesso()
+    test_barra_simulada_igual_ao_dataframe()
+    test_resample_vetorizado_igual_ao_pandas()
+    test_historico_portfolio_compacto()
+    print("\n✅ Todos os testes passaram!")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Teste: Backtest em lote (vários pares/exchanges)
+================================================
+
+PROBLEMA ORIGINAL:
+- backtest.py simulava um CSV e uma config por vez; comparar ADA (Binance) e
+  XRP (KuCoin) exigia execuções separadas e somar os resultados à mão
+
+CORREÇÃO:
+- src/backtest/lote.py roda jobs (config, CSV, timeframe) num pool de
+  processos, com progresso de cada simulação durante a execução
+- Tabela única por job e curva de patrimônio combinada (cada bot com o
+  próprio capital); backtest.py --lote ARQUIVO.json
+- Job cuja simulação parou no meio (erro capturado pelo BotWorker) sai com
+  erro: fora do cache, da tabela e da curva combinada
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.executor import (
+    ERRO_SIMULACAO_INCOMPLETA,
+    calcular_metricas,
+    executar_simulacao,
+    silenciar_logs_simulacao,
+)
+from src.backtest.lote import carregar_lote, combinar_curvas, executar_job, executar_lote
+from src.core.bot_worker import BotWorker
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+
+def _criar_csv(caminho: Path, semente: int, inicio: str, freq: str, n_barras: int) -> Path:
+    rng = np.random.default_rng(semente)
+    # Queda e recuperação: gera compras do DCA e vendas
+    tendencia = np.concatenate([np.full(n_barras // 2, -0.0003), np.full(n_barras - n_barras // 2, 0.0004)])
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.004, n_barras) + tendencia))).round(6)
+    pd.DataFrame({
+        'timestamp': pd.date_range(inicio, periods=n_barras, freq=freq),
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+        'volume': np.ones(n_barras),
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def _criar_lote(tmp: Path) -> Path:
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    config['nome_instancia'] = 'XRP'
+    config['CAPITAL_INICIAL'] = 400
+    (tmp / 'ada.json').write_text(json.dumps({**config, 'nome_instancia': 'ADA'}), encoding='utf-8')
+    (tmp / 'xrp.json').write_text(json.dumps(config), encoding='utf-8')
+
+    # XRP em 5m começa um dia depois e vai além do ADA
+    _criar_csv(tmp / 'ada_1m.csv', 19, '2024-01-01', '1min', 3 * 1440)
+    _criar_csv(tmp / 'xrp_5m.csv', 91, '2024-01-02', '5min', 4 * 288)
+
+    lote = {
+        'taxa': 0.1,
+        'jobs': [
+            {'config': str(tmp / 'ada.json'), 'csv': str(tmp / 'ada_1m.csv'), 'timeframe': '1m', 'saldo': 1000},
+            {'config': str(tmp / 'xrp.json'), 'csv': str(tmp / 'xrp_5m.csv'), 'timeframe': '5m',
+             'estrategias': 'dca,giro_rapido'},
+        ],
+    }
+    caminho = tmp / 'lote.json'
+    caminho.write_text(json.dumps(lote), encoding='utf-8')
+    return caminho
+
+
+def test_carregar_lote():
+    """Padrões do arquivo e da CLI, CAPITAL_INICIAL, nomes únicos e jobs incompletos."""
+    print("=" * 80)
+    print("🧪 TESTE: Leitura do arquivo de lote")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        jobs = carregar_lote(str(_criar_lote(tmp)), saldo_padrao=None, taxa_padrao=0.5)
+        assert [job.nome for job in jobs] == ['ADA', 'XRP']
+        assert [job.saldo_inicial for job in jobs] == [1000.0, 400.0]  # XRP: CAPITAL_INICIAL
+        assert [job.taxa_pct for job in jobs] == [0.1, 0.1]  # do arquivo, acima da CLI
+        assert jobs[0].estrategias == ['ambas'] and jobs[1].estrategias == ['dca', 'giro_rapido']
+
+        # Lista simples, nomes repetidos e padrões da CLI
+        job = {'config': str(tmp / 'ada.json'), 'csv': str(tmp / 'ada_1m.csv'), 'timeframe': '1m'}
+        (tmp / 'lista.json').write_text(json.dumps([job, job]), encoding='utf-8')
+        jobs = carregar_lote(str(tmp / 'lista.json'), 250, 0.075, 'giro_rapido')
+        assert [j.nome for j in jobs] == ['ADA', 'ADA#2']
+        assert jobs[1].saldo_inicial == 250 and jobs[1].taxa_pct == 0.075
+        assert jobs[1].estrategias == ['giro_rapido']
+
+        (tmp / 'incompleto.json').write_text(json.dumps([{'config': str(tmp / 'ada.json')}]), encoding='utf-8')
+        try:
+            carregar_lote(str(tmp / 'incompleto.json'), 1000, 0.1)
+            assert False, "Job sem CSV deveria ser recusado"
+        except ValueError:
+            pass
+
+    print("   ✅ Padrões, CAPITAL_INICIAL e nomes únicos resolvidos")
+
+
+def test_lote_em_paralelo():
+    """Cada job igual à simulação isolada; curva combinada soma as carteiras no tempo."""
+    print("=" * 80)
+    print("🧪 TESTE: executar_lote em processos")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        jobs = carregar_lote(str(_criar_lote(tmp)))
+        relatorio = executar_lote(jobs, max_workers=2, usar_cache=False)
+
+        assert [r['job'].nome for r in relatorio['jobs']] == ['ADA', 'XRP']
+        for resultado in relatorio['jobs']:
+            job = resultado['job']
+            assert resultado['erro'] is None, resultado['erro']
+            api = SimulatedExchangeAPI(job.caminho_csv, job.saldo_inicial, job.taxa_pct, job.timeframe)
+            isolado = calcular_metricas(executar_simulacao(job.config, api, job.estrategias), job.saldo_inicial)
+            assert resultado['metricas'] == isolado, job.nome
+        assert all(r['metricas']['total_trades'] > 0 for r in relatorio['jobs'])
+
+        curva = relatorio['curva']
+        assert list(curva.columns) == ['timestamp', 'ADA', 'XRP', 'total']
+        assert curva['timestamp'].is_monotonic_increasing and curva['timestamp'].is_unique
+        assert np.allclose(curva['total'], curva['ADA'] + curva['XRP'])
+        # Antes do XRP começar, ele conta com o capital inicial; depois do fim do ADA, o final dele
+        antes_xrp = curva[curva['timestamp'] < pd.Timestamp('2024-01-02')]
+        assert len(antes_xrp) and (antes_xrp['XRP'] == 400.0).all()
+        ada, xrp = relatorio['jobs'][0]['metricas'], relatorio['jobs'][1]['metricas']
+        assert curva['ADA'].iloc[-1] == ada['valor_final']
+        assert curva['total'].iloc[-1] == ada['valor_final'] + xrp['valor_final']
+
+        metricas = relatorio['metricas']
+        assert metricas['capital_inicial'] == 1400.0
+        assert metricas['total_trades'] == ada['total_trades'] + xrp['total_trades']
+        assert np.isclose(metricas['retorno_pct'], (metricas['valor_final'] - 1400) / 1400 * 100)
+
+        # CSV inexistente: erro no job, o resto do lote segue
+        quebrado = jobs[1]._replace(caminho_csv=str(tmp / 'nao_existe.csv'))
+        resultado = executar_job(quebrado, usar_cache=False)
+        assert resultado['erro'] and resultado['curva'] is None
+        parcial = combinar_curvas([relatorio['jobs'][0], resultado])
+        assert list(parcial.columns) == ['timestamp', 'ADA', 'total']
+
+    print(f"   ✅ ADA {ada['retorno_pct']:+.2f}% + XRP {xrp['retorno_pct']:+.2f}% → "
+          f"combinado {metricas['retorno_pct']:+.2f}% ({len(curva):,} pontos)")
+
+
+def test_job_interrompido():
+    """Erro no meio do loop: job com erro e nada gravado no cache."""
+    print("=" * 80)
+    print("🧪 TESTE: Job com simulação incompleta")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    ciclo_original = BotWorker._executar_ciclo_decisao
+
+    def falhar_na_barra_300(worker, *args, **kwargs):
+        if worker.exchange_api.indice_atual >= 300:
+            raise RuntimeError("falha simulada")
+        return ciclo_original(worker, *args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        job = carregar_lote(str(_criar_lote(tmp)))[0]
+        BotWorker._executar_ciclo_decisao = falhar_na_barra_300
+        try:
+            resultado = executar_job(job, usar_cache=True)
+        finally:
+            BotWorker._executar_ciclo_decisao = ciclo_original
+
+        assert resultado['erro'] == ERRO_SIMULACAO_INCOMPLETA
+        assert resultado['curva'] is None and resultado['metricas'] == {}
+        assert not list(tmp.glob('.cache_resultados/*.pkl')), "Resultado parcial não pode ir para o cache"
+        assert list(combinar_curvas([resultado]).columns) == ['timestamp', 'total']
+
+        # Sem a falha, o mesmo job roda inteiro e aí sim vai para o cache
+        completo = executar_job(job, usar_cache=True)
+        assert completo['erro'] is None and not completo['em_cache']
+        assert len(list(tmp.glob('.cache_resultados/*.pkl'))) == 1
+
+    print("   ✅ Job parcial reportado como erro e fora do cache")
+
+
+if __name__ == '__main__':
+    test_carregar_lote()
+    test_lote_em_paralelo()
+    test_job_interrompido()
+    print("\n✅ Todos os testes passaram!")
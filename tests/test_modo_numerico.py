@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Teste: Modo numérico float para backtests
+=========================================
+
+FUNCIONALIDADE:
+- MODO_NUMERICO='float' faz o caminho quente (estratégias, GestaoCapital,
+  PositionManager, BotWorker) operar em float, com constantes convertidas
+  uma única vez
+- Em tempo real o modo é sempre Decimal, mesmo que a config peça float
+- comparar_modos_numericos() roda a mesma config nos dois modos e relata
+  a primeira divergência em trades e saldos finais (tolerância relativa com
+  piso absoluto: saldos zerados terminam como poeira de arredondamento)
+"""
+
+import json
+import sys
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.equivalencia import comparar_modos_numericos, comparar_trades
+from src.core.numerico import CONTEXTO_DECIMAL, ContextoNumerico, criar_contexto_numerico
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+
+def _criar_csv(diretorio: Path, dias: int = 2) -> Path:
+    n_barras = dias * 1440
+    rng = np.random.default_rng(5)
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.003, n_barras)))).round(6)
+    caminho = diretorio / 'num_1m.csv'
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+        'volume': np.ones(n_barras),
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def test_contexto_numerico():
+    """Conversões e truncamento nos dois modos."""
+    print("=" * 80)
+    print("🧪 TESTE: ContextoNumerico (decimal e float)")
+    print("=" * 80)
+
+    exato = ContextoNumerico('decimal')
+    rapido = ContextoNumerico('float')
+
+    assert exato(0.1) == Decimal('0.1') and isinstance(exato.cem, Decimal)
+    valor = Decimal('2.5')
+    assert exato(valor) is valor, "Decimal não deve ser reconvertido"
+    assert rapido('0.1') == 0.1 and isinstance(rapido.cem, float)
+
+    assert exato.arredondar_para_baixo(Decimal('12.39'), exato('10')) == Decimal('12.3')
+    assert rapido.arredondar_para_baixo(12.39, 10.0) == 12.3
+
+    try:
+        ContextoNumerico('binario')
+        assert False, "Modo inválido deveria ser rejeitado"
+    except ValueError:
+        pass
+
+    print("   ✅ Conversões e arredondamento coerentes")
+
+
+def test_tempo_real_sempre_decimal():
+    """MODO_NUMERICO='float' só vale em simulação."""
+    print("=" * 80)
+    print("🧪 TESTE: Fallback para Decimal fora do backtest")
+    print("=" * 80)
+
+    config = {'MODO_NUMERICO': 'float'}
+    assert criar_contexto_numerico(config, modo_simulacao=False) is CONTEXTO_DECIMAL
+    assert not criar_contexto_numerico(config, modo_simulacao=True).exato
+    assert criar_contexto_numerico({}, modo_simulacao=True) is CONTEXTO_DECIMAL
+    assert criar_contexto_numerico({'MODO_NUMERICO': 'xyz'}, modo_simulacao=True) is CONTEXTO_DECIMAL
+
+    print("   ✅ Produção permanece em Decimal")
+
+
+def test_comparar_trades_aponta_divergencia():
+    """A primeira diferença de decisão ou quantidade é reportada."""
+    print("=" * 80)
+    print("🧪 TESTE: Detecção da primeira divergência entre trades")
+    print("=" * 80)
+
+    base = {'side': 'BUY', 'carteira': 'giro_rapido', 'timestamp': '2024-01-01 10:00:00',
+            'motivo': 'COMPRA', 'preco': 0.5, 'quantidade_usdt': 100.0,
+            'quantidade_ativo': 200.0, 'fee': 0.1}
+    quase_igual = dict(base, quantidade_ativo=200.0 * (1 + 1e-13))
+    assert comparar_trades([base], [quase_igual])['equivalentes']
+
+    outra_carteira = dict(base, carteira='acumulacao')
+    resultado = comparar_trades([base, base], [base, outra_carteira])
+    assert not resultado['equivalentes']
+    assert resultado['primeira_divergencia']['indice'] == 1
+    assert resultado['primeira_divergencia']['campo'] == 'carteira'
+
+    resultado = comparar_trades([base, base], [base])
+    assert resultado['primeira_divergencia']['campo'] == 'total_trades'
+
+    # Poeira perto de zero: diferença relativa grande, absoluta desprezível
+    poeira_d = dict(base, quantidade_ativo=9.6e-14)
+    poeira_f = dict(base, quantidade_ativo=1.27e-13)
+    assert comparar_trades([poeira_d], [poeira_f])['equivalentes']
+    assert not comparar_trades([poeira_d], [poeira_f], tolerancia_absoluta=0.0)['equivalentes']
+    assert not comparar_trades([base], [dict(base, quantidade_ativo=200.0 + 1e-6)])['equivalentes']
+
+    print("   ✅ Divergências localizadas")
+
+
+def test_backtest_nos_dois_modos():
+    """Mesma config, mesmos dados: mesmas decisões em decimal e em float."""
+    print("=" * 80)
+    print("🧪 TESTE: Backtest decimal x float")
+    print("=" * 80)
+
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        relatorio = comparar_modos_numericos(
+            config=config, caminho_csv=str(_criar_csv(Path(tmp))), saldo_inicial=1000,
+            taxa_pct=0.1, timeframe_base='1m', estrategias=['ambas']
+        )
+
+    assert config.get('MODO_NUMERICO', 'decimal') == 'decimal', "Config original não deve ser alterada"
+    assert relatorio['trades']['equivalentes'], relatorio['trades']['primeira_divergencia']
+    assert relatorio['equivalentes']
+    total_decimal, total_float = relatorio['metricas']['total_trades']
+    assert total_decimal == total_float
+
+    print(f"   ✅ {total_decimal} trades idênticos "
+          f"(maior Δ rel {relatorio['trades']['maior_diferenca_relativa']:.1e})")
+
+
+if __name__ == '__main__':
+    test_contexto_numerico()
+    test_tempo_real_sempre_decimal()
+    test_comparar_trades_aponta_divergencia()
+    test_backtest_nos_dois_modos()
+    print("\n✅ Todos os testes passaram!")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Teste: Monte Carlo com caminhos de preço por block bootstrap
+============================================================
+
+PROBLEMA ORIGINAL:
+- Os degraus do DCA eram avaliados num único caminho histórico, o que premia
+  parâmetros ajustados às quedas que por acaso aconteceram
+
+CORREÇÃO:
+- src/backtest/monte_carlo.py gera caminhos OHLCV sintéticos (block bootstrap
+  circular dos retornos, vetorizado em NumPy) e roda a estratégia completa em
+  cada um, em paralelo, direto na SimulatedExchangeAPI (sem CSV)
+- Relatório com a distribuição de retorno, drawdown máximo e tempo submerso;
+  backtest.py --monte-carlo N
+- Caminho cuja simulação parou antes do fim sai com erro, fora do resumo
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.executor import (
+    ERRO_SIMULACAO_INCOMPLETA,
+    calcular_metricas,
+    calcular_tempo_submerso,
+    executar_simulacao,
+    silenciar_logs_simulacao,
+)
+from src.backtest.monte_carlo import (
+    avaliar_caminho,
+    decompor_barras,
+    executar_monte_carlo,
+    gerar_caminhos,
+    resumir_distribuicao,
+    tamanho_bloco_padrao,
+)
+from src.core.bot_worker import BotWorker
+from src.exchange.historico_cache import obter_store_historico
+from src.exchange.kline_store import KlineStore
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+
+def _criar_csv(diretorio: Path, n_barras: int = 3 * 1440) -> Path:
+    rng = np.random.default_rng(20)
+    # Volatilidade em regimes (calma / agitada) para o bootstrap preservar
+    sigma = np.repeat(rng.choice([0.001, 0.005], size=n_barras // 360 + 1), 360)[:n_barras]
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 1, n_barras) * sigma))).round(6)
+    abertura = np.concatenate(([close[0]], close[:-1]))
+    caminho = diretorio / 'mc_1m.csv'
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+        'open': abertura,
+        'high': np.maximum(abertura, close) * 1.001,
+        'low': np.minimum(abertura, close) * 0.999,
+        'close': close,
+        'volume': rng.uniform(1, 10, n_barras),
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def test_geracao_dos_caminhos():
+    """Blocos contíguos do histórico, candles coerentes e caminhos reprodutíveis."""
+    print("=" * 80)
+    print("🧪 TESTE: Block bootstrap vetorizado")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = obter_store_historico(str(_criar_csv(Path(tmp))))
+        decomposicao = decompor_barras(store)
+        assert tamanho_bloco_padrao(store.timestamps) == 1440
+
+        bloco = 100
+        valores = gerar_caminhos(decomposicao, range(4), bloco, semente=7)
+        assert valores.shape == (4, 5, len(store))
+        assert np.array_equal(valores[2], gerar_caminhos(decomposicao, [2], bloco, semente=7)[0])
+        assert not np.array_equal(valores[2], gerar_caminhos(decomposicao, [2], bloco, semente=8)[0])
+
+        abertura, maxima, minima, fechamento, volume = valores[1]
+        assert np.array_equal(valores[1][:, 0], store.valores[:, 0]), "Caminho parte da primeira barra real"
+        assert (maxima >= np.maximum(abertura, fechamento) * (1 - 1e-12)).all()
+        assert (minima <= np.minimum(abertura, fechamento) * (1 + 1e-12)).all()
+        assert (fechamento > 0).all()
+
+        # Cada bloco é uma sequência contígua (circular) dos retornos históricos
+        retornos = np.diff(np.log(fechamento))
+        historicos = decomposicao.retornos
+        for inicio in range(0, len(retornos) - bloco, bloco):
+            trecho = retornos[inicio:inicio + bloco]
+            posicao = int(np.argmin(np.abs(historicos - trecho[0])))
+            circular = np.take(historicos, range(posicao, posicao + bloco), mode='wrap')
+            assert np.allclose(trecho, circular, atol=1e-9), inicio
+        assert set(np.round(volume[1:], 9)) <= set(np.round(store.volume[1:], 9))
+
+    print(f"   ✅ {valores.shape[0]} caminhos de {valores.shape[2]:,} barras em blocos de {bloco}")
+
+
+def test_tempo_submerso():
+    """Percentual abaixo do pico e maior intervalo pico → recuperação."""
+    print("=" * 80)
+    print("🧪 TESTE: calcular_tempo_submerso")
+    print("=" * 80)
+
+    dia = 86_400_000
+    valores = np.array([100, 90, 95, 100, 110, 105, 104, 111, 108], dtype=np.float64)
+    timestamps = np.arange(len(valores), dtype=np.int64) * dia
+    tempo = calcular_tempo_submerso(valores, timestamps)
+    # Submersos: 90, 95 (pico 100) | 105, 104 (pico 110) | 108 (sem recuperação)
+    assert np.isclose(tempo['tempo_submerso_pct'], 5 / 9 * 100)
+    assert tempo['maior_submersao_dias'] == 3.0  # dia 0 → recupera no dia 3 (e dia 4 → dia 7)
+    assert calcular_tempo_submerso(np.array([1.0, 2.0, 3.0]), timestamps[:3])['tempo_submerso_pct'] == 0.0
+
+    print("   ✅ Trechos submersos medidos do pico à recuperação")
+
+
+def test_monte_carlo_em_paralelo():
+    """Referência histórica igual ao backtest direto; caminhos iguais aos gerados no processo principal."""
+    print("=" * 80)
+    print("🧪 TESTE: executar_monte_carlo")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = str(_criar_csv(Path(tmp)))
+        relatorio = executar_monte_carlo(
+            config, caminho, 1000, 0.1, '1m', ['ambas'],
+            n_caminhos=3, tamanho_bloco=360, semente=5, max_workers=2
+        )
+
+        assert [r['indice'] for r in relatorio['caminhos']] == [0, 1, 2]
+        assert all(r['erro'] is None for r in relatorio['caminhos']), relatorio['caminhos']
+
+        direto = calcular_metricas(
+            executar_simulacao(config, SimulatedExchangeAPI(caminho, 1000, 0.1, '1m'), ['ambas']), 1000
+        )
+        historico = relatorio['historico']['metricas']
+        assert {k: historico[k] for k in direto} == direto
+
+        store = obter_store_historico(caminho)
+        valores = gerar_caminhos(decompor_barras(store), [1], 360, semente=5)[0]
+        local = avaliar_caminho(KlineStore(store.timestamps, valores), config, ['ambas'], 1000, 0.1, '1m', 1)
+        assert local['metricas'] == relatorio['caminhos'][1]['metricas']
+        assert any(r['metricas']['total_trades'] > 0 for r in relatorio['caminhos'])
+
+        retornos = [r['metricas']['retorno_pct'] for r in relatorio['caminhos']]
+        resumo = relatorio['resumo']['retorno_pct']
+        assert np.isclose(resumo['p50'], np.median(retornos)) and resumo['min'] == min(retornos)
+        assert relatorio['prob_prejuizo_pct'] == sum(r < 0 for r in retornos) / 3 * 100
+        assert 0 <= relatorio['percentil_historico'] <= 100
+
+    print(f"   ✅ Retornos {', '.join(f'{r:+.2f}%' for r in retornos)} | histórico {historico['retorno_pct']:+.2f}%")
+
+
+def test_caminho_incompleto_fora_da_distribuicao():
+    """Simulação que parou no meio (erro capturado pelo BotWorker) não entra no resumo."""
+    print("=" * 80)
+    print("🧪 TESTE: Caminho com simulação incompleta")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    ciclo_original = BotWorker._executar_ciclo_decisao
+
+    def falhar_na_barra_500(worker, *args, **kwargs):
+        if worker.exchange_api.indice_atual >= 500:
+            raise RuntimeError("falha simulada")
+        return ciclo_original(worker, *args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = obter_store_historico(str(_criar_csv(Path(tmp), n_barras=1440)))
+        completo = avaliar_caminho(store, config, ['ambas'], 1000, 0.1, '1m', 0)
+        BotWorker._executar_ciclo_decisao = falhar_na_barra_500
+        try:
+            incompleto = avaliar_caminho(store, config, ['ambas'], 1000, 0.1, '1m', 1)
+        finally:
+            BotWorker._executar_ciclo_decisao = ciclo_original
+
+    assert completo['erro'] is None
+    assert incompleto['erro'] == ERRO_SIMULACAO_INCOMPLETA and incompleto['metricas'] == {}
+    resumo = resumir_distribuicao([completo, incompleto])
+    assert resumo['retorno_pct']['min'] == resumo['retorno_pct']['max'] == completo['metricas']['retorno_pct']
+
+    print("   ✅ Caminho parcial reportado como erro e fora da distribuição")
+
+
+if __name__ == '__main__':
+    test_geracao_dos_caminhos()
+    test_tempo_submerso()
+    test_monte_carlo_em_paralelo()
+    test_caminho_incompleto_fora_da_distribuicao()
+    print("\n✅ Todos os testes passaram!")
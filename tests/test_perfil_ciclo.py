@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Teste: Perfil por etapa do ciclo de decisão
+===========================================
+
+PROBLEMA ORIGINAL:
+- Não havia como saber se um ciclo lento era API, indicador ou disco
+
+CORREÇÃO:
+- PERFIL_CICLO_DECISAO ativa o PerfilCiclo: tempo acumulado e chamadas por
+  etapa (comandos, stops, SMA, DCA, venda, recompra, giro, execução)
+- Resumo no fim do backtest e em get_detailed_status_dict (/details)
+- Desativado, o ciclo marca as etapas em PERFIL_INATIVO (métodos vazios,
+  sem um if por etapa) e o resultado não muda
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.executor import preparar_config_simulacao, silenciar_logs_simulacao
+from src.core.bot_worker import BotWorker
+from src.core.perfil_ciclo import ETAPAS_CICLO, PERFIL_INATIVO, PerfilCiclo
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+
+def _criar_csv(diretorio: Path, n_barras: int = 3 * 1440) -> Path:
+    rng = np.random.default_rng(21)
+    # Queda e recuperação: aciona degraus de DCA, vendas e o giro
+    tendencia = np.concatenate([np.full(n_barras // 2, -0.0002), np.full(n_barras - n_barras // 2, 0.0003)])
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.003, n_barras) + tendencia))).round(6)
+    caminho = diretorio / 'perfil_1m.csv'
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+        'volume': np.ones(n_barras),
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def _rodar(caminho: Path, diretorio: Path, perfil: bool) -> BotWorker:
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    config['PERFIL_CICLO_DECISAO'] = perfil
+    config['SALTAR_BARRAS_OCIOSAS'] = False
+    preparar_config_simulacao(config, ['ambas'], diretorio / ('com_perfil' if perfil else 'sem_perfil'))
+    api = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m')
+    worker = BotWorker(config=config, exchange_api=api, modo_simulacao=True)
+    worker.run()
+    return worker
+
+
+def test_acumulo_por_etapa():
+    """Tempo vai para a etapa aberta; encerrar fecha a última."""
+    print("=" * 80)
+    print("🧪 TESTE: Acúmulo de tempo e chamadas por etapa")
+    print("=" * 80)
+
+    perfil = PerfilCiclo()
+    for _ in range(3):
+        perfil.iniciar()
+        perfil.entrar('comandos')
+        perfil.entrar('stops')
+        time.sleep(0.002)
+        perfil.entrar('execucao')
+        perfil.encerrar()
+
+    resumo = perfil.resumo()
+    etapas = {etapa['etapa']: etapa for etapa in resumo['etapas']}
+    assert resumo['ciclos'] == 3
+    assert [etapa['etapa'] for etapa in resumo['etapas']] == list(ETAPAS_CICLO)
+    assert etapas['comandos']['chamadas'] == etapas['stops']['chamadas'] == etapas['execucao']['chamadas'] == 3
+    assert etapas['dca']['chamadas'] == 0 and etapas['dca']['tempo_total_s'] == 0.0
+    assert etapas['stops']['tempo_total_s'] >= 0.006
+    assert etapas['stops']['percentual'] > 90
+    assert abs(sum(etapa['percentual'] for etapa in resumo['etapas']) - 100) < 1e-6
+
+    linhas = perfil.formatar()
+    assert any(linha.strip().startswith('stops') for linha in linhas)
+    assert not any(linha.strip().startswith('dca') for linha in linhas)
+
+    perfil.reiniciar()
+    assert perfil.resumo()['ciclos'] == 0 and perfil.resumo()['tempo_total_s'] == 0.0
+
+    print("   ✅ Tempo atribuído à etapa aberta e resumo consistente")
+
+
+def test_backtest_com_perfil():
+    """Mesmos trades com e sem perfil; etapas contadas por ciclo."""
+    print("=" * 80)
+    print("🧪 TESTE: BotWorker.run com PERFIL_CICLO_DECISAO")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp))
+        sem_perfil = _rodar(caminho, Path(tmp), perfil=False)
+        com_perfil = _rodar(caminho, Path(tmp), perfil=True)
+
+    assert sem_perfil.perfil_ciclo is None
+    assert PERFIL_INATIVO.resumo()['ciclos'] == 0 and PERFIL_INATIVO.resumo()['tempo_total_s'] == 0.0
+    trades_sem = sem_perfil.exchange_api.get_resultados()['trades']
+    trades_com = com_perfil.exchange_api.get_resultados()['trades']
+    assert len(trades_com) > 0, "Cenário sem trades não testa a etapa de execução"
+    assert [(t['side'], t['preco']) for t in trades_com] == [(t['side'], t['preco']) for t in trades_sem]
+
+    resumo = com_perfil.perfil_ciclo.resumo()
+    etapas = {etapa['etapa']: etapa for etapa in resumo['etapas']}
+    ciclos = resumo['ciclos']
+    assert ciclos == com_perfil.exchange_api.total_barras - 200, ciclos
+    assert etapas['comandos']['chamadas'] == etapas['sma']['chamadas'] == ciclos
+    assert etapas['stops']['chamadas'] == 2 * ciclos  # uma entrada por carteira
+    assert 0 < etapas['dca']['chamadas'] <= ciclos
+    assert 0 < etapas['giro']['chamadas'] <= ciclos
+    assert etapas['execucao']['chamadas'] >= len(trades_com)
+    assert etapas['tarefas_periodicas']['chamadas'] == 0  # só em tempo real
+    assert resumo['tempo_total_s'] > 0
+
+    print(f"   ✅ {ciclos:,} ciclos, {len(trades_com)} trades iguais, "
+          f"{resumo['media_ciclo_us']:.1f} µs/ciclo")
+
+
+if __name__ == '__main__':
+    test_acumulo_por_etapa()
+    test_backtest_com_perfil()
+    print("\n✅ Todos os testes passaram!")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Teste: Perfil de log da simulação
+=================================
+
+PROBLEMA ORIGINAL:
+- No backtest, cada barra formatava f-strings de logger.debug (RSI do giro,
+  cooldowns e degraus do DCA) e criava LogRecords descartados só no handler
+- Vendas por stop eram narradas em WARNING, linha a linha
+
+CORREÇÃO:
+- PerfilLogSimulacao (src/utils/logger.py) sobe o nível do logger durante o
+  loop: DEBUG/INFO param em isEnabledFor, antes de formatar argumentos
+- Chamadas quentes passam argumentos no estilo '%s' (formatação adiada)
+- Trades vão para SinkEventosTrade (BotWorker.eventos_trade)
+- Opt-in: PERFIL_LOG_SIMULACAO=true na config ou backtest.py --perfil-log
+"""
+
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.executor import preparar_config_simulacao
+from src.core.bot_worker import BotWorker
+from src.exchange.simulated_api import SimulatedExchangeAPI
+from src.utils.logger import ColoredFormatter, PerfilLogSimulacao, SinkEventosTrade, get_loggers
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+
+class _ContadorRegistros(logging.Handler):
+    """Conta os registros que chegam ao handler, por nível."""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.niveis = []
+
+    def emit(self, record):
+        self.niveis.append(record.levelno)
+
+
+class _Formatacoes:
+    """Conta quantas vezes o valor foi convertido para texto."""
+
+    def __init__(self):
+        self.total = 0
+
+    def __str__(self):
+        self.total += 1
+        return 'valor'
+
+
+def _criar_csv(diretorio: Path, n_barras: int = 3 * 1440) -> Path:
+    rng = np.random.default_rng(34)
+    # Queda e recuperação: aciona degraus de DCA, stops e o giro
+    tendencia = np.concatenate([np.full(n_barras // 2, -0.0002), np.full(n_barras - n_barras // 2, 0.0003)])
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.003, n_barras) + tendencia))).round(6)
+    caminho = diretorio / 'log_1m.csv'
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+        'volume': np.ones(n_barras),
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def _rodar(caminho: Path, diretorio: Path, perfil_log: Optional[bool]):
+    """perfil_log=None: chave ausente da config (padrão do BotWorker)."""
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    config.pop('PERFIL_LOG_SIMULACAO', None)
+    if perfil_log is not None:
+        config['PERFIL_LOG_SIMULACAO'] = perfil_log
+    preparar_config_simulacao(config, ['ambas'], diretorio / ('com_perfil' if perfil_log else 'sem_perfil'))
+    api = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m')
+    worker = BotWorker(config=config, exchange_api=api, modo_simulacao=True)
+
+    logger = get_loggers()[0].logger
+    contador = _ContadorRegistros()
+    logger.addHandler(contador)
+    try:
+        worker.run()
+    finally:
+        logger.removeHandler(contador)
+    return worker, contador.niveis
+
+
+def test_perfil_descarta_antes_de_formatar():
+    """DEBUG/INFO descartados sem formatar argumentos; nível e formatters restaurados."""
+    print("=" * 80)
+    print("🧪 TESTE: PerfilLogSimulacao descarta DEBUG/INFO antes de formatar")
+    print("=" * 80)
+
+    logger_bot, _ = get_loggers()
+    logger = logger_bot.logger
+    nivel_original = logger.level
+    logger.setLevel(logging.DEBUG)
+    formatters = [handler.formatter for handler in logger.handlers]
+    contador = _ContadorRegistros()
+    logger.addHandler(contador)
+    adaptador = logging.LoggerAdapter(logger, {'context': 'teste'})
+    valor = _Formatacoes()
+    try:
+        with PerfilLogSimulacao() as eventos:
+            assert isinstance(eventos, SinkEventosTrade)
+            assert not logger_bot.isEnabledFor(logging.INFO)
+            adaptador.debug("debug %s", valor)
+            logger_bot.info("info %s", valor)
+            adaptador.warning("aviso %s", "visível")
+            # Console sem cores enquanto o perfil está ativo
+            assert not any(isinstance(h.formatter, ColoredFormatter) for h in logger.handlers)
+
+        assert contador.niveis == [logging.WARNING], contador.niveis
+        assert valor.total == 0, "Argumentos de DEBUG/INFO não deveriam ser formatados"
+        assert logger.level == logging.DEBUG
+        assert [handler.formatter for handler in logger.handlers if handler is not contador] == formatters
+
+        # Nunca abaixa um nível já mais alto (ex: sweep silenciado em ERROR)
+        logger.setLevel(logging.ERROR)
+        with PerfilLogSimulacao():
+            assert logger.level == logging.ERROR
+        assert logger.level == logging.ERROR
+    finally:
+        logger.removeHandler(contador)
+        logger.setLevel(nivel_original)
+
+    print("   ✅ Registros abaixo de WARNING descartados e estado restaurado")
+
+
+def test_sink_eventos_trade():
+    """Eventos guardados como tuplas e lidos como dicts na ordem."""
+    print("=" * 80)
+    print("🧪 TESTE: SinkEventosTrade")
+    print("=" * 80)
+
+    sink = SinkEventosTrade()
+    sink.registrar('2024-01-01T00:00:00', 'COMPRA', 'acumulacao', 0.5, 100, meta='1')
+    sink.registrar('2024-01-01T01:00:00', 'VENDA', 'giro_rapido', 0.55, 100, lucro_usdt=5.0, observacao='TSL')
+    assert len(sink) == 2
+    eventos = sink.obter_eventos()
+    assert [e['tipo'] for e in eventos] == ['COMPRA', 'VENDA']
+    assert eventos[0]['meta'] == '1' and eventos[0]['lucro_usdt'] is None
+    assert eventos[1]['lucro_usdt'] == 5.0 and eventos[1]['observacao'] == 'TSL'
+    assert set(eventos[0]) == set(SinkEventosTrade.CAMPOS)
+
+    print("   ✅ Eventos compactos preservam ordem e campos")
+
+
+def test_backtest_com_perfil_log():
+    """Mesmos trades; trades no destino estruturado e sem DEBUG/INFO durante o loop."""
+    print("=" * 80)
+    print("🧪 TESTE: BotWorker.run com PERFIL_LOG_SIMULACAO")
+    print("=" * 80)
+
+    logger = get_loggers()[0].logger
+    nivel_original = logger.level
+    logger.setLevel(logging.DEBUG)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            caminho = _criar_csv(Path(tmp))
+            # Opt-in: sem a chave na config o log segue o padrão
+            sem_perfil, niveis_sem = _rodar(caminho, Path(tmp), perfil_log=None)
+            com_perfil, niveis_com = _rodar(caminho, Path(tmp), perfil_log=True)
+    finally:
+        logger.setLevel(nivel_original)
+
+    trades_sem = sem_perfil.exchange_api.get_resultados()['trades']
+    trades_com = com_perfil.exchange_api.get_resultados()['trades']
+    assert len(trades_com) > 0, "Cenário sem trades não testa o destino estruturado"
+    assert [(t['side'], t['preco']) for t in trades_com] == [(t['side'], t['preco']) for t in trades_sem]
+
+    assert sem_perfil.eventos_trade is None
+    eventos = com_perfil.eventos_trade.obter_eventos()
+    assert len(eventos) == len(trades_com)
+    assert [e['tipo'] for e in eventos] == ['COMPRA' if t['side'] == 'BUY' else 'VENDA' for t in trades_com]
+
+    debug_sem = sum(1 for nivel in niveis_sem if nivel == logging.DEBUG)
+    debug_com = sum(1 for nivel in niveis_com if nivel == logging.DEBUG)
+    avisos_sem = sum(1 for nivel in niveis_sem if nivel == logging.WARNING)
+    avisos_com = sum(1 for nivel in niveis_com if nivel == logging.WARNING)
+    assert debug_sem > 1000, debug_sem
+    assert debug_com < debug_sem / 100, (debug_com, debug_sem)
+    assert avisos_com < avisos_sem, (avisos_com, avisos_sem)
+    assert logger.level == nivel_original
+
+    print(f"   ✅ {len(trades_com)} trades iguais; registros DEBUG {debug_sem:,} → {debug_com:,}, "
+          f"WARNING {avisos_sem} → {avisos_com}")
+
+
+if __name__ == '__main__':
+    test_perfil_descarta_antes_de_formatar()
+    test_sink_eventos_trade()
+    test_backtest_com_perfil_log()
+    print("\n✅ Todos os testes passaram!")
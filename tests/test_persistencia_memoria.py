@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Teste: Persistência em memória para backtests
+=============================================
+
+PROBLEMA ORIGINAL:
+- Cada backtest criava um SQLite e um JSON temporários; StateManager
+  reescrevia e renomeava o JSON a cada set_state (cada pico de TSL, cada
+  HWM) e cada ordem abria uma conexão SQLite nova
+
+CORREÇÃO:
+- StateManager delega a persistência a um backend plugável
+  (ArmazenamentoEstadoJSON / ArmazenamentoEstadoMemoria)
+- DatabaseManager(em_memoria=True) usa um SQLite em memória com conexão única
+- BotWorker escolhe o modo em memória quando modo_simulacao=True e pode
+  exportar tudo para disco ao final (EXPORTAR_PERSISTENCIA_BACKTEST)
+"""
+
+import json
+import sqlite3
+import sys
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.executor import preparar_config_simulacao
+from src.core.bot_worker import BotWorker
+from src.core.position_manager import PositionManager
+from src.exchange.simulated_api import SimulatedExchangeAPI
+from src.persistencia.armazenamento import ArmazenamentoEstadoMemoria
+from src.persistencia.database import DatabaseManager
+from src.persistencia.state_manager import StateManager
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+
+def test_state_manager_em_memoria():
+    """Estado em memória não toca o disco; exportar grava o JSON final."""
+    print("=" * 80)
+    print("🧪 TESTE: StateManager com ArmazenamentoEstadoMemoria")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        armazenamento = ArmazenamentoEstadoMemoria()
+        state = StateManager(armazenamento=armazenamento)
+        for i in range(100):
+            state.set_state('tsl_pico', i)
+        state.set_state('stops', {'giro_rapido': None})
+        assert state.delete_state('tsl_pico')
+
+        assert list(Path(tmp).iterdir()) == []
+        assert armazenamento.total_salvamentos == 102
+
+        destino = Path(tmp) / 'sub' / 'estado.json'
+        state.exportar(str(destino))
+        assert json.loads(destino.read_text(encoding='utf-8')) == {'stops': {'giro_rapido': None}}
+
+        # Backend JSON (padrão) continua lendo o que foi exportado
+        assert StateManager(str(destino)).get_all_state() == {'stops': {'giro_rapido': None}}
+
+    print("   ✅ 102 alterações sem I/O, exportação correta")
+
+
+def test_database_em_memoria():
+    """SQLite em memória: ordens, PositionManager e exportação para arquivo."""
+    print("=" * 80)
+    print("🧪 TESTE: DatabaseManager(em_memoria=True)")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'bot.db'
+        db = DatabaseManager(db_path, Path(tmp) / 'backup', em_memoria=True)
+        assert not db_path.exists() and not (Path(tmp) / 'backup').exists()
+
+        for tipo, preco in (('COMPRA', '0.50'), ('COMPRA', '0.40'), ('VENDA', '0.60')):
+            db.registrar_ordem({
+                'tipo': tipo, 'par': 'ADA/USDT', 'quantidade': Decimal('100'),
+                'preco': Decimal(preco), 'valor_total': Decimal(preco) * 100,
+                'estrategia': 'giro_rapido', 'timestamp': f'2024-01-0{1 if tipo == "COMPRA" else 2}T00:00:00'
+            })
+
+        # row_factory definido por um método não vaza para os seguintes
+        assert db.obter_ultima_ordem('VENDA')['preco'] == 0.6
+        assert db.ordem_ja_existe('inexistente') is False
+
+        position_manager = PositionManager(db)
+        assert position_manager.get_quantidade_total('giro_rapido') == Decimal('100')
+
+        db.exportar()
+        assert db_path.exists()
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM ordens").fetchone()[0] == 3
+
+    print("   ✅ Banco em memória operacional e exportado")
+
+
+def test_bot_worker_simulacao_sem_arquivos():
+    """BotWorker em simulação não cria banco/estado; exporta ao final se pedido."""
+    print("=" * 80)
+    print("🧪 TESTE: BotWorker(modo_simulacao=True) com persistência em memória")
+    print("=" * 80)
+
+    n_barras = 1500
+    rng = np.random.default_rng(2)
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.003, n_barras)))).round(6)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho_csv = Path(tmp) / 'mem_1m.csv'
+        pd.DataFrame({
+            'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+            'open': close, 'high': close, 'low': close, 'close': close,
+            'volume': np.ones(n_barras),
+        }).to_csv(caminho_csv, index=False)
+
+        config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+        dir_execucao = Path(tmp) / 'execucao'
+        preparar_config_simulacao(config, ['ambas'], dir_execucao)
+
+        api = SimulatedExchangeAPI(str(caminho_csv), 1000, 0.1, '1m')
+        worker = BotWorker(config=config, exchange_api=api, modo_simulacao=True)
+        assert worker.db.em_memoria
+        assert isinstance(worker.state.armazenamento, ArmazenamentoEstadoMemoria)
+        worker.run()
+        assert not dir_execucao.exists(), "Backtest não deveria gravar nada em disco"
+
+        config['EXPORTAR_PERSISTENCIA_BACKTEST'] = True
+        api = SimulatedExchangeAPI(str(caminho_csv), 1000, 0.1, '1m')
+        worker = BotWorker(config=config, exchange_api=api, modo_simulacao=True)
+        worker.run()
+        assert Path(config['DATABASE_PATH']).exists()
+        assert Path(config['STATE_FILE_PATH']).exists()
+        with sqlite3.connect(config['DATABASE_PATH']) as conn:
+            total_ordens = conn.execute("SELECT COUNT(*) FROM ordens").fetchone()[0]
+        assert total_ordens == len(api.get_resultados()['trades'])
+
+    print(f"   ✅ Nada gravado durante a simulação; {total_ordens} ordens exportadas")
+
+
+if __name__ == '__main__':
+    test_state_manager_em_memoria()
+    test_database_em_memoria()
+    test_bot_worker_simulacao_sem_arquivos()
+    print("\n✅ Todos os testes passaram!")
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Teste: RSI incremental (Wilder) vs TA-Lib
+=========================================
+
+PROBLEMA ORIGINAL:
+- AnaliseTecnica.get_rsi buscava 100 klines e rodava talib.RSI na janela
+  inteira a cada ciclo, mesmo sem nenhum candle novo fechado
+
+CORREÇÃO:
+- RSIIncremental mantém as médias de Wilder dos candles fechados,
+  atualiza em O(1) quando um candle fecha e usa cache entre fechamentos
+- Os valores precisam bater com o TA-Lib
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import talib
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.analise_tecnica import AnaliseTecnica
+from src.core.rsi_incremental import RSIIncremental
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+
+def _serie_closes(n: int, seed: int = 3) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 0.5 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+def test_streaming_igual_talib_historico_completo():
+    """Alimentando candle a candle, o RSI deve ser idêntico ao TA-Lib na série inteira."""
+    print("=" * 80)
+    print("🧪 TESTE: RSI incremental vs talib.RSI (histórico completo)")
+    print("=" * 80)
+
+    closes = _serie_closes(600)
+    timestamps = np.arange(len(closes), dtype=np.int64) * 60_000
+    esperado = talib.RSI(closes, timeperiod=14)
+
+    rsi = RSIIncremental(14)
+    # Primeira chamada semeia com todo o histórico disponível; depois janelas de 100
+    for fim in range(15, len(closes) + 1):
+        inicio = 0 if fim < 120 else fim - 100
+        valor = rsi.atualizar(timestamps[inicio:fim], closes[inicio:fim])
+        assert abs(valor - esperado[fim - 1]) < 1e-8, \
+            f"RSI divergente no candle {fim - 1}: {valor} vs {esperado[fim - 1]}"
+
+    print("   ✅ Idêntico ao TA-Lib (tolerância 1e-8)")
+
+
+def test_tolerancia_vs_janela_de_100_candles():
+    """Comparado com talib.RSI sobre a janela de 100 candles usada antes, a diferença é mínima."""
+    print("=" * 80)
+    print("🧪 TESTE: RSI incremental vs talib.RSI (janela de 100 candles)")
+    print("=" * 80)
+
+    closes = _serie_closes(2000, seed=11)
+    timestamps = np.arange(len(closes), dtype=np.int64) * 60_000
+
+    rsi = RSIIncremental(14)
+    maior_diferenca = 0.0
+    for fim in range(100, len(closes) + 1):
+        janela = slice(fim - 100, fim)
+        valor = rsi.atualizar(timestamps[janela], closes[janela])
+        referencia = talib.RSI(closes[janela], timeperiod=14)[-1]
+        maior_diferenca = max(maior_diferenca, abs(valor - referencia))
+
+    print(f"   📊 Maior diferença: {maior_diferenca:.6f} pontos de RSI")
+    assert maior_diferenca < 0.1, f"Diferença acima da tolerância: {maior_diferenca}"
+
+
+def test_cache_e_candle_em_formacao():
+    """Sem candle novo o estado não anda; o candle em formação só altera o valor provisório."""
+    print("=" * 80)
+    print("🧪 TESTE: Cache entre fechamentos e candle em formação")
+    print("=" * 80)
+
+    closes = _serie_closes(200)
+    timestamps = np.arange(len(closes), dtype=np.int64) * 60_000
+
+    rsi = RSIIncremental(14)
+    valor = rsi.atualizar(timestamps, closes)
+    estado = (rsi.media_ganho, rsi.media_perda, rsi.ts_ultimo_fechado)
+
+    # Mesma janela: cache
+    assert rsi.atualizar(timestamps, closes) == valor
+
+    # Candle em formação muda de preço (modo real): estado dos fechados intacto
+    closes_alterados = closes.copy()
+    closes_alterados[-1] *= 1.02
+    novo_valor = rsi.atualizar(timestamps, closes_alterados)
+    assert novo_valor > valor, "Alta no candle em formação deve subir o RSI"
+    assert (rsi.media_ganho, rsi.media_perda, rsi.ts_ultimo_fechado) == estado
+    assert abs(novo_valor - talib.RSI(closes_alterados, timeperiod=14)[-1]) < 1e-8
+
+    # valor_com_close reproduz o mesmo cálculo sem buscar klines
+    assert abs(rsi.valor_com_close(float(closes_alterados[-1])) - novo_valor) < 1e-12
+
+    print("   ✅ Cache e candle em formação corretos")
+
+
+def test_get_rsi_no_backtest():
+    """get_rsi com a API simulada deve acompanhar o TA-Lib barra a barra."""
+    print("=" * 80)
+    print("🧪 TESTE: AnaliseTecnica.get_rsi (SimulatedExchangeAPI)")
+    print("=" * 80)
+
+    n = 3000
+    closes = _serie_closes(n, seed=5).round(6)
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n, freq='1min'),
+        'open': closes, 'high': closes, 'low': closes, 'close': closes,
+        'volume': np.ones(n),
+    })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = Path(tmp) / 'rsi_1m.csv'
+        df.to_csv(caminho, index=False)
+        api = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m')
+        analise = AnaliseTecnica(api)
+
+        maior_diferenca = 0.0
+        while api.get_barra_atual() is not None:
+            rsi = analise.get_rsi('ADA/USDT', '5m', periodo=14, limite_candles=100)
+            janela = api.obter_klines_array('ADA/USDT', '5m', 100)
+            referencia = talib.RSI(np.ascontiguousarray(janela.close), timeperiod=14)[-1]
+            maior_diferenca = max(maior_diferenca, abs(float(rsi) - referencia))
+
+    print(f"   📊 Maior diferença: {maior_diferenca:.6f} pontos de RSI")
+    assert maior_diferenca < 0.1, f"Diferença acima da tolerância: {maior_diferenca}"
+
+
+
+def test_projetar_igual_atualizar():
+    """projetar() devolve o que atualizar() daria em cada momento, sem mexer no estado."""
+    print("=" * 80)
+    print("🧪 TESTE: Projeção do RSI sem alterar o estado")
+    print("=" * 80)
+
+    closes = _serie_closes(300, seed=11)
+    timestamps = np.arange(len(closes), dtype=np.int64) * 60_000
+    rsi = RSIIncremental(14)
+    rsi.atualizar(timestamps[:120], closes[:120])
+    estado = (rsi.media_ganho, rsi.media_perda, rsi.ultimo_close_fechado)
+
+    # Momento k: candles até 118 + k fechados, candle 119 + k em formação (com close provisório)
+    rng = np.random.default_rng(2)
+    passos = np.repeat(np.arange(40), 3)
+    closes_formando = closes[119 + passos] * (1 + rng.normal(0, 0.002, len(passos)))
+    projetados = rsi.projetar(closes[119:], passos, closes_formando)
+    assert (rsi.media_ganho, rsi.media_perda, rsi.ultimo_close_fechado) == estado
+
+    referencia = RSIIncremental(14)
+    referencia.atualizar(timestamps[:120], closes[:120])
+    for passo, close_formando, projetado in zip(passos, closes_formando, projetados):
+        fim = 120 + int(passo)
+        janela = closes[fim - 100:fim].copy()
+        janela[-1] = close_formando
+        esperado = referencia.atualizar(timestamps[fim - 100:fim], janela)
+        assert abs(projetado - esperado) < 1e-9, f"Passo {passo}: {projetado} vs {esperado}"
+
+    print(f"   ✅ {len(passos)} momentos projetados iguais a atualizar()")
+
+
+if __name__ == '__main__':
+    test_streaming_igual_talib_historico_completo()
+    test_tolerancia_vs_janela_de_100_candles()
+    test_cache_e_candle_em_formacao()
+    test_get_rsi_no_backtest()
+    test_projetar_igual_atualizar()
+    print("\n✅ Todos os testes passaram!")
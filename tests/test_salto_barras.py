@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Teste: Salto de barras ociosas no loop de simulação
+===================================================
+
+FUNCIONALIDADE:
+- Depois de cada ciclo de decisão o PlanejadorSaltos calcula a próxima barra
+  em que algum gatilho pode disparar (stops, degraus, vendas, SMA, cooldown,
+  RSI do giro) e o BotWorker pula direto para ela
+- As barras puladas ganham snapshots em bloco (avancar_sem_eventos)
+- Com e sem SALTAR_BARRAS_OCIOSAS os trades e os snapshots precisam ser
+  idênticos (comparar_salto_de_barras), nos dois modos numéricos
+- Opt-in: sem a chave na config o loop roda barra a barra
+"""
+
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.equivalencia import comparar_salto_de_barras, comparar_trades
+from src.backtest.executor import executar_simulacao, silenciar_logs_simulacao
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+
+def _criar_csv(diretorio: Path, dias: int = 5, lacuna_horas: int = 0) -> Path:
+    n_barras = dias * 1440
+    rng = np.random.default_rng(13)
+    # Queda e recuperação: aciona degraus de DCA, metas de venda e o giro
+    tendencia = np.concatenate([np.full(n_barras // 2, -0.0002), np.full(n_barras - n_barras // 2, 0.0003)])
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.003, n_barras) + tendencia))).round(6)
+    timestamps = pd.date_range('2024-01-01', periods=n_barras, freq='1min')
+    if lacuna_horas:
+        # Buraco no histórico (exchange fora do ar): o tempo salta, as barras não
+        meio = n_barras // 3
+        timestamps = timestamps[:meio].append(timestamps[meio:] + pd.Timedelta(hours=lacuna_horas))
+
+    caminho = diretorio / 'salto_1m.csv'
+    pd.DataFrame({
+        'timestamp': timestamps,
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+        'volume': np.ones(n_barras),
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def _config(modo: str = 'decimal', **chaves) -> dict:
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    config['MODO_NUMERICO'] = modo
+    config.update(chaves)
+    return config
+
+
+def _comparar(caminho: Path, config: dict, estrategia: str) -> dict:
+    relatorio = comparar_salto_de_barras(
+        config=config, caminho_csv=str(caminho), saldo_inicial=1000,
+        taxa_pct=0.1, timeframe_base='1m', estrategias=[estrategia]
+    )
+    assert relatorio['trades']['equivalentes'], relatorio['trades']['primeira_divergencia']
+    assert relatorio['snapshots'] is None, relatorio['snapshots']
+    assert relatorio['equivalentes']
+    assert relatorio['total_trades'] > 0, "Cenário sem trades não testa nada"
+    assert relatorio['barras_saltadas'] > 0, "Nenhuma barra foi pulada"
+    return relatorio
+
+
+def test_avancar_sem_eventos():
+    """Snapshots em bloco iguais aos gravados barra a barra."""
+    print("=" * 80)
+    print("🧪 TESTE: avancar_sem_eventos x get_barra_atual + record_snapshot")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api = SimulatedExchangeAPI(str(_criar_csv(Path(tmp), dias=1)), 1000, 0.1, '1m')
+        barra_a_barra, com_salto = api.clonar(), api.clonar()
+
+        for _ in range(700):
+            barra_a_barra.get_barra_atual()
+            barra_a_barra.record_snapshot()
+
+        com_salto.get_barra_atual()
+        com_salto.record_snapshot()
+        com_salto.avancar_sem_eventos(com_salto.indice_atual + 699)
+
+    assert com_salto.indice_atual == barra_a_barra.indice_atual
+    assert com_salto.barras_sem_eventos == 699
+    assert list(com_salto.portfolio_over_time) == list(barra_a_barra.portfolio_over_time)
+
+    print("   ✅ 700 snapshots idênticos")
+
+
+def test_mesmos_trades_e_snapshots():
+    """ambas, dca e giro rápido, em decimal e float: salto não muda nada."""
+    print("=" * 80)
+    print("🧪 TESTE: Barra a barra x salto de barras (estratégias e modos)")
+    print("=" * 80)
+
+    silenciar_logs_simulacao(logging.ERROR)
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp))
+        for estrategia in ['ambas', 'dca', 'giro_rapido']:
+            for modo in ['decimal', 'float']:
+                relatorio = _comparar(caminho, _config(modo), estrategia)
+                print(f"   ✅ {estrategia}/{modo}: {relatorio['total_trades']} trades, "
+                      f"{relatorio['barras_saltadas']}/{relatorio['total_barras']} barras puladas")
+
+
+def test_lacuna_e_cooldowns():
+    """Buraco nos dados e cooldowns longos (giro e DCA) continuam equivalentes."""
+    print("=" * 80)
+    print("🧪 TESTE: Salto de barras com lacuna no histórico e cooldowns")
+    print("=" * 80)
+
+    silenciar_logs_simulacao(logging.ERROR)
+    config = _config('float', COOLDOWN_GLOBAL_APOS_COMPRA_MINUTOS=240)
+    config['estrategia_giro_rapido'].update(cooldown_compra_segundos=7200, rsi_timeframe_entrada='15m')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp), lacuna_horas=6)
+        for estrategia in ['ambas', 'giro_rapido']:
+            relatorio = _comparar(caminho, config, estrategia)
+            print(f"   ✅ {estrategia}: {relatorio['total_trades']} trades, "
+                  f"{relatorio['barras_saltadas']}/{relatorio['total_barras']} barras puladas")
+
+
+def test_salto_desligado_por_padrao():
+    """Sem SALTAR_BARRAS_OCIOSAS na config: barra a barra; ligado: mesmos trades."""
+    print("=" * 80)
+    print("🧪 TESTE: Salto de barras é opt-in")
+    print("=" * 80)
+
+    silenciar_logs_simulacao(logging.ERROR)
+    with tempfile.TemporaryDirectory() as tmp:
+        api_base = SimulatedExchangeAPI(str(_criar_csv(Path(tmp), dias=3)), 1000, 0.1, '1m')
+        config = _config()
+        config.pop('SALTAR_BARRAS_OCIOSAS', None)
+
+        api_padrao = api_base.clonar()
+        padrao = executar_simulacao(config, api_padrao, ['ambas'])
+        assert api_padrao.barras_sem_eventos == 0, "Salto não deveria estar ativo sem a chave"
+
+        api_salto = api_base.clonar()
+        com_salto = executar_simulacao(dict(config, SALTAR_BARRAS_OCIOSAS=True), api_salto, ['ambas'])
+        assert api_salto.barras_sem_eventos > 0
+        assert len(padrao['trades']) > 0, "Cenário sem trades não testa nada"
+        comparacao = comparar_trades(padrao['trades'], com_salto['trades'], tolerancia=0.0, tolerancia_absoluta=0.0)
+        assert comparacao['equivalentes'], comparacao['primeira_divergencia']
+        assert com_salto['saldo_final_usdt'] == padrao['saldo_final_usdt']
+        assert com_salto['saldo_final_ativo'] == padrao['saldo_final_ativo']
+
+    print(f"   ✅ {len(padrao['trades'])} trades idênticos; "
+          f"{api_salto.barras_sem_eventos} barras puladas só com a chave ligada")
+
+
+if __name__ == '__main__':
+    test_avancar_sem_eventos()
+    test_mesmos_trades_e_snapshots()
+    test_lacuna_e_cooldowns()
+    test_salto_desligado_por_padrao()
+    print("\n✅ Todos os testes passaram!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Teste: Série de SMA de referência no backtest
+=============================================
+
+BUG ORIGINAL:
+- _atualizar_sma_referencia usava datetime.now() para decidir quando
+  recalcular; no backtest a SMA era calculada uma única vez no início e a
+  distancia_sma do DCA era medida contra uma média congelada
+
+CORREÇÃO:
+- AnaliseTecnica.calcular_serie_sma_multiplos_timeframes pré-calcula a SMA
+  ponderada (40% 1h + 60% 4h) para cada barra, sem lookahead
+- BotWorker consulta a série por índice e respeita
+  INTERVALO_ATUALIZACAO_SMA_HORAS no tempo simulado
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.analise_tecnica import AnaliseTecnica
+from src.core.bot_worker import BotWorker
+from src.core.numerico import CONTEXTO_DECIMAL
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+
+def _criar_api(diretorio: Path, n_barras: int = 6000) -> SimulatedExchangeAPI:
+    rng = np.random.default_rng(21)
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.002, n_barras)))).round(6)
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+        'open': close, 'high': close, 'low': close, 'close': close,
+        'volume': np.ones(n_barras),
+    }).to_csv(diretorio / 'sma_1m.csv', index=False)
+    return SimulatedExchangeAPI(str(diretorio / 'sma_1m.csv'), 1000, 0.1, '1m')
+
+
+def test_serie_igual_ao_calculo_por_barra():
+    """A série vetorizada deve bater com a SMA calculada na janela de cada barra."""
+    print("=" * 80)
+    print("🧪 TESTE: Série de SMA vetorizada vs cálculo direto")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api = _criar_api(Path(tmp))
+        analise = AnaliseTecnica(api)
+        periodo_dias = 1  # 24 candles de 1h / 6 candles de 4h
+        series = analise.calcular_serie_sma_multiplos_timeframes(periodo_dias=periodo_dias)
+
+        for indice in (0, 59, 60, 61, 1439, 2000, 4321, 5999):
+            api.indice_atual = indice + 1
+            preco_barra = api.get_preco_atual('ADA/USDT')
+            smas = {}
+            for intervalo, n_candles in (('1h', 24), ('4h', 6)):
+                closes = api.obter_klines_array('ADA/USDT', intervalo, n_candles).close.copy()
+                # Sem lookahead: candle em formação vale o fechamento da barra atual
+                closes[-1] = preco_barra
+                smas[intervalo] = closes.mean()
+                assert abs(series[intervalo][indice] - smas[intervalo]) < 1e-12, \
+                    f"SMA {intervalo} divergente na barra {indice}"
+
+            media = smas['1h'] * 0.4 + smas['4h'] * 0.6
+            assert abs(series['media'][indice] - media) < 1e-12
+
+    print("   ✅ Série idêntica ao cálculo barra a barra")
+
+
+def test_atualizacao_pelo_tempo_simulado():
+    """A SMA de referência deve mudar ao longo do backtest, no intervalo configurado."""
+    print("=" * 80)
+    print("🧪 TESTE: Atualização da SMA no tempo simulado")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api = _criar_api(Path(tmp))
+        worker = SimpleNamespace(
+            config={'INTERVALO_ATUALIZACAO_SMA_HORAS': 2, 'PERIODO_DIAS_SMA_REFERENCIA': 1},
+            modo_simulacao=True,
+            num=CONTEXTO_DECIMAL,
+            exchange_api=api,
+            analise_tecnica=AnaliseTecnica(api),
+            serie_sma_simulacao=None,
+            sma_1h=None, sma_4h=None, sma_referencia=None, ultima_atualizacao_sma=None,
+            ts_ms_ultima_sma=None,
+            logger=SimpleNamespace(debug=lambda *a, **k: None, info=lambda *a, **k: None,
+                                   warning=lambda *a, **k: None, error=lambda *a, **k: None),
+        )
+        worker._atualizar_sma_referencia_simulada = \
+            lambda horas: BotWorker._atualizar_sma_referencia_simulada(worker, horas)
+
+        BotWorker._preparar_sma_simulacao(worker)
+        assert worker.serie_sma_simulacao is not None
+
+        atualizacoes = []
+        while api.get_barra_atual() is not None:
+            BotWorker._atualizar_sma_referencia(worker)
+            if not atualizacoes or atualizacoes[-1][0] != worker.ultima_atualizacao_sma:
+                atualizacoes.append((worker.ultima_atualizacao_sma, worker.sma_referencia))
+
+        intervalos = {b[0] - a[0] for a, b in zip(atualizacoes, atualizacoes[1:])}
+        print(f"   📊 {len(atualizacoes)} atualizações durante o backtest")
+        assert len(atualizacoes) > 1, "SMA não pode ficar congelada no valor inicial"
+        assert intervalos == {pd.Timedelta(hours=2).to_pytimedelta()}, f"Intervalos inesperados: {intervalos}"
+        assert len({valor for _, valor in atualizacoes}) == len(atualizacoes)
+
+    print("   ✅ SMA atualizada a cada 2h de tempo simulado")
+
+
+if __name__ == '__main__':
+    test_serie_igual_ao_calculo_por_barra()
+    test_atualizacao_pelo_tempo_simulado()
+    print("\n✅ Todos os testes passaram!")
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Teste: StateManager com escritas agrupadas e journal
+====================================================
+
+PROBLEMA ORIGINAL:
+- Em produção, cada set_state reescrevia o JSON inteiro (write + rename),
+  inclusive a cada novo pico do trailing stop e a cada HWM
+
+CORREÇÃO:
+- intervalo_flush_segundos > 0: no máximo 1 snapshot por intervalo
+- Alterações entre snapshots vão para um journal append-only
+  (<estado>.json.journal), reaplicado ao carregar após um crash
+- chaves_criticas (ex: stops) forçam snapshot imediato, com fsync
+  (o journal recebe apenas flush e guarda só alterações não críticas)
+- BotWorker: stop criado/promovido/removido é crítico; novo pico do TSL vai
+  pelo journal (numa alta contínua seria um fsync por ciclo)
+- obter_metricas(): flushes e latência
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.bot_worker import BotWorker
+from src.persistencia.state_manager import StateManager
+
+
+def _ler_snapshot(caminho: Path) -> dict:
+    return json.loads(caminho.read_text(encoding='utf-8'))
+
+
+def test_agrupamento_de_escritas():
+    """Muitas alterações dentro do intervalo geram um único snapshot."""
+    print("=" * 80)
+    print("🧪 TESTE: Agrupamento de escritas dentro do intervalo")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = Path(tmp) / 'estado.json'
+        state = StateManager(str(caminho), intervalo_flush_segundos=60)
+        for i in range(200):
+            state.set_state('tsl_pico', i)
+
+        assert _ler_snapshot(caminho) == {}, "Snapshot não deveria ser reescrito"
+        assert state.tem_alteracoes_pendentes
+        assert state.flush_se_necessario() is False
+
+        metricas = state.obter_metricas()
+        assert metricas['flushes'] == 0
+        assert metricas['entradas_journal'] == 200
+
+        state.flush()
+        assert _ler_snapshot(caminho) == {'tsl_pico': 199}
+        assert not state.armazenamento.caminho_journal.exists()
+        assert not state.tem_alteracoes_pendentes
+
+        # Intervalo vencido: próxima alteração já grava o snapshot
+        state.intervalo_flush_segundos = 0.01
+        time.sleep(0.02)
+        state.set_state('tsl_pico', 500)
+        assert _ler_snapshot(caminho) == {'tsl_pico': 500}
+
+    print("   ✅ 200 alterações, 1 snapshot")
+
+
+def test_chave_critica_grava_imediatamente():
+    """Chaves críticas (e critico=True) não esperam o intervalo."""
+    print("=" * 80)
+    print("🧪 TESTE: Snapshot imediato para chaves críticas")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = Path(tmp) / 'estado.json'
+        state = StateManager(str(caminho), intervalo_flush_segundos=60,
+                             chaves_criticas=['stops_ativos_persistentes'])
+
+        state.set_state('high_water_mark_profit', 1.5)
+        stops = {'giro_rapido': {'tipo': 'sl', 'nivel_stop': 0.48}}
+        state.set_state('stops_ativos_persistentes', stops)
+        assert _ler_snapshot(caminho) == {'high_water_mark_profit': 1.5, 'stops_ativos_persistentes': stops}
+
+        # Atualização de pico explicitamente não crítica
+        stops['giro_rapido']['nivel_stop'] = 0.49
+        state.set_state('stops_ativos_persistentes', stops, critico=False)
+        assert _ler_snapshot(caminho)['stops_ativos_persistentes']['giro_rapido']['nivel_stop'] == 0.48
+
+        state.set_state('capital_para_recompra', {}, critico=True)
+        assert _ler_snapshot(caminho)['stops_ativos_persistentes']['giro_rapido']['nivel_stop'] == 0.49
+        assert state.obter_metricas()['flushes'] == 2
+
+    print("   ✅ Stops gravados sem esperar o intervalo")
+
+
+def test_recuperacao_pelo_journal():
+    """Um crash antes do flush não perde alterações (linha truncada é ignorada)."""
+    print("=" * 80)
+    print("🧪 TESTE: Recuperação do estado pelo journal após crash")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = Path(tmp) / 'estado.json'
+        state = StateManager(str(caminho), intervalo_flush_segundos=60)
+        state.set_state('a', 1)
+        state.set_state('b', [1, 2])
+        state.set_state('a', 2)
+        assert state.delete_state('b')
+        state.set_state('c', {'x': 1})
+
+        # Simula crash no meio da escrita da última linha
+        with open(state.armazenamento.caminho_journal, 'a', encoding='utf-8') as f:
+            f.write('{"op": "set", "k": "d", "v"')
+        del state
+
+        recuperado = StateManager(str(caminho))
+        assert recuperado.get_all_state() == {'a': 2, 'c': {'x': 1}}
+        assert _ler_snapshot(caminho) == {'a': 2, 'c': {'x': 1}}
+        assert not recuperado.armazenamento.caminho_journal.exists()
+
+        # Comportamento original (intervalo 0): sem journal
+        recuperado.set_state('e', True)
+        assert _ler_snapshot(caminho)['e'] is True
+        assert not recuperado.armazenamento.caminho_journal.exists()
+
+    print("   ✅ Estado reconstruído do snapshot + journal")
+
+
+def test_alteracao_critica_sincronizada():
+    """Alteração crítica e flush fazem fsync; entradas do journal não."""
+    print("=" * 80)
+    print("🧪 TESTE: fsync nas alterações críticas")
+    print("=" * 80)
+
+    fsync_original = os.fsync
+    chamadas = []
+
+    def fsync_contado(fd):
+        chamadas.append(fd)
+        fsync_original(fd)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = Path(tmp) / 'estado.json'
+        os.fsync = fsync_contado
+        try:
+            state = StateManager(str(caminho), intervalo_flush_segundos=60,
+                                 chaves_criticas=['stops_ativos_persistentes'])
+            chamadas.clear()
+            for i in range(50):
+                state.set_state('high_water_mark_profit', i)
+            assert chamadas == [], "Journal não deveria fazer fsync"
+
+            state.set_state('stops_ativos_persistentes', {'giro_rapido': None})
+            assert chamadas, "Alteração crítica precisa de fsync"
+
+            chamadas.clear()
+            state.set_state('high_water_mark_profit', 99)
+            state.flush()
+            assert chamadas, "Flush (que apaga o journal) precisa de fsync"
+
+            # Modo original (intervalo 0): fsync só nas chaves críticas
+            direto = StateManager(str(Path(tmp) / 'direto.json'),
+                                  chaves_criticas=['stops_ativos_persistentes'])
+            chamadas.clear()
+            direto.set_state('high_water_mark_profit', 1)
+            assert chamadas == []
+            direto.set_state('stops_ativos_persistentes', {})
+            assert chamadas
+        finally:
+            os.fsync = fsync_original
+
+        assert _ler_snapshot(caminho)['high_water_mark_profit'] == 99
+
+    print("   ✅ Críticas duráveis; journal sem custo de fsync")
+
+
+def test_pico_do_tsl_pelo_journal():
+    """Stop ativado: snapshot com fsync; novos picos: journal, sem fsync."""
+    print("=" * 80)
+    print("🧪 TESTE: Estado dos stops no BotWorker (crítico x pico do TSL)")
+    print("=" * 80)
+
+    fsync_original = os.fsync
+    chamadas = []
+
+    def fsync_contado(fd):
+        chamadas.append(fd)
+        fsync_original(fd)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = Path(tmp) / 'estado.json'
+        worker = SimpleNamespace(
+            state=StateManager(str(caminho), intervalo_flush_segundos=60,
+                               chaves_criticas=['stops_ativos_persistentes']),
+            stops_ativos={'acumulacao': None, 'giro_rapido': None},
+            logger=logging.getLogger(__name__),
+        )
+        tsl = {'tipo': 'tsl', 'nivel_stop': Decimal('0.49'), 'preco_pico': Decimal('0.50'),
+               'distancia_pct': Decimal('2')}
+
+        os.fsync = fsync_contado
+        try:
+            worker.stops_ativos['giro_rapido'] = tsl
+            BotWorker._salvar_estado_stops(worker)
+            assert chamadas, "Ativação do stop precisa de fsync"
+
+            chamadas.clear()
+            for pico in ('0.51', '0.52', '0.53'):
+                tsl['preco_pico'] = Decimal(pico)
+                BotWorker._salvar_estado_stops(worker, critico=False)
+            assert chamadas == [], "Novo pico não deveria fazer fsync"
+            assert worker.state.obter_metricas()['entradas_journal'] == 3
+            assert _ler_snapshot(caminho)['stops_ativos_persistentes']['giro_rapido']['preco_pico'] == 0.50
+
+            # Crash neste ponto: o último pico volta pelo journal
+            copia = Path(tmp) / 'copia'
+            copia.mkdir()
+            for arquivo in (caminho, worker.state.armazenamento.caminho_journal):
+                (copia / arquivo.name).write_bytes(arquivo.read_bytes())
+            recuperado = StateManager(str(copia / caminho.name))
+            assert recuperado.get_state('stops_ativos_persistentes')['giro_rapido']['preco_pico'] == 0.53
+
+            worker.stops_ativos['giro_rapido'] = None
+            BotWorker._salvar_estado_stops(worker)
+            assert chamadas, "Remoção do stop precisa de fsync"
+        finally:
+            os.fsync = fsync_original
+
+        assert _ler_snapshot(caminho)['stops_ativos_persistentes']['giro_rapido'] is None
+
+    print("   ✅ Ativação e remoção com fsync; picos agrupados no journal")
+
+
+if __name__ == '__main__':
+    test_agrupamento_de_escritas()
+    test_chave_critica_grava_imediatamente()
+    test_recuperacao_pelo_journal()
+    test_alteracao_critica_sincronizada()
+    test_pico_do_tsl_pelo_journal()
+    print("\n✅ Todos os testes passaram!")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Teste: Sweep de parâmetros do laboratório de backtest
+=====================================================
+
+PROBLEMA ORIGINAL:
+- backtest.py roda UMA configuração por processo, com parâmetros vindos
+  de prompts interativos; otimizar o giro rápido exigia um dia de
+  execuções sequenciais
+
+CORREÇÃO:
+- src/backtest/sweep.py expande uma grade de parâmetros e roda as
+  combinações num ProcessPoolExecutor, carregando o CSV uma vez por processo
+- SimulatedExchangeAPI.clonar() reaproveita dados e resamples entre execuções
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.executor import calcular_drawdown_maximo, executar_simulacao, silenciar_logs_simulacao
+from src.backtest.sweep import aplicar_parametros, executar_sweep, expandir_grade
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+
+def _criar_csv(diretorio: Path, n_barras: int = 4000) -> Path:
+    rng = np.random.default_rng(8)
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.003, n_barras)))).round(6)
+    caminho = diretorio / 'sweep_1m.csv'
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+        'volume': np.ones(n_barras),
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def test_expandir_e_aplicar_grade():
+    """Produto cartesiano e caminhos com pontos (incluindo índices de lista)."""
+    print("=" * 80)
+    print("🧪 TESTE: Expansão da grade e aplicação de parâmetros")
+    print("=" * 80)
+
+    grade = {
+        'estrategia_giro_rapido.rsi_limite_compra': [25, 30],
+        'DEGRAUS_COMPRA.1.gatilho_distancia_sma': [7, 9, 11],
+        'rsi_limite_compra': 40,
+    }
+    combinacoes = expandir_grade(grade)
+    assert len(combinacoes) == 6
+    assert all(c['rsi_limite_compra'] == 40 for c in combinacoes)
+
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    original = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    aplicar_parametros(config, combinacoes[-1])
+    assert config['estrategia_giro_rapido']['rsi_limite_compra'] == 30
+    assert config['DEGRAUS_COMPRA'][1]['gatilho_distancia_sma'] == 11
+    assert config['DEGRAUS_COMPRA'][0] == original['DEGRAUS_COMPRA'][0]
+
+    # Lista inteira como valor alternativo
+    degraus = [{'nivel': 1, 'gatilho_distancia_sma': 2, 'percentual_capital_usar': 10, 'intervalo_horas': 12}]
+    aplicar_parametros(config, {'DEGRAUS_COMPRA': degraus})
+    assert config['DEGRAUS_COMPRA'] == degraus and config['DEGRAUS_COMPRA'] is not degraus
+
+    assert abs(calcular_drawdown_maximo(np.array([100.0, 120.0, 90.0, 130.0])) - 25.0) < 1e-12
+
+    print("   ✅ Grade expandida e parâmetros aplicados")
+
+
+def test_clone_igual_a_instancia_nova():
+    """Simular sobre um clone deve dar exatamente o mesmo resultado que reler o CSV."""
+    print("=" * 80)
+    print("🧪 TESTE: SimulatedExchangeAPI.clonar() vs instância nova")
+    print("=" * 80)
+
+    silenciar_logs_simulacao()
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp))
+        api = SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m')
+        indice_original = api.indice_atual
+        clone = api.clonar()
+        resultado_clone = executar_simulacao(config, clone, ['ambas'])
+        resultado_novo = executar_simulacao(config, SimulatedExchangeAPI(str(caminho), 1000, 0.1, '1m'), ['ambas'])
+
+    assert len(resultado_clone['trades']) == len(resultado_novo['trades'])
+    assert resultado_clone['saldo_final_usdt'] == resultado_novo['saldo_final_usdt']
+    assert resultado_clone['saldo_final_ativo'] == resultado_novo['saldo_final_ativo']
+    # A instância original não foi consumida pelo clone
+    assert api.indice_atual == indice_original
+    assert clone.kline_stores['1m'].valores is api.kline_stores['1m'].valores
+
+    print(f"   ✅ {len(resultado_clone['trades'])} trades idênticos")
+
+
+def test_sweep_paralelo():
+    """Sweep com 2 processos: uma linha por combinação, ranking ordenado."""
+    print("=" * 80)
+    print("🧪 TESTE: Sweep em ProcessPoolExecutor")
+    print("=" * 80)
+
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    grade = {
+        'estrategia_giro_rapido.stop_loss_inicial_pct': [0.8, 1.5],
+        'estrategia_giro_rapido.alocacao_capital_pct': [20, 50],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = _criar_csv(Path(tmp), n_barras=2500)
+        resultados = executar_sweep(
+            config_base=config, grade=grade, caminho_csv=str(caminho),
+            saldo_inicial=1000, taxa_pct=0.1, timeframe_base='1m',
+            estrategias=['giro_rapido'], max_workers=2
+        )
+
+    assert len(resultados) == 4
+    assert all(r['erro'] is None for r in resultados), [r['erro'] for r in resultados]
+    retornos = [r['metricas']['retorno_pct'] for r in resultados]
+    assert retornos == sorted(retornos, reverse=True)
+    assert {tuple(r['parametros'].values()) for r in resultados} == {(0.8, 20), (0.8, 50), (1.5, 20), (1.5, 50)}
+    # Config base não foi alterada pelas combinações
+    assert config == json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+
+    print("   ✅ 4 combinações executadas e ranqueadas")
+
+
+if __name__ == '__main__':
+    test_expandir_e_aplicar_grade()
+    test_clone_igual_a_instancia_nova()
+    test_sweep_paralelo()
+    print("\n✅ Todos os testes passaram!")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Teste: Walk-forward sobre a SimulatedExchangeAPI
+================================================
+
+FUNCIONALIDADE:
+- O histórico é dividido em janelas in-sample / out-of-sample móveis
+- A grade é otimizada no IS e a melhor combinação roda no OOS seguinte
+- As curvas OOS são costuradas numa curva única
+- Cada janela é uma fatia (SimulatedExchangeAPI.fatiar) dos arrays já
+  resampleados, sem reler o CSV
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtest.walk_forward import costurar_curvas_oos, executar_walk_forward, gerar_janelas
+from src.exchange.simulated_api import SimulatedExchangeAPI
+
+CONFIG_TEMPLATE = Path(__file__).parent.parent / 'configs' / 'backtest_template.json'
+
+
+def _criar_csv(diretorio: Path, dias: int = 4) -> Path:
+    n_barras = dias * 1440
+    rng = np.random.default_rng(17)
+    close = (0.5 * np.exp(np.cumsum(rng.normal(0, 0.003, n_barras)))).round(6)
+    caminho = diretorio / 'wf_1m.csv'
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n_barras, freq='1min'),
+        'open': close, 'high': close * 1.001, 'low': close * 0.999, 'close': close,
+        'volume': np.ones(n_barras),
+    }).to_csv(caminho, index=False)
+    return caminho
+
+
+def test_gerar_janelas():
+    """Janelas IS/OOS contíguas, OOS sem sobreposição e dentro do histórico."""
+    print("=" * 80)
+    print("🧪 TESTE: Geração das janelas do walk-forward")
+    print("=" * 80)
+
+    indice = pd.date_range('2024-01-01', '2024-01-31 23:59', freq='1min')
+    janelas = gerar_janelas(indice, dias_in_sample=10, dias_out_of_sample=5)
+
+    assert len(janelas) == 4
+    for anterior, seguinte in zip(janelas, janelas[1:]):
+        assert seguinte.oos_inicio == anterior.oos_fim
+    for janela in janelas:
+        assert janela.is_fim == janela.oos_inicio
+        assert janela.oos_fim <= indice[-1]
+
+    try:
+        gerar_janelas(indice, 10, 5, passo_dias=2)
+        assert False, "Passo menor que o OOS deveria ser rejeitado"
+    except ValueError:
+        pass
+
+    print(f"   ✅ {len(janelas)} janelas geradas")
+
+
+def test_fatiar_reaproveita_resamples():
+    """A fatia opera só no período pedido e enxerga os mesmos candles do histórico completo."""
+    print("=" * 80)
+    print("🧪 TESTE: SimulatedExchangeAPI.fatiar()")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api = SimulatedExchangeAPI(str(_criar_csv(Path(tmp))), 1000, 0.1, '1m')
+        for intervalo in ('5m', '1h', '4h'):
+            api.obter_kline_store(intervalo)
+
+        inicio, fim = pd.Timestamp('2024-01-02 06:00'), pd.Timestamp('2024-01-03 00:00')
+        fatia = api.fatiar(inicio, fim, barras_aquecimento=300)
+
+        # Views: nenhum array copiado
+        assert np.shares_memory(fatia.kline_stores['4h'].valores, api.kline_stores['4h'].valores)
+        assert np.shares_memory(fatia.store_base.valores, api.store_base.valores)
+
+        barras = []
+        while (barra := fatia.get_barra_atual()) is not None:
+            barras.append(barra.timestamp)
+            if len(barras) in (1, 500):
+                ts_ms = fatia._timestamp_atual_ms()
+                api.indice_atual = int(np.searchsorted(api.store_base.timestamps, ts_ms)) + 1
+                for intervalo in ('1m', '1h', '4h'):
+                    esperado = api.obter_klines_array('ADA/USDT', intervalo, 100)
+                    obtido = fatia.obter_klines_array('ADA/USDT', intervalo, 100)
+                    assert np.array_equal(esperado.timestamps, obtido.timestamps), intervalo
+                    assert np.array_equal(esperado.close, obtido.close), intervalo
+
+        assert barras[0] == inicio.to_pydatetime()
+        assert barras[-1] == (fim - pd.Timedelta(minutes=1)).to_pydatetime()
+        assert len(barras) == 18 * 60
+
+    print(f"   ✅ {len(barras)} barras operadas, histórico idêntico ao completo")
+
+
+def test_costurar_curvas():
+    """Retornos das janelas se compõem na curva costurada."""
+    print("=" * 80)
+    print("🧪 TESTE: Costura das curvas OOS")
+    print("=" * 80)
+
+    def janela(numero):
+        return type('J', (), {'numero': numero})()
+
+    resultados = [
+        {'janela': janela(1), 'erro': None, 'curva_oos': [('2024-01-01T00:00:00', 1000.0), ('2024-01-01T00:00:00', 1000.0), ('2024-01-01T00:01:00', 1100.0)]},
+        {'janela': janela(2), 'erro': None, 'curva_oos': [('2024-01-01T00:02:00', 1000.0), ('2024-01-01T00:03:00', 900.0)]},
+    ]
+    curva = costurar_curvas_oos(resultados, 1000)
+
+    assert len(curva) == 4
+    assert abs(curva['patrimonio'].iloc[-1] - 990.0) < 1e-9
+    assert curva['timestamp'].is_monotonic_increasing
+
+    print("   ✅ Curva costurada: 1000 → 1100 → 990")
+
+
+def test_walk_forward_paralelo():
+    """Walk-forward ponta a ponta com 2 processos."""
+    print("=" * 80)
+    print("🧪 TESTE: Walk-forward em ProcessPoolExecutor")
+    print("=" * 80)
+
+    config = json.loads(CONFIG_TEMPLATE.read_text(encoding='utf-8'))
+    grade = {'estrategia_giro_rapido.stop_loss_inicial_pct': [0.8, 1.5]}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        relatorio = executar_walk_forward(
+            config_base=config, grade=grade, caminho_csv=str(_criar_csv(Path(tmp))),
+            saldo_inicial=1000, taxa_pct=0.1, timeframe_base='1m', estrategias=['giro_rapido'],
+            dias_in_sample=1, dias_out_of_sample=1, max_workers=2
+        )
+
+    janelas = relatorio['janelas']
+    assert [r['janela'].numero for r in janelas] == [1, 2]
+    assert all(r['erro'] is None for r in janelas), [r['erro'] for r in janelas]
+
+    curva = relatorio['curva']
+    assert curva['timestamp'].is_monotonic_increasing and curva['timestamp'].is_unique
+    assert curva['timestamp'].iloc[0] == janelas[0]['janela'].oos_inicio
+    assert curva['timestamp'].iloc[-1] < janelas[-1]['janela'].oos_fim
+
+    retorno_composto = np.prod([1 + r['metricas_oos']['retorno_pct'] / 100 for r in janelas]) - 1
+    assert abs(relatorio['metricas']['retorno_pct'] - retorno_composto * 100) < 1e-6
+
+    print(f"   ✅ Retorno OOS costurado: {relatorio['metricas']['retorno_pct']:+.2f}%")
+
+
+if __name__ == '__main__':
+    test_gerar_janelas()
+    test_fatiar_reaproveita_resamples()
+    test_costurar_curvas()
+    test_walk_forward_paralelo()
+    print("\n✅ Todos os testes passaram!")